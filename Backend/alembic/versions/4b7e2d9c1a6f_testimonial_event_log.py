@@ -0,0 +1,44 @@
+"""testimonial event log
+
+Revision ID: 4b7e2d9c1a6f
+Revises: c940fac9dd5a
+Create Date: 2026-10-19 21:14:37.205000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2d9c1a6f'
+down_revision: Union[str, Sequence[str], None] = 'c940fac9dd5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _rename_log(old: str, new: str) -> None:
+    op.rename_table(old, new)
+    op.execute(f'ALTER SEQUENCE {old}_id_seq RENAME TO {new}_id_seq')
+    op.execute(f'ALTER TABLE {new} RENAME CONSTRAINT {old}_pkey TO {new}_pkey')
+    op.execute(f'ALTER TABLE {new} RENAME CONSTRAINT {old}_user_id_fkey TO {new}_user_id_fkey')
+    op.execute(f'ALTER INDEX ix_{old}_user_id_id RENAME TO ix_{new}_user_id_id')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rename_log('moderationevent', 'testimonialevent')
+    op.add_column('webhookendpoint', sa.Column('last_event_id', sa.BigInteger(), server_default='0', nullable=False))
+    # Events logged so far were already written to the outbox
+    op.execute(
+        "UPDATE webhookendpoint SET last_event_id = events.last_id "
+        "FROM (SELECT user_id, max(id) AS last_id FROM testimonialevent GROUP BY user_id) events "
+        "WHERE events.user_id = webhookendpoint.user_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('webhookendpoint', 'last_event_id')
+    _rename_log('testimonialevent', 'moderationevent')
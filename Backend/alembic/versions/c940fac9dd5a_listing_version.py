@@ -0,0 +1,35 @@
+"""listing version
+
+Revision ID: c940fac9dd5a
+Revises: 6fd6aa1cd355
+Create Date: 2026-10-19 18:02:11.412000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c940fac9dd5a'
+down_revision: Union[str, Sequence[str], None] = '6fd6aa1cd355'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('tenanttestimonialstats_listing_version_seq')))
+    op.add_column('tenanttestimonialstats', sa.Column('listing_version', sa.BigInteger(), server_default='0', nullable=False))
+    # Existing tenants get a version their cached listings have never seen
+    op.execute(
+        "UPDATE tenanttestimonialstats "
+        "SET listing_version = nextval('tenanttestimonialstats_listing_version_seq')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tenanttestimonialstats', 'listing_version')
+    op.execute(sa.schema.DropSequence(sa.Sequence('tenanttestimonialstats_listing_version_seq')))
@@ -1,11 +1,13 @@
 from fastapi import APIRouter
 
+from app.api.router.analytics import router as analytics_router
 from app.api.router.api_key import router as api_key_router
 from app.api.router.auth import router as auth_router
 from app.api.router.category import router as category_router
 from app.api.router.tag import router as tag_router
 from app.api.router.testimonial import router as testimonial_router
 from app.api.router.user import router as user_router
+from app.api.router.webhook import router as webhook_router
 
 router = APIRouter()
 router.include_router(auth_router)
@@ -14,3 +16,5 @@ router.include_router(api_key_router)
 router.include_router(testimonial_router)
 router.include_router(tag_router)
 router.include_router(category_router)
+router.include_router(analytics_router)
+router.include_router(webhook_router)
@@ -0,0 +1,142 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Query, Response, status
+from pydantic import Field
+
+from app.core.db import SessionDep
+from app.core.deps import ModeratorDep
+from app.models.testimonial import StatusType
+from app.schemas.analytics import (
+    AnalyticsDimension,
+    AnalyticsInterval,
+    ProductAuthorCount,
+    RatingBreakdown,
+    TagPairCount,
+)
+from app.services.analytics import AnalyticsService
+from app.services.user import UserService
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"],
+)
+
+# Reports are per user: browsers may keep them but must revalidate them
+PRIVATE_REVALIDATE = "private, no-cache"
+
+StatusFilter = Annotated[StatusType | None, Query(description="Only testimonials with this status")]
+SinceFilter = Annotated[datetime | None, Query(description="Created at or after, UTC if no offset")]
+UntilFilter = Annotated[datetime | None, Query(description="Created before, UTC if no offset")]
+
+
+@router.get(
+    "/ratings",
+    status_code=status.HTTP_200_OK,
+    response_model=list[RatingBreakdown],
+)
+def get_rating_breakdown(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    response: Response,
+    group_by: AnalyticsDimension | None = Query(None, description="Group by category or product"),
+    interval: AnalyticsInterval | None = Query(None, description="Split by week, month or year"),
+    percentiles: list[Annotated[int, Field(ge=1, le=100)]] = Query(
+        [50, 90], description="Rating percentiles to compute"
+    ),
+    limit: int = Query(50, ge=1, le=500, description="Number of groups to return"),
+    status: StatusFilter = None,
+    since: SinceFilter = None,
+    until: UntilFilter = None,
+):
+    """Get rating distributions, averages and percentiles per group and period.
+
+    Args:
+    - db (SessionDep): database session
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+    - response (Response): response whose cache headers are set
+    - group_by (AnalyticsDimension | None, optional): category or product. Defaults to a single group.
+    - interval (AnalyticsInterval | None, optional): week, month or year. Defaults to the whole range.
+    - percentiles (list[int], optional): percentiles from 1 to 100. Defaults to [50, 90].
+    - limit (int, optional): Number of groups to return, those with the most ratings. Defaults to 50.
+    - status (StatusType | None, optional): Only testimonials with this status.
+    - since (datetime | None, optional): Created at or after.
+    - until (datetime | None, optional): Created before.
+
+    Returns:
+    - list[RatingBreakdown]: one entry per non-empty group and period
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    facts = AnalyticsService.get_facts(db, tenant_owner_id)
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+    return AnalyticsService.rating_breakdown(
+        facts, group_by, interval, percentiles, limit, status, since, until
+    )
+
+
+@router.get(
+    "/tags/co-occurrence",
+    status_code=status.HTTP_200_OK,
+    response_model=list[TagPairCount],
+)
+def get_tag_cooccurrence(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    response: Response,
+    limit: int = Query(20, ge=1, le=200, description="Number of tag pairs to return"),
+    status: StatusFilter = None,
+    since: SinceFilter = None,
+    until: UntilFilter = None,
+):
+    """Get the pairs of tags most often used together on a testimonial.
+
+    Args:
+    - db (SessionDep): database session
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+    - response (Response): response whose cache headers are set
+    - limit (int, optional): Number of tag pairs to return. Defaults to 20.
+    - status (StatusType | None, optional): Only testimonials with this status.
+    - since (datetime | None, optional): Created at or after.
+    - until (datetime | None, optional): Created before.
+
+    Returns:
+    - list[TagPairCount]: most frequent pairs first
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    facts = AnalyticsService.get_facts(db, tenant_owner_id)
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+    return AnalyticsService.tag_cooccurrence(facts, limit, status, since, until)
+
+
+@router.get(
+    "/authors",
+    status_code=status.HTTP_200_OK,
+    response_model=list[ProductAuthorCount],
+)
+def get_author_counts(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    response: Response,
+    limit: int = Query(20, ge=1, le=200, description="Number of products to return"),
+    status: StatusFilter = None,
+    since: SinceFilter = None,
+    until: UntilFilter = None,
+):
+    """Get the number of testimonials and distinct authors per product.
+
+    Args:
+    - db (SessionDep): database session
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+    - response (Response): response whose cache headers are set
+    - limit (int, optional): Number of products to return. Defaults to 20.
+    - status (StatusType | None, optional): Only testimonials with this status.
+    - since (datetime | None, optional): Created at or after.
+    - until (datetime | None, optional): Created before.
+
+    Returns:
+    - list[ProductAuthorCount]: products with the most distinct authors first
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    facts = AnalyticsService.get_facts(db, tenant_owner_id)
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+    return AnalyticsService.author_counts(facts, limit, status, since, until)
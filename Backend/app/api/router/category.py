@@ -1,8 +1,12 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Header, Query, Response, status
 
+from app.core.config import settings
 from app.core.db import SessionDep
-from app.schemas import CategoryResponse
+from app.core.deps import ModeratorDep
+from app.schemas.pagination import CatalogSort
 from app.services.category import CategoryService
+from app.services.user import UserService
+from app.utils.http_cache import etag_matches, not_modified
 
 router = APIRouter(
     prefix="/categories",
@@ -11,15 +15,38 @@ router = APIRouter(
 
 
 @router.get("", status_code=status.HTTP_200_OK)
-def get_categories(db: SessionDep):
-    """Retrieve all categories.
+def get_categories(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    limit: int = Query(50, ge=1, le=200, description="Number of items to retrieve"),
+    sort: CatalogSort = Query(CatalogSort.POPULAR, description="Sort by usage or by name"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+):
+    """Retrieve the categories used by the tenant, with their usage counts.
+
+    Pages are served from an in-process cache and can be cached by the
+    browser (Cache-Control + ETag).
 
     Args:
     - db (SessionDep): database session
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+    - skip (int, optional): Number of items to skip. Defaults to 0.
+    - limit (int, optional): Number of items to retrieve. Defaults to 50.
+    - sort (CatalogSort, optional): Sort by usage ("popular") or by name. Defaults to "popular".
+    - if_none_match (str | None, optional): ETag of a cached copy; answered with 304 if still valid.
 
     Returns:
-    - list[CategoryResponse]: list of all categories
+    - PaginationResponse[CategoryUsageResponse]: paginated categories of the tenant
     """
 
-    categories = CategoryService.get_all_categories(db)
-    return [CategoryResponse.model_validate(cat) for cat in categories]
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    catalog = CategoryService.get_catalog(db, tenant_owner_id, skip, limit, sort)
+    cache_control = f"private, max-age={settings.CATALOG_MAX_AGE_SECONDS}"
+    if etag_matches(if_none_match, catalog.etag):
+        return not_modified(catalog.etag, cache_control)
+    return Response(
+        content=catalog.body,
+        media_type="application/json",
+        headers={"ETag": catalog.etag, "Cache-Control": cache_control},
+    )
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Header, Query, Response, status
 
+from app.core.config import settings
 from app.core.db import SessionDep
-from app.schemas.tag import TagResponse
+from app.core.deps import ModeratorDep
+from app.schemas.pagination import CatalogSort
+from app.schemas.tag import TagSuggestionResponse
 from app.services.tag import TagService
+from app.services.user import UserService
+from app.utils.http_cache import etag_matches, not_modified
 
 router = APIRouter(
     prefix="/tags",
@@ -14,11 +19,52 @@ router = APIRouter(
     "",
     status_code=status.HTTP_200_OK,
 )
-def get_tags(db: SessionDep):
-    """Get all tags.
+def get_tags(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    limit: int = Query(50, ge=1, le=200, description="Number of items to retrieve"),
+    sort: CatalogSort = Query(CatalogSort.POPULAR, description="Sort by usage or by name"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+):
+    """Get the tags used by the tenant, with their usage counts.
+
+    Pages are served from an in-process cache and can be cached by the
+    browser (Cache-Control + ETag).
+
+    Returns:
+    - PaginationResponse[TagUsageResponse]: paginated tags of the tenant
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    catalog = TagService.get_catalog(db, tenant_owner_id, skip, limit, sort)
+    cache_control = f"private, max-age={settings.CATALOG_MAX_AGE_SECONDS}"
+    if etag_matches(if_none_match, catalog.etag):
+        return not_modified(catalog.etag, cache_control)
+    return Response(
+        content=catalog.body,
+        media_type="application/json",
+        headers={"ETag": catalog.etag, "Cache-Control": cache_control},
+    )
+
+
+@router.get(
+    "/suggest",
+    status_code=status.HTTP_200_OK,
+    response_model=list[TagSuggestionResponse],
+)
+def suggest_tags(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+):
+    """Type-ahead for tags, ranked by how often the tenant uses them.
+
+    Answered from an in-memory prefix index of tag slugs; the database is only
+    read to load the index.
 
     Returns:
-    - list[TagResponse]: list of all tags
+    - list[TagSuggestionResponse]: matching tags, most used first
     """
-    tags = TagService.get_all_tags(db)
-    return [TagResponse.model_validate(tag) for tag in tags]
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    return [entry._asdict() for entry in TagService.suggest_tags(db, tenant_owner_id, q, limit)]
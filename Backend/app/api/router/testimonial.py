@@ -1,27 +1,78 @@
+import codecs
+import io
+from datetime import UTC, datetime, timedelta
+from typing import BinaryIO
 from uuid import UUID
 
-from fastapi import APIRouter, File, HTTPException, Query, UploadFile, status
+from fastapi import (
+    APIRouter,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import HTMLResponse, StreamingResponse
+from pydantic import ValidationError
 
+from app.core.cache import CachedBody
+from app.core.config import settings
 from app.core.db import SessionDep
-from app.core.deps import APIKeyPublicDep, ModeratorDep
+from app.core.deps import APIKeyEmbedDep, APIKeyPublicDep, ModeratorDep, StreamModeratorDep
+from app.core.jwt import create_stream_token
 from app.models.testimonial import StatusType
+from app.schemas.engagement import EngagementBeacon, EngagementGranularity, EngagementReport
 from app.schemas.pagination import PaginationResponse
 from app.schemas.testimonial import (
+    EmbedLayout,
+    ExportFormat,
+    ProductRatingSummaryResponse,
+    TestimonialAccepted,
+    TestimonialBatchResponse,
+    TestimonialBulkModeration,
+    TestimonialBulkModerationResponse,
     TestimonialCreate,
+    TestimonialImportResponse,
     TestimonialResponse,
+    TestimonialStatsResponse,
     TestimonialStatusUpdate,
     TestimonialUpdate,
 )
+from app.schemas.token import StreamTokenResponse
 from app.services.api_keys import APIKeyService
 from app.services.cloudinary import CloudinaryService
+from app.services.embed import EmbedService
+from app.services.engagement import EngagementService
+from app.services.ingest import IngestService
+from app.services.moderation_stream import ModerationStreamService
+from app.services.stats import StatsService
 from app.services.testimonial import TestimonialService
 from app.services.user import UserService
+from app.utils.http_cache import accepts_gzip, etag_matches, make_etag, not_modified
 
 router = APIRouter(
     prefix="/testimonials",
     tags=["Testimonial"],
 )
 
+# Moderation data is per user: browsers may keep it but must revalidate it
+PRIVATE_REVALIDATE = "private, no-cache"
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+# Embed widget bodies, by whether the script variant was requested
+EMBED_MEDIA_TYPES = {
+    False: "text/html; charset=utf-8",
+    True: "text/javascript; charset=utf-8",
+}
+
 
 @router.post(
     "/upload-images",
@@ -83,6 +134,344 @@ def create_testimonial(
     )
 
 
+@router.post(
+    "/ingest",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=TestimonialAccepted,
+)
+def ingest_testimonial(
+    data: TestimonialCreate,
+    api_key: APIKeyPublicDep,
+):
+    """Accept a testimonial for buffered insertion.
+
+    Same payload as POST /testimonials, but the row is written in a batch by a
+    background worker shortly after the response: the returned id becomes
+    readable once that flush completes. Responds 503 with Retry-After when the
+    buffer is full.
+
+    Args:
+    - data (TestimonialCreate): data for creating the testimonial
+    - api_key (APIKeyPublicDep): API key for authentication
+
+    Returns:
+    - TestimonialAccepted: id the testimonial will be stored under
+    """
+    tenant_owner_id = APIKeyService.get_tenant_owner_id_from_api_key(api_key)
+    return TestimonialAccepted(id=IngestService.submit(data, tenant_owner_id))
+
+
+@router.post(
+    "/public/engagement",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+)
+async def record_engagement(
+    request: Request,
+    api_key: APIKeyEmbedDep,
+):
+    """Record impressions and clicks reported by a widget.
+
+    Meant for `navigator.sendBeacon`, which cannot set headers nor a JSON
+    content type: the key goes in the query string and the body is parsed as
+    JSON whatever its content type. Events are only appended to memory and
+    written in aggregated batches by a background flusher.
+
+    Args:
+    - request (Request): request whose body is an EngagementBeacon
+    - api_key (APIKeyEmbedDep): API key from the `key` query parameter
+
+    Returns:
+    - Response: 204, empty
+    """
+    try:
+        beacon = EngagementBeacon.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False)) from None
+    tenant_owner_id = APIKeyService.get_tenant_owner_id_from_api_key(api_key)
+    EngagementService.record(tenant_owner_id, beacon)
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers={"Cache-Control": "no-store"})
+
+
+def _published_response(
+    cached: CachedBody,
+    if_none_match: str | None,
+    media_type: str = "application/json",
+    vary: str = "X-API-Key",
+    content_encoding: str | None = None,
+) -> Response:
+    """Serve a cached public body, or 304 if the client copy is still valid."""
+    cache_control = f"public, max-age={settings.PUBLIC_MAX_AGE_SECONDS}"
+    if etag_matches(if_none_match, cached.etag):
+        response = not_modified(cached.etag, cache_control)
+    else:
+        response = Response(
+            content=cached.body,
+            media_type=media_type,
+            headers={"ETag": cached.etag, "Cache-Control": cache_control},
+        )
+        if content_encoding:
+            response.headers["Content-Encoding"] = content_encoding
+    # Bodies differ per tenant, and the tenant comes from the API key header by default
+    response.headers["Vary"] = vary
+    # Targeted CDN invalidation: Surrogate-Key (Fastly and others), Cache-Tag (Cloudflare)
+    if cached.surrogate_keys:
+        response.headers["Surrogate-Key"] = " ".join(cached.surrogate_keys)
+        response.headers["Cache-Tag"] = ",".join(cached.surrogate_keys)
+    return response
+
+
+@router.get(
+    "/public",
+    status_code=status.HTTP_200_OK,
+    response_model=PaginationResponse[TestimonialResponse],
+)
+def get_published_testimonials(
+    db: SessionDep,
+    api_key: APIKeyPublicDep,
+    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    limit: int = Query(10, ge=1, le=100, description="Number of items to retrieve"),
+    product_id: str | None = Query(None, description="Filter by product ID"),
+    category: str | None = Query(None, description="Filter by category name or slug"),
+    tag: str | None = Query(None, description="Filter by tag name or slug"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+):
+    """Get approved, active testimonials of the API key's tenant, newest first.
+
+    For embeds and widgets. Pages are served from an in-process cache dropped
+    whenever a published testimonial changes, and can be cached by browsers
+    and CDNs (Cache-Control + ETag).
+
+    Args:
+    - db (SessionDep): database session
+    - api_key (APIKeyPublicDep): API key for authentication
+    - skip (int, optional): Number of items to skip. Defaults to 0.
+    - limit (int, optional): Number of items to retrieve. Defaults to 10.
+    - product_id (str | None, optional): Filter by product ID.
+    - category (str | None, optional): Filter by category name or slug.
+    - tag (str | None, optional): Filter by tag name or slug.
+    - if_none_match (str | None, optional): ETag of a cached page; answered with 304 if still valid.
+
+    Returns:
+    - PaginationResponse[TestimonialResponse]: Paginated published testimonials
+    """
+    tenant_owner_id = APIKeyService.get_tenant_owner_id_from_api_key(api_key)
+    cached = TestimonialService.get_published(
+        db, tenant_owner_id, skip, limit, product_id=product_id, category=category, tag=tag
+    )
+    return _published_response(cached, if_none_match)
+
+
+@router.get(
+    "/public/rating-summary",
+    status_code=status.HTTP_200_OK,
+    response_model=ProductRatingSummaryResponse,
+)
+def get_product_rating_summary(
+    db: SessionDep,
+    api_key: APIKeyPublicDep,
+    product_id: str = Query(..., description="Product ID"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+):
+    """Get the rating summary of a product: review count, average and star histogram.
+
+    Read from a summary kept up to date on every testimonial write, so the cost
+    does not grow with the number of reviews. Only approved, active, rated
+    testimonials count.
+
+    Args:
+    - db (SessionDep): database session
+    - api_key (APIKeyPublicDep): API key for authentication
+    - product_id (str): Product ID
+    - if_none_match (str | None, optional): ETag of a cached copy; answered with 304 if still valid.
+
+    Returns:
+    - ProductRatingSummaryResponse: rating summary, zeros if the product has no reviews
+    """
+    tenant_owner_id = APIKeyService.get_tenant_owner_id_from_api_key(api_key)
+    cached = TestimonialService.get_rating_summary(db, tenant_owner_id, product_id)
+    return _published_response(cached, if_none_match)
+
+
+@router.get(
+    "/public/{testimonial_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=TestimonialResponse,
+)
+def get_published_testimonial(
+    testimonial_id: UUID,
+    db: SessionDep,
+    api_key: APIKeyPublicDep,
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+):
+    """Get one approved, active testimonial of the API key's tenant.
+
+    Args:
+    - testimonial_id (UUID): ID of the testimonial
+    - db (SessionDep): database session
+    - api_key (APIKeyPublicDep): API key for authentication
+    - if_none_match (str | None, optional): ETag of a cached copy; answered with 304 if still valid.
+
+    Returns:
+    - TestimonialResponse: the published testimonial
+    """
+    tenant_owner_id = APIKeyService.get_tenant_owner_id_from_api_key(api_key)
+    cached = TestimonialService.get_published_testimonial(testimonial_id, db, tenant_owner_id)
+    return _published_response(cached, if_none_match)
+
+
+def _embed_response(
+    db: SessionDep,
+    api_key: APIKeyEmbedDep,
+    script: bool,
+    layout: EmbedLayout,
+    limit: int,
+    product_id: str | None,
+    category: str | None,
+    tag: str | None,
+    if_none_match: str | None,
+    accept_encoding: str | None,
+) -> Response:
+    tenant_owner_id = APIKeyService.get_tenant_owner_id_from_api_key(api_key)
+    compressed = accepts_gzip(accept_encoding)
+    cached = EmbedService.get_widget(
+        db,
+        tenant_owner_id,
+        layout,
+        limit,
+        script=script,
+        compressed=compressed,
+        product_id=product_id,
+        category=category,
+        tag=tag,
+    )
+    return _published_response(
+        cached,
+        if_none_match,
+        media_type=EMBED_MEDIA_TYPES[script],
+        # The API key is part of the URL here
+        vary="Accept-Encoding",
+        content_encoding="gzip" if compressed else None,
+    )
+
+
+@router.get("/embed", status_code=status.HTTP_200_OK, response_class=HTMLResponse)
+def get_embed_widget(
+    db: SessionDep,
+    api_key: APIKeyEmbedDep,
+    layout: EmbedLayout = Query(EmbedLayout.GRID, description="carousel, grid or single"),
+    limit: int = Query(6, ge=1, le=24, description="Number of testimonials to show"),
+    product_id: str | None = Query(None, description="Filter by product ID"),
+    category: str | None = Query(None, description="Filter by category name or slug"),
+    tag: str | None = Query(None, description="Filter by tag name or slug"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+    accept_encoding: str | None = Header(None, alias="Accept-Encoding"),
+):
+    """Published testimonials rendered as an HTML page, for an iframe.
+
+    `<iframe src=".../testimonials/embed?key=API_KEY&layout=carousel">`. The
+    rendered widget (and its gzip variant) is cached per feed version, so a
+    load is a single cached response.
+
+    Args:
+    - db (SessionDep): database session
+    - api_key (APIKeyEmbedDep): API key, from the `key` query parameter
+    - layout (EmbedLayout, optional): carousel, grid or single. Defaults to grid.
+    - limit (int, optional): Number of testimonials to show. Defaults to 6.
+    - product_id (str | None, optional): Filter by product ID.
+    - category (str | None, optional): Filter by category name or slug.
+    - tag (str | None, optional): Filter by tag name or slug.
+    - if_none_match (str | None, optional): ETag of a cached copy; answered with 304 if still valid.
+    - accept_encoding (str | None, optional): gzip-encoded body when accepted.
+
+    Returns:
+    - HTMLResponse: self-contained HTML document
+    """
+    return _embed_response(
+        db, api_key, False, layout, limit, product_id, category, tag, if_none_match, accept_encoding
+    )
+
+
+@router.get("/embed.js", status_code=status.HTTP_200_OK)
+def get_embed_script(
+    db: SessionDep,
+    api_key: APIKeyEmbedDep,
+    layout: EmbedLayout = Query(EmbedLayout.GRID, description="carousel, grid or single"),
+    limit: int = Query(6, ge=1, le=24, description="Number of testimonials to show"),
+    product_id: str | None = Query(None, description="Filter by product ID"),
+    category: str | None = Query(None, description="Filter by category name or slug"),
+    tag: str | None = Query(None, description="Filter by tag name or slug"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+    accept_encoding: str | None = Header(None, alias="Accept-Encoding"),
+):
+    """Published testimonials as a script inserting the rendered widget after itself.
+
+    `<script src=".../testimonials/embed.js?key=API_KEY&layout=grid"></script>`.
+    Same options and caching as GET /testimonials/embed.
+
+    Returns:
+    - JavaScript: inserts the widget markup next to the script tag
+    """
+    return _embed_response(
+        db, api_key, True, layout, limit, product_id, category, tag, if_none_match, accept_encoding
+    )
+
+
+def _is_utf8(file: BinaryIO) -> bool:
+    """Whether a seekable file is valid UTF-8; rewinds it afterwards."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for chunk in iter(lambda: file.read(64 * 1024), b""):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        file.seek(0)
+    return True
+
+
+@router.post(
+    "/import",
+    status_code=status.HTTP_200_OK,
+    response_model=TestimonialImportResponse,
+)
+def import_testimonials(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    file: UploadFile = File(..., description="NDJSON or CSV file with the testimonials"),
+    import_format: ExportFormat = Query(
+        ExportFormat.NDJSON, alias="format", description="File format (ndjson, csv)"
+    ),
+):
+    """Import many testimonials from one file, e.g. when migrating a tenant.
+
+    NDJSON files hold one TestimonialCreate payload per line. CSV files use the
+    columns of GET /testimonials/export?format=csv, so an export can be imported back.
+
+    Args:
+    - db (SessionDep): database session
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+    - file (UploadFile): the file to import, UTF-8 encoded
+    - import_format (ExportFormat, optional): ndjson or csv. Defaults to ndjson.
+
+    Returns:
+    - TestimonialImportResponse: imported and failed counts, rejected lines and throughput
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    # Checked before anything is imported: a decoding error halfway through
+    # would leave the batches already committed without a response to report them
+    if not _is_utf8(file.file):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="File must be UTF-8 encoded"
+        )
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return TestimonialService.import_testimonials(lines, import_format, db, tenant_owner_id)
+    finally:
+        lines.detach()
+
+
 @router.get(
     "",
     status_code=status.HTTP_200_OK,
@@ -91,6 +480,7 @@ def create_testimonial(
 def get_testimonials(
     db: SessionDep,
     current_user: ModeratorDep,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(10, ge=1, le=100, description="Number of items to retrieve"),
     search: str | None = Query(None, description="Search in title, product name or content"),
@@ -100,6 +490,10 @@ def get_testimonials(
     rating: int | None = Query(None, ge=0, le=5, description="Filter by rating (0-5)"),
     category_name: str | None = Query(None, description="Filter by category name"),
     tags: list[str] | None = Query(None, description="Filter by tags (must match all)"),
+    db_json: bool = Query(
+        False, description="Build the JSON page in Postgres instead of serializing in Python"
+    ),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
 ):
     """Get testimonials with pagination and optional filters.
 
@@ -113,11 +507,51 @@ def get_testimonials(
     - rating (int | None, optional): Filter by rating (0-5). Defaults to Query(None, ge=0, le=5, description="Filter by rating (0-5)").
     - category_name (str | None, optional): Filter by category name. Defaults to Query(None, description="Filter by category name").
     - tags (list[str] | None, optional): Filter by tags (must match all). Defaults to Query(None, description="Filter by tags (must match all)").
+    - db_json (bool, optional): Let Postgres render the whole page as a single JSON value. Defaults to False.
+    - if_none_match (str | None, optional): ETag of a cached page; answered with 304 if still valid.
 
     Returns:
     - PaginationResponse[TestimonialResponse]: Paginated response containing testimonials
     """
     tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+
+    # Decide 304 with a cheap probe before running the page query
+    listing_version = TestimonialService.get_listing_version(db, tenant_owner_id)
+    etag = make_etag(
+        tenant_owner_id,
+        listing_version,
+        skip,
+        limit,
+        search,
+        status,
+        rating,
+        category_name,
+        ",".join(tags) if tags else None,
+        db_json,
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PRIVATE_REVALIDATE)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+
+    if db_json:
+        body = TestimonialService.get_testimonials_json(
+            db=db,
+            skip=skip,
+            limit=limit,
+            tenant_owner_id=tenant_owner_id,
+            search=search,
+            status=status,
+            rating=rating,
+            category_name=category_name,
+            tags=tags,
+        )
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": PRIVATE_REVALIDATE},
+        )
+
     testimonials, total_items = TestimonialService.get_testimonials(
         db=db,
         skip=skip,
@@ -151,6 +585,279 @@ def get_testimonials(
     )
 
 
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+def export_testimonials(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    export_format: ExportFormat = Query(
+        ExportFormat.NDJSON, alias="format", description="Export format (ndjson, csv)"
+    ),
+    search: str | None = Query(None, description="Search in title, product name or content"),
+    status: StatusType | None = Query(
+        None, description="Filter by status (pending, approved, rejected)"
+    ),
+    rating: int | None = Query(None, ge=0, le=5, description="Filter by rating (0-5)"),
+    category_name: str | None = Query(None, description="Filter by category name"),
+    tags: list[str] | None = Query(None, description="Filter by tags (must match all)"),
+):
+    """Export all testimonials matching the filters as a streamed NDJSON or CSV file.
+
+    Args:
+    - db (SessionDep): database session
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+    - export_format (ExportFormat, optional): ndjson (one TestimonialResponse per line) or csv. Defaults to ndjson.
+    - search (str | None, optional): Search in title, product name or content.
+    - status (StatusType | None, optional): Filter by status (pending, approved, rejected).
+    - rating (int | None, optional): Filter by rating (0-5).
+    - category_name (str | None, optional): Filter by category name.
+    - tags (list[str] | None, optional): Filter by tags (must match all).
+
+    Returns:
+    - StreamingResponse: the export, streamed as it is read from the database
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    body = TestimonialService.export_testimonials(
+        db=db,
+        tenant_owner_id=tenant_owner_id,
+        export_format=export_format,
+        search=search,
+        status=status,
+        rating=rating,
+        category_name=category_name,
+        tags=tags,
+    )
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="testimonials.{export_format}"',
+            "Cache-Control": "private, no-store",
+        },
+    )
+
+
+@router.get(
+    "/stats",
+    status_code=status.HTTP_200_OK,
+    response_model=TestimonialStatsResponse,
+)
+def get_testimonial_stats(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    response: Response,
+    categories_limit: int = Query(
+        10, ge=0, le=100, description="Number of categories to include, most used first"
+    ),
+):
+    """Get the dashboard summary: counts by status, average rating and totals per category.
+
+    Args:
+    - db (SessionDep): database session
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+    - response (Response): response whose cache headers are set
+    - categories_limit (int, optional): Number of categories to include. Defaults to 10.
+
+    Returns:
+    - TestimonialStatsResponse: summary read from the tenant counters
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+    return StatsService.get_stats(db, tenant_owner_id, categories_limit)
+
+
+@router.get(
+    "/engagement",
+    status_code=status.HTTP_200_OK,
+    response_model=EngagementReport,
+)
+def get_engagement_report(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    response: Response,
+    granularity: EngagementGranularity = Query(
+        EngagementGranularity.DAY, description="Bucket size (hour, day)"
+    ),
+    start: datetime | None = Query(
+        None,
+        description="Start of the range, UTC if no offset. Defaults to 30 days (48 hours hourly) before end",
+    ),
+    end: datetime | None = Query(None, description="End of the range, exclusive. Defaults to now"),
+    testimonial_id: UUID | None = Query(None, description="Only this testimonial"),
+):
+    """Get impressions and clicks over a time range, from the hourly or daily rollups.
+
+    Args:
+    - db (SessionDep): database session
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+    - response (Response): response whose cache headers are set
+    - granularity (EngagementGranularity, optional): hour or day buckets. Defaults to day.
+    - start (datetime | None, optional): Start of the range. Defaults to 30 days (48 hours hourly) before end.
+    - end (datetime | None, optional): End of the range, exclusive. Defaults to now.
+    - testimonial_id (UUID | None, optional): Only this testimonial.
+
+    Returns:
+    - EngagementReport: totals and per-bucket series
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    end = end or datetime.now(UTC)
+    if start is None:
+        start = end - (
+            timedelta(hours=48) if granularity == EngagementGranularity.HOUR else timedelta(days=30)
+        )
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+    return EngagementService.get_report(
+        db, tenant_owner_id, granularity, start, end, testimonial_id
+    )
+
+
+@router.post(
+    "/stream/token",
+    status_code=status.HTTP_200_OK,
+    response_model=StreamTokenResponse,
+)
+def create_moderation_stream_token(current_user: ModeratorDep, response: Response):
+    """Issue a short-lived token that opens the moderation event stream.
+
+    Browsers' EventSource cannot send the Authorization header, so the stream
+    takes this token in its URL instead. It only opens streams, and only for
+    MODERATION_STREAM_TOKEN_SECONDS.
+
+    Args:
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+
+    Returns:
+    - StreamTokenResponse: the token and its lifetime in seconds
+    """
+    response.headers["Cache-Control"] = "no-store"
+    return StreamTokenResponse(
+        token=create_stream_token({"sub": str(current_user.id)}),
+        expires_in=settings.MODERATION_STREAM_TOKEN_SECONDS,
+    )
+
+
+@router.get(
+    "/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+def stream_moderation_events(
+    db: SessionDep,
+    current_user: StreamModeratorDep,
+    last_event_id: int | None = Header(
+        None, alias="Last-Event-ID", ge=0, description="Resume after this event"
+    ),
+    resume_after: int | None = Query(
+        None,
+        alias="last_event_id",
+        ge=0,
+        description="Resume after this event, for a new EventSource (the header wins)",
+    ),
+):
+    """Stream testimonial events of the tenant as Server-Sent Events, instead of polling the list.
+
+    Events are testimonial.created, testimonial.updated,
+    testimonial.status_changed and testimonial.deleted, each with the
+    testimonial's id, status and product in data. After replaying what the
+    client missed since Last-Event-ID, a "ready" event marks the switch to live
+    events; a "reset" event instead means too much was missed and the list must
+    be reloaded.
+
+    Open it as `new EventSource("/testimonials/stream?token=...")` with a token
+    from POST /testimonials/stream/token. The browser reconnects on its own,
+    sending Last-Event-ID, for as long as the token is valid. Once it has
+    expired the connection is refused (401) and EventSource stops: fetch a new
+    token and open a new EventSource with `&last_event_id=` set to the id of
+    the last event received.
+
+    Args:
+    - db (SessionDep): database session
+    - current_user (StreamModeratorDep): user of the stream token (guaranteed to be moderator or higher by StreamModeratorDep)
+    - last_event_id (int | None, optional): id of the last event received, sent by EventSource on reconnect.
+    - resume_after (int | None, optional): same, as the last_event_id query parameter.
+
+    Returns:
+    - StreamingResponse: text/event-stream, open until the client disconnects
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    if last_event_id is None:
+        last_event_id = resume_after
+    # The stream outlives the request: give the session's connection back to the pool
+    db.close()
+    return StreamingResponse(
+        ModerationStreamService.stream(tenant_owner_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "private, no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=TestimonialBatchResponse,
+)
+def get_testimonials_batch(
+    db: SessionDep,
+    current_user: ModeratorDep,
+    ids: list[UUID] = Query(
+        ...,
+        min_length=1,
+        max_length=settings.BATCH_FETCH_MAX_IDS,
+        description="Testimonial IDs, results keep this order",
+    ),
+):
+    """Get several testimonials by ID in one request.
+
+    Args:
+    - db (SessionDep): database session
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+    - ids (list[UUID]): IDs to fetch, repeated as `?ids=...&ids=...`
+
+    Returns:
+    - TestimonialBatchResponse: testimonials in the requested order and the IDs that were not found
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    testimonials, missing = TestimonialService.get_testimonials_by_ids(ids, db, tenant_owner_id)
+    return TestimonialBatchResponse(
+        results=[
+            TestimonialResponse(
+                **t.model_dump(),
+                category_name=t.category.name if t.category else None,
+                tags=[tag.name for tag in t.tags] if t.tags else None,
+            )
+            for t in testimonials
+        ],
+        missing=missing,
+    )
+
+
+@router.post(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=TestimonialBulkModerationResponse,
+)
+def bulk_moderate_testimonials(
+    data: TestimonialBulkModeration,
+    db: SessionDep,
+    current_user: ModeratorDep,
+):
+    """Approve, reject or soft delete many testimonials in one call.
+
+    Args:
+    - data (TestimonialBulkModeration): action plus either a list of ids or listing filters
+    - db (SessionDep): database session
+    - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+
+    Returns:
+    - TestimonialBulkModerationResponse: outcome per testimonial (updated, unchanged or not_found)
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    return TestimonialService.bulk_moderate(data, db, tenant_owner_id)
+
+
 @router.get(
     "/{testimonial_id}",
     status_code=status.HTTP_200_OK,
@@ -160,6 +867,8 @@ def get_testimonial_by_id(
     testimonial_id: UUID,
     db: SessionDep,
     current_user: ModeratorDep,
+    response: Response,
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
 ):
     """Get a testimonial by its ID.
 
@@ -167,6 +876,7 @@ def get_testimonial_by_id(
     - testimonial_id (UUID): ID of the testimonial to retrieve
     - db (SessionDep): database session
     - current_user (ModeratorDep): current user making the request (guaranteed to be moderator or higher by ModeratorDep)
+    - if_none_match (str | None, optional): ETag of a cached copy; answered with 304 if still valid.
 
     Raises:
     - HTTPException: if the testimonial is not found
@@ -178,6 +888,14 @@ def get_testimonial_by_id(
     testimonial = TestimonialService.get_testimonial_by_id(testimonial_id, db, tenant_owner_id)
     if not testimonial:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Testimonial not found")
+
+    # Answer before lazy-loading category/tags and serializing
+    etag = make_etag(testimonial.id, testimonial.updated_at.isoformat())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PRIVATE_REVALIDATE)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
+
     return TestimonialResponse(
         **testimonial.model_dump(),
         category_name=testimonial.category.name if testimonial.category else None,
@@ -208,17 +926,12 @@ def update_testimonial(
     - TestimonialResponse: the updated testimonial
     """
     tenant_owner_id = UserService._get_tenant_owner_id(current_user)
-    testimonial = TestimonialService.update_testimonial(
+    return TestimonialService.update_testimonial(
         data=data,
         db=db,
         tenant_owner_id=tenant_owner_id,
         testimonial_id=testimonial_id,
     )
-    return TestimonialResponse(
-        **testimonial.model_dump(),
-        category_name=testimonial.category.name if testimonial.category else None,
-        tags=[tag.name for tag in testimonial.tags] if testimonial.tags else None,
-    )
 
 
 @router.patch(
@@ -0,0 +1,147 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Query, status
+
+from app.core.db import SessionDep
+from app.core.deps import AdminDep
+from app.models.webhook import WebhookDeliveryStatus
+from app.schemas import (
+    WebhookDeliveryResponse,
+    WebhookEndpointCreate,
+    WebhookEndpointResponse,
+    WebhookEndpointSecretResponse,
+    WebhookEndpointUpdate,
+)
+from app.services.user import UserService
+from app.services.webhook import WebhookService
+
+router = APIRouter(
+    prefix="/webhooks",
+    tags=["Webhooks"],
+)
+
+
+@router.post(
+    "",
+    status_code=status.HTTP_201_CREATED,
+    response_model=WebhookEndpointSecretResponse,
+)
+def create_webhook(data: WebhookEndpointCreate, db: SessionDep, current_user: AdminDep):
+    """Register an endpoint to receive testimonial events.
+
+    Events are POSTed as {"events": [...]} batches, signed with the returned
+    secret: the Webhook-Signature header is v1= followed by the hex
+    HMAC-SHA256 of "{Webhook-Timestamp}.{body}". The URL must be https and its
+    host resolve to public addresses only; this is checked again before every
+    request.
+
+    Args:
+    - data (WebhookEndpointCreate): URL, events and concurrency of the endpoint
+    - db (SessionDep): database session
+    - current_user (AdminDep): current user making the request (guaranteed to be admin or higher by AdminDep)
+
+    Returns:
+    - WebhookEndpointSecretResponse: the endpoint with its signing secret, only shown once
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    return WebhookService.create_endpoint(db, tenant_owner_id, data)
+
+
+@router.get("", status_code=status.HTTP_200_OK, response_model=list[WebhookEndpointResponse])
+def list_webhooks(db: SessionDep, current_user: AdminDep):
+    """List the webhook endpoints of the tenant.
+
+    Args:
+    - db (SessionDep): database session
+    - current_user (AdminDep): current user making the request (guaranteed to be admin or higher by AdminDep)
+
+    Returns:
+    - list[WebhookEndpointResponse]: endpoints, newest first
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    return WebhookService.list_endpoints(db, tenant_owner_id)
+
+
+@router.patch(
+    "/{endpoint_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=WebhookEndpointResponse,
+)
+def update_webhook(
+    endpoint_id: UUID,
+    data: WebhookEndpointUpdate,
+    db: SessionDep,
+    current_user: AdminDep,
+):
+    """Update an endpoint; disabling it keeps its pending deliveries until it is enabled again.
+
+    Args:
+    - endpoint_id (UUID): ID of the endpoint
+    - data (WebhookEndpointUpdate): fields to update
+    - db (SessionDep): database session
+    - current_user (AdminDep): current user making the request (guaranteed to be admin or higher by AdminDep)
+
+    Returns:
+    - WebhookEndpointResponse: the updated endpoint
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    return WebhookService.update_endpoint(db, tenant_owner_id, endpoint_id, data)
+
+
+@router.delete("/{endpoint_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_webhook(endpoint_id: UUID, db: SessionDep, current_user: AdminDep):
+    """Delete an endpoint and its deliveries.
+
+    Args:
+    - endpoint_id (UUID): ID of the endpoint
+    - db (SessionDep): database session
+    - current_user (AdminDep): current user making the request (guaranteed to be admin or higher by AdminDep)
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    WebhookService.delete_endpoint(db, tenant_owner_id, endpoint_id)
+
+
+@router.get(
+    "/{endpoint_id}/deliveries",
+    status_code=status.HTTP_200_OK,
+    response_model=list[WebhookDeliveryResponse],
+)
+def list_webhook_deliveries(
+    endpoint_id: UUID,
+    db: SessionDep,
+    current_user: AdminDep,
+    delivery_status: WebhookDeliveryStatus | None = Query(
+        None, alias="status", description="Only deliveries in this status"
+    ),
+    limit: int = Query(50, ge=1, le=200, description="Number of deliveries to return"),
+):
+    """List the recent deliveries of an endpoint, with their attempts and last error.
+
+    Args:
+    - endpoint_id (UUID): ID of the endpoint
+    - db (SessionDep): database session
+    - current_user (AdminDep): current user making the request (guaranteed to be admin or higher by AdminDep)
+    - delivery_status (WebhookDeliveryStatus | None, optional): pending, delivered or dead.
+    - limit (int, optional): Number of deliveries to return. Defaults to 50.
+
+    Returns:
+    - list[WebhookDeliveryResponse]: deliveries, newest first
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    return WebhookService.list_deliveries(db, tenant_owner_id, endpoint_id, delivery_status, limit)
+
+
+@router.post("/{endpoint_id}/deliveries/redeliver", status_code=status.HTTP_200_OK)
+def redeliver_webhook_deliveries(endpoint_id: UUID, db: SessionDep, current_user: AdminDep) -> int:
+    """Queue the dead-lettered deliveries of an endpoint again.
+
+    Args:
+    - endpoint_id (UUID): ID of the endpoint
+    - db (SessionDep): database session
+    - current_user (AdminDep): current user making the request (guaranteed to be admin or higher by AdminDep)
+
+    Returns:
+    - int: number of deliveries queued
+    """
+    tenant_owner_id = UserService._get_tenant_owner_id(current_user)
+    return WebhookService.redeliver(db, tenant_owner_id, endpoint_id)
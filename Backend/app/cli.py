@@ -0,0 +1,114 @@
+"""Maintenance commands, run as `python -m app.cli <command>`."""
+
+import argparse
+import sys
+from pathlib import Path
+from uuid import UUID
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.services.engagement import EngagementService
+from app.services.event_log import EventLogService
+from app.services.feed import FeedService
+from app.services.rating_summary import RatingSummaryService
+from app.services.snapshot import SnapshotService
+from app.services.stats import StatsService
+from app.services.webhook import WebhookService
+
+
+def compact_engagement(args: argparse.Namespace) -> int:
+    with Session(engine) as db:
+        result = EngagementService.compact(db)
+    print(
+        f"{result['folded']} raw bucket(s) folded into the rollups, "
+        f"{result['hourly_expired']} hourly and {result['daily_expired']} daily bucket(s) expired"
+    )
+    return 0
+
+
+def reconcile_counters(args: argparse.Namespace) -> int:
+    with Session(engine) as db:
+        corrected = StatsService.reconcile(db, args.tenant)
+    for table, tenants in corrected.items():
+        print(f"{table}: {tenants} tenant(s) corrected")
+    return 0
+
+
+def prune_webhooks(args: argparse.Namespace) -> int:
+    with Session(engine) as db:
+        deleted = WebhookService.prune(db)
+    print(f"{deleted} delivered or dead webhook delivery(ies) deleted")
+    return 0
+
+
+def prune_events(args: argparse.Namespace) -> int:
+    with Session(engine) as db:
+        deleted = EventLogService.prune(db)
+    print(f"{deleted} testimonial event(s) deleted")
+    return 0
+
+
+def rebuild_feed(args: argparse.Namespace) -> int:
+    with Session(engine) as db:
+        FeedService.rebuild(db, args.tenant)
+    print("Published feed rebuilt")
+    return 0
+
+
+def rebuild_ratings(args: argparse.Namespace) -> int:
+    with Session(engine) as db:
+        RatingSummaryService.rebuild(db, args.tenant)
+    print("Product rating summaries rebuilt")
+    return 0
+
+
+def rebuild_snapshots(args: argparse.Namespace) -> int:
+    if not settings.SNAPSHOT_DIR:
+        print("SNAPSHOT_DIR is not set", file=sys.stderr)
+        return 1
+    with Session(engine) as db:
+        written = SnapshotService.rebuild(db, Path(settings.SNAPSHOT_DIR), args.tenant)
+    print(f"Snapshots written for {written} tenant(s) in {settings.SNAPSHOT_DIR}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, handler, help_text in (
+        ("reconcile-counters", reconcile_counters, "recount the usage and dashboard counters"),
+        ("rebuild-feed", rebuild_feed, "recompute the published feed from the testimonials"),
+        ("rebuild-ratings", rebuild_ratings, "recompute the product rating summaries"),
+        ("rebuild-snapshots", rebuild_snapshots, "regenerate the static snapshot files"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--tenant", type=UUID, help="only this tenant owner ID")
+        command.set_defaults(handler=handler)
+
+    command = commands.add_parser(
+        "compact-engagement",
+        help="fold raw engagement buckets into the rollups and apply retention",
+    )
+    command.set_defaults(handler=compact_engagement)
+
+    command = commands.add_parser(
+        "prune-webhooks",
+        help="delete webhook deliveries older than WEBHOOK_RETENTION_DAYS",
+    )
+    command.set_defaults(handler=prune_webhooks)
+
+    command = commands.add_parser(
+        "prune-events",
+        help="delete testimonial events older than EVENT_LOG_RETENTION_HOURS",
+    )
+    command.set_defaults(handler=prune_events)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
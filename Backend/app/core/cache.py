@@ -0,0 +1,110 @@
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable
+from typing import NamedTuple
+
+from app.utils.http_cache import etag_for_body
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+    expires_at: float
+    # CDN invalidation tags of the body (Surrogate-Key / Cache-Tag)
+    surrogate_keys: tuple[str, ...] = ()
+
+
+class ResponseCache:
+    """In-process cache of pre-serialized response bodies.
+
+    Entries are grouped by scope (e.g. a tenant id) so a write can drop every
+    cached body of that scope at once. The TTL bounds staleness across workers,
+    since invalidation only reaches the process that performed the write.
+
+    Concurrent misses on the same key build the body once. A body whose build
+    started before an invalidation of its scope is returned but not stored.
+    With max_entries, a scope keeps at most that many keys, oldest dropped first.
+    Surrogate keys, when asked for, are derived from the body once per build.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int | None = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._scopes: dict[Hashable, dict[Hashable, CachedBody]] = {}
+        # Bumped by invalidate(): a build only stores if nothing was dropped meanwhile
+        self._epoch = 0
+        self._generations: dict[Hashable, int] = {}
+        self._building: dict[tuple[Hashable, Hashable], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, scope: Hashable, key: Hashable) -> CachedBody | None:
+        with self._lock:
+            entry = self._scopes.get(scope, {}).get(key)
+        if entry is None or entry.expires_at < time.monotonic():
+            return None
+        return entry
+
+    def set(
+        self,
+        scope: Hashable,
+        key: Hashable,
+        body: bytes,
+        generation: tuple[int, int] | None = None,
+        surrogate_keys: Iterable[str] = (),
+    ) -> CachedBody:
+        entry = CachedBody(
+            body,
+            etag_for_body(body),
+            time.monotonic() + self.ttl_seconds,
+            tuple(surrogate_keys),
+        )
+        with self._lock:
+            if generation is not None and generation != self._generation(scope):
+                return entry
+            entries = self._scopes.setdefault(scope, {})
+            entries.pop(key, None)
+            entries[key] = entry
+            if self.max_entries is not None and len(entries) > self.max_entries:
+                del entries[next(iter(entries))]
+        return entry
+
+    def get_or_set(
+        self,
+        scope: Hashable,
+        key: Hashable,
+        build: Callable[[], bytes],
+        surrogate_keys: Callable[[bytes], Iterable[str]] | None = None,
+    ) -> CachedBody:
+        entry = self.get(scope, key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            building = self._building.setdefault((scope, key), threading.Lock())
+        with building:
+            entry = self.get(scope, key)
+            if entry is None:
+                with self._lock:
+                    generation = self._generation(scope)
+                try:
+                    body = build()
+                    keys = surrogate_keys(body) if surrogate_keys is not None else ()
+                    entry = self.set(scope, key, body, generation, keys)
+                finally:
+                    with self._lock:
+                        self._building.pop((scope, key), None)
+        return entry
+
+    def invalidate(self, scope: Hashable = None) -> None:
+        """Drop the cached bodies of one scope, or of every scope if none given."""
+        with self._lock:
+            if scope is None:
+                self._scopes.clear()
+                self._generations.clear()
+                self._epoch += 1
+            else:
+                self._scopes.pop(scope, None)
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def _generation(self, scope: Hashable) -> tuple[int, int]:
+        return self._epoch, self._generations.get(scope, 0)
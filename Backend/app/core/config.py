@@ -78,5 +78,114 @@ class Settings(BaseSettings):
     CLOUDINARY_API_KEY: str = ""
     CLOUDINARY_API_SECRET: str = ""
 
+    # Tag/category catalogs: in-process cache TTL and HTTP max-age
+    CATALOG_CACHE_TTL_SECONDS: int = 300
+    CATALOG_MAX_AGE_SECONDS: int = 60
+
+    # Bulk moderation: ids per request and rows per transaction
+    BULK_MODERATION_MAX_IDS: int = 10_000
+    BULK_MODERATION_CHUNK_SIZE: int = 500
+
+    # Batch reads: ids per GET /testimonials/batch
+    BATCH_FETCH_MAX_IDS: int = 100
+
+    # Exports: rows fetched per server-side cursor round trip
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Imports: rows validated and inserted per transaction, line errors reported
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+
+    # Buffered public submissions: pending items (503 beyond), rows per insert,
+    # max wait before a partial batch is flushed, optional on-disk journal
+    INGEST_BUFFER_MAX_ITEMS: int = 10_000
+    INGEST_BATCH_SIZE: int = 500
+    INGEST_FLUSH_INTERVAL_SECONDS: float = 1.0
+    INGEST_JOURNAL_DIR: str | None = None
+    INGEST_JOURNAL_FSYNC: bool = False
+
+    # Public read API: in-process cache TTL and keys per tenant, HTTP max-age,
+    # and how long a verified API key is trusted without a lookup
+    PUBLIC_CACHE_TTL_SECONDS: int = 300
+    PUBLIC_CACHE_MAX_ENTRIES: int = 1000
+    PUBLIC_MAX_AGE_SECONDS: int = 60
+    API_KEY_CACHE_TTL_SECONDS: int = 60
+
+    # Static snapshots of the public feed: output directory (disabled when unset),
+    # testimonials per page file, and whether the API serves the directory itself
+    SNAPSHOT_DIR: str | None = None
+    SNAPSHOT_PAGE_SIZE: int = 50
+    SNAPSHOT_SERVE: bool = False
+
+    # Embed widgets: rendered fragments kept per tenant (they are keyed by feed
+    # version, so the TTL only bounds memory held by unused variants)
+    EMBED_CACHE_TTL_SECONDS: int = 3600
+    EMBED_CACHE_MAX_ENTRIES: int = 200
+
+    # CDN purges by surrogate key: purge endpoint (disabled when unset), bearer
+    # token, keys per purge request and request timeout
+    PURGE_URL: str | None = None
+    PURGE_TOKEN: str | None = None
+    PURGE_BATCH_SIZE: int = 256
+    PURGE_TIMEOUT_SECONDS: float = 5.0
+
+    # Engagement beacons: events held in memory between flushes (oldest dropped
+    # beyond), flush period, width of the stored time buckets, rows per upsert
+    # and events accepted per beacon
+    ENGAGEMENT_BUFFER_SIZE: int = 100_000
+    ENGAGEMENT_FLUSH_INTERVAL_SECONDS: float = 5.0
+    ENGAGEMENT_BUCKET_SECONDS: int = 60
+    ENGAGEMENT_BATCH_SIZE: int = 1000
+    ENGAGEMENT_BEACON_MAX_EVENTS: int = 50
+
+    # Engagement rollups: how long hourly and daily buckets are kept by compaction
+    ENGAGEMENT_HOURLY_RETENTION_DAYS: int = 14
+    ENGAGEMENT_DAILY_RETENTION_DAYS: int = 730
+
+    # Ad-hoc analytics: how long a tenant's column arrays stay loaded (writes
+    # through this process drop them sooner) and how many tenants are kept
+    ANALYTICS_CACHE_TTL_SECONDS: int = 300
+    ANALYTICS_CACHE_MAX_TENANTS: int = 50
+
+    # Webhooks: whether this process runs the dispatcher, events per request,
+    # events copied from the event log per endpoint and pass,
+    # default concurrent requests per endpoint, request timeout, how long a
+    # claimed delivery is reserved (must exceed the timeout), polling period
+    # when idle, retry back-off (doubling from base up to max), attempts before
+    # a delivery is dead-lettered, and days delivered and dead rows are kept.
+    # Endpoints must be https URLs resolving only to public addresses, checked
+    # on registration and again before every request; local development may
+    # allow http and private addresses (never in production: it enables SSRF)
+    WEBHOOK_DISPATCHER_ENABLED: bool = True
+    WEBHOOK_BATCH_SIZE: int = 20
+    WEBHOOK_FANOUT_LIMIT: int = 500
+    WEBHOOK_MAX_CONCURRENCY: int = 4
+    WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    WEBHOOK_LEASE_SECONDS: int = 60
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = 5.0
+    WEBHOOK_BACKOFF_BASE_SECONDS: float = 10.0
+    WEBHOOK_BACKOFF_MAX_SECONDS: float = 3600.0
+    WEBHOOK_MAX_ATTEMPTS: int = 10
+    WEBHOOK_RETENTION_DAYS: int = 14
+    WEBHOOK_ALLOW_PRIVATE_URLS: bool = False
+
+    # Moderation stream (SSE): events replayed on resume before the client is
+    # told to reload instead, events queued for a slow client before it is
+    # disconnected, keep-alive comment period, reconnection delay sent to
+    # clients, lifetime of a connection (shutdown and reloads wait for open
+    # ones; clients resume seamlessly), and seconds a stream token opens
+    # streams for (EventSource cannot send the bearer header)
+    MODERATION_STREAM_REPLAY_LIMIT: int = 1000
+    MODERATION_STREAM_QUEUE_SIZE: int = 1000
+    MODERATION_STREAM_KEEPALIVE_SECONDS: float = 15.0
+    MODERATION_STREAM_RETRY_MILLISECONDS: int = 3000
+    MODERATION_STREAM_MAX_SECONDS: float = 60.0
+    MODERATION_STREAM_TOKEN_SECONDS: int = 300
+
+    # Testimonial event log, read by the moderation stream and the webhooks:
+    # hours events are kept (longer while an active webhook endpoint has not
+    # received them yet)
+    EVENT_LOG_RETENTION_HOURS: int = 24
+
 
 settings = Settings()
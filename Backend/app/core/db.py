@@ -1,6 +1,8 @@
+from collections.abc import Callable
 from typing import Annotated
 
 from fastapi import Depends
+from sqlalchemy import event
 from sqlmodel import Session, create_engine
 
 from app.core.config import settings
@@ -19,3 +21,44 @@ def get_session():
 
 
 SessionDep = Annotated[Session, Depends(get_session)]
+
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run callback once the current transaction of db commits.
+
+    Used for side effects outside the database (cache invalidation, in-memory
+    indexes) that must not run if the transaction is rolled back.
+    """
+    db.info.setdefault("after_commit", []).append(callback)
+
+
+def before_commit(db: Session, flush: Callable[[Session, list], None]) -> list:
+    """Buffer of the current transaction of db, passed to flush right before it commits.
+
+    Used for writes to rows shared by a whole tenant (counters, the event log)
+    so their locks are taken as late as possible and held only until the
+    commit, not for the rest of the request. Items appended by every caller
+    in the transaction are flushed together, once, in registration order.
+    """
+    buffers = db.info.setdefault("before_commit", {})
+    if flush not in buffers:
+        buffers[flush] = []
+    return buffers[flush]
+
+
+@event.listens_for(Session, "before_commit")
+def _run_before_commit(session: Session) -> None:
+    for flush, items in session.info.pop("before_commit", {}).items():
+        flush(session, items)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_commit(session: Session, previous_transaction) -> None:
+    session.info.pop("before_commit", None)
+    session.info.pop("after_commit", None)
@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.params import Header
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
@@ -9,6 +9,7 @@ from sqlmodel import Session
 
 from app.core.config import settings
 from app.core.db import SessionDep, get_session
+from app.core.jwt import STREAM_TOKEN_AUDIENCE
 from app.models.api_key import APIKey
 from app.models.user import Roles, User
 from app.services.api_keys import APIKeyService
@@ -107,6 +108,40 @@ def require_moderator(current_user: User = Depends(get_current_user)):
     return current_user
 
 
+def get_stream_user(
+    session: Session = Depends(get_session),
+    token: str = Query(..., description="Stream token from POST /testimonials/stream/token"),
+) -> User:
+    """
+    Validate a moderation stream token, passed in the query string:
+    EventSource cannot send headers. Access tokens are not accepted here.
+    """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+            audience=STREAM_TOKEN_AUDIENCE,
+            options={"require_aud": True},
+        )
+    except ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="El token ha expirado."
+        ) from None
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido."
+        ) from None
+
+    user_id = payload.get("sub")
+    user = session.get(User, user_id) if user_id is not None else None
+    if not user or not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido.")
+
+    # Checked on every connection: a revoked role closes the stream at its next reconnect
+    return require_moderator(user)
+
+
 def get_api_key_public(
     db: SessionDep,
     x_api_key: str = Header(..., alias="X-API-Key"),  # type: ignore
@@ -124,7 +159,20 @@ def get_api_key_public(
     return api_key
 
 
+def get_api_key_embed(
+    db: SessionDep,
+    key: str = Query(..., description="Public API key"),
+) -> APIKey:
+    """
+    Validate API key for embed widgets, passed in the query string:
+    iframes and script tags cannot send headers.
+    """
+    return get_api_key_public(db, key)
+
+
 OwnerDep = Annotated[User, Depends(require_owner)]
 AdminDep = Annotated[User, Depends(require_admin)]
 ModeratorDep = Annotated[User, Depends(require_moderator)]
+StreamModeratorDep = Annotated[User, Depends(get_stream_user)]
 APIKeyPublicDep = Annotated[APIKey, Depends(get_api_key_public)]
+APIKeyEmbedDep = Annotated[APIKey, Depends(get_api_key_embed)]
@@ -4,6 +4,9 @@ from jose import jwt
 
 from app.core.config import settings
 
+# Audience of stream tokens; access tokens have none, so neither is accepted for the other
+STREAM_TOKEN_AUDIENCE = "moderation-stream"
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
@@ -17,3 +20,13 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None):
     expire = datetime.now(UTC) + (expires_delta or timedelta(days=30))
     to_encode["exp"] = expire
     return jwt.encode(to_encode, settings.REFRESH_SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def create_stream_token(data: dict, expires_delta: timedelta | None = None):
+    to_encode = data.copy()
+    expire = datetime.now(UTC) + (
+        expires_delta or timedelta(seconds=settings.MODERATION_STREAM_TOKEN_SECONDS)
+    )
+    to_encode["exp"] = expire
+    to_encode["aud"] = STREAM_TOKEN_AUDIENCE
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -0,0 +1,120 @@
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class RingBuffer:
+    """Fixed-size in-memory event log, drained periodically by a background thread.
+
+    append() and extend() only store references in preallocated slots, so the
+    request path never blocks on the database nor allocates beyond capacity.
+    When the buffer is full the oldest events are overwritten and counted in
+    dropped: meant for high-volume data that tolerates loss, such as analytics
+    events, where shedding beats pushing back on clients.
+
+    Every flush_interval seconds (earlier once half full) the worker hands all
+    events appended since the last drain to flush(). If flush raises, the
+    events are logged and discarded rather than retried.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[Any]], None],
+        capacity: int,
+        flush_interval: float,
+        name: str = "ring",
+    ):
+        self._flush = flush
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.name = name
+        self.dropped = 0
+        self._reported_dropped = 0
+
+        self._slots: list[Any] = [None] * capacity
+        self._head = 0
+        self._size = 0
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return self._size
+
+    def append(self, item: Any) -> None:
+        """Store one event, overwriting the oldest one if the buffer is full."""
+        self.extend((item,))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """Store several events under a single lock acquisition."""
+        self.start()
+        with self._cond:
+            for item in items:
+                self._slots[self._head] = item
+                self._head = (self._head + 1) % self.capacity
+                if self._size < self.capacity:
+                    self._size += 1
+                else:
+                    self.dropped += 1
+            if self._size * 2 >= self.capacity:
+                self._cond.notify()
+
+    def drain(self) -> list[Any]:
+        """Remove and return the stored events, oldest first."""
+        with self._cond:
+            start = (self._head - self._size) % self.capacity
+            if start + self._size <= self.capacity:
+                items = self._slots[start : start + self._size]
+            else:
+                items = self._slots[start:] + self._slots[: self._head]
+            self._size = 0
+            return items
+
+    def start(self) -> None:
+        """Start the worker (no-op once started)."""
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-ring", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Flush what is stored and stop the worker."""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify()
+        thread.join(timeout)
+        with self._cond:
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and self._size * 2 < self.capacity:
+                    self._cond.wait(self.flush_interval)
+                stopping = self._stopping
+                dropped = self.dropped - self._reported_dropped
+                self._reported_dropped = self.dropped
+            if dropped:
+                logger.warning("%s: buffer full, %d events dropped", self.name, dropped)
+
+            items = self.drain()
+            if items:
+                try:
+                    self._flush(items)
+                except Exception:
+                    logger.exception(
+                        "%s: flush of %d events failed, dropped", self.name, len(items)
+                    )
+            if stopping:
+                return
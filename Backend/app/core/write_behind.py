@@ -0,0 +1,225 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+
+class BufferFull(Exception):
+    """The buffer is at capacity: the caller should shed load and retry later."""
+
+
+class WriteBehindBuffer:
+    """Bounded in-process queue flushed in batches by a background thread.
+
+    submit() only appends to memory (and to the journal, when enabled), so the
+    request path never waits on the database. A worker thread hands batches of
+    up to batch_size items to flush() as soon as a batch is full or
+    flush_interval seconds after the first pending item.
+
+    If flush raises, the batch goes back to the front of the queue and is retried
+    after a back-off, so flush must be idempotent. Items are JSON-serializable
+    dicts.
+
+    Durability: without a journal, pending items are lost if the process dies.
+    With journal_dir, every item is appended to this process's journal before
+    submit() returns (and fsynced if fsync is set). After every successful
+    flush the journal is truncated, or rewritten with only the items still
+    pending, so it stays bounded under steady traffic. Journals left behind by
+    dead processes are claimed and replayed by start().
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[dict]], None],
+        max_items: int,
+        batch_size: int,
+        flush_interval: float,
+        journal_dir: str | None = None,
+        fsync: bool = False,
+        name: str = "buffer",
+        retry_backoff: float = 1.0,
+    ):
+        self._flush = flush
+        self.max_items = max_items
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.journal_dir = Path(journal_dir) if journal_dir else None
+        self.fsync = fsync
+        self.name = name
+        self.retry_backoff = retry_backoff
+
+        self._items: deque[dict] = deque()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._journal: IO[str] | None = None
+        self._journal_path: Path | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items) + self._in_flight
+
+    def submit(self, item: dict) -> None:
+        """Queue an item for the next flush.
+
+        Raises:
+            BufferFull: if max_items items are already pending
+        """
+        self.start()
+        with self._cond:
+            if len(self._items) + self._in_flight >= self.max_items:
+                raise BufferFull()
+            self._append_journal([item])
+            self._items.append(item)
+            if len(self._items) >= self.batch_size or len(self._items) == 1:
+                self._cond.notify()
+
+    def start(self) -> None:
+        """Replay orphaned journals and start the worker (no-op once started)."""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            if self.journal_dir is not None:
+                self._open_journal()
+            self._thread = threading.Thread(
+                target=self._run, name=f"{self.name}-write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Flush what is pending and stop the worker."""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+            self._cond.notify()
+        thread.join(timeout)
+        with self._cond:
+            self._thread = None
+            if self._journal is not None:
+                # Leftovers stay on disk for the next process to replay
+                if not self._items and not self._in_flight:
+                    self._journal_path.unlink(missing_ok=True)
+                self._journal.close()
+                self._journal = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._items and not self._stopping:
+                    self._cond.wait()
+                if not self._items:
+                    return
+                # Give a batch the chance to fill up, unless shutting down
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._items) < self.batch_size and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                count = min(self.batch_size, len(self._items))
+                batch = [self._items.popleft() for _ in range(count)]
+                self._in_flight = count
+
+            try:
+                self._flush(batch)
+            except Exception:
+                logger.exception("%s: flush of %d items failed, retrying", self.name, count)
+                with self._cond:
+                    self._items.extendleft(reversed(batch))
+                    self._in_flight = 0
+                    if self._stopping:
+                        logger.error(
+                            "%s: stopping with %d unflushed items", self.name, len(self._items)
+                        )
+                        return
+                    self._cond.wait(self.retry_backoff)
+                continue
+
+            with self._cond:
+                self._in_flight = 0
+                if self._journal is not None:
+                    self._compact_journal()
+
+    def _append_journal(self, items: list[dict]) -> None:
+        if self._journal is None:
+            return
+        self._journal.write("".join(json.dumps(item) + "\n" for item in items))
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _compact_journal(self) -> None:
+        """Drop flushed items from the journal; called with the lock held.
+
+        The pending items are written to a new file, locked like the journal,
+        which then replaces it by rename: a crash in between leaves either the
+        old journal or the new one, never a partial one.
+        """
+        if not self._items:
+            self._journal.seek(0)
+            self._journal.truncate()
+            return
+        compacted = self._journal_path.with_suffix(".compacting")
+        journal = open(compacted, "w", encoding="utf-8")  # noqa: SIM115
+        fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        previous, self._journal = self._journal, journal
+        self._append_journal(list(self._items))
+        os.replace(compacted, self._journal_path)
+        previous.close()
+
+    def _open_journal(self) -> None:
+        """Open this process's journal and take over the ones of dead processes.
+
+        A live journal is held under an exclusive flock, so another worker of the
+        same deployment can tell an orphan from a journal still in use.
+        """
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        path = self.journal_dir / f"{self.name}-{os.getpid()}-{uuid4().hex[:8]}.ndjson"
+        self._journal = open(path, "a", encoding="utf-8")  # noqa: SIM115
+        self._journal_path = path
+        fcntl.flock(self._journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        for orphan in sorted(self.journal_dir.glob(f"{self.name}-*.ndjson")):
+            if orphan == path:
+                continue
+            try:
+                journal = orphan.open(encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with journal:
+                try:
+                    fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                # Already replayed and removed by a process that got the lock first
+                if os.fstat(journal.fileno()).st_nlink == 0:
+                    continue
+                items = [json.loads(line) for line in journal if line.strip()]
+                # Re-journal before removing the orphan so nothing is lost in between
+                self._append_journal(items)
+                self._items.extend(items)
+                orphan.unlink()
+            if items:
+                logger.info("%s: replaying %d items from %s", self.name, len(items), orphan.name)
+
+        # Left by a process that died while compacting: its journal kept every item
+        for leftover in self.journal_dir.glob(f"{self.name}-*.compacting"):
+            try:
+                with leftover.open(encoding="utf-8") as journal:
+                    fcntl.flock(journal.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    leftover.unlink()
+            except (FileNotFoundError, BlockingIOError):
+                continue
@@ -1,16 +1,50 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 
 from app.api.index import router as api_router
 from app.core.config import settings
+from app.services.engagement import engagement_buffer
+from app.services.ingest import ingest_buffer
+from app.services.moderation_stream import moderation_event_bus
+from app.services.purge import purge_buffer
+from app.services.snapshot import snapshot_buffer
+from app.services.webhook import webhook_dispatcher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Replays journaled submissions left by a previous run, flushes on shutdown
+    ingest_buffer.start()
+    if settings.WEBHOOK_DISPATCHER_ENABLED:
+        webhook_dispatcher.start()
+    yield
+    moderation_event_bus.stop()
+    webhook_dispatcher.stop(settings.WEBHOOK_TIMEOUT_SECONDS)
+    ingest_buffer.stop()
+    snapshot_buffer.stop()
+    purge_buffer.stop()
+    engagement_buffer.stop()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="0.0.1",
+    lifespan=lifespan,
 )
 
 app.include_router(api_router, prefix=settings.API)
 
+if settings.SNAPSHOT_DIR and settings.SNAPSHOT_SERVE:
+    # Same files a CDN would serve: published content only, no API key required
+    app.mount(
+        f"{settings.API}/snapshots",
+        StaticFiles(directory=settings.SNAPSHOT_DIR, check_dir=False),
+        name="snapshots",
+    )
+
 if settings.ENVIRONMENT == "development":
     app.add_middleware(
         CORSMiddleware,
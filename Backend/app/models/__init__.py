@@ -9,10 +9,20 @@ This is important for relationships to work correctly.
 from .abstract import Abstract, AbstractActive
 from .api_key import APIKey
 from .category import Category
+from .engagement import (
+    TestimonialEngagement,
+    TestimonialEngagementDaily,
+    TestimonialEngagementHourly,
+)
+from .product_rating_summary import ProductRatingSummary
+from .published_testimonial import PublishedTestimonial
 from .tag import Tag
+from .tenant_usage import TenantCategoryUsage, TenantTagUsage, TenantTestimonialStats
 from .testimonial import Testimonial
+from .testimonial_event import TestimonialEvent
 from .testimonial_tag_link import TestimonialTagLink
 from .user import User
+from .webhook import WebhookDelivery, WebhookEndpoint
 
 __all__ = [
     "Abstract",
@@ -23,4 +33,15 @@ __all__ = [
     "Tag",
     "Testimonial",
     "TestimonialTagLink",
+    "TenantTagUsage",
+    "TenantCategoryUsage",
+    "TenantTestimonialStats",
+    "PublishedTestimonial",
+    "ProductRatingSummary",
+    "TestimonialEngagement",
+    "TestimonialEngagementHourly",
+    "TestimonialEngagementDaily",
+    "WebhookEndpoint",
+    "WebhookDelivery",
+    "TestimonialEvent",
 ]
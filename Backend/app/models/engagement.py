@@ -0,0 +1,47 @@
+from datetime import datetime
+from uuid import UUID
+
+import sqlalchemy
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class EngagementBucket(SQLModel):
+    """Impressions and clicks of a testimonial in one time bucket (denormalized).
+
+    bucket_start is the start of the bucket, in UTC. Reports filter tenants by
+    (user_id, bucket_start) and single testimonials by the primary key.
+    """
+
+    testimonial_id: UUID = Field(foreign_key="testimonial.id", primary_key=True, ondelete="CASCADE")
+    bucket_start: datetime = Field(primary_key=True, sa_type=sqlalchemy.DateTime(timezone=True))
+    user_id: UUID = Field(foreign_key="user.id", ondelete="CASCADE")
+    impressions: int = Field(default=0, nullable=False)
+    clicks: int = Field(default=0, nullable=False)
+
+
+class TestimonialEngagement(EngagementBucket, table=True):
+    """Raw ENGAGEMENT_BUCKET_SECONDS buckets written from the beacon buffer.
+
+    Only a staging area: compaction moves every completed hour to the rollups.
+    """
+
+    __table_args__ = (
+        Index("ix_testimonialengagement_user_id_bucket_start", "user_id", "bucket_start"),
+    )
+
+
+class TestimonialEngagementHourly(EngagementBucket, table=True):
+    """Hourly rollup, kept for ENGAGEMENT_HOURLY_RETENTION_DAYS."""
+
+    __table_args__ = (
+        Index("ix_testimonialengagementhourly_user_id_bucket_start", "user_id", "bucket_start"),
+    )
+
+
+class TestimonialEngagementDaily(EngagementBucket, table=True):
+    """Daily rollup (UTC days), kept for ENGAGEMENT_DAILY_RETENTION_DAYS."""
+
+    __table_args__ = (
+        Index("ix_testimonialengagementdaily_user_id_bucket_start", "user_id", "bucket_start"),
+    )
@@ -0,0 +1,22 @@
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+
+class ProductRatingSummary(SQLModel, table=True):
+    """Ratings of the published testimonials of a product (denormalized).
+
+    Only rated testimonials (1 to 5 stars) count. Kept in step with testimonial
+    writes by RatingSummaryService, so a product summary is a primary key lookup.
+    """
+
+    user_id: UUID = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    product_id: str = Field(primary_key=True)
+    review_count: int = Field(default=0, nullable=False)
+    rating_sum: int = Field(default=0, nullable=False)
+    # Histogram: number of reviews with each star rating
+    rating_1: int = Field(default=0, nullable=False)
+    rating_2: int = Field(default=0, nullable=False)
+    rating_3: int = Field(default=0, nullable=False)
+    rating_4: int = Field(default=0, nullable=False)
+    rating_5: int = Field(default=0, nullable=False)
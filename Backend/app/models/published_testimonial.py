@@ -0,0 +1,52 @@
+from datetime import datetime
+from uuid import UUID
+
+import sqlalchemy
+from sqlalchemy import Column, Index
+from sqlalchemy.dialects.postgresql import ARRAY, JSON
+from sqlmodel import Field, SQLModel
+
+
+class PublishedTestimonial(SQLModel, table=True):
+    """Public feed read model: one row per approved, active testimonial (denormalized).
+
+    body is the rendered TestimonialResponse with category and tags inlined; the
+    other columns only serve filtering and display order. Kept in step with
+    testimonial writes by FeedService.
+    """
+
+    __table_args__ = (
+        # Display order is (created_at, id) descending, within each filter
+        Index("ix_publishedtestimonial_user_id_created_at", "user_id", "created_at", "id"),
+        Index(
+            "ix_publishedtestimonial_user_id_product_id_created_at",
+            "user_id",
+            "product_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_publishedtestimonial_user_id_category_slug_created_at",
+            "user_id",
+            "category_slug",
+            "created_at",
+            "id",
+        ),
+        Index("ix_publishedtestimonial_tag_slugs", "tag_slugs", postgresql_using="gin"),
+    )
+
+    id: UUID = Field(foreign_key="testimonial.id", primary_key=True, ondelete="CASCADE")
+    user_id: UUID = Field(foreign_key="user.id", ondelete="CASCADE")
+    product_id: str
+    category_slug: str | None = None
+    tag_slugs: list[str] = Field(
+        default_factory=list,
+        sa_column=Column(
+            # JSON variant only so the metadata can be created on SQLite in tests
+            ARRAY(sqlalchemy.String).with_variant(sqlalchemy.JSON(), "sqlite"),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+    created_at: datetime = Field(sa_type=sqlalchemy.DateTime(timezone=True))
+    body: dict = Field(sa_column=Column(JSON, nullable=False))
@@ -0,0 +1,57 @@
+from uuid import UUID
+
+import sqlalchemy
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+# Listing versions are drawn from a sequence so a value is never handed out
+# twice, even when reconcile deletes and a later write recreates a stats row.
+LISTING_VERSION = sqlalchemy.Sequence(
+    "tenanttestimonialstats_listing_version_seq", metadata=SQLModel.metadata
+)
+
+
+class TenantTagUsage(SQLModel, table=True):
+    """Number of active testimonials of a tenant using a tag (denormalized)."""
+
+    __table_args__ = (Index("ix_tenanttagusage_user_id_usage_count", "user_id", "usage_count"),)
+
+    user_id: UUID = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    tag_id: UUID = Field(foreign_key="tag.id", primary_key=True, ondelete="CASCADE")
+    usage_count: int = Field(default=0, nullable=False)
+
+
+class TenantCategoryUsage(SQLModel, table=True):
+    """Number of active testimonials of a tenant in a category (denormalized)."""
+
+    __table_args__ = (
+        Index("ix_tenantcategoryusage_user_id_usage_count", "user_id", "usage_count"),
+    )
+
+    user_id: UUID = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    category_id: UUID = Field(foreign_key="category.id", primary_key=True, ondelete="CASCADE")
+    usage_count: int = Field(default=0, nullable=False)
+
+
+class TenantTestimonialStats(SQLModel, table=True):
+    """Dashboard counters of the active testimonials of a tenant (denormalized).
+
+    listing_version takes a fresh LISTING_VERSION value in every transaction
+    that writes one of the tenant's testimonials; listing ETags are built from it.
+    """
+
+    user_id: UUID = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    pending_count: int = Field(default=0, nullable=False)
+    approved_count: int = Field(default=0, nullable=False)
+    rejected_count: int = Field(default=0, nullable=False)
+    uncategorized_count: int = Field(default=0, nullable=False)
+    rating_count: int = Field(default=0, nullable=False)
+    rating_sum: int = Field(default=0, nullable=False)
+    listing_version: int = Field(
+        default=0,
+        sa_column=sqlalchemy.Column(
+            sqlalchemy.BigInteger().with_variant(sqlalchemy.Integer(), "sqlite"),
+            nullable=False,
+            server_default="0",
+        ),
+    )
@@ -0,0 +1,47 @@
+from datetime import datetime
+from uuid import UUID
+
+import sqlalchemy
+from sqlalchemy import Column, Identity, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+from .abstract import get_utc_now
+
+
+class TestimonialEvent(SQLModel, table=True):
+    """Log of testimonial writes, read by id by the moderation stream and the webhooks.
+
+    Written by the last statement of the transaction of the change it
+    reports, under a per-tenant advisory lock held until the commit right
+    after: ids of one tenant are therefore allocated in commit order, so a
+    reader that has seen id N has seen every earlier event of its tenant and
+    resumes with id > N. Stream clients resume from the id they last received,
+    webhook endpoints from their last_event_id. Rows are kept for
+    EVENT_LOG_RETENTION_HOURS, and until every active webhook endpoint of
+    their tenant has passed them.
+    """
+
+    __table_args__ = (
+        # Resume and fetch by tenant: events after an id, oldest first
+        Index("ix_testimonialevent_user_id_id", "user_id", "id"),
+    )
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column(
+            sqlalchemy.BigInteger().with_variant(sqlalchemy.Integer(), "sqlite"),
+            Identity(),
+            primary_key=True,
+        ),
+    )
+    user_id: UUID = Field(foreign_key="user.id", ondelete="CASCADE")
+    event_type: str = Field(max_length=50)  # a WebhookEventType value
+    data: dict = Field(
+        sa_column=Column(JSONB().with_variant(sqlalchemy.JSON(), "sqlite"), nullable=False)
+    )
+    created_at: datetime = Field(
+        default_factory=get_utc_now,
+        sa_type=sqlalchemy.DateTime(timezone=True),
+        sa_column_kwargs={"server_default": sqlalchemy.func.now()},
+    )
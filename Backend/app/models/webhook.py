@@ -0,0 +1,103 @@
+from datetime import datetime
+from enum import StrEnum
+from uuid import UUID, uuid4
+
+import sqlalchemy
+from sqlalchemy import Column, Index, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlmodel import Field, SQLModel
+
+from .abstract import Abstract, get_utc_now
+
+
+class WebhookEventType(StrEnum):
+    TESTIMONIAL_CREATED = "testimonial.created"
+    TESTIMONIAL_UPDATED = "testimonial.updated"
+    TESTIMONIAL_STATUS_CHANGED = "testimonial.status_changed"
+    TESTIMONIAL_DELETED = "testimonial.deleted"
+
+
+class WebhookDeliveryStatus(StrEnum):
+    PENDING = "pending"
+    DELIVERED = "delivered"
+    DEAD = "dead"
+
+
+class WebhookEndpoint(Abstract, table=True):
+    """A URL of a tenant that receives the events it subscribes to.
+
+    secret signs the deliveries, so it is stored as is: it is only returned
+    when the endpoint is created. max_concurrency bounds the requests the
+    dispatcher has in flight to the endpoint at once. last_event_id is the
+    last TestimonialEvent of the tenant the dispatcher has written deliveries
+    for; it starts at the latest event when the endpoint is created or enabled.
+    """
+
+    user_id: UUID = Field(foreign_key="user.id", index=True, ondelete="CASCADE")
+    url: str = Field(max_length=2000)
+    description: str | None = Field(default=None, max_length=200)
+    secret: str = Field(max_length=100)
+    events: list[str] = Field(
+        sa_column=Column(
+            # JSON variant only so the metadata can be created on SQLite in tests
+            ARRAY(sqlalchemy.String).with_variant(sqlalchemy.JSON(), "sqlite"),
+            nullable=False,
+        ),
+    )
+    max_concurrency: int = Field(default=4, nullable=False)
+    is_active: bool = Field(default=True, nullable=False)
+    last_event_id: int = Field(
+        default=0,
+        sa_column=Column(
+            sqlalchemy.BigInteger().with_variant(sqlalchemy.Integer(), "sqlite"),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+
+
+class WebhookDelivery(SQLModel, table=True):
+    """Outbox row: one event to deliver to one endpoint.
+
+    Written by the dispatcher from the testimonial event log (see
+    WebhookService.fan_out), which only holds committed changes, in the same
+    transaction that advances the endpoint's last_event_id: each event of a
+    subscribed type is written once per endpoint. The dispatcher claims due
+    pending rows by pushing next_attempt_at forward (a lease), then marks them
+    delivered, or schedules a retry, or dead-letters them after
+    WEBHOOK_MAX_ATTEMPTS failures.
+    """
+
+    __table_args__ = (
+        # Claims: due pending deliveries of each endpoint, oldest first
+        Index(
+            "ix_webhookdelivery_pending",
+            "endpoint_id",
+            "next_attempt_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        # Delivery log of an endpoint, newest first
+        Index("ix_webhookdelivery_endpoint_id_created_at", "endpoint_id", "created_at"),
+    )
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    endpoint_id: UUID = Field(foreign_key="webhookendpoint.id", ondelete="CASCADE")
+    event_type: str = Field(max_length=50)  # a WebhookEventType value
+    # Envelope sent to the endpoint: {"id", "type", "created_at", "data"}
+    payload: dict = Field(
+        sa_column=Column(JSONB().with_variant(sqlalchemy.JSON(), "sqlite"), nullable=False)
+    )
+    status: WebhookDeliveryStatus = Field(default=WebhookDeliveryStatus.PENDING)
+    attempts: int = Field(default=0, nullable=False)
+    next_attempt_at: datetime = Field(
+        default_factory=get_utc_now,
+        sa_type=sqlalchemy.DateTime(timezone=True),
+        sa_column_kwargs={"server_default": sqlalchemy.func.now()},
+    )
+    last_error: str | None = Field(default=None, max_length=500)
+    created_at: datetime = Field(
+        default_factory=get_utc_now,
+        sa_type=sqlalchemy.DateTime(timezone=True),
+        sa_column_kwargs={"server_default": sqlalchemy.func.now()},
+    )
+    delivered_at: datetime | None = Field(default=None, sa_type=sqlalchemy.DateTime(timezone=True))
@@ -1,8 +1,34 @@
+from .analytics import (
+    AnalyticsDimension,
+    AnalyticsInterval,
+    ProductAuthorCount,
+    RatingBreakdown,
+    TagPairCount,
+)
 from .api_key import APIKeyCreate, APIKeyListResponse, APIKeyResponse, APIKeyUpdate
-from .category import CategoryCreate, CategoryResponse, CategoryUpdate
-from .pagination import PaginationResponse
-from .tag import TagCreate, TagResponse, TagUpdate
-from .testimonial import TestimonialCreate, TestimonialResponse, TestimonialUpdate
+from .category import CategoryCreate, CategoryResponse, CategoryUpdate, CategoryUsageResponse
+from .engagement import (
+    EngagementBeacon,
+    EngagementEvent,
+    EngagementGranularity,
+    EngagementPoint,
+    EngagementReport,
+    EngagementType,
+)
+from .pagination import CatalogSort, PaginationResponse
+from .tag import TagCreate, TagResponse, TagSuggestionResponse, TagUpdate, TagUsageResponse
+from .testimonial import (
+    ProductRatingSummaryResponse,
+    TestimonialAccepted,
+    TestimonialBatchResponse,
+    TestimonialBulkModeration,
+    TestimonialBulkModerationResponse,
+    TestimonialCreate,
+    TestimonialImportResponse,
+    TestimonialResponse,
+    TestimonialStatsResponse,
+    TestimonialUpdate,
+)
 from .token import TokenResponse
 from .user import (
     AdminUserUpdate,
@@ -11,8 +37,20 @@ from .user import (
     UserResponse,
     UserUpdate,
 )
+from .webhook import (
+    WebhookDeliveryResponse,
+    WebhookEndpointCreate,
+    WebhookEndpointResponse,
+    WebhookEndpointSecretResponse,
+    WebhookEndpointUpdate,
+)
 
 __all__ = [
+    "AnalyticsDimension",
+    "AnalyticsInterval",
+    "ProductAuthorCount",
+    "RatingBreakdown",
+    "TagPairCount",
     "TokenResponse",
     "APIKeyCreate",
     "APIKeyResponse",
@@ -21,16 +59,38 @@ __all__ = [
     "CategoryCreate",
     "CategoryResponse",
     "CategoryUpdate",
+    "CategoryUsageResponse",
+    "EngagementBeacon",
+    "EngagementEvent",
+    "EngagementType",
+    "EngagementGranularity",
+    "EngagementPoint",
+    "EngagementReport",
     "TagCreate",
     "TagResponse",
     "TagUpdate",
+    "TagUsageResponse",
+    "TagSuggestionResponse",
+    "TestimonialAccepted",
+    "ProductRatingSummaryResponse",
     "TestimonialCreate",
     "TestimonialResponse",
     "TestimonialUpdate",
+    "TestimonialBatchResponse",
+    "TestimonialBulkModeration",
+    "TestimonialBulkModerationResponse",
+    "TestimonialImportResponse",
+    "TestimonialStatsResponse",
     "AdminUserUpdate",
     "UserCreate",
     "UserCreateInternal",
     "UserResponse",
     "UserUpdate",
     "PaginationResponse",
+    "CatalogSort",
+    "WebhookEndpointCreate",
+    "WebhookEndpointUpdate",
+    "WebhookEndpointResponse",
+    "WebhookEndpointSecretResponse",
+    "WebhookDeliveryResponse",
 ]
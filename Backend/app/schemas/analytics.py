@@ -0,0 +1,35 @@
+from datetime import date
+from enum import StrEnum
+
+from sqlmodel import Field, SQLModel
+
+
+class AnalyticsDimension(StrEnum):
+    CATEGORY = "category"
+    PRODUCT = "product"
+
+
+class AnalyticsInterval(StrEnum):
+    WEEK = "week"
+    MONTH = "month"
+    YEAR = "year"
+
+
+class RatingBreakdown(SQLModel):
+    group: str | None = Field(description="Category name or product ID, None when uncategorized")
+    period: date | None = Field(description="First day of the week, month or year")
+    count: int
+    average_rating: float
+    histogram: dict[int, int] = Field(description="Number of reviews per star rating (1 to 5)")
+    percentiles: dict[int, int] = Field(description="Nearest-rank rating percentiles")
+
+
+class TagPairCount(SQLModel):
+    tags: tuple[str, str]
+    count: int = Field(description="Testimonials having both tags")
+
+
+class ProductAuthorCount(SQLModel):
+    product_id: str
+    testimonials: int
+    authors: int = Field(description="Distinct author names")
@@ -27,6 +27,10 @@ class CategoryResponse(SQLModel):
     created_at: datetime
 
 
+class CategoryUsageResponse(CategoryResponse):
+    usage_count: int
+
+
 class CategoryUpdate(SQLModel):
     name: str | None = Field(
         default=None, min_length=1, max_length=100, description="Updated name of the category"
@@ -0,0 +1,45 @@
+from datetime import datetime
+from enum import StrEnum
+from uuid import UUID
+
+from sqlmodel import Field, SQLModel
+
+from app.core.config import settings
+
+
+class EngagementType(StrEnum):
+    IMPRESSION = "impression"
+    CLICK = "click"
+
+
+class EngagementEvent(SQLModel):
+    testimonial_id: UUID
+    type: EngagementType
+
+
+class EngagementBeacon(SQLModel):
+    events: list[EngagementEvent] = Field(
+        min_length=1,
+        max_length=settings.ENGAGEMENT_BEACON_MAX_EVENTS,
+        description="Events seen by the widget since its last beacon",
+    )
+
+
+class EngagementGranularity(StrEnum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+class EngagementPoint(SQLModel):
+    bucket_start: datetime
+    impressions: int
+    clicks: int
+
+
+class EngagementReport(SQLModel):
+    granularity: EngagementGranularity
+    start: datetime
+    end: datetime
+    impressions: int = Field(description="Total over the range")
+    clicks: int = Field(description="Total over the range")
+    series: list[EngagementPoint] = Field(description="Buckets with activity, oldest first")
@@ -1,3 +1,4 @@
+from enum import StrEnum
 from typing import TypeVar
 
 from sqlmodel import SQLModel
@@ -13,3 +14,8 @@ class PaginationResponse[T](SQLModel):
     has_next: bool
     has_prev: bool
     results: list[T]
+
+
+class CatalogSort(StrEnum):
+    POPULAR = "popular"
+    NAME = "name"
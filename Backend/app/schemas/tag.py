@@ -27,6 +27,17 @@ class TagResponse(SQLModel):
     created_at: datetime
 
 
+class TagUsageResponse(TagResponse):
+    usage_count: int
+
+
+class TagSuggestionResponse(SQLModel):
+    id: UUID
+    name: str
+    slug: str
+    usage_count: int
+
+
 class TagUpdate(SQLModel):
     name: str | None = Field(
         default=None,
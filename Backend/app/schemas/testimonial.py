@@ -1,11 +1,14 @@
 from datetime import datetime
+from enum import StrEnum
 from urllib.parse import urlparse
 from uuid import UUID
 
-from pydantic import HttpUrl, field_validator, model_serializer
+from pydantic import HttpUrl, field_validator, model_serializer, model_validator
 from sqlmodel import Field, SQLModel
 
+from app.core.config import settings
 from app.models.testimonial import StatusType
+from app.schemas.category import CategoryUsageResponse
 
 
 class TestimonialStatusUpdate(SQLModel):
@@ -103,7 +106,115 @@ class TestimonialResponse(SQLModel):
         }
 
 
+class TestimonialBatchResponse(SQLModel):
+    results: list[TestimonialResponse]
+    missing: list[UUID]
+
+
+class TestimonialAccepted(SQLModel):
+    id: UUID
+
+
+class ProductRatingSummaryResponse(SQLModel):
+    product_id: str
+    review_count: int
+    average_rating: float | None = Field(description="Mean of the ratings, None without reviews")
+    histogram: dict[int, int] = Field(description="Number of reviews per star rating (1 to 5)")
+
+
+class TestimonialStatsResponse(SQLModel):
+    total: int = Field(description="Active testimonials, whatever their status")
+    pending: int
+    approved: int
+    rejected: int
+    average_rating: float | None = Field(description="Mean of the 1 to 5 ratings, None without any")
+    uncategorized: int = Field(description="Active testimonials without a category")
+    categories: list[CategoryUsageResponse] = Field(description="Most used categories first")
+
+
 class TestimonialUpdate(SQLModel):
     content: TestimonialContent | None = None
     category_name: str | None = None
+    tags: list[str] | None = Field(default=None, description="Replace the tag list")
+    add_tags: list[str] | None = Field(default=None, description="Tags to add to the current list")
+    remove_tags: list[str] | None = Field(
+        default=None, description="Tags to remove from the current list"
+    )
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class EmbedLayout(StrEnum):
+    CAROUSEL = "carousel"
+    GRID = "grid"
+    SINGLE = "single"
+
+
+class BulkModerationAction(StrEnum):
+    APPROVE = "approve"
+    REJECT = "reject"
+    DELETE = "delete"
+
+
+class BulkModerationOutcome(StrEnum):
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+    NOT_FOUND = "not_found"
+
+
+class TestimonialFilters(SQLModel):
+    search: str | None = None
+    status: StatusType | None = None
+    rating: int | None = Field(default=None, ge=0, le=5)
+    category_name: str | None = None
     tags: list[str] | None = None
+
+
+class TestimonialBulkModeration(SQLModel):
+    action: BulkModerationAction
+    ids: list[UUID] | None = Field(
+        default=None,
+        min_length=1,
+        max_length=settings.BULK_MODERATION_MAX_IDS,
+        description="Testimonials to moderate",
+    )
+    filters: TestimonialFilters | None = Field(
+        default=None, description="Moderate every testimonial matching these filters"
+    )
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.ids is None) == (self.filters is None):
+            raise ValueError("Provide either ids or filters")
+        return self
+
+
+class BulkModerationItem(SQLModel):
+    id: UUID
+    outcome: BulkModerationOutcome
+
+
+class TestimonialBulkModerationResponse(SQLModel):
+    action: BulkModerationAction
+    matched: int
+    updated: int
+    has_more: bool = False
+    results: list[BulkModerationItem]
+
+
+class ImportLineError(SQLModel):
+    line: int
+    error: str
+
+
+class TestimonialImportResponse(SQLModel):
+    imported: int
+    failed: int
+    errors: list[ImportLineError] = Field(
+        description="First IMPORT_MAX_REPORTED_ERRORS rejected lines"
+    )
+    elapsed_seconds: float
+    rows_per_second: float
@@ -5,3 +5,8 @@ class TokenResponse(SQLModel):
     access_token: str = Field(description="Access token")
     refresh_token: str | None = Field(default=None, description="Refresh token")
     token_type: str = Field(default="bearer", description="Token type")
+
+
+class StreamTokenResponse(SQLModel):
+    token: str = Field(description="Stream token, passed as ?token= to GET /testimonials/stream")
+    expires_in: int = Field(description="Seconds the token opens streams for")
@@ -0,0 +1,74 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import HttpUrl, field_validator
+from sqlmodel import Field, SQLModel
+
+from app.core.config import settings
+from app.models.webhook import WebhookDeliveryStatus, WebhookEventType
+
+
+def _require_https(url: HttpUrl | None) -> HttpUrl | None:
+    if url is not None and url.scheme != "https" and not settings.WEBHOOK_ALLOW_PRIVATE_URLS:
+        raise ValueError("Webhook URLs must use https")
+    return url
+
+
+class WebhookEndpointCreate(SQLModel):
+    url: HttpUrl = Field(
+        description="https URL of a public host, receives the events as signed JSON POST requests"
+    )
+    description: str | None = Field(default=None, max_length=200)
+    events: list[WebhookEventType] = Field(
+        default_factory=lambda: list(WebhookEventType),
+        min_length=1,
+        description="Event types to deliver, all by default",
+    )
+    max_concurrency: int = Field(
+        default=settings.WEBHOOK_MAX_CONCURRENCY,
+        ge=1,
+        le=16,
+        description="Requests in flight to the endpoint at once",
+    )
+
+    @field_validator("url", mode="after")
+    def validate_url(cls, v):
+        return _require_https(v)
+
+
+class WebhookEndpointUpdate(SQLModel):
+    url: HttpUrl | None = None
+    description: str | None = Field(default=None, max_length=200)
+    events: list[WebhookEventType] | None = Field(default=None, min_length=1)
+    max_concurrency: int | None = Field(default=None, ge=1, le=16)
+    is_active: bool | None = None
+
+    @field_validator("url", mode="after")
+    def validate_url(cls, v):
+        return _require_https(v)
+
+
+class WebhookEndpointResponse(SQLModel):
+    id: UUID
+    url: str
+    description: str | None
+    events: list[WebhookEventType]
+    max_concurrency: int
+    is_active: bool
+    created_at: datetime
+
+
+class WebhookEndpointSecretResponse(WebhookEndpointResponse):
+    secret: str = Field(description="Signing secret, only shown once")
+
+
+class WebhookDeliveryResponse(SQLModel):
+    id: UUID
+    event_type: WebhookEventType
+    payload: dict
+    status: WebhookDeliveryStatus
+    attempts: int
+    next_attempt_at: datetime
+    last_error: str | None
+    created_at: datetime
+    delivered_at: datetime | None
@@ -0,0 +1,424 @@
+import math
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from uuid import UUID
+
+import numpy as np
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.db import SessionDep, after_commit
+from app.models.category import Category
+from app.models.tag import Tag
+from app.models.testimonial import StatusType, Testimonial
+from app.models.testimonial_tag_link import TestimonialTagLink
+from app.schemas.analytics import (
+    AnalyticsDimension,
+    AnalyticsInterval,
+    ProductAuthorCount,
+    RatingBreakdown,
+    TagPairCount,
+)
+from app.services.changes import TestimonialChange
+
+STATUSES = tuple(StatusType)
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+_SECONDS_PER_DAY = 86_400
+
+# Loaded tenants: tenant id -> (facts, expires_at)
+_facts_cache: dict[UUID, tuple["TenantFacts", float]] = {}
+# Invalidations per tenant, so a load racing with a write is not kept
+_generations: dict[UUID, int] = {}
+_facts_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class TenantFacts:
+    """Active testimonials of a tenant as parallel NumPy columns, one entry per testimonial.
+
+    String columns are dictionary-encoded: codes index the matching tuple of
+    values, -1 meaning none. Tags are stored CSR-style: the tags of testimonial
+    i are tag_codes[tag_offsets[i]:tag_offsets[i + 1]].
+    """
+
+    rating: np.ndarray  # int8, 0 when unrated
+    created_at: np.ndarray  # int64, epoch seconds
+    status: np.ndarray  # int8 index into STATUSES
+    category: np.ndarray  # int32 codes into categories
+    product: np.ndarray  # int32 codes into products
+    author: np.ndarray  # int32 codes into authors
+    tag_offsets: np.ndarray  # int64, len(self) + 1 entries
+    tag_codes: np.ndarray  # int32 codes into tags
+    categories: tuple[str, ...]
+    products: tuple[str, ...]
+    authors: tuple[str, ...]
+    tags: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.rating)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays."""
+        return sum(
+            column.nbytes
+            for column in (
+                self.rating,
+                self.created_at,
+                self.status,
+                self.category,
+                self.product,
+                self.author,
+                self.tag_offsets,
+                self.tag_codes,
+            )
+        )
+
+
+def _encode(values: Sequence) -> tuple[np.ndarray, tuple]:
+    """Dictionary-encode values: (int32 codes, distinct values in order of appearance)."""
+    index: dict = {}
+    codes = np.fromiter(
+        (-1 if value is None else index.setdefault(value, len(index)) for value in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return codes, tuple(index)
+
+
+def build_facts(rows: Sequence[tuple], tag_rows: Iterable[tuple[UUID, str]]) -> TenantFacts:
+    """Build the column arrays of a tenant from query rows.
+
+    Args:
+        rows (Sequence[tuple]): (id, product ID, author name, rating, created_at,
+            status, category name) per active testimonial
+        tag_rows (Iterable[tuple[UUID, str]]): (testimonial ID, tag name) pairs
+
+    Returns:
+        TenantFacts: the encoded columns
+    """
+    ids, products, authors, ratings, created, statuses, categories = (
+        list(zip(*rows, strict=True)) or [()] * 7
+    )
+    position = {testimonial_id: i for i, testimonial_id in enumerate(ids)}
+
+    tag_rows = [(position[tid], name) for tid, name in tag_rows if tid in position]
+    tag_owner = np.fromiter((row for row, _ in tag_rows), dtype=np.int64, count=len(tag_rows))
+    tag_codes, tags = _encode([name for _, name in tag_rows])
+    order = np.argsort(tag_owner, kind="stable")
+    tag_offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(tag_owner, minlength=len(ids)), out=tag_offsets[1:])
+
+    category_codes, category_names = _encode(categories)
+    product_codes, product_ids = _encode(products)
+    # Author names are compared case- and whitespace-insensitively
+    author_codes, author_names = _encode(
+        [(name.strip().lower() or None) if name else None for name in authors]
+    )
+    return TenantFacts(
+        rating=np.fromiter((rating or 0 for rating in ratings), dtype=np.int8, count=len(ids)),
+        created_at=np.fromiter(
+            (int(moment.timestamp()) for moment in created), dtype=np.int64, count=len(ids)
+        ),
+        status=np.fromiter(
+            (_STATUS_CODES[status] for status in statuses), dtype=np.int8, count=len(ids)
+        ),
+        category=category_codes,
+        product=product_codes,
+        author=author_codes,
+        tag_offsets=tag_offsets,
+        tag_codes=tag_codes[order],
+        categories=category_names,
+        products=product_ids,
+        authors=author_names,
+        tags=tags,
+    )
+
+
+def _epoch(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return int(moment.timestamp())
+
+
+def _period_starts(created_at: np.ndarray, interval: AnalyticsInterval) -> np.ndarray:
+    """First day (datetime64[D], UTC) of the week (ISO, Monday), month or year of each instant."""
+    days = created_at // _SECONDS_PER_DAY
+    if interval == AnalyticsInterval.WEEK:
+        # 1970-01-01 was a Thursday, three days after a Monday
+        return (days - (days + 3) % 7).astype("datetime64[D]")
+    unit = "datetime64[M]" if interval == AnalyticsInterval.MONTH else "datetime64[Y]"
+    return days.astype("datetime64[D]").astype(unit).astype("datetime64[D]")
+
+
+class AnalyticsService:
+    @staticmethod
+    def get_facts(db: SessionDep, tenant_owner_id: UUID) -> TenantFacts:
+        """Get the column arrays of a tenant, loading them with two queries on a cache miss.
+
+        Args:
+            db (SessionDep): database session, only used to load the facts
+            tenant_owner_id (UUID): tenant owner ID
+
+        Returns:
+            TenantFacts: active testimonials of the tenant
+        """
+        with _facts_lock:
+            cached = _facts_cache.get(tenant_owner_id)
+            generation = _generations.get(tenant_owner_id, 0)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        active = (Testimonial.user_id == tenant_owner_id, Testimonial.is_active.is_(True))  # type: ignore
+        rows = db.exec(
+            select(
+                Testimonial.id,
+                Testimonial.product_id,
+                Testimonial.author_name,
+                Testimonial.rating,
+                Testimonial.created_at,
+                Testimonial.status,
+                Category.name,
+            )
+            .outerjoin(Category, Category.id == Testimonial.category_id)  # type: ignore
+            .where(*active)
+        ).all()
+        tag_rows = db.exec(
+            select(TestimonialTagLink.testimonial_id, Tag.name)
+            .join(Tag, Tag.id == TestimonialTagLink.tag_id)  # type: ignore
+            .join(Testimonial, Testimonial.id == TestimonialTagLink.testimonial_id)  # type: ignore
+            .where(*active)
+        ).all()
+        facts = build_facts(rows, tag_rows)
+
+        with _facts_lock:
+            if _generations.get(tenant_owner_id, 0) != generation:
+                return facts
+            _facts_cache.pop(tenant_owner_id, None)
+            while len(_facts_cache) >= settings.ANALYTICS_CACHE_MAX_TENANTS:
+                # Oldest load first: dicts keep insertion order
+                _facts_cache.pop(next(iter(_facts_cache)))
+            _facts_cache[tenant_owner_id] = (
+                facts,
+                time.monotonic() + settings.ANALYTICS_CACHE_TTL_SECONDS,
+            )
+        return facts
+
+    @staticmethod
+    def apply_changes(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Drop the loaded facts of the tenants written to, once the transaction commits."""
+        tenants = {change.tenant_owner_id for change in changes}
+        if tenants:
+            after_commit(db, lambda: AnalyticsService.invalidate(tenants))
+
+    @staticmethod
+    def invalidate(tenant_owner_ids: Iterable[UUID]) -> None:
+        """Drop the loaded facts of the given tenants."""
+        with _facts_lock:
+            for tenant_owner_id in tenant_owner_ids:
+                _facts_cache.pop(tenant_owner_id, None)
+                _generations[tenant_owner_id] = _generations.get(tenant_owner_id, 0) + 1
+
+    @staticmethod
+    def _mask(
+        facts: TenantFacts,
+        status: StatusType | None,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> np.ndarray:
+        """Rows matching the common filters; naive datetimes are taken as UTC."""
+        mask = np.ones(len(facts), dtype=bool)
+        if status is not None:
+            mask &= facts.status == _STATUS_CODES[status]
+        if since is not None:
+            mask &= facts.created_at >= _epoch(since)
+        if until is not None:
+            mask &= facts.created_at < _epoch(until)
+        return mask
+
+    @staticmethod
+    def rating_breakdown(
+        facts: TenantFacts,
+        group_by: AnalyticsDimension | None = None,
+        interval: AnalyticsInterval | None = None,
+        percentiles: Sequence[int] = (50, 90),
+        limit: int = 50,
+        status: StatusType | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[RatingBreakdown]:
+        """Rating histograms, averages and percentiles per group and period.
+
+        All groups and periods are counted at once with a single bincount over
+        a combined (group, period, rating) key; percentiles come from the
+        cumulative histograms. Only 1 to 5 ratings count.
+
+        Args:
+            facts (TenantFacts): columns of the tenant
+            group_by (AnalyticsDimension | None): category or product, or a single group
+            interval (AnalyticsInterval | None): week, month or year, or the whole range
+            percentiles (Sequence[int]): percentiles to compute, from 1 to 100
+            limit (int): number of groups to return, those with the most ratings
+            status (StatusType | None): only testimonials with this status
+            since (datetime | None): created at or after
+            until (datetime | None): created before
+
+        Returns:
+            list[RatingBreakdown]: one entry per non-empty group and period, largest
+                groups first and periods in order
+        """
+        mask = AnalyticsService._mask(facts, status, since, until) & (facts.rating >= 1)
+        mask &= facts.rating <= 5
+        ratings = facts.rating[mask].astype(np.int64) - 1
+
+        if group_by is None:
+            labels: tuple[str | None, ...] = (None,)
+            groups = np.zeros(len(ratings), dtype=np.int64)
+        else:
+            codes = facts.category if group_by == AnalyticsDimension.CATEGORY else facts.product
+            values = facts.categories if group_by == AnalyticsDimension.CATEGORY else facts.products
+            # Code -1 (no category) becomes group 0
+            labels = (None, *values)
+            groups = codes[mask].astype(np.int64) + 1
+
+        if interval is None:
+            period_starts = np.array([np.datetime64("NaT", "D")])
+            periods = np.zeros(len(ratings), dtype=np.int64)
+        else:
+            period_starts, periods = np.unique(
+                _period_starts(facts.created_at[mask], interval), return_inverse=True
+            )
+
+        shape = (len(labels), len(period_starts), 5)
+        histograms = np.bincount(
+            (groups * shape[1] + periods) * 5 + ratings, minlength=math.prod(shape)
+        ).reshape(shape)
+        counts = histograms.sum(axis=2)
+        sums = histograms @ np.arange(1, 6)
+        cumulative = histograms.cumsum(axis=2)
+        # Nearest rank: the smallest rating reached by ceil(p% of count) reviews
+        levels = sorted(set(percentiles))
+        thresholds = np.ceil(counts[..., None] * np.array(levels, dtype=np.int64) / 100)
+        ranks = (cumulative[..., None, :] >= thresholds[..., None]).argmax(axis=3) + 1
+
+        totals = counts.sum(axis=1)
+        top = np.argsort(-totals, kind="stable")[:limit]
+        top = top[totals[top] > 0]
+        # Pull the non-empty cells out as Python lists: indexing arrays per cell is slow
+        ranked_groups, periods = np.nonzero(counts[top])
+        groups = top[ranked_groups]
+        return [
+            RatingBreakdown(
+                group=labels[group],
+                period=None if np.isnat(start) else start.item(),
+                count=count,
+                average_rating=round(total / count, 2),
+                histogram=dict(zip(range(1, 6), histogram, strict=True)),
+                percentiles=dict(zip(levels, ranked, strict=True)),
+            )
+            for group, start, count, total, histogram, ranked in zip(
+                groups.tolist(),
+                period_starts[periods],
+                counts[groups, periods].tolist(),
+                sums[groups, periods].tolist(),
+                histograms[groups, periods].tolist(),
+                ranks[groups, periods].tolist(),
+                strict=True,
+            )
+        ]
+
+    @staticmethod
+    def tag_cooccurrence(
+        facts: TenantFacts,
+        limit: int = 20,
+        status: StatusType | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[TagPairCount]:
+        """Pairs of tags most often found on the same testimonial.
+
+        Every tag entry is repeated once per tag of its testimonial to enumerate
+        all pairs without a Python loop; pairs are then counted with np.unique.
+
+        Args:
+            facts (TenantFacts): columns of the tenant
+            limit (int): number of pairs to return
+            status (StatusType | None): only testimonials with this status
+            since (datetime | None): created at or after
+            until (datetime | None): created before
+
+        Returns:
+            list[TagPairCount]: most frequent pairs first
+        """
+        mask = AnalyticsService._mask(facts, status, since, until)
+        lengths = np.diff(facts.tag_offsets)
+        codes = facts.tag_codes[np.repeat(mask, lengths)].astype(np.int64)
+        lengths = lengths[mask]
+
+        # For each entry: the size and the start of its testimonial's tag run
+        sizes = np.repeat(lengths, lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        pair_starts = np.cumsum(sizes) - sizes
+        left = np.repeat(codes, sizes)
+        right = codes[
+            np.repeat(starts, sizes) + np.arange(sizes.sum()) - np.repeat(pair_starts, sizes)
+        ]
+        keep = left < right
+        pairs, counts = np.unique(left[keep] * len(facts.tags) + right[keep], return_counts=True)
+
+        top = np.lexsort((pairs, -counts))[:limit]
+        return [
+            TagPairCount(
+                tags=(
+                    facts.tags[pairs[i] // len(facts.tags)],
+                    facts.tags[pairs[i] % len(facts.tags)],
+                ),
+                count=int(counts[i]),
+            )
+            for i in top
+        ]
+
+    @staticmethod
+    def author_counts(
+        facts: TenantFacts,
+        limit: int = 20,
+        status: StatusType | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[ProductAuthorCount]:
+        """Testimonials and distinct authors per product.
+
+        Args:
+            facts (TenantFacts): columns of the tenant
+            limit (int): number of products to return
+            status (StatusType | None): only testimonials with this status
+            since (datetime | None): created at or after
+            until (datetime | None): created before
+
+        Returns:
+            list[ProductAuthorCount]: products with the most distinct authors first
+        """
+        mask = AnalyticsService._mask(facts, status, since, until)
+        products = facts.product[mask].astype(np.int64)
+        authors = facts.author[mask].astype(np.int64)
+        testimonials = np.bincount(products, minlength=len(facts.products))
+
+        named = authors >= 0
+        distinct = np.unique(products[named] * len(facts.authors) + authors[named])
+        author_counts = np.bincount(
+            distinct // max(len(facts.authors), 1), minlength=len(facts.products)
+        )
+
+        present = np.flatnonzero(testimonials)
+        top = present[np.lexsort((-testimonials[present], -author_counts[present]))][:limit]
+        return [
+            ProductAuthorCount(
+                product_id=facts.products[i],
+                testimonials=int(testimonials[i]),
+                authors=int(author_counts[i]),
+            )
+            for i in top
+        ]
@@ -1,6 +1,8 @@
 import hashlib
 import hmac
 import secrets
+import threading
+import time
 from uuid import UUID
 
 from sqlmodel import select
@@ -9,6 +11,10 @@ from app.core.config import settings
 from app.core.db import SessionDep
 from app.models.api_key import APIKey
 
+# Verified keys by digest, so hot public reads skip the lookup: (key, expires_at)
+_verified_keys: dict[str, tuple[APIKey, float]] = {}
+_verified_keys_lock = threading.Lock()
+
 
 class APIKeyService:
     @staticmethod
@@ -63,6 +69,8 @@ class APIKeyService:
         key.revoked = True
         db.add(key)
         db.commit()
+        with _verified_keys_lock:
+            _verified_keys.pop(key.secret_digest, None)
         return True
 
     @staticmethod
@@ -70,10 +78,20 @@ class APIKeyService:
         """Verify a raw token: compute digest and return the active APIKey model if matches.
 
         Strategy: lookup by prefix, then compare digest with constant-time compare.
+        Matches are remembered for API_KEY_CACHE_TTL_SECONDS; revoking a key forgets
+        it in this process, other workers stop accepting it once the entry expires.
         """
         if not raw_token or len(raw_token) < len(settings.API_KEY_DISPLAY_PREFIX) + 1:
             return None
 
+        incoming = hmac.new(
+            settings.API_KEY_SECRET.encode(), raw_token.encode(), hashlib.sha256
+        ).hexdigest()
+        with _verified_keys_lock:
+            cached = _verified_keys.get(incoming)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
         prefix = raw_token[
             : len(settings.API_KEY_DISPLAY_PREFIX) + settings.API_KEY_PREFIX_BODY_CHARS
         ]
@@ -87,11 +105,15 @@ class APIKeyService:
 
         if not result:
             return None
-        incoming = hmac.new(
-            settings.API_KEY_SECRET.encode(), raw_token.encode(), hashlib.sha256
-        ).hexdigest()
         if hmac.compare_digest(incoming, result.secret_digest):
-            return result
+            # Detached copy: the cached key outlives this session
+            verified = APIKey(**result.model_dump())
+            with _verified_keys_lock:
+                _verified_keys[incoming] = (
+                    verified,
+                    time.monotonic() + settings.API_KEY_CACHE_TTL_SECONDS,
+                )
+            return verified
         return None
 
     @staticmethod
@@ -1,13 +1,35 @@
-from sqlmodel import select
+from collections.abc import Iterable
+from uuid import UUID, uuid4
 
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import func, select
+
+from app.core.cache import CachedBody, ResponseCache
+from app.core.config import settings
 from app.core.db import SessionDep
 from app.models import Category
+from app.models.tenant_usage import TenantCategoryUsage
+from app.schemas.category import CategoryUsageResponse
+from app.schemas.pagination import CatalogSort, PaginationResponse
 from app.utils.validators.slug import generate_slug
 
+_catalog_cache = ResponseCache(ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
+
 
 class CategoryService:
     @staticmethod
     def get_or_create_category(name: str, db: SessionDep) -> Category:
+        """Resolve a category name, creating it if needed without committing.
+
+        Uses INSERT ... ON CONFLICT DO NOTHING RETURNING so concurrent creates of
+        the same slug cannot fail on the unique constraint.
+
+        Args:
+            name (str): category name as typed by the user
+            db (SessionDep): database session
+        Returns:
+            Category: existing or newly created category
+        """
         slug = generate_slug(name)
 
         category = db.exec(select(Category).where(Category.slug == slug)).first()
@@ -16,11 +38,67 @@ class CategoryService:
             return category
 
         # Crear si no existe
-        new_category = Category(name=name.strip().lower(), slug=slug)
-        db.add(new_category)
-        db.commit()
-        db.refresh(new_category)
-        return new_category
+        category = db.exec(
+            insert(Category)
+            .values(id=uuid4(), name=name.strip().lower(), slug=slug)
+            .on_conflict_do_nothing(index_elements=["slug"])
+            .returning(Category)
+        ).scalar_one_or_none()
+
+        if category is None:
+            # Created by a concurrent transaction
+            category = db.exec(select(Category).where(Category.slug == slug)).one()
+        return category
+
+    @staticmethod
+    def get_or_create_categories(names: list[str], db: SessionDep) -> list[Category]:
+        """Resolve many category names at once, creating the missing ones in bulk.
+
+        Same approach as TagService.get_or_create_tags: one SELECT ... IN for the
+        existing slugs, one INSERT ... ON CONFLICT DO NOTHING RETURNING for the
+        rest, and nothing committed.
+
+        Args:
+            names (list[str]): category names as typed by the user
+            db (SessionDep): database session
+        Returns:
+            list[Category]: one category per distinct slug, in input order
+        """
+        names_by_slug: dict[str, str] = {}
+        for name in names:
+            names_by_slug.setdefault(generate_slug(name), name.strip().lower())
+        if not names_by_slug:
+            return []
+
+        categories_by_slug = {
+            category.slug: category
+            for category in db.exec(
+                select(Category).where(Category.slug.in_(names_by_slug))  # type: ignore
+            ).all()
+        }
+
+        missing = [slug for slug in names_by_slug if slug not in categories_by_slug]
+        if missing:
+            created = db.exec(
+                insert(Category)
+                .values(
+                    [{"id": uuid4(), "name": names_by_slug[slug], "slug": slug} for slug in missing]
+                )
+                .on_conflict_do_nothing(index_elements=["slug"])
+                .returning(Category)
+            ).scalars()
+            categories_by_slug.update((category.slug, category) for category in created)
+
+            raced = [slug for slug in missing if slug not in categories_by_slug]
+            if raced:
+                categories_by_slug.update(
+                    (category.slug, category)
+                    for category in db.exec(
+                        select(Category).where(Category.slug.in_(raced))  # type: ignore
+                    ).all()
+                )
+
+        return [categories_by_slug[slug] for slug in names_by_slug]
 
     @staticmethod
     def get_all_categories(db: SessionDep) -> list[Category]:
@@ -33,3 +111,99 @@ class CategoryService:
         """
         categories = db.exec(select(Category)).all()
         return list(categories)
+
+    @staticmethod
+    def get_tenant_categories(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        skip: int,
+        limit: int,
+        sort: CatalogSort = CatalogSort.POPULAR,
+    ) -> tuple[list[CategoryUsageResponse], int]:
+        """Retrieve the categories used by a tenant with their usage counts.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID for filtering
+            skip (int): number of items to skip
+            limit (int): number of items to retrieve
+            sort (CatalogSort): most used first, or alphabetical
+        Returns:
+            tuple[list[CategoryUsageResponse], int]: page of categories and total count
+        """
+        filters = [
+            TenantCategoryUsage.user_id == tenant_owner_id,
+            TenantCategoryUsage.usage_count > 0,
+        ]
+
+        total_items = db.exec(
+            select(func.count()).select_from(TenantCategoryUsage).where(*filters)
+        ).one()
+
+        if sort == CatalogSort.POPULAR:
+            order_by = (TenantCategoryUsage.usage_count.desc(), Category.name)  # type: ignore
+        else:
+            order_by = (Category.name,)
+
+        rows = db.exec(
+            select(
+                Category.id,
+                Category.name,
+                Category.slug,
+                Category.created_at,
+                TenantCategoryUsage.usage_count,
+            )
+            .join(TenantCategoryUsage, TenantCategoryUsage.category_id == Category.id)  # type: ignore
+            .where(*filters)
+            .order_by(*order_by)
+            .offset(skip)
+            .limit(limit)
+        ).all()
+
+        return [CategoryUsageResponse(**row._asdict()) for row in rows], total_items
+
+    @staticmethod
+    def get_catalog(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        skip: int,
+        limit: int,
+        sort: CatalogSort = CatalogSort.POPULAR,
+    ) -> CachedBody:
+        """Get a serialized page of the tenant category catalog, querying only on a cache miss.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID for filtering
+            skip (int): number of items to skip
+            limit (int): number of items to retrieve
+            sort (CatalogSort): most used first, or alphabetical
+        Returns:
+            CachedBody: JSON body of PaginationResponse[CategoryUsageResponse] and its ETag
+        """
+
+        def build() -> bytes:
+            categories, total_items = CategoryService.get_tenant_categories(
+                db, tenant_owner_id, skip, limit, sort
+            )
+            return (
+                PaginationResponse[CategoryUsageResponse](
+                    total_items=total_items,
+                    results=categories,
+                    page=skip // limit + 1,
+                    size=limit,
+                    total_pages=(total_items + limit - 1) // limit,
+                    has_next=(skip + limit) < total_items,
+                    has_prev=skip > 0,
+                )
+                .model_dump_json()
+                .encode()
+            )
+
+        return _catalog_cache.get_or_set(tenant_owner_id, (skip, limit, sort), build)
+
+    @staticmethod
+    def invalidate_catalog(tenant_owner_ids: Iterable[UUID]) -> None:
+        """Drop the cached catalog pages of the given tenants."""
+        for tenant_owner_id in tenant_owner_ids:
+            _catalog_cache.invalidate(tenant_owner_id)
@@ -0,0 +1,86 @@
+from dataclasses import dataclass, replace
+from uuid import UUID
+
+from app.models.testimonial import StatusType, Testimonial
+from app.models.webhook import WebhookEventType
+
+
+@dataclass(frozen=True, slots=True)
+class TestimonialState:
+    """Snapshot of the testimonial fields that derived data depends on."""
+
+    __test__ = False  # not a pytest test class, despite the name
+
+    id: UUID
+    product_id: str
+    status: StatusType
+    is_active: bool
+    rating: int | None
+    category_id: UUID | None
+    tag_ids: frozenset[UUID] = frozenset()
+
+    @classmethod
+    def of(cls, testimonial: Testimonial, tag_ids=None) -> "TestimonialState":
+        if tag_ids is None:
+            tag_ids = [tag.id for tag in testimonial.tags]
+        return cls(
+            id=testimonial.id,
+            product_id=testimonial.product_id,
+            status=testimonial.status,
+            is_active=testimonial.is_active,
+            rating=testimonial.rating,
+            category_id=testimonial.category_id,
+            tag_ids=frozenset(tag_ids),
+        )
+
+    @property
+    def published(self) -> bool:
+        """Visible through the public API."""
+        return self.is_active and self.status == StatusType.APPROVED
+
+    def evolve(self, **changes) -> "TestimonialState":
+        return replace(self, **changes)
+
+
+@dataclass(frozen=True, slots=True)
+class TestimonialChange:
+    """A write to one testimonial: before is None on create, after is None on removal."""
+
+    __test__ = False  # not a pytest test class, despite the name
+
+    tenant_owner_id: UUID
+    before: TestimonialState | None
+    after: TestimonialState | None
+
+
+def _event_data(state: TestimonialState) -> dict:
+    return {
+        "id": str(state.id),
+        "product_id": state.product_id,
+        "status": state.status.value,
+        "rating": state.rating,
+        "category_id": str(state.category_id) if state.category_id else None,
+        "tag_ids": sorted(str(tag_id) for tag_id in state.tag_ids),
+    }
+
+
+def change_event(change: TestimonialChange) -> tuple[WebhookEventType, dict] | None:
+    """Event type and data reported for a write, None for writes to removed testimonials.
+
+    Shared by the webhooks and the moderation stream so both describe a write
+    the same way.
+    """
+    before, after = change.before, change.after
+    was_active = before is not None and before.is_active
+    is_active = after is not None and after.is_active
+    if not was_active:
+        if not is_active:
+            return None
+        return WebhookEventType.TESTIMONIAL_CREATED, _event_data(after)
+    if not is_active:
+        return WebhookEventType.TESTIMONIAL_DELETED, _event_data(before)
+    if before.status != after.status:
+        data = _event_data(after)
+        data["previous_status"] = before.status.value
+        return WebhookEventType.TESTIMONIAL_STATUS_CHANGED, data
+    return WebhookEventType.TESTIMONIAL_UPDATED, _event_data(after)
@@ -0,0 +1,149 @@
+import gzip
+import json
+from html import escape
+from uuid import UUID
+
+from app.core.cache import CachedBody, ResponseCache
+from app.core.config import settings
+from app.core.db import SessionDep
+from app.schemas.testimonial import EmbedLayout
+from app.services.testimonial import TestimonialService
+from app.utils.validators.slug import generate_slug
+
+_fragment_cache = ResponseCache(
+    ttl_seconds=settings.EMBED_CACHE_TTL_SECONDS,
+    max_entries=settings.EMBED_CACHE_MAX_ENTRIES,
+)
+
+# Scoped to the fragment root, so host pages are not restyled
+_STYLE = (
+    ".tm-embed{font:15px/1.5 system-ui,sans-serif;color:#1f2933}"
+    ".tm-embed *{box-sizing:border-box}"
+    ".tm-item{margin:0;padding:16px;border:1px solid #e4e7eb;border-radius:8px;background:#fff}"
+    ".tm-item blockquote{margin:0 0 12px}"
+    ".tm-item h3{margin:0 0 8px;font-size:1em}"
+    ".tm-item figcaption{display:flex;gap:8px;align-items:center;font-size:.9em;color:#52606d}"
+    ".tm-rating{color:#f0b429;letter-spacing:1px}"
+    ".tm-grid{display:grid;gap:16px;grid-template-columns:repeat(auto-fill,minmax(240px,1fr))}"
+    ".tm-carousel{display:flex;gap:16px;overflow-x:auto;scroll-snap-type:x mandatory}"
+    ".tm-carousel .tm-item{flex:0 0 min(85%,320px);scroll-snap-align:start}"
+    ".tm-empty{color:#7b8794}"
+)
+
+
+def _item_html(testimonial: dict) -> str:
+    content = testimonial.get("content") or {}
+    parts = ['<figure class="tm-item">']
+    if content.get("title"):
+        parts.append(f"<h3>{escape(content['title'])}</h3>")
+    if content.get("content"):
+        parts.append(f"<blockquote>{escape(content['content'])}</blockquote>")
+    parts.append("<figcaption>")
+    if content.get("author_name"):
+        parts.append(f'<span class="tm-author">{escape(content["author_name"])}</span>')
+    rating = content.get("rating") or 0
+    if rating:
+        stars = "★" * rating + "☆" * (5 - rating)
+        parts.append(f'<span class="tm-rating" aria-label="{rating}/5">{stars}</span>')
+    parts.append("</figcaption></figure>")
+    return "".join(parts)
+
+
+def render_fragment(testimonials: list[dict], layout: EmbedLayout) -> str:
+    """Self-contained HTML (scoped style and markup) for a list of TestimonialResponse dicts."""
+    if layout == EmbedLayout.SINGLE:
+        testimonials = testimonials[:1]
+    items = "".join(_item_html(testimonial) for testimonial in testimonials)
+    if not items:
+        items = '<p class="tm-empty">No testimonials yet.</p>'
+    return (
+        f"<style>{_STYLE}</style>"
+        f'<div class="tm-embed tm-{layout.value}" data-layout="{layout.value}">{items}</div>'
+    )
+
+
+def _document(fragment: str) -> str:
+    return (
+        '<!doctype html><html><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width,initial-scale=1">'
+        "<style>body{margin:0;padding:8px;background:transparent}</style>"
+        f"</head><body>{fragment}</body></html>"
+    )
+
+
+def _script(fragment: str) -> str:
+    # The fragment goes in as a JSON string; "</" is escaped so it cannot close a <script>
+    literal = json.dumps(fragment).replace("</", "<\\/")
+    return (
+        "(function(){var s=document.currentScript;"
+        f"s.insertAdjacentHTML('afterend',{literal});}})();"
+    )
+
+
+class EmbedService:
+    @staticmethod
+    def get_widget(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        layout: EmbedLayout,
+        limit: int,
+        script: bool = False,
+        compressed: bool = False,
+        product_id: str | None = None,
+        category: str | None = None,
+        tag: str | None = None,
+    ) -> CachedBody:
+        """Get a rendered embed widget, rendering only when the feed or the options change.
+
+        Fragments are built from the cached public page of the same testimonials
+        and keyed by its ETag, the feed version: a publish or an edit yields a new
+        page, hence a new fragment, without invalidating anything here. The gzip
+        variant is stored alongside the plain one, compressed once.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID
+            layout (EmbedLayout): carousel, grid or single
+            limit (int): number of testimonials to show
+            script (bool): JavaScript inserting the widget instead of an HTML document
+            compressed (bool): gzip-encoded body
+            product_id (str | None): filter by product ID
+            category (str | None): filter by category name or slug
+            tag (str | None): filter by tag name or slug
+
+        Returns:
+            CachedBody: widget body, its ETag and the surrogate keys of the page
+        """
+        if layout == EmbedLayout.SINGLE:
+            limit = 1
+        page = TestimonialService.get_published(
+            db, tenant_owner_id, 0, limit, product_id=product_id, category=category, tag=tag
+        )
+
+        def build() -> bytes:
+            fragment = render_fragment(json.loads(page.body)["results"], layout)
+            return (_script(fragment) if script else _document(fragment)).encode()
+
+        def surrogate_keys(_: bytes) -> tuple[str, ...]:
+            return page.surrogate_keys
+
+        key = (
+            "widget",
+            script,
+            layout,
+            limit,
+            product_id,
+            generate_slug(category) if category else None,
+            generate_slug(tag) if tag else None,
+            page.etag,
+        )
+        plain = _fragment_cache.get_or_set(tenant_owner_id, key, build, surrogate_keys)
+        if not compressed:
+            return plain
+        return _fragment_cache.get_or_set(
+            tenant_owner_id,
+            (*key, "gzip"),
+            # mtime=0: identical bytes, hence ETags, on every worker
+            lambda: gzip.compress(plain.body, mtime=0),
+            surrogate_keys,
+        )
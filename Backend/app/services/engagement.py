@@ -0,0 +1,274 @@
+import time
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+from itertools import batched
+from uuid import UUID
+
+from sqlalchemy import DateTime, Integer, Uuid, and_, column, delete, func, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import SessionDep, engine
+from app.core.ring_buffer import RingBuffer
+from app.models.engagement import (
+    EngagementBucket,
+    TestimonialEngagement,
+    TestimonialEngagementDaily,
+    TestimonialEngagementHourly,
+)
+from app.models.testimonial import Testimonial
+from app.schemas.engagement import (
+    EngagementBeacon,
+    EngagementGranularity,
+    EngagementPoint,
+    EngagementReport,
+    EngagementType,
+)
+
+_COUNTERS = {EngagementType.IMPRESSION: "impressions", EngagementType.CLICK: "clicks"}
+_COLUMNS = ["testimonial_id", "bucket_start", "user_id", *_COUNTERS.values()]
+
+ROLLUPS: dict[EngagementGranularity, type[EngagementBucket]] = {
+    EngagementGranularity.HOUR: TestimonialEngagementHourly,
+    EngagementGranularity.DAY: TestimonialEngagementDaily,
+}
+
+
+def _add_to(model: type[EngagementBucket], rows):
+    """Upsert adding the counters of rows (a select of _COLUMNS) to those of model."""
+    stmt = insert(model).from_select(_COLUMNS, rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["testimonial_id", "bucket_start"],
+        set_={
+            counter: getattr(model, counter) + stmt.excluded[counter]
+            for counter in _COUNTERS.values()
+        },
+    )
+
+
+def _rolled_up(source, unit: str):
+    """Counters of source (a selectable with _COLUMNS) summed per testimonial and UTC unit."""
+    bucket = func.date_trunc(unit, source.c.bucket_start, "UTC")
+    return select(
+        source.c.testimonial_id,
+        bucket.label("bucket_start"),
+        source.c.user_id,
+        *(func.sum(source.c[counter]).label(counter) for counter in _COUNTERS.values()),
+    ).group_by(source.c.testimonial_id, bucket, source.c.user_id)
+
+
+class EngagementService:
+    @staticmethod
+    def record(tenant_owner_id: UUID, beacon: EngagementBeacon) -> None:
+        """Append the events of a beacon to the in-memory buffer.
+
+        Nothing is written here: the events are timestamped on arrival and
+        aggregated by the next flush of the buffer.
+
+        Args:
+            tenant_owner_id (UUID): tenant owner ID from the API key
+            beacon (EngagementBeacon): validated beacon payload
+        """
+        received_at = time.time()
+        engagement_buffer.extend(
+            (tenant_owner_id, event.testimonial_id, event.type, received_at)
+            for event in beacon.events
+        )
+
+    @staticmethod
+    def aggregate(events: list[tuple]) -> list[dict]:
+        """Sum buffered events per testimonial and time bucket.
+
+        Args:
+            events (list[tuple]): (tenant owner ID, testimonial ID, type, epoch seconds)
+
+        Returns:
+            list[dict]: TestimonialEngagement rows holding the increments
+        """
+        width = settings.ENGAGEMENT_BUCKET_SECONDS
+        counts: Counter[tuple[UUID, UUID, int, EngagementType]] = Counter()
+        for tenant_owner_id, testimonial_id, event_type, received_at in events:
+            bucket = int(received_at // width * width)
+            counts[(tenant_owner_id, testimonial_id, bucket, event_type)] += 1
+
+        rows: dict[tuple[UUID, UUID, int], dict] = {}
+        for (tenant_owner_id, testimonial_id, bucket, event_type), count in counts.items():
+            row = rows.setdefault(
+                (tenant_owner_id, testimonial_id, bucket),
+                {
+                    "user_id": tenant_owner_id,
+                    "testimonial_id": testimonial_id,
+                    "bucket_start": datetime.fromtimestamp(bucket, UTC),
+                    "impressions": 0,
+                    "clicks": 0,
+                },
+            )
+            row[_COUNTERS[event_type]] += count
+        return list(rows.values())
+
+    @staticmethod
+    def flush(events: list[tuple]) -> None:
+        """Write buffered events as batched upserts of per-bucket increments.
+
+        Events naming a testimonial of another tenant, or one that does not
+        exist, are discarded by the join in the upsert. Rows are written in key
+        order, so concurrent flushes from several workers cannot deadlock.
+
+        Args:
+            events (list[tuple]): events drained from the buffer, as built by record()
+        """
+        rows = sorted(
+            EngagementService.aggregate(events),
+            key=lambda row: (row["testimonial_id"], row["bucket_start"]),
+        )
+        with Session(engine) as db:
+            for batch in batched(rows, settings.ENGAGEMENT_BATCH_SIZE, strict=False):
+                db.exec(EngagementService._upsert(list(batch)))
+                db.commit()
+
+    @staticmethod
+    def _upsert(rows: list[dict]):
+        increments = values(
+            column("user_id", Uuid),
+            column("testimonial_id", Uuid),
+            column("bucket_start", DateTime(timezone=True)),
+            column("impressions", Integer),
+            column("clicks", Integer),
+            name="increments",
+        ).data([tuple(row.values()) for row in rows])
+        return _add_to(
+            TestimonialEngagement,
+            select(*(increments.c[name] for name in _COLUMNS))
+            .select_from(increments)
+            .join(
+                Testimonial,
+                and_(
+                    Testimonial.id == increments.c.testimonial_id,
+                    Testimonial.user_id == increments.c.user_id,
+                ),
+            ),
+        )
+
+    @staticmethod
+    def compact(db: SessionDep, now: datetime | None = None) -> dict[str, int]:
+        """Move completed hours of raw buckets into the rollups and apply retention.
+
+        Raw buckets before the current hour are deleted and added, in the same
+        statement, to the hourly rollup and to the daily one, so a bucket is
+        counted exactly once even if the job is interrupted or run twice. A flush
+        landing late in an already compacted hour is folded by the next run.
+        Rollup buckets older than their retention period are then dropped.
+
+        Args:
+            db (SessionDep): database session
+            now (datetime | None): reference time, defaults to the current time
+
+        Returns:
+            dict[str, int]: raw buckets folded and rollup buckets expired
+        """
+        now = now or datetime.now(UTC)
+        current_hour = now.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+        raw = TestimonialEngagement
+
+        moved = (
+            delete(raw)
+            .where(raw.bucket_start < current_hour)
+            .returning(*(getattr(raw, name) for name in _COLUMNS))
+            .cte("moved")
+        )
+        hours = _rolled_up(moved, "hour").cte("hours")
+        folded = db.exec(
+            select(func.count())
+            .select_from(moved)
+            .add_cte(
+                _add_to(TestimonialEngagementHourly, select(hours)).cte("into_hourly"),
+                _add_to(TestimonialEngagementDaily, _rolled_up(hours, "day")).cte("into_daily"),
+            )
+        ).one()
+
+        expired = {}
+        for name, model, retention in (
+            (
+                "hourly_expired",
+                TestimonialEngagementHourly,
+                settings.ENGAGEMENT_HOURLY_RETENTION_DAYS,
+            ),
+            ("daily_expired", TestimonialEngagementDaily, settings.ENGAGEMENT_DAILY_RETENTION_DAYS),
+        ):
+            cutoff = current_hour.replace(hour=0) - timedelta(days=retention)
+            expired[name] = db.exec(delete(model).where(model.bucket_start < cutoff)).rowcount
+        db.commit()
+        return {"folded": folded, **expired}
+
+    @staticmethod
+    def get_report(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        granularity: EngagementGranularity,
+        start: datetime,
+        end: datetime,
+        testimonial_id: UUID | None = None,
+    ) -> EngagementReport:
+        """Impressions and clicks of a tenant over a time range, read from one rollup.
+
+        Reads are an index range scan over (user_id, bucket_start), or over the
+        primary key for a single testimonial, so their cost depends on the range
+        asked for and not on how much history is kept. Buckets of the current
+        hour only show up once compacted.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID
+            granularity (EngagementGranularity): hourly or daily buckets
+            start (datetime): start of the range, rounded down to a bucket (UTC if naive)
+            end (datetime): end of the range, exclusive (UTC if naive)
+            testimonial_id (UUID | None): only this testimonial
+
+        Returns:
+            EngagementReport: totals and the non-empty buckets of the range
+        """
+        start, end = (
+            moment.replace(tzinfo=UTC) if moment.tzinfo is None else moment.astimezone(UTC)
+            for moment in (start, end)
+        )
+        start = start.replace(minute=0, second=0, microsecond=0)
+        if granularity == EngagementGranularity.DAY:
+            start = start.replace(hour=0)
+
+        model = ROLLUPS[granularity]
+        criteria = [
+            model.user_id == tenant_owner_id,
+            model.bucket_start >= start,
+            model.bucket_start < end,
+        ]
+        if testimonial_id is not None:
+            criteria.append(model.testimonial_id == testimonial_id)
+        rows = db.exec(
+            select(
+                model.bucket_start,
+                func.sum(model.impressions).label("impressions"),
+                func.sum(model.clicks).label("clicks"),
+            )
+            .where(*criteria)
+            .group_by(model.bucket_start)
+            .order_by(model.bucket_start)
+        ).all()
+
+        series = [EngagementPoint(**row._asdict()) for row in rows]
+        return EngagementReport(
+            granularity=granularity,
+            start=start,
+            end=end,
+            impressions=sum(point.impressions for point in series),
+            clicks=sum(point.clicks for point in series),
+            series=series,
+        )
+
+
+engagement_buffer = RingBuffer(
+    EngagementService.flush,
+    capacity=settings.ENGAGEMENT_BUFFER_SIZE,
+    flush_interval=settings.ENGAGEMENT_FLUSH_INTERVAL_SECONDS,
+    name="engagement",
+)
@@ -0,0 +1,126 @@
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import BigInteger, String, Uuid, column, delete, exists, func, literal, values
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.db import SessionDep, after_commit, before_commit
+from app.models.testimonial_event import TestimonialEvent
+from app.models.webhook import WebhookEndpoint
+from app.services.changes import TestimonialChange, change_event
+from app.services.webhook import webhook_dispatcher
+
+# NOTIFY channel; payloads are "{tenant owner id}:{first id}:{last id}"
+CHANNEL = "testimonial_events"
+
+
+def _lock_key(tenant_owner_id: UUID) -> int:
+    """Advisory lock key serializing the events of a tenant: the first 64 bits of its ID."""
+    return int.from_bytes(tenant_owner_id.bytes[:8], "big", signed=True)
+
+
+class EventLogService:
+    @staticmethod
+    def apply_changes(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Queue the events of testimonial writes for the log, written right before commit.
+
+        The log is the only record of the writes: the moderation stream reads
+        it through NOTIFY and the webhook dispatcher derives its deliveries
+        from it (see WebhookService.fan_out). Nothing is executed until the
+        caller's transaction commits, so the per-tenant lock that orders the
+        log is not held while the rest of the transaction runs.
+
+        Args:
+            db (SessionDep): database session
+            changes (list[TestimonialChange]): writes performed in this transaction
+        """
+        before_commit(db, EventLogService._write_events).extend(changes)
+
+    @staticmethod
+    def _write_events(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Append the events of a transaction to the log and notify the listeners.
+
+        One statement, run as the last one before COMMIT: it takes a
+        transaction-level advisory lock per tenant (in key order, so writers of
+        several tenants cannot deadlock), then inserts the events and NOTIFYs
+        their id ranges. The lock is held only until the commit that follows,
+        and serializes just this step between concurrent writers of a tenant:
+        their ids are allocated in commit order, which resuming by id relies
+        on. Postgres sends the NOTIFY only if the transaction commits; the
+        webhook dispatcher of this process is woken once it has.
+        """
+        events = []
+        for change in changes:
+            event = change_event(change)
+            if event is None:
+                continue
+            event_type, data = event
+            events.append((change.tenant_owner_id, event_type.value, data))
+        if not events:
+            return
+
+        keys = sorted({_lock_key(tenant_owner_id) for tenant_owner_id, _, _ in events})
+        locked = (
+            select(func.pg_advisory_xact_lock(func.unnest(literal(keys, ARRAY(BigInteger)))))
+            .cte("locked")
+            .prefix_with("MATERIALIZED")
+        )
+        rows = values(
+            column("user_id", Uuid),
+            column("event_type", String),
+            column("data", JSONB),
+            name="events",
+        ).data(events)
+        inserted = (
+            insert(TestimonialEvent)
+            .from_select(
+                ["user_id", "event_type", "data"],
+                # Evaluated before the first row is inserted: no id is drawn
+                # before every lock is held
+                select(rows).where(
+                    select(func.count()).select_from(locked).scalar_subquery() == len(keys)
+                ),
+            )
+            .returning(TestimonialEvent.id, TestimonialEvent.user_id)  # type: ignore[arg-type]
+            .cte("inserted")
+        )
+        db.exec(
+            select(
+                func.pg_notify(
+                    CHANNEL,
+                    func.concat(
+                        inserted.c.user_id,
+                        ":",
+                        func.min(inserted.c.id),
+                        ":",
+                        func.max(inserted.c.id),
+                    ),
+                )
+            ).group_by(inserted.c.user_id)
+        )
+        after_commit(db, webhook_dispatcher.wake)
+
+    @staticmethod
+    def prune(db: SessionDep, now: datetime | None = None) -> int:
+        """Delete events older than EVENT_LOG_RETENTION_HOURS.
+
+        Events an active webhook endpoint of their tenant has not been written
+        deliveries for yet are kept until it has.
+
+        Returns:
+            int: number of rows deleted
+        """
+        cutoff = (now or datetime.now(UTC)) - timedelta(hours=settings.EVENT_LOG_RETENTION_HOURS)
+        event = TestimonialEvent
+        undelivered = exists().where(
+            WebhookEndpoint.user_id == event.user_id,
+            WebhookEndpoint.is_active.is_(True),  # type: ignore
+            WebhookEndpoint.last_event_id < event.id,
+        )
+        deleted = db.exec(
+            delete(event).where(event.created_at < cutoff, ~undelivered)  # type: ignore[operator]
+        ).rowcount  # type: ignore[arg-type]
+        db.commit()
+        return deleted
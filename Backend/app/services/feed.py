@@ -0,0 +1,218 @@
+from collections.abc import Iterator
+from uuid import UUID
+
+from sqlalchemy import Text, Uuid, any_, bindparam, cast, delete
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, array, insert
+from sqlmodel import func, select
+
+from app.core.db import SessionDep
+from app.models.category import Category
+from app.models.published_testimonial import PublishedTestimonial
+from app.models.tag import Tag
+from app.models.testimonial import StatusType, Testimonial
+from app.models.testimonial_tag_link import TestimonialTagLink
+from app.services.changes import TestimonialChange
+from app.services.rendering import paginated_json, testimonial_json
+
+_FEED_COLUMNS = ("id", "user_id", "product_id", "category_slug", "tag_slugs", "created_at", "body")
+
+
+class FeedService:
+    @staticmethod
+    def apply_changes(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Keep the published feed in step with testimonial writes, inside the caller's transaction.
+
+        Only writes touching a testimonial published before or after them matter:
+        rows that stopped being published are deleted, published ones are
+        re-rendered (content edits included) with one upsert.
+
+        Args:
+            db (SessionDep): database session
+            changes (list[TestimonialChange]): writes performed in this transaction
+        """
+        touched = {
+            (change.after or change.before).id
+            for change in changes
+            if (change.before is not None and change.before.published)
+            or (change.after is not None and change.after.published)
+        }
+        if not touched:
+            return
+        published = [
+            change.after.id
+            for change in changes
+            if change.after is not None and change.after.published
+        ]
+
+        unpublished = list(touched.difference(published))
+        if unpublished:
+            db.exec(
+                delete(PublishedTestimonial).where(
+                    PublishedTestimonial.id
+                    == any_(bindparam("ids", unpublished, type_=ARRAY(Uuid)))
+                )
+            )
+        if published:
+            FeedService._upsert(
+                db, Testimonial.id == any_(bindparam("ids", published, type_=ARRAY(Uuid)))
+            )
+
+    @staticmethod
+    def rebuild(db: SessionDep, tenant_owner_id: UUID | None = None) -> None:
+        """Recompute the feed of one tenant, or of every tenant, from the testimonials.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID | None): tenant to rebuild; all tenants when None
+        """
+        stale = delete(PublishedTestimonial)
+        criteria = []
+        if tenant_owner_id is not None:
+            stale = stale.where(PublishedTestimonial.user_id == tenant_owner_id)
+            criteria.append(Testimonial.user_id == tenant_owner_id)
+        db.exec(stale)
+        FeedService._upsert(db, *criteria)
+        db.commit()
+
+    @staticmethod
+    def _upsert(db: SessionDep, *criteria) -> None:
+        """Render the published testimonials matching criteria into the feed."""
+        rows = (
+            select(Testimonial)
+            .where(
+                *criteria,
+                Testimonial.user_id.is_not(None),  # type: ignore
+                Testimonial.status == StatusType.APPROVED,
+                Testimonial.is_active.is_(True),  # type: ignore
+            )
+            .subquery("published")
+        )
+        category_slug = (
+            select(Category.slug).where(Category.id == rows.c.category_id).scalar_subquery()
+        )
+        tag_slugs = func.coalesce(
+            select(func.array_agg(aggregate_order_by(Tag.slug, Tag.slug)))
+            .join(TestimonialTagLink, TestimonialTagLink.tag_id == Tag.id)  # type: ignore
+            .where(TestimonialTagLink.testimonial_id == rows.c.id)
+            .scalar_subquery(),
+            array([], type_=Text),
+        )
+
+        stmt = insert(PublishedTestimonial).from_select(
+            list(_FEED_COLUMNS),
+            select(
+                rows.c.id,
+                rows.c.user_id,
+                rows.c.product_id,
+                category_slug,
+                tag_slugs,
+                rows.c.created_at,
+                testimonial_json(rows),
+            ),
+        )
+        db.exec(
+            stmt.on_conflict_do_update(
+                index_elements=["id"],
+                set_={column: stmt.excluded[column] for column in _FEED_COLUMNS[1:]},
+            )
+        )
+
+    @staticmethod
+    def get_page_json(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        skip: int,
+        limit: int,
+        product_id: str | None = None,
+        category_slug: str | None = None,
+        tag_slug: str | None = None,
+    ) -> str:
+        """Get a page of the tenant feed as a PaginationResponse JSON document.
+
+        An index range scan over pre-rendered bodies: no joins or per-row rendering.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID for filtering
+            skip (int): number of items to skip
+            limit (int): number of items to retrieve
+            product_id (str | None): filter by product ID
+            category_slug (str | None): filter by category slug
+            tag_slug (str | None): filter by tag slug
+
+        Returns:
+            str: JSON document with the paginated testimonials
+        """
+        query = select(PublishedTestimonial).where(PublishedTestimonial.user_id == tenant_owner_id)
+        if product_id:
+            query = query.where(PublishedTestimonial.product_id == product_id)
+        if category_slug:
+            query = query.where(PublishedTestimonial.category_slug == category_slug)
+        if tag_slug:
+            query = query.where(
+                PublishedTestimonial.tag_slugs.contains([tag_slug])  # type: ignore
+            )
+
+        statement = paginated_json(
+            query,
+            skip,
+            limit,
+            item=lambda page: page.c.body,
+            order_by=lambda page: (page.c.created_at.desc(), page.c.id.desc()),
+        )
+        return db.exec(statement).one()
+
+    @staticmethod
+    def iter_bodies(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        product_id: str | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[str]:
+        """Stream the rendered bodies of a tenant feed in display order.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID for filtering
+            product_id (str | None): only this product
+            batch_size (int): rows fetched per server-side cursor round trip
+
+        Yields:
+            str: JSON text of each TestimonialResponse
+        """
+        query = select(cast(PublishedTestimonial.body, Text)).where(
+            PublishedTestimonial.user_id == tenant_owner_id
+        )
+        if product_id is not None:
+            query = query.where(PublishedTestimonial.product_id == product_id)
+        query = query.order_by(
+            PublishedTestimonial.created_at.desc(),  # type: ignore
+            PublishedTestimonial.id.desc(),  # type: ignore
+        ).execution_options(yield_per=batch_size)
+        for partition in db.exec(query).partitions():
+            yield from partition
+
+    @staticmethod
+    def count_by_product(db: SessionDep, tenant_owner_id: UUID) -> dict[str, int]:
+        """Number of published testimonials of a tenant per product."""
+        rows = db.exec(
+            select(PublishedTestimonial.product_id, func.count())
+            .where(PublishedTestimonial.user_id == tenant_owner_id)
+            .group_by(PublishedTestimonial.product_id)
+        ).all()
+        return dict(rows)
+
+    @staticmethod
+    def get_tenants(db: SessionDep) -> list[UUID]:
+        """Tenants with at least one published testimonial."""
+        return list(db.exec(select(PublishedTestimonial.user_id).distinct()).all())
+
+    @staticmethod
+    def get_item_json(db: SessionDep, testimonial_id: UUID, tenant_owner_id: UUID) -> str | None:
+        """Get the rendered body of one published testimonial, or None if not published."""
+        return db.exec(
+            select(cast(PublishedTestimonial.body, Text)).where(
+                PublishedTestimonial.id == testimonial_id,
+                PublishedTestimonial.user_id == tenant_owner_id,
+            )
+        ).first()
@@ -0,0 +1,137 @@
+import logging
+from collections import defaultdict
+from uuid import UUID, uuid4
+
+import psycopg
+from fastapi import HTTPException, status
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.write_behind import BufferFull, WriteBehindBuffer
+from app.models.testimonial import Testimonial
+from app.schemas.testimonial import TestimonialCreate
+from app.services.testimonial import TestimonialService
+
+logger = logging.getLogger(__name__)
+
+
+class IngestService:
+    @staticmethod
+    def submit(data: TestimonialCreate, tenant_owner_id: UUID | None) -> UUID:
+        """Accept a public submission into the write-behind buffer.
+
+        The id is assigned here so the caller gets it back before the row exists;
+        the row is inserted by the next flush of the buffer.
+
+        Args:
+            data (TestimonialCreate): validated testimonial data
+            tenant_owner_id (UUID | None): tenant owner ID from the API key
+
+        Raises:
+            HTTPException: 401 if the key no longer has an owner, 503 with
+                Retry-After while the buffer is full
+
+        Returns:
+            UUID: id the testimonial will be stored under
+        """
+        if tenant_owner_id is None:
+            # The owner was deleted: nothing could ever store the submission
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or missing API Key.",
+            )
+        testimonial_id = uuid4()
+        try:
+            ingest_buffer.submit(
+                {
+                    "id": str(testimonial_id),
+                    "tenant_owner_id": str(tenant_owner_id),
+                    "data": data.model_dump(mode="json", exclude_unset=True),
+                }
+            )
+        except BufferFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many pending submissions, retry later",
+                headers={"Retry-After": str(max(1, round(settings.INGEST_FLUSH_INTERVAL_SECONDS)))},
+            ) from None
+        return testimonial_id
+
+    @staticmethod
+    def flush(items: list[dict]) -> None:
+        """Insert buffered submissions, one COPY batch per tenant.
+
+        Safe to call again with the same items (retries, journal replay): ids that
+        already exist are skipped. A database outage propagates so the buffer keeps
+        the items and retries; any other failure (a malformed item, a constraint
+        violation) is narrowed down to the offending submissions, which are logged
+        and dropped, so they cannot hold up the rest of the buffer.
+
+        Args:
+            items (list[dict]): buffered submissions as built by submit()
+        """
+        submissions = []
+        for item in items:
+            try:
+                submissions.append(
+                    (
+                        UUID(item["id"]),
+                        UUID(item["tenant_owner_id"]),
+                        TestimonialCreate.model_validate(item["data"]),
+                    )
+                )
+            except (KeyError, TypeError, ValueError):  # ValidationError is a ValueError
+                logger.exception("Dropping malformed buffered testimonial %r", item)
+        if not submissions:
+            return
+
+        with Session(engine) as db:
+            ids = [testimonial_id for testimonial_id, _, _ in submissions]
+            existing = set(db.exec(select(Testimonial.id).where(Testimonial.id.in_(ids))).all())
+            db.rollback()
+
+            by_tenant: dict[UUID, list[tuple]] = defaultdict(list)
+            for testimonial_id, tenant_owner_id, data in submissions:
+                if testimonial_id not in existing:
+                    by_tenant[tenant_owner_id].append((testimonial_id, data))
+
+            for tenant_owner_id, group in by_tenant.items():
+                try:
+                    IngestService._insert(group, db, tenant_owner_id)
+                except (OperationalError, psycopg.OperationalError):
+                    raise
+                except Exception:
+                    db.rollback()
+                    if len(group) == 1:
+                        logger.exception("Dropping buffered testimonial %s", group[0][0])
+                        continue
+                    for submission in group:
+                        try:
+                            IngestService._insert([submission], db, tenant_owner_id)
+                        except (OperationalError, psycopg.OperationalError):
+                            raise
+                        except Exception:
+                            db.rollback()
+                            logger.exception("Dropping buffered testimonial %s", submission[0])
+
+    @staticmethod
+    def _insert(group: list[tuple], db: Session, tenant_owner_id: UUID) -> None:
+        TestimonialService._insert_batch(
+            [data for _, data in group],
+            db,
+            tenant_owner_id,
+            ids=[testimonial_id for testimonial_id, _ in group],
+        )
+
+
+ingest_buffer = WriteBehindBuffer(
+    IngestService.flush,
+    max_items=settings.INGEST_BUFFER_MAX_ITEMS,
+    batch_size=settings.INGEST_BATCH_SIZE,
+    flush_interval=settings.INGEST_FLUSH_INTERVAL_SECONDS,
+    journal_dir=settings.INGEST_JOURNAL_DIR,
+    fsync=settings.INGEST_JOURNAL_FSYNC,
+    name="ingest",
+)
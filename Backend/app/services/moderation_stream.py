@@ -0,0 +1,341 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from collections.abc import AsyncIterator, Sequence
+from contextlib import suppress
+from uuid import UUID
+
+import psycopg
+from sqlalchemy import BigInteger, Uuid, and_, column, func, values
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import SessionDep, engine
+from app.models.testimonial_event import TestimonialEvent
+from app.services.event_log import CHANNEL
+
+logger = logging.getLogger(__name__)
+
+
+def _frame(event_type: str, event_id: int, data: dict) -> str:
+    """One SSE message; the id is what the browser sends back as Last-Event-ID."""
+    body = json.dumps(data, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {event_type}\ndata: {body}\n\n"
+
+
+def _event_frame(event: TestimonialEvent) -> str:
+    return _frame(
+        event.event_type,
+        event.id,  # type: ignore[arg-type]
+        {
+            "id": event.id,
+            "type": event.event_type,
+            "created_at": event.created_at.isoformat(),
+            "data": event.data,
+        },
+    )
+
+
+class Subscription:
+    """Events of one tenant waiting to be sent by one stream.
+
+    Pushed from the bus thread, consumed on the stream's event loop. A stream
+    that falls more than max_events behind is closed rather than buffered
+    without bound: its client reconnects and catches up from the event log.
+    """
+
+    def __init__(self, tenant_owner_id: UUID, loop: asyncio.AbstractEventLoop, max_events: int):
+        self.tenant_owner_id = tenant_owner_id
+        self.max_events = max_events
+        self.closed = False
+        self._loop = loop
+        self._queued = 0
+        self._queue: asyncio.Queue[list[TestimonialEvent] | None] = asyncio.Queue()
+
+    def push(self, events: list[TestimonialEvent]) -> None:
+        """Queue events for the stream; thread-safe."""
+        with suppress(RuntimeError):  # the loop is already closed
+            self._loop.call_soon_threadsafe(self._push, events)
+
+    def close(self) -> None:
+        """End the stream once what is queued has been sent; thread-safe."""
+        with suppress(RuntimeError):
+            self._loop.call_soon_threadsafe(self._close)
+
+    async def get(self) -> list[TestimonialEvent] | None:
+        """Next events in commit order, None once closed."""
+        events = await self._queue.get()
+        if events is not None:
+            self._queued -= len(events)
+        return events
+
+    def _push(self, events: list[TestimonialEvent]) -> None:
+        if self.closed:
+            return
+        if self._queued + len(events) > self.max_events:
+            logger.warning("moderation stream of %s too slow, closed", self.tenant_owner_id)
+            self._close()
+            return
+        self._queued += len(events)
+        self._queue.put_nowait(events)
+
+    def _close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self._queue.put_nowait(None)
+
+
+class ModerationEventBus:
+    """Fans the moderation events out to the SSE streams of this process.
+
+    A thread LISTENs on CHANNEL with a connection of its own. Each notification
+    names a tenant and the id range one transaction wrote for it; the ranges of
+    tenants with streams in this process are fetched in one query and pushed to
+    their subscriptions, so tenants nobody is watching cost nothing here.
+
+    Events go through NOTIFY even when they are written by this process:
+    notifications arrive in commit order, which is what lets a stream send ids
+    in increasing order, and they reach the streams of every worker alike.
+
+    Notifications sent while the connection is down are lost, so every
+    subscription is closed when listening fails, and those made meanwhile when
+    it resumes: clients reconnect and resume from the event log with
+    Last-Event-ID. The thread is started by the first subscription.
+    """
+
+    def __init__(self, poll_interval: float = 1.0, name: str = "moderation-events"):
+        self.poll_interval = poll_interval
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._subscriptions: dict[UUID, set[Subscription]] = defaultdict(set)
+        # Subscriptions that went on without a listener, closed once there is one
+        self._unlistened: set[Subscription] = set()
+        self._listening = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    async def subscribe(self, tenant_owner_id: UUID) -> Subscription:
+        """Register a stream; waits briefly for the listener so no event is missed."""
+        self.start()
+        subscription = Subscription(
+            tenant_owner_id, asyncio.get_running_loop(), settings.MODERATION_STREAM_QUEUE_SIZE
+        )
+        with self._lock:
+            self._subscriptions[tenant_owner_id].add(subscription)
+        if not self._listening.is_set():
+            await asyncio.to_thread(self._listening.wait, 5 * self.poll_interval)
+            with self._lock:
+                if not self._listening.is_set():
+                    self._unlistened.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._unlistened.discard(subscription)
+            subscriptions = self._subscriptions.get(subscription.tenant_owner_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.tenant_owner_id]
+
+    def publish(self, payloads: Sequence[str]) -> None:
+        """Push the events named by NOTIFY payloads to the streams of their tenants."""
+        with self._lock:
+            watched = set(self._subscriptions)
+        ranges = []
+        for payload in payloads:
+            tenant_owner_id, first_id, last_id = payload.split(":")
+            if UUID(tenant_owner_id) in watched:
+                ranges.append((UUID(tenant_owner_id), int(first_id), int(last_id)))
+        if not ranges:
+            return
+
+        with Session(engine) as db:
+            events = ModerationStreamService.fetch(db, ranges)
+        by_tenant: dict[UUID, list[TestimonialEvent]] = defaultdict(list)
+        for event in events:
+            by_tenant[event.user_id].append(event)
+        with self._lock:
+            for tenant_owner_id, tenant_events in by_tenant.items():
+                for subscription in self._subscriptions.get(tenant_owner_id, ()):
+                    subscription.push(tenant_events)
+
+    def close_all(self) -> None:
+        """Close every subscription; their clients reconnect and resume."""
+        with self._lock:
+            for subscriptions in self._subscriptions.values():
+                for subscription in subscriptions:
+                    subscription.close()
+
+    def start(self) -> None:
+        """Start the listener thread (no-op once started)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=f"{self.name}-listener", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop listening and close the streams."""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping.set()
+        thread.join(timeout)
+        self.close_all()
+        with self._lock:
+            self._thread = None
+
+    def _connect(self) -> psycopg.Connection:
+        conninfo = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        return psycopg.connect(conninfo, autocommit=True)
+
+    def _run(self) -> None:
+        delay = self.poll_interval
+        while not self._stopping.is_set():
+            try:
+                with self._connect() as conn:
+                    conn.execute(f"LISTEN {CHANNEL}")
+                    with self._lock:
+                        self._listening.set()
+                        for subscription in self._unlistened:
+                            subscription.close()
+                        self._unlistened.clear()
+                    delay = self.poll_interval
+                    while not self._stopping.is_set():
+                        notifies = list(conn.notifies(timeout=self.poll_interval, stop_after=1))
+                        if notifies:
+                            # Whatever else has arrived meanwhile is fetched in the same query
+                            notifies += conn.notifies(timeout=0)
+                            self.publish([notify.payload for notify in notifies])
+            except Exception:
+                logger.exception("%s: listener failed, reconnecting in %.0fs", self.name, delay)
+            self._listening.clear()
+            self.close_all()
+            self._stopping.wait(delay)
+            delay = min(delay * 2, 30.0)
+
+
+class ModerationStreamService:
+    @staticmethod
+    def fetch(db: SessionDep, ranges: list[tuple[UUID, int, int]]) -> list[TestimonialEvent]:
+        """Events of the given (tenant, first id, last id) ranges, in id order."""
+        rows = values(
+            column("user_id", Uuid),
+            column("first_id", BigInteger),
+            column("last_id", BigInteger),
+            name="ranges",
+        ).data(ranges)
+        return list(
+            db.exec(
+                select(TestimonialEvent)
+                .join(
+                    rows,
+                    and_(
+                        TestimonialEvent.user_id == rows.c.user_id,
+                        TestimonialEvent.id.between(rows.c.first_id, rows.c.last_id),  # type: ignore[union-attr]
+                    ),
+                )
+                .order_by(TestimonialEvent.id)  # type: ignore[arg-type]
+            ).all()
+        )
+
+    @staticmethod
+    def replay(
+        db: SessionDep, tenant_owner_id: UUID, last_event_id: int | None
+    ) -> tuple[list[TestimonialEvent], int, bool]:
+        """Events a client missed since last_event_id.
+
+        Returns the events, the id the client is caught up to once it has them,
+        and whether it must reload instead: when it missed more than
+        MODERATION_STREAM_REPLAY_LIMIT events, or last_event_id is no longer in
+        the log (pruned, or not an event of this tenant). Clients connecting
+        without last_event_id start from the latest event.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID
+            last_event_id (int | None): Last-Event-ID sent by the client
+        """
+        tenant_events = select(TestimonialEvent).where(TestimonialEvent.user_id == tenant_owner_id)
+        latest = db.exec(
+            select(func.max(TestimonialEvent.id)).where(TestimonialEvent.user_id == tenant_owner_id)
+        ).one()
+        latest = latest or 0
+        if last_event_id is None:
+            return [], latest, False
+        if last_event_id:
+            seen = db.get(TestimonialEvent, last_event_id)
+            if seen is None or seen.user_id != tenant_owner_id:
+                return [], latest, True
+
+        limit = settings.MODERATION_STREAM_REPLAY_LIMIT
+        events = list(
+            db.exec(
+                tenant_events.where(TestimonialEvent.id > last_event_id)  # type: ignore[operator]
+                .order_by(TestimonialEvent.id)  # type: ignore[arg-type]
+                .limit(limit + 1)
+            ).all()
+        )
+        if len(events) > limit:
+            return [], latest, True
+        return events, events[-1].id if events else last_event_id, False  # type: ignore[return-value]
+
+    @staticmethod
+    async def stream(tenant_owner_id: UUID, last_event_id: int | None) -> AsyncIterator[str]:
+        """Server-Sent Events of a tenant's testimonials, resumable with Last-Event-ID.
+
+        Subscribes before reading the log so nothing committed in between is
+        missed; events already replayed are skipped when they arrive live. The
+        catch-up ends with a "ready" event, or a "reset" one telling the client
+        to reload its list; both carry the id to resume from.
+
+        The stream ends after MODERATION_STREAM_MAX_SECONDS, asking the client
+        to reconnect at once: servers wait for open responses before shutting
+        down or reloading, and each reconnection checks the token again.
+        """
+        subscription = await moderation_event_bus.subscribe(tenant_owner_id)
+        try:
+            yield f"retry: {settings.MODERATION_STREAM_RETRY_MILLISECONDS}\n\n"
+
+            def replay():
+                with Session(engine) as db:
+                    return ModerationStreamService.replay(db, tenant_owner_id, last_event_id)
+
+            events, cursor, reset = await asyncio.to_thread(replay)
+            for event in events:
+                yield _event_frame(event)
+            yield _frame("reset" if reset else "ready", cursor, {})
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.MODERATION_STREAM_MAX_SECONDS
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    events = await asyncio.wait_for(
+                        subscription.get(),
+                        min(remaining, settings.MODERATION_STREAM_KEEPALIVE_SECONDS),
+                    )
+                except TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if events is None:
+                    return
+                for event in events:
+                    if event.id > cursor:  # type: ignore[operator]
+                        cursor = event.id  # type: ignore[assignment]
+                        yield _event_frame(event)
+            # Only until the next connection, which sends the usual delay again
+            yield "retry: 100\n\n"
+        finally:
+            moderation_event_bus.unsubscribe(subscription)
+
+
+moderation_event_bus = ModerationEventBus()
@@ -0,0 +1,279 @@
+import hashlib
+import json
+import logging
+import re
+from collections.abc import Iterable
+from typing import Protocol
+from uuid import UUID
+
+import httpx
+from sqlalchemy import Uuid, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import SessionDep, after_commit, engine
+from app.core.write_behind import BufferFull, WriteBehindBuffer
+from app.models.published_testimonial import PublishedTestimonial
+from app.services.changes import TestimonialChange
+
+logger = logging.getLogger(__name__)
+
+# Characters kept verbatim in a key; other product IDs are replaced by a digest,
+# since keys are space (Surrogate-Key) and comma (Cache-Tag) separated
+_PLAIN_KEY_PART = re.compile(r"[A-Za-z0-9._-]{1,100}")
+
+
+def _key_part(value: str) -> str:
+    if _PLAIN_KEY_PART.fullmatch(value):
+        return value
+    return "~" + hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+class PurgeBackend(Protocol):
+    def purge(self, keys: list[str]) -> None:
+        """Invalidate every cached response tagged with any of the keys."""
+
+
+class HTTPPurgeBackend:
+    """POSTs the keys to a purge endpoint, raising on transient failures so the batch is retried.
+
+    The keys go both as a JSON body {"tags": [...]} and as a Surrogate-Key
+    header, with the token as a bearer Authorization header. Network errors,
+    5xx and 429 responses raise; other 4xx responses (a bad token, too many
+    keys) would fail again on every retry and hold up every later purge, so
+    the batch is logged and dropped instead: its responses stay cached until
+    they expire.
+    """
+
+    def __init__(self, url: str, token: str | None = None, timeout: float = 5.0):
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+
+    def purge(self, keys: list[str]) -> None:
+        headers = {"Surrogate-Key": " ".join(keys)}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        response = httpx.post(self.url, json={"tags": keys}, headers=headers, timeout=self.timeout)
+        if response.is_server_error or response.status_code == httpx.codes.TOO_MANY_REQUESTS:
+            response.raise_for_status()
+        if response.is_client_error:
+            logger.error(
+                "Purge of %d key(s) rejected with HTTP %d, dropped: %s",
+                len(keys),
+                response.status_code,
+                response.text[:200],
+            )
+
+
+class PurgeService:
+    """Surrogate keys of public responses, and CDN purges when testimonials change.
+
+    Keys, all scoped to a tenant except the globally unique testimonial ID:
+
+        tenant:{tenant}                      every public response of the tenant
+        tenant:{tenant}:feed                 unfiltered pages
+        tenant:{tenant}:product:{product}    pages filtered by product, rating summary
+        tenant:{tenant}:category:{slug}      pages filtered by category
+        tenant:{tenant}:tag:{slug}           pages filtered by tag
+        testimonial:{id}                     the item, and every page listing it
+
+    An edit to a published testimonial purges only its own key. A change of the
+    set of pages it belongs to (publication, product, category, tags) also purges
+    the keys of those pages, before and after the change. So does a rating edit,
+    for the rating summary of the product.
+    """
+
+    @staticmethod
+    def tenant_key(tenant_owner_id: UUID) -> str:
+        return f"tenant:{tenant_owner_id}"
+
+    @staticmethod
+    def testimonial_key(testimonial_id: UUID | str) -> str:
+        return f"testimonial:{testimonial_id}"
+
+    @staticmethod
+    def membership_keys(
+        tenant_owner_id: UUID,
+        product_id: str,
+        category_slug: str | None,
+        tag_slugs: Iterable[str],
+    ) -> list[str]:
+        """Keys of the page filters a published testimonial matches."""
+        scope = PurgeService.tenant_key(tenant_owner_id)
+        keys = [f"{scope}:feed", f"{scope}:product:{_key_part(product_id)}"]
+        if category_slug:
+            keys.append(f"{scope}:category:{category_slug}")
+        keys.extend(f"{scope}:tag:{slug}" for slug in tag_slugs)
+        return keys
+
+    @staticmethod
+    def page_keys(
+        tenant_owner_id: UUID,
+        body: bytes,
+        product_id: str | None = None,
+        category_slug: str | None = None,
+        tag_slug: str | None = None,
+    ) -> list[str]:
+        """Keys of a PaginationResponse body of published testimonials.
+
+        Args:
+            tenant_owner_id (UUID): tenant owner ID
+            body (bytes): JSON body of the page
+            product_id (str | None): product filter of the page
+            category_slug (str | None): category filter of the page
+            tag_slug (str | None): tag filter of the page
+
+        Returns:
+            list[str]: tenant and filter keys, then one key per listed testimonial
+        """
+        scope = PurgeService.tenant_key(tenant_owner_id)
+        keys = [scope]
+        if product_id:
+            keys.append(f"{scope}:product:{_key_part(product_id)}")
+        if category_slug:
+            keys.append(f"{scope}:category:{category_slug}")
+        if tag_slug:
+            keys.append(f"{scope}:tag:{tag_slug}")
+        if len(keys) == 1:
+            keys.append(f"{scope}:feed")
+        keys.extend(
+            PurgeService.testimonial_key(item["id"]) for item in json.loads(body)["results"]
+        )
+        return keys
+
+    @staticmethod
+    def product_keys(tenant_owner_id: UUID, product_id: str) -> list[str]:
+        """Keys of the rating summary of a product."""
+        scope = PurgeService.tenant_key(tenant_owner_id)
+        return [scope, f"{scope}:product:{_key_part(product_id)}"]
+
+    @staticmethod
+    def item_keys(tenant_owner_id: UUID, testimonial_id: UUID) -> list[str]:
+        """Keys of the public response of one testimonial."""
+        return [
+            PurgeService.tenant_key(tenant_owner_id),
+            PurgeService.testimonial_key(testimonial_id),
+        ]
+
+    @staticmethod
+    def _published_keys(db: SessionDep, ids: list[UUID]) -> dict[UUID, set[str]]:
+        """Membership keys of the given testimonials that are in the published feed."""
+        rows = db.exec(
+            select(
+                PublishedTestimonial.id,
+                PublishedTestimonial.user_id,
+                PublishedTestimonial.product_id,
+                PublishedTestimonial.category_slug,
+                PublishedTestimonial.tag_slugs,
+            ).where(PublishedTestimonial.id == any_(bindparam("ids", ids, type_=ARRAY(Uuid))))
+        ).all()
+        return {
+            row.id: set(
+                PurgeService.membership_keys(
+                    row.user_id, row.product_id, row.category_slug, row.tag_slugs
+                )
+            )
+            for row in rows
+        }
+
+    @staticmethod
+    def apply_changes(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Queue CDN purges for writes touching published testimonials, after commit.
+
+        Must run before the published feed is updated: the current feed rows give
+        the keys of the pages the testimonials are leaving.
+
+        Args:
+            db (SessionDep): database session
+            changes (list[TestimonialChange]): writes performed in this transaction
+        """
+        if purge_backend is None:
+            return
+        touched = {
+            (change.after or change.before).id: change
+            for change in changes
+            if (change.before is not None and change.before.published)
+            or (change.after is not None and change.after.published)
+        }
+        if not touched:
+            return
+        before = PurgeService._published_keys(db, list(touched))
+        items = [
+            {
+                "id": str(testimonial_id),
+                "before": sorted(before.get(testimonial_id, ())),
+                "keys": PurgeService._rating_keys(change),
+            }
+            for testimonial_id, change in touched.items()
+        ]
+        after_commit(db, lambda: PurgeService._schedule(items))
+
+    @staticmethod
+    def _rating_keys(change: TestimonialChange) -> list[str]:
+        """Summary key of a published testimonial whose rating was edited in place."""
+        before, after = change.before, change.after
+        if before is None or after is None or before.rating == after.rating:
+            return []
+        return PurgeService.product_keys(change.tenant_owner_id, after.product_id)[1:]
+
+    @staticmethod
+    def _schedule(items: list[dict]) -> None:
+        for item in items:
+            try:
+                purge_buffer.submit(item)
+            except BufferFull:
+                logger.warning("Purge queue full: %s stays cached until it expires", item["id"])
+
+    @staticmethod
+    def flush(items: list[dict]) -> None:
+        """Send the keys of the queued testimonials to the purge backend, deduplicated.
+
+        The feed rows at flush time give the keys of the pages the testimonials
+        now belong to. Transient failures propagate, so the buffer retries the
+        whole batch (see HTTPPurgeBackend for the ones that do not).
+        """
+        backend = purge_backend
+        if backend is None:
+            return
+
+        before: dict[UUID, set[str]] = {}
+        keys: set[str] = set()
+        for item in items:
+            before.setdefault(UUID(item["id"]), set()).update(item["before"])
+            keys.update(item.get("keys", ()))
+        with Session(engine) as db:
+            after = PurgeService._published_keys(db, list(before))
+
+        for testimonial_id, previous in before.items():
+            keys.add(PurgeService.testimonial_key(testimonial_id))
+            current = after.get(testimonial_id, set())
+            if previous != current:
+                keys.update(previous, current)
+
+        ordered = sorted(keys)
+        size = settings.PURGE_BATCH_SIZE
+        for start in range(0, len(ordered), size):
+            backend.purge(ordered[start : start + size])
+
+
+def _configured_backend() -> PurgeBackend | None:
+    if not settings.PURGE_URL:
+        return None
+    return HTTPPurgeBackend(
+        settings.PURGE_URL, settings.PURGE_TOKEN, settings.PURGE_TIMEOUT_SECONDS
+    )
+
+
+# Replace to plug in another CDN client; None disables purging
+purge_backend: PurgeBackend | None = _configured_backend()
+
+# Coalesces the purges of bursts (e.g. bulk moderation) into few requests, off the request path
+purge_buffer = WriteBehindBuffer(
+    PurgeService.flush,
+    max_items=10_000,
+    batch_size=1000,
+    flush_interval=0.5,
+    name="purge",
+)
@@ -0,0 +1,139 @@
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy import and_, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+
+from app.core.db import SessionDep, before_commit
+from app.models.product_rating_summary import ProductRatingSummary
+from app.models.testimonial import StatusType, Testimonial
+from app.schemas.testimonial import ProductRatingSummaryResponse
+from app.services.changes import TestimonialChange, TestimonialState
+
+RATINGS = range(1, 6)
+_COUNTERS = ("review_count", "rating_sum", *(f"rating_{rating}" for rating in RATINGS))
+
+
+def _rated(state: TestimonialState | None) -> bool:
+    return state is not None and state.published and state.rating in RATINGS
+
+
+class RatingSummaryService:
+    @staticmethod
+    def apply_changes(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Queue testimonial changes for the per-product rating summaries.
+
+        The summaries are written by _write_summaries right before the
+        caller's transaction commits, so their row locks are not held for the
+        rest of it.
+
+        Args:
+            db (SessionDep): database session
+            changes (list[TestimonialChange]): writes performed in this transaction
+        """
+        before_commit(db, RatingSummaryService._write_summaries).extend(changes)
+
+    @staticmethod
+    def _write_summaries(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Apply the rating deltas of a transaction's changes with one upsert.
+
+        Only published testimonials with a 1 to 5 rating count. Rows are
+        upserted in (user_id, product_id) order so that transactions touching
+        the same products in a different order cannot deadlock.
+        """
+        deltas: dict[tuple[UUID, str], Counter[str]] = {}
+        for change in changes:
+            for state, sign in ((change.before, -1), (change.after, 1)):
+                if not _rated(state):
+                    continue
+                delta = deltas.setdefault((change.tenant_owner_id, state.product_id), Counter())
+                delta["review_count"] += sign
+                delta["rating_sum"] += sign * state.rating
+                delta[f"rating_{state.rating}"] += sign
+
+        rows = [
+            {"user_id": tenant, "product_id": product_id, **{c: delta[c] for c in _COUNTERS}}
+            for (tenant, product_id), delta in sorted(deltas.items())
+            if any(delta.values())
+        ]
+        if not rows:
+            return
+        stmt = insert(ProductRatingSummary).values(rows)
+        db.exec(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "product_id"],
+                set_={
+                    column: getattr(ProductRatingSummary, column) + stmt.excluded[column]
+                    for column in _COUNTERS
+                },
+            )
+        )
+
+    @staticmethod
+    def rebuild(db: SessionDep, tenant_owner_id: UUID | None = None) -> None:
+        """Recompute the summaries of one tenant, or of every tenant, from the testimonials.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID | None): tenant to rebuild; all tenants when None
+        """
+        stale = delete(ProductRatingSummary)
+        criteria = [
+            Testimonial.user_id.is_not(None),  # type: ignore
+            Testimonial.status == StatusType.APPROVED,
+            Testimonial.is_active.is_(True),  # type: ignore
+            Testimonial.rating.between(RATINGS.start, RATINGS.stop - 1),  # type: ignore
+        ]
+        if tenant_owner_id is not None:
+            stale = stale.where(ProductRatingSummary.user_id == tenant_owner_id)
+            criteria.append(Testimonial.user_id == tenant_owner_id)
+
+        buckets = [
+            func.count().filter(Testimonial.rating == rating).label(f"rating_{rating}")
+            for rating in RATINGS
+        ]
+        summaries = (
+            select(
+                Testimonial.user_id,
+                Testimonial.product_id,
+                func.count().label("review_count"),
+                func.sum(Testimonial.rating).label("rating_sum"),
+                *buckets,
+            )
+            .where(and_(*criteria))
+            .group_by(Testimonial.user_id, Testimonial.product_id)
+        )
+        db.exec(stale)
+        db.exec(
+            insert(ProductRatingSummary).from_select(
+                ["user_id", "product_id", *_COUNTERS], summaries
+            )
+        )
+        db.commit()
+
+    @staticmethod
+    def get_summary(
+        db: SessionDep, tenant_owner_id: UUID, product_id: str
+    ) -> ProductRatingSummaryResponse:
+        """Rating summary of a product: one primary key lookup, zeros if it has no reviews.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID
+            product_id (str): product ID
+
+        Returns:
+            ProductRatingSummaryResponse: review count, average and histogram
+        """
+        summary = db.get(ProductRatingSummary, (tenant_owner_id, product_id))
+        if summary is None:
+            summary = ProductRatingSummary(user_id=tenant_owner_id, product_id=product_id)
+        return ProductRatingSummaryResponse(
+            product_id=product_id,
+            review_count=summary.review_count,
+            average_rating=round(summary.rating_sum / summary.review_count, 2)
+            if summary.review_count
+            else None,
+            histogram={rating: getattr(summary, f"rating_{rating}") for rating in RATINGS},
+        )
@@ -0,0 +1,134 @@
+from collections.abc import Callable
+
+from sqlalchemy import String, Text, case, cast, literal, literal_column, null
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlmodel import func, or_, select
+
+from app.models.category import Category
+from app.models.tag import Tag
+from app.models.testimonial_tag_link import TestimonialTagLink
+
+
+def iso_utc(column):
+    """Format a timestamptz column the way pydantic serializes UTC datetimes.
+
+    Pydantic prints six fractional digits, or none when microseconds are 0.
+    """
+    utc = func.timezone("UTC", column)
+    return case(
+        (
+            func.extract("microseconds", utc) % 1_000_000 == 0,
+            func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+        ),
+        else_=func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"'),
+    )
+
+
+def _non_empty(column):
+    return func.coalesce(column, "") != ""
+
+
+def testimonial_json(rows):
+    """JSON object for each testimonial in `rows`, mirroring TestimonialResponse.to_response."""
+    category = (
+        select(func.nullif(Category.name, ""))
+        .where(Category.id == rows.c.category_id)
+        .scalar_subquery()
+    )
+    tag_names = (
+        select(func.json_agg(aggregate_order_by(Tag.name, Tag.name)))
+        .join(TestimonialTagLink, TestimonialTagLink.tag_id == Tag.id)  # type: ignore
+        .where(TestimonialTagLink.testimonial_id == rows.c.id)
+        .scalar_subquery()
+    )
+    image_count = case(
+        (
+            func.json_typeof(rows.c.image_url) == "array",
+            func.json_array_length(rows.c.image_url),
+        ),
+        else_=0,
+    )
+
+    return func.json_build_object(
+        "id", rows.c.id,
+        "status", func.lower(cast(rows.c.status, String)),
+        "product", func.json_build_object("id", rows.c.product_id, "name", rows.c.product_name),
+        "content", case(
+            (
+                or_(
+                    _non_empty(rows.c.title),
+                    _non_empty(rows.c.content),
+                    func.coalesce(rows.c.rating, 0) != 0,
+                    _non_empty(rows.c.author_name),
+                ),
+                func.json_build_object(
+                    "title", rows.c.title,
+                    "content", rows.c.content,
+                    "rating", rows.c.rating,
+                    "author_name", rows.c.author_name,
+                ),
+            ),
+            else_=null(),
+        ),
+        "media", case(
+            (
+                or_(_non_empty(rows.c.youtube_url), image_count > 0),
+                func.json_build_object(
+                    "youtube_url", rows.c.youtube_url,
+                    "image_url", rows.c.image_url,
+                ),
+            ),
+            else_=null(),
+        ),
+        "category", category,
+        "tags", tag_names,
+        "created_at", iso_utc(rows.c.created_at),
+        "updated_at", iso_utc(rows.c.updated_at),
+    )  # fmt: skip
+
+
+def paginated_json(
+    query,
+    skip: int,
+    limit: int,
+    item: Callable,
+    order_by: Callable,
+):
+    """Statement rendering one page of query as a PaginationResponse JSON document.
+
+    Args:
+        query (Select): unordered and unpaginated rows
+        skip (int): number of items to skip
+        limit (int): number of items to retrieve
+        item (Callable): builds the JSON value of a row from the page subquery
+        order_by (Callable): builds the sort keys from the page subquery
+
+    Returns:
+        Select: one row with the JSON document as text
+    """
+    # Inlined into both uses, so the page can be an index range scan and the
+    # count an index-only scan instead of materializing every matching row
+    filtered = query.cte("filtered").prefix_with("NOT MATERIALIZED")
+
+    page = select(filtered).order_by(*order_by(filtered)).offset(skip).limit(limit).subquery("page")
+
+    results = select(
+        func.coalesce(
+            func.json_agg(aggregate_order_by(item(page), *order_by(page))),
+            literal_column("'[]'::json"),
+        )
+    ).scalar_subquery()
+    totals = select(func.count().label("total_items")).select_from(filtered).cte("totals")
+    total_items = totals.c.total_items
+
+    envelope = func.json_build_object(
+        "total_items", total_items,
+        "page", skip // limit + 1,
+        "size", limit,
+        "total_pages", (total_items + limit - 1) // limit,
+        "has_next", total_items > skip + limit,
+        "has_prev", literal(skip > 0),
+        "results", results,
+    )  # fmt: skip
+
+    return select(cast(envelope, Text)).select_from(totals)
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from uuid import UUID
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import SessionDep, after_commit, engine
+from app.core.write_behind import BufferFull, WriteBehindBuffer
+from app.models.abstract import get_utc_now
+from app.services.changes import TestimonialChange
+from app.services.feed import FeedService
+
+logger = logging.getLogger(__name__)
+
+# Shard of the whole tenant feed, as opposed to the one of a single product
+ALL_PRODUCTS = None
+
+# Product IDs usable verbatim as a directory name and URL segment
+_PLAIN_PRODUCT_ID = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9._-]{0,99}")
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    """Write through a temporary file renamed over path: readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _page_document(bodies: list[str], page: int, size: int, total_items: int) -> str:
+    """PaginationResponse JSON around already rendered bodies, without re-serializing them."""
+    total_pages = (total_items + size - 1) // size
+    envelope = json.dumps(
+        {
+            "total_items": total_items,
+            "page": page,
+            "size": size,
+            "total_pages": total_pages,
+            "has_next": page < total_pages,
+            "has_prev": page > 1,
+        }
+    )
+    return f'{envelope[:-1]}, "results": [{",".join(bodies)}]}}'
+
+
+def _pages(bodies: Iterator[str], size: int) -> Iterator[list[str]]:
+    page: list[str] = []
+    for body in bodies:
+        page.append(body)
+        if len(page) == size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+class SnapshotService:
+    """Pre-rendered JSON files of the public feed, for a static server or CDN.
+
+    Layout under SNAPSHOT_DIR, pages numbered from 1 like the public API:
+
+        {tenant}/manifest.json
+        {tenant}/all/page-{n}.json
+        {tenant}/products/{product dir}/page-{n}.json
+
+    The product dir is the product ID itself when it is a plain name, else a
+    "~"-prefixed digest of it: percent-escaped names are decoded differently by
+    servers and CDNs. The manifest maps every product ID to its shard path.
+    An empty shard still has a page-1.json, so widgets never get a 404.
+    """
+
+    @staticmethod
+    def tenant_dir(root: Path, tenant_owner_id: UUID) -> Path:
+        return root / str(tenant_owner_id)
+
+    @staticmethod
+    def shard_path(product_id: str | None) -> str:
+        """Path of a shard relative to its tenant directory."""
+        if product_id is ALL_PRODUCTS:
+            return "all"
+        if _PLAIN_PRODUCT_ID.fullmatch(product_id):
+            return f"products/{product_id}"
+        return f"products/~{hashlib.sha256(product_id.encode()).hexdigest()[:32]}"
+
+    @staticmethod
+    def write_shard(
+        db: SessionDep,
+        root: Path,
+        tenant_owner_id: UUID,
+        product_id: str | None,
+        total_items: int,
+    ) -> None:
+        """Rewrite every page file of one shard and drop pages past the new end.
+
+        Args:
+            db (SessionDep): database session
+            root (Path): snapshot directory
+            tenant_owner_id (UUID): tenant owner ID
+            product_id (str | None): product of the shard, ALL_PRODUCTS for the whole feed
+            total_items (int): published testimonials in the shard
+        """
+        size = settings.SNAPSHOT_PAGE_SIZE
+        shard = SnapshotService.tenant_dir(root, tenant_owner_id) / SnapshotService.shard_path(
+            product_id
+        )
+        bodies = FeedService.iter_bodies(db, tenant_owner_id, product_id, batch_size=size * 20)
+
+        pages = 0
+        for pages, page in enumerate(_pages(bodies, size), start=1):
+            _write_atomic(
+                shard / f"page-{pages}.json", _page_document(page, pages, size, total_items)
+            )
+        if pages == 0:
+            _write_atomic(shard / "page-1.json", _page_document([], 1, size, 0))
+            pages = 1
+
+        for path in shard.glob("page-*.json"):
+            number = path.stem.removeprefix("page-")
+            if not number.isdigit() or int(number) > pages:
+                path.unlink(missing_ok=True)
+
+    @staticmethod
+    def write_manifest(root: Path, tenant_owner_id: UUID, counts: dict[str, int]) -> None:
+        """Index of the shards of a tenant with their page counts."""
+        size = settings.SNAPSHOT_PAGE_SIZE
+
+        def shard(product_id: str | None, total_items: int) -> dict:
+            return {
+                "path": SnapshotService.shard_path(product_id),
+                "total_items": total_items,
+                "total_pages": max(1, (total_items + size - 1) // size),
+            }
+
+        manifest = {
+            "generated_at": get_utc_now().isoformat(),
+            "size": size,
+            "all": shard(ALL_PRODUCTS, sum(counts.values())),
+            "products": {
+                product_id: shard(product_id, count) for product_id, count in sorted(counts.items())
+            },
+        }
+        _write_atomic(
+            SnapshotService.tenant_dir(root, tenant_owner_id) / "manifest.json",
+            json.dumps(manifest),
+        )
+
+    @staticmethod
+    def regenerate(
+        db: SessionDep,
+        root: Path,
+        tenant_owner_id: UUID,
+        product_ids: Iterable[str] | None = None,
+    ) -> None:
+        """Rewrite the whole-feed shard, the given product shards and the manifest of a tenant.
+
+        With product_ids None every shard of the tenant is rewritten and the
+        directories of products without published testimonials are removed.
+
+        Args:
+            db (SessionDep): database session
+            root (Path): snapshot directory
+            tenant_owner_id (UUID): tenant owner ID
+            product_ids (Iterable[str] | None): products whose shards changed; all when None
+        """
+        # One snapshot for the counts and every page: files agree with each other
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        counts = FeedService.count_by_product(db, tenant_owner_id)
+
+        full = product_ids is None
+        products = set(counts) if full else set(product_ids)
+        SnapshotService.write_shard(db, root, tenant_owner_id, ALL_PRODUCTS, sum(counts.values()))
+        for product_id in products:
+            SnapshotService.write_shard(
+                db, root, tenant_owner_id, product_id, counts.get(product_id, 0)
+            )
+        SnapshotService.write_manifest(root, tenant_owner_id, counts)
+
+        if full:
+            products_dir = SnapshotService.tenant_dir(root, tenant_owner_id) / "products"
+            keep = {SnapshotService.shard_path(product_id) for product_id in products}
+            for path in products_dir.glob("*"):
+                if f"products/{path.name}" not in keep:
+                    shutil.rmtree(path, ignore_errors=True)
+        db.rollback()
+
+    @staticmethod
+    def rebuild(db: SessionDep, root: Path, tenant_owner_id: UUID | None = None) -> int:
+        """Regenerate the snapshots of one tenant, or of every tenant with published testimonials.
+
+        Rebuilding every tenant also removes the directories of tenants that no
+        longer have any.
+
+        Returns:
+            int: number of tenants written
+        """
+        if tenant_owner_id is not None:
+            SnapshotService.regenerate(db, root, tenant_owner_id)
+            return 1
+
+        tenants = FeedService.get_tenants(db)
+        # Each tenant is then written from its own repeatable-read transaction
+        db.rollback()
+        for tenant in tenants:
+            SnapshotService.regenerate(db, root, tenant)
+        current = {str(tenant) for tenant in tenants}
+        for path in root.glob("*"):
+            if path.is_dir() and path.name not in current:
+                shutil.rmtree(path, ignore_errors=True)
+        return len(tenants)
+
+    @staticmethod
+    def apply_changes(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Queue the shards touched by published testimonials for regeneration after commit.
+
+        Args:
+            db (SessionDep): database session
+            changes (list[TestimonialChange]): writes performed in this transaction
+        """
+        if not settings.SNAPSHOT_DIR:
+            return
+        shards = {
+            (str(change.tenant_owner_id), state.product_id)
+            for change in changes
+            if (change.before is not None and change.before.published)
+            or (change.after is not None and change.after.published)
+            for state in (change.before, change.after)
+            if state is not None
+        }
+        if shards:
+            after_commit(db, lambda: SnapshotService._schedule(shards))
+
+    @staticmethod
+    def _schedule(shards: set[tuple[str, str]]) -> None:
+        for tenant, product_id in shards:
+            try:
+                snapshot_buffer.submit({"tenant_owner_id": tenant, "product_id": product_id})
+            except BufferFull:
+                logger.warning(
+                    "Snapshot queue full: %s/%s stays stale until the next rebuild",
+                    tenant,
+                    product_id,
+                )
+
+    @staticmethod
+    def flush(items: list[dict]) -> None:
+        """Regenerate the queued shards, once per tenant and product however often queued."""
+        products: dict[UUID, set[str]] = {}
+        for item in items:
+            products.setdefault(UUID(item["tenant_owner_id"]), set()).add(item["product_id"])
+
+        root = Path(settings.SNAPSHOT_DIR)
+        for tenant_owner_id, product_ids in products.items():
+            with Session(engine) as db:
+                SnapshotService.regenerate(db, root, tenant_owner_id, product_ids)
+
+
+# Coalesces bursts (e.g. bulk moderation) into one regeneration per shard, off the request path
+snapshot_buffer = WriteBehindBuffer(
+    SnapshotService.flush,
+    max_items=10_000,
+    batch_size=1000,
+    flush_interval=0.5,
+    name="snapshot",
+)
@@ -0,0 +1,260 @@
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy import and_, delete, exists, func, or_, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import SQLModel, select
+
+from app.core.db import SessionDep, before_commit
+from app.models.tenant_usage import (
+    LISTING_VERSION,
+    TenantCategoryUsage,
+    TenantTagUsage,
+    TenantTestimonialStats,
+)
+from app.models.testimonial import StatusType, Testimonial
+from app.models.testimonial_tag_link import TestimonialTagLink
+from app.schemas.testimonial import TestimonialStatsResponse
+from app.services.category import CategoryService
+from app.services.changes import TestimonialChange
+from app.services.rating_summary import RATINGS
+from app.services.tag import TagService
+
+_COUNTERS = (
+    "pending_count",
+    "approved_count",
+    "rejected_count",
+    "uncategorized_count",
+    "rating_count",
+    "rating_sum",
+)
+
+
+def _reconcile_table(
+    db: SessionDep,
+    model: type[SQLModel],
+    keys: tuple[str, ...],
+    counters: tuple[str, ...],
+    fresh,
+    tenant_owner_id: UUID | None,
+) -> set[UUID]:
+    """Make a counters table match a fresh aggregate, returning the tenants it corrected.
+
+    Rows missing from the aggregate are deleted unless they are already all
+    zeros; rows in it are upserted only where a counter differs.
+    """
+    table = model.__table__  # type: ignore[attr-defined]
+    computed = fresh.subquery()
+
+    stale = delete(table).where(
+        ~exists().where(and_(*(computed.c[key] == table.c[key] for key in keys))),
+        or_(*(table.c[counter] != 0 for counter in counters)),
+    )
+    if tenant_owner_id is not None:
+        stale = stale.where(table.c.user_id == tenant_owner_id)
+    removed = db.exec(stale.returning(table.c.user_id)).scalars().all()  # type: ignore[call-overload]
+
+    upsert = insert(table).from_select([*keys, *counters], fresh)
+    columns = [*keys, *counters]
+    corrected = (
+        db.exec(
+            upsert.on_conflict_do_update(  # type: ignore[call-overload]
+                index_elements=list(keys),
+                set_={counter: upsert.excluded[counter] for counter in counters},
+                where=tuple_(*(table.c[c] for c in columns)).is_distinct_from(
+                    tuple_(*(upsert.excluded[c] for c in columns))
+                ),
+            ).returning(table.c.user_id)
+        )
+        .scalars()
+        .all()
+    )
+    return {*removed, *corrected}
+
+
+class StatsService:
+    @staticmethod
+    def apply_changes(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Queue testimonial changes for the per-tenant dashboard counters.
+
+        The counters are written by _write_counters right before the caller's
+        transaction commits: the stats row of a tenant is shared by all of its
+        writes, so its lock is taken as late as possible.
+
+        Args:
+            db (SessionDep): database session
+            changes (list[TestimonialChange]): writes performed in this transaction
+        """
+        before_commit(db, StatsService._write_counters).extend(changes)
+
+    @staticmethod
+    def _write_counters(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Apply the counter deltas of a transaction's changes with one upsert.
+
+        Only active testimonials are counted. Every tenant written to also gets
+        a new listing_version, even when its counters stay the same, so cached
+        listings are invalidated exactly when this commits. Rows are upserted
+        in tenant order so that transactions writing several tenants cannot
+        deadlock.
+        """
+        deltas: dict[UUID, Counter[str]] = {}
+        for change in changes:
+            deltas.setdefault(change.tenant_owner_id, Counter())
+            for state, sign in ((change.before, -1), (change.after, 1)):
+                if state is None or not state.is_active:
+                    continue
+                delta = deltas[change.tenant_owner_id]
+                delta[f"{state.status.value}_count"] += sign
+                if state.category_id is None:
+                    delta["uncategorized_count"] += sign
+                if state.rating in RATINGS:
+                    delta["rating_count"] += sign
+                    delta["rating_sum"] += sign * state.rating
+
+        if not deltas:
+            return
+        rows = [
+            {
+                "user_id": tenant,
+                **{counter: delta[counter] for counter in _COUNTERS},
+                "listing_version": LISTING_VERSION.next_value(),
+            }
+            for tenant, delta in sorted(deltas.items())
+        ]
+        stmt = insert(TenantTestimonialStats).values(rows)
+        db.exec(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    **{
+                        counter: getattr(TenantTestimonialStats, counter) + stmt.excluded[counter]
+                        for counter in _COUNTERS
+                    },
+                    "listing_version": stmt.excluded.listing_version,
+                },
+            )
+        )
+
+    @staticmethod
+    def get_stats(
+        db: SessionDep, tenant_owner_id: UUID, categories_limit: int = 10
+    ) -> TestimonialStatsResponse:
+        """Dashboard summary of a tenant, read from the counters instead of counting testimonials.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID
+            categories_limit (int): number of categories to include, most used first
+
+        Returns:
+            TestimonialStatsResponse: counts by status, average rating and category totals
+        """
+        stats = db.get(TenantTestimonialStats, tenant_owner_id)
+        if stats is None:
+            stats = TenantTestimonialStats(user_id=tenant_owner_id)
+        categories, _ = CategoryService.get_tenant_categories(
+            db, tenant_owner_id, 0, categories_limit
+        )
+        return TestimonialStatsResponse(
+            total=stats.pending_count + stats.approved_count + stats.rejected_count,
+            pending=stats.pending_count,
+            approved=stats.approved_count,
+            rejected=stats.rejected_count,
+            average_rating=round(stats.rating_sum / stats.rating_count, 2)
+            if stats.rating_count
+            else None,
+            uncategorized=stats.uncategorized_count,
+            categories=categories,
+        )
+
+    @staticmethod
+    def reconcile(db: SessionDep, tenant_owner_id: UUID | None = None) -> dict[str, int]:
+        """Recompute the dashboard and usage counters from the testimonials, fixing any drift.
+
+        The counter tables are locked against writers for the duration, in the
+        order the write paths upsert them, so a testimonial write either commits
+        before the recount sees it or applies its delta on top of the result.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID | None): tenant to reconcile; all tenants when None
+
+        Returns:
+            dict[str, int]: number of corrected tenants per counters table
+        """
+        db.exec(
+            text(
+                f"LOCK TABLE {TenantTagUsage.__tablename__}, "
+                f"{TenantCategoryUsage.__tablename__}, "
+                f"{TenantTestimonialStats.__tablename__} IN SHARE ROW EXCLUSIVE MODE"
+            )
+        )
+
+        criteria = [
+            Testimonial.user_id.is_not(None),  # type: ignore
+            Testimonial.is_active.is_(True),  # type: ignore
+        ]
+        if tenant_owner_id is not None:
+            criteria.append(Testimonial.user_id == tenant_owner_id)
+        rated = Testimonial.rating.between(RATINGS.start, RATINGS.stop - 1)  # type: ignore
+
+        stats = (
+            select(
+                Testimonial.user_id,
+                *(
+                    func.count().filter(Testimonial.status == status).label(f"{status.value}_count")
+                    for status in StatusType
+                ),
+                func.count()
+                .filter(Testimonial.category_id.is_(None))  # type: ignore
+                .label("uncategorized_count"),
+                func.count().filter(rated).label("rating_count"),
+                func.coalesce(func.sum(Testimonial.rating).filter(rated), 0).label("rating_sum"),
+            )
+            .where(*criteria)
+            .group_by(Testimonial.user_id)
+        )
+        categories = (
+            select(
+                Testimonial.user_id,
+                Testimonial.category_id,
+                func.count().label("usage_count"),
+            )
+            .where(*criteria, Testimonial.category_id.is_not(None))  # type: ignore
+            .group_by(Testimonial.user_id, Testimonial.category_id)
+        )
+        tags = (
+            select(
+                Testimonial.user_id,
+                TestimonialTagLink.tag_id,
+                func.count().label("usage_count"),
+            )
+            .join(TestimonialTagLink, TestimonialTagLink.testimonial_id == Testimonial.id)  # type: ignore
+            .where(*criteria)
+            .group_by(Testimonial.user_id, TestimonialTagLink.tag_id)
+        )
+
+        tag_tenants = _reconcile_table(
+            db, TenantTagUsage, ("user_id", "tag_id"), ("usage_count",), tags, tenant_owner_id
+        )
+        category_tenants = _reconcile_table(
+            db,
+            TenantCategoryUsage,
+            ("user_id", "category_id"),
+            ("usage_count",),
+            categories,
+            tenant_owner_id,
+        )
+        stats_tenants = _reconcile_table(
+            db, TenantTestimonialStats, ("user_id",), _COUNTERS, stats, tenant_owner_id
+        )
+        db.commit()
+
+        TagService.invalidate_catalog(tag_tenants)
+        TagService.invalidate_suggestions(tag_tenants)
+        CategoryService.invalidate_catalog(category_tenants)
+        return {
+            TenantTagUsage.__tablename__: len(tag_tenants),
+            TenantCategoryUsage.__tablename__: len(category_tenants),
+            TenantTestimonialStats.__tablename__: len(stats_tenants),
+        }
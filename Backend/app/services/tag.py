@@ -1,24 +1,73 @@
-from sqlmodel import select
+import time
+from collections.abc import Iterable, Mapping
+from uuid import UUID, uuid4
 
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import func, select
+
+from app.core.cache import CachedBody, ResponseCache
+from app.core.config import settings
 from app.core.db import SessionDep
 from app.models.tag import Tag
+from app.models.tenant_usage import TenantTagUsage
+from app.schemas.pagination import CatalogSort, PaginationResponse
+from app.schemas.tag import TagUsageResponse
+from app.utils.prefix_index import IndexEntry, PrefixIndex
 from app.utils.validators.slug import generate_slug
 
+_catalog_cache = ResponseCache(ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
+
+# Per-tenant autocomplete indexes: tenant id -> (index, expires_at)
+_suggest_indexes: dict[UUID, tuple[PrefixIndex, float]] = {}
+
 
 class TagService:
     @staticmethod
     def get_or_create_tags(tag_names: list[str], db: SessionDep) -> list[Tag]:
-        tags = []
+        """Resolve tag names to tags, creating the missing ones in bulk.
+
+        One SELECT ... WHERE slug IN (...) finds the existing tags and one
+        INSERT ... ON CONFLICT DO NOTHING RETURNING creates the rest. Nothing is
+        committed: the caller's transaction decides. Tags inserted concurrently by
+        another transaction are picked up by a final SELECT.
+
+        Args:
+            tag_names (list[str]): tag names as typed by the user
+            db (SessionDep): database session
+        Returns:
+            list[Tag]: one tag per distinct slug, in input order
+        """
+        names_by_slug: dict[str, str] = {}
         for name in tag_names:
-            slug = generate_slug(name)
-            tag = db.exec(select(Tag).where(Tag.slug == slug)).first()
-            if not tag:
-                tag = Tag(name=name.strip().lower(), slug=slug)
-                db.add(tag)
-                db.commit()
-                db.refresh(tag)
-            tags.append(tag)
-        return tags
+            names_by_slug.setdefault(generate_slug(name), name.strip().lower())
+        if not names_by_slug:
+            return []
+
+        tags_by_slug = {
+            tag.slug: tag
+            for tag in db.exec(select(Tag).where(Tag.slug.in_(names_by_slug))).all()  # type: ignore
+        }
+
+        missing = [slug for slug in names_by_slug if slug not in tags_by_slug]
+        if missing:
+            created = db.exec(
+                insert(Tag)
+                .values(
+                    [{"id": uuid4(), "name": names_by_slug[slug], "slug": slug} for slug in missing]
+                )
+                .on_conflict_do_nothing()
+                .returning(Tag)
+            ).scalars()
+            tags_by_slug.update((tag.slug, tag) for tag in created)
+
+            raced = [slug for slug in missing if slug not in tags_by_slug]
+            if raced:
+                tags_by_slug.update(
+                    (tag.slug, tag)
+                    for tag in db.exec(select(Tag).where(Tag.slug.in_(raced))).all()  # type: ignore
+                )
+
+        return [tags_by_slug[slug] for slug in names_by_slug]
 
     @staticmethod
     def get_all_tags(db: SessionDep) -> list[Tag]:
@@ -31,3 +80,149 @@ class TagService:
         """
         tags = db.exec(select(Tag)).all()
         return list(tags)
+
+    @staticmethod
+    def get_tenant_tags(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        skip: int,
+        limit: int,
+        sort: CatalogSort = CatalogSort.POPULAR,
+    ) -> tuple[list[TagUsageResponse], int]:
+        """Retrieve the tags used by a tenant with their usage counts.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID for filtering
+            skip (int): number of items to skip
+            limit (int): number of items to retrieve
+            sort (CatalogSort): most used first, or alphabetical
+        Returns:
+            tuple[list[TagUsageResponse], int]: page of tags and total count
+        """
+        filters = [TenantTagUsage.user_id == tenant_owner_id, TenantTagUsage.usage_count > 0]
+
+        total_items = db.exec(
+            select(func.count()).select_from(TenantTagUsage).where(*filters)
+        ).one()
+
+        if sort == CatalogSort.POPULAR:
+            order_by = (TenantTagUsage.usage_count.desc(), Tag.name)  # type: ignore
+        else:
+            order_by = (Tag.name,)
+
+        rows = db.exec(
+            select(Tag.id, Tag.name, Tag.slug, Tag.created_at, TenantTagUsage.usage_count)
+            .join(TenantTagUsage, TenantTagUsage.tag_id == Tag.id)  # type: ignore
+            .where(*filters)
+            .order_by(*order_by)
+            .offset(skip)
+            .limit(limit)
+        ).all()
+
+        return [TagUsageResponse(**row._asdict()) for row in rows], total_items
+
+    @staticmethod
+    def get_catalog(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        skip: int,
+        limit: int,
+        sort: CatalogSort = CatalogSort.POPULAR,
+    ) -> CachedBody:
+        """Get a serialized page of the tenant tag catalog, querying only on a cache miss.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID for filtering
+            skip (int): number of items to skip
+            limit (int): number of items to retrieve
+            sort (CatalogSort): most used first, or alphabetical
+        Returns:
+            CachedBody: JSON body of PaginationResponse[TagUsageResponse] and its ETag
+        """
+
+        def build() -> bytes:
+            tags, total_items = TagService.get_tenant_tags(db, tenant_owner_id, skip, limit, sort)
+            return (
+                PaginationResponse[TagUsageResponse](
+                    total_items=total_items,
+                    results=tags,
+                    page=skip // limit + 1,
+                    size=limit,
+                    total_pages=(total_items + limit - 1) // limit,
+                    has_next=(skip + limit) < total_items,
+                    has_prev=skip > 0,
+                )
+                .model_dump_json()
+                .encode()
+            )
+
+        return _catalog_cache.get_or_set(tenant_owner_id, (skip, limit, sort), build)
+
+    @staticmethod
+    def invalidate_catalog(tenant_owner_ids: Iterable[UUID]) -> None:
+        """Drop the cached catalog pages of the given tenants."""
+        for tenant_owner_id in tenant_owner_ids:
+            _catalog_cache.invalidate(tenant_owner_id)
+
+    @staticmethod
+    def suggest_tags(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        q: str,
+        limit: int = 10,
+    ) -> list[IndexEntry]:
+        """Autocomplete tag names from the tenant's in-memory prefix index.
+
+        The index is loaded on first use (and after its TTL) with a single
+        query; lookups after that never touch the database.
+
+        Args:
+            db (SessionDep): database session, only used to load the index
+            tenant_owner_id (UUID): tenant owner ID
+            q (str): text typed by the user
+            limit (int): maximum number of suggestions
+        Returns:
+            list[IndexEntry]: matching tags, most used first
+        """
+        prefix = generate_slug(q)
+        if not prefix:
+            return []
+        return TagService._get_suggest_index(db, tenant_owner_id).search(prefix, limit)
+
+    @staticmethod
+    def _get_suggest_index(db: SessionDep, tenant_owner_id: UUID) -> PrefixIndex:
+        cached = _suggest_indexes.get(tenant_owner_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
+        rows = db.exec(
+            select(Tag.id, Tag.name, Tag.slug, TenantTagUsage.usage_count)
+            .join(TenantTagUsage, TenantTagUsage.tag_id == Tag.id)  # type: ignore
+            .where(TenantTagUsage.user_id == tenant_owner_id, TenantTagUsage.usage_count > 0)
+        ).all()
+        index = PrefixIndex([IndexEntry(*row) for row in rows])
+        _suggest_indexes[tenant_owner_id] = (
+            index,
+            time.monotonic() + settings.CATALOG_CACHE_TTL_SECONDS,
+        )
+        return index
+
+    @staticmethod
+    def apply_usage_deltas(deltas: Mapping[tuple[UUID, UUID], int]) -> None:
+        """Apply committed (tenant id, tag id) usage deltas to the loaded indexes.
+
+        A tag the index has never seen drops that tenant's index, which is then
+        reloaded on the next suggestion.
+        """
+        for (tenant_owner_id, tag_id), delta in deltas.items():
+            cached = _suggest_indexes.get(tenant_owner_id)
+            if cached and not cached[0].increment(tag_id, delta):
+                _suggest_indexes.pop(tenant_owner_id, None)
+
+    @staticmethod
+    def invalidate_suggestions(tenant_owner_ids: Iterable[UUID]) -> None:
+        """Drop the suggestion indexes of the given tenants, reloaded on next use."""
+        for tenant_owner_id in tenant_owner_ids:
+            _suggest_indexes.pop(tenant_owner_id, None)
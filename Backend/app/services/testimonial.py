@@ -1,68 +1,240 @@
-from uuid import UUID
+import csv
+import io
+import json
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+from uuid import UUID, uuid4
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import selectinload
+from pydantic import ValidationError
+from sqlalchemy import (
+    Row,
+    String,
+    Text,
+    Uuid,
+    any_,
+    bindparam,
+    cast,
+    delete,
+    literal_column,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert
+from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import func, or_, select
 
-from app.core.db import SessionDep
+from app.core.cache import CachedBody, ResponseCache
+from app.core.config import settings
+from app.core.db import SessionDep, after_commit
+from app.models.abstract import get_utc_now
 from app.models.category import Category
 from app.models.tag import Tag
+from app.models.tenant_usage import TenantTestimonialStats
 from app.models.testimonial import StatusType, Testimonial
-from app.schemas.testimonial import TestimonialCreate, TestimonialUpdate
+from app.models.testimonial_tag_link import TestimonialTagLink
+from app.schemas.testimonial import (
+    BulkModerationAction,
+    BulkModerationItem,
+    BulkModerationOutcome,
+    ExportFormat,
+    ImportLineError,
+    TestimonialBulkModeration,
+    TestimonialBulkModerationResponse,
+    TestimonialCreate,
+    TestimonialImportResponse,
+    TestimonialResponse,
+    TestimonialUpdate,
+)
+from app.services.analytics import AnalyticsService
 from app.services.category import CategoryService
+from app.services.changes import TestimonialChange, TestimonialState
+from app.services.event_log import EventLogService
+from app.services.feed import FeedService
+from app.services.purge import PurgeService
+from app.services.rating_summary import RatingSummaryService
+from app.services.rendering import iso_utc, paginated_json, testimonial_json
+from app.services.snapshot import SnapshotService
+from app.services.stats import StatsService
 from app.services.tag import TagService
+from app.services.usage import UsageService
+from app.utils.validators.slug import generate_slug
 
+_CSV_COLUMNS = (
+    "id",
+    "status",
+    "product_id",
+    "product_name",
+    "title",
+    "content",
+    "rating",
+    "author_name",
+    "youtube_url",
+    "image_url",
+    "category",
+    "tags",
+    "created_at",
+    "updated_at",
+)
+# Separator for list values (image URLs, tags) inside one CSV cell
+_CSV_LIST_SEPARATOR = "|"
 
-class TestimonialService:
-    @staticmethod
-    def create_testimonial(
-        data: TestimonialCreate,
-        db: SessionDep,
-        tenant_owner_id: UUID | None,
-    ) -> Testimonial:
-        testimonial = Testimonial(
-            product_id=data.product.id,
-            product_name=data.product.name,
-            title=data.content.title if data.content else None,
-            content=data.content.content if data.content else None,
-            rating=data.content.rating if data.content else None,
-            author_name=data.content.author_name if data.content else None,
-            youtube_url=data.media.youtube_url if data.media else None,  # type: ignore
-            image_url=data.media.image_url if data.media else [],  # type: ignore
-            user_id=tenant_owner_id,
+
+def _csv_columns(rows) -> list:
+    """Flat columns of each testimonial in `rows`, in _CSV_COLUMNS order."""
+    category = select(Category.name).where(Category.id == rows.c.category_id).scalar_subquery()
+    tag_names = (
+        select(
+            func.string_agg(
+                Tag.name,
+                aggregate_order_by(literal_column(f"'{_CSV_LIST_SEPARATOR}'"), Tag.name),
+            )
         )
+        .join(TestimonialTagLink, TestimonialTagLink.tag_id == Tag.id)  # type: ignore
+        .where(TestimonialTagLink.testimonial_id == rows.c.id)
+        .scalar_subquery()
+    )
+    return [
+        rows.c.id,
+        func.lower(cast(rows.c.status, String)),
+        rows.c.product_id,
+        rows.c.product_name,
+        rows.c.title,
+        rows.c.content,
+        rows.c.rating,
+        rows.c.author_name,
+        rows.c.youtube_url,
+        rows.c.image_url,
+        category,
+        tag_names,
+        iso_utc(rows.c.created_at),
+        iso_utc(rows.c.updated_at),
+    ]
 
-        if data.category_name:
-            category = CategoryService.get_or_create_category(data.category_name, db)
-            testimonial.category_id = category.id
 
-        if data.tags:
-            tags = TagService.get_or_create_tags(data.tags, db)
-            testimonial.tags = tags
+def _csv_record(row: dict[str, str]) -> dict:
+    """TestimonialCreate payload from a CSV row laid out like the CSV export."""
 
-        db.add(testimonial)
-        db.commit()
-        db.refresh(testimonial, attribute_names=["category", "tags"])
-        return testimonial
+    def value(column: str) -> str | None:
+        return (row.get(column) or "").strip() or None
+
+    def values(column: str) -> list[str] | None:
+        text = value(column)
+        return text.split(_CSV_LIST_SEPARATOR) if text else None
+
+    return {
+        "product": {"id": value("product_id"), "name": value("product_name")},
+        "content": {
+            "title": value("title"),
+            "content": value("content"),
+            "rating": value("rating"),
+            "author_name": value("author_name"),
+        },
+        "media": {"youtube_url": value("youtube_url"), "image_url": values("image_url")},
+        "category_name": value("category"),
+        "tags": values("tags"),
+    }
+
+
+def _import_records(lines: Iterable[str], import_format: ExportFormat) -> Iterator[tuple[int, Any]]:
+    """Yield (line number, payload) for each record; payload is an error message if unparsable.
+
+    A CSV file that cannot be parsed any further (e.g. a field over the csv
+    module's size limit) ends with an error for the line it stopped at.
+    """
+    if import_format == ExportFormat.CSV:
+        reader = csv.DictReader(lines)
+        try:
+            for row in reader:
+                yield reader.line_num, _csv_record(row)
+        except csv.Error as e:
+            # DictReader.line_num is only updated once a row has been parsed
+            yield reader.reader.line_num, f"Invalid CSV: {e}; the rest of the file was not imported"
+        return
 
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, f"Invalid JSON: {e.msg}"
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'body'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+# Columns written by imports, in COPY order
+_COPY_COLUMNS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "user_id",
+    "is_active",
+    "status",
+    "product_id",
+    "product_name",
+    "title",
+    "content",
+    "rating",
+    "author_name",
+    "youtube_url",
+    "image_url",
+    "category_id",
+)
+
+_published_cache = ResponseCache(
+    ttl_seconds=settings.PUBLIC_CACHE_TTL_SECONDS,
+    max_entries=settings.PUBLIC_CACHE_MAX_ENTRIES,
+)
+
+_BULK_MODERATION_VALUES = {
+    BulkModerationAction.APPROVE: {"status": StatusType.APPROVED},
+    BulkModerationAction.REJECT: {"status": StatusType.REJECTED},
+    BulkModerationAction.DELETE: {"is_active": False},
+}
+
+
+class TestimonialService:
     @staticmethod
-    def get_testimonials(
-        db: SessionDep,
-        skip: int,
-        limit: int,
+    def _apply_changes(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Keep data derived from testimonials in sync, inside the caller's transaction.
+
+        Args:
+            db (SessionDep): database session
+            changes (list[TestimonialChange]): writes performed in this transaction
+        """
+        changes = [change for change in changes if change.tenant_owner_id is not None]
+        if not changes:
+            return
+        UsageService.apply_changes(db, changes)
+        StatsService.apply_changes(db, changes)
+        AnalyticsService.apply_changes(db, changes)
+        RatingSummaryService.apply_changes(db, changes)
+        # Last of the writes queued for before commit: it takes the tenant locks
+        EventLogService.apply_changes(db, changes)
+        # Reads the feed rows as they were before this transaction's writes
+        PurgeService.apply_changes(db, changes)
+        FeedService.apply_changes(db, changes)
+        SnapshotService.apply_changes(db, changes)
+        TestimonialService._invalidate_published(db, changes)
+
+    @staticmethod
+    def _build_query(
         tenant_owner_id: UUID,
         search: str | None = None,
         status: str | None = None,
         rating: int | None = None,
         category_name: str | None = None,
         tags: list[str] | None = None,
-    ) -> tuple[list[Testimonial], int]:
-        """Get testimonials with pagination and filters.
+    ):
+        """Build the filtered testimonial query shared by the listing endpoints.
 
         Args:
-            db (SessionDep): database session
-            skip (int): number of items to skip
-            limit (int): number of items to retrieve
             tenant_owner_id (UUID): tenant owner ID for filtering
             search (str | None): keyword search in title, product_name or content
             status (str | None): filter by status (pending, approved, rejected)
@@ -71,9 +243,8 @@ class TestimonialService:
             tags (list[str] | None): filter by tag names (testimonials must have all tags)
 
         Returns:
-            tuple: (list of testimonials, total count)
+            Select: unordered and unpaginated query over Testimonial
         """
-
         # Base filter for tenant
         filters = [Testimonial.user_id == tenant_owner_id]
 
@@ -108,6 +279,217 @@ class TestimonialService:
             for tag_name in tags:
                 query = query.join(Testimonial.tags.and_(Tag.name == tag_name))  # type: ignore
 
+        return query
+
+    @staticmethod
+    def _testimonial_values(data: TestimonialCreate, tenant_owner_id: UUID | None) -> dict:
+        """Column values of a new testimonial from a create payload."""
+        return {
+            "product_id": data.product.id,
+            "product_name": data.product.name,
+            "title": data.content.title if data.content else None,
+            "content": data.content.content if data.content else None,
+            "rating": data.content.rating if data.content else None,
+            "author_name": data.content.author_name if data.content else None,
+            "youtube_url": data.media.youtube_url if data.media else None,
+            "image_url": data.media.image_url if data.media else [],
+            "user_id": tenant_owner_id,
+        }
+
+    @staticmethod
+    def create_testimonial(
+        data: TestimonialCreate,
+        db: SessionDep,
+        tenant_owner_id: UUID | None,
+    ) -> Testimonial:
+        testimonial = Testimonial(**TestimonialService._testimonial_values(data, tenant_owner_id))
+
+        if data.category_name:
+            category = CategoryService.get_or_create_category(data.category_name, db)
+            testimonial.category_id = category.id
+
+        if data.tags:
+            tags = TagService.get_or_create_tags(data.tags, db)
+            testimonial.tags = tags
+
+        db.add(testimonial)
+        TestimonialService._apply_changes(
+            db, [TestimonialChange(tenant_owner_id, None, TestimonialState.of(testimonial))]
+        )
+        db.commit()
+        db.refresh(testimonial, attribute_names=["category", "tags"])
+        return testimonial
+
+    @staticmethod
+    def import_testimonials(
+        lines: Iterable[str],
+        import_format: ExportFormat,
+        db: SessionDep,
+        tenant_owner_id: UUID,
+    ) -> TestimonialImportResponse:
+        """Create testimonials in bulk from NDJSON or CSV lines.
+
+        NDJSON lines are TestimonialCreate payloads; CSV uses the layout of the CSV
+        export (extra columns such as id or status are ignored). Valid records are
+        inserted IMPORT_BATCH_SIZE at a time, each batch in its own transaction,
+        so a failure in one batch keeps the batches already committed. A CSV
+        file that cannot be parsed to the end is reported as a rejected line;
+        the records read before it are still imported.
+
+        Args:
+            lines (Iterable[str]): the uploaded file, line by line, already checked to be UTF-8
+            import_format (ExportFormat): ndjson or csv
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID for the new testimonials
+
+        Returns:
+            TestimonialImportResponse: counts, rejected lines and throughput
+        """
+        started = time.perf_counter()
+        imported = failed = 0
+        errors: list[ImportLineError] = []
+        batch: list[TestimonialCreate] = []
+
+        for line_number, record in _import_records(lines, import_format):
+            try:
+                if isinstance(record, str):
+                    raise ValueError(record)
+                batch.append(TestimonialCreate.model_validate(record))
+            except (ValidationError, ValueError) as e:
+                failed += 1
+                if len(errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+                    message = _validation_message(e) if isinstance(e, ValidationError) else str(e)
+                    errors.append(ImportLineError(line=line_number, error=message))
+                continue
+
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                imported += TestimonialService._insert_batch(batch, db, tenant_owner_id)
+                batch = []
+        if batch:
+            imported += TestimonialService._insert_batch(batch, db, tenant_owner_id)
+
+        elapsed = time.perf_counter() - started
+        return TestimonialImportResponse(
+            imported=imported,
+            failed=failed,
+            errors=errors,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(imported / elapsed, 1) if elapsed else 0.0,
+        )
+
+    @staticmethod
+    def _insert_batch(
+        batch: list[TestimonialCreate],
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        ids: list[UUID] | None = None,
+    ) -> int:
+        """Insert validated payloads with bulk category/tag resolution and one commit.
+
+        Args:
+            ids (list[UUID] | None): pre-assigned ids, parallel to batch; generated when omitted
+
+        Returns:
+            int: number of testimonials inserted
+        """
+        categories = CategoryService.get_or_create_categories(
+            [data.category_name for data in batch if data.category_name], db
+        )
+        category_ids = {category.slug: category.id for category in categories}
+        tags = TagService.get_or_create_tags(
+            [name for data in batch for name in data.tags or []], db
+        )
+        tag_ids = {tag.slug: tag.id for tag in tags}
+
+        now = get_utc_now()
+        rows, links, changes = [], [], []
+        for index, data in enumerate(batch):
+            values = TestimonialService._testimonial_values(data, tenant_owner_id)
+            values |= {
+                "id": ids[index] if ids else uuid4(),
+                "created_at": now,
+                "updated_at": now,
+                "is_active": True,
+                # COPY takes the database representation: enum name and JSON text
+                "status": StatusType.PENDING.name,
+                "image_url": json.dumps(values["image_url"]),
+                "category_id": (
+                    category_ids[generate_slug(data.category_name)] if data.category_name else None
+                ),
+            }
+            testimonial_tag_ids = frozenset(
+                tag_ids[generate_slug(name)] for name in data.tags or []
+            )
+
+            rows.append([values[column] for column in _COPY_COLUMNS])
+            links.extend((values["id"], tag_id) for tag_id in testimonial_tag_ids)
+            changes.append(
+                TestimonialChange(
+                    tenant_owner_id,
+                    None,
+                    TestimonialState(
+                        id=values["id"],
+                        product_id=values["product_id"],
+                        status=StatusType.PENDING,
+                        is_active=True,
+                        rating=values["rating"],
+                        category_id=values["category_id"],
+                        tag_ids=testimonial_tag_ids,
+                    ),
+                )
+            )
+
+        # COPY instead of INSERTs
+        cursor = db.connection().connection.cursor()
+        with cursor.copy(f"COPY testimonial ({', '.join(_COPY_COLUMNS)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+        if links:
+            with cursor.copy("COPY testimonialtaglink (testimonial_id, tag_id) FROM STDIN") as copy:
+                for link in links:
+                    copy.write_row(link)
+        TestimonialService._apply_changes(db, changes)
+        db.commit()
+        return len(rows)
+
+    @staticmethod
+    def get_testimonials(
+        db: SessionDep,
+        skip: int,
+        limit: int,
+        tenant_owner_id: UUID,
+        search: str | None = None,
+        status: str | None = None,
+        rating: int | None = None,
+        category_name: str | None = None,
+        tags: list[str] | None = None,
+    ) -> tuple[list[Testimonial], int]:
+        """Get testimonials with pagination and filters.
+
+        Args:
+            db (SessionDep): database session
+            skip (int): number of items to skip
+            limit (int): number of items to retrieve
+            tenant_owner_id (UUID): tenant owner ID for filtering
+            search (str | None): keyword search in title, product_name or content
+            status (str | None): filter by status (pending, approved, rejected)
+            rating (int | None): filter by rating
+            category_name (str | None): filter by category name
+            tags (list[str] | None): filter by tag names (testimonials must have all tags)
+
+        Returns:
+            tuple: (list of testimonials, total count)
+        """
+
+        query = TestimonialService._build_query(
+            tenant_owner_id=tenant_owner_id,
+            search=search,
+            status=status,
+            rating=rating,
+            category_name=category_name,
+            tags=tags,
+        )
+
         # Count total items with filters
         count_query = select(func.count()).select_from(query.subquery())
         total_items = db.exec(count_query).one()
@@ -122,6 +504,156 @@ class TestimonialService:
 
         return list(testimonials), total_items
 
+    @staticmethod
+    def get_testimonials_json(
+        db: SessionDep,
+        skip: int,
+        limit: int,
+        tenant_owner_id: UUID,
+        search: str | None = None,
+        status: str | None = None,
+        rating: int | None = None,
+        category_name: str | None = None,
+        tags: list[str] | None = None,
+    ) -> str:
+        """Get a paginated page of testimonials rendered as JSON by Postgres.
+
+        The whole page (pagination envelope, category name and tag names) is built
+        with json_build_object/json_agg in a single statement, so no rows are
+        materialized in Python. The shape matches PaginationResponse[TestimonialResponse].
+
+        Args:
+            db (SessionDep): database session
+            skip (int): number of items to skip
+            limit (int): number of items to retrieve
+            tenant_owner_id (UUID): tenant owner ID for filtering
+            search (str | None): keyword search in title, product_name or content
+            status (str | None): filter by status (pending, approved, rejected)
+            rating (int | None): filter by rating
+            category_name (str | None): filter by category name
+            tags (list[str] | None): filter by tag names (testimonials must have all tags)
+
+        Returns:
+            str: JSON document with the paginated testimonials
+        """
+        query = TestimonialService._build_query(
+            tenant_owner_id=tenant_owner_id,
+            search=search,
+            status=status,
+            rating=rating,
+            category_name=category_name,
+            tags=tags,
+        )
+        statement = paginated_json(
+            query,
+            skip,
+            limit,
+            item=testimonial_json,
+            order_by=lambda page: (page.c.created_at.desc(),),
+        )
+        return db.exec(statement).one()
+
+    @staticmethod
+    def export_testimonials(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        export_format: ExportFormat,
+        search: str | None = None,
+        status: str | None = None,
+        rating: int | None = None,
+        category_name: str | None = None,
+        tags: list[str] | None = None,
+    ) -> Iterator[str]:
+        """Stream a tenant's testimonials as NDJSON lines or CSV rows.
+
+        Rows are read through a server-side cursor, EXPORT_BATCH_SIZE at a time,
+        and each batch is yielded as one chunk, so memory stays flat regardless of
+        the export size. NDJSON lines are rendered by Postgres in the
+        TestimonialResponse shape; CSV has one flat column per field.
+
+        Args:
+            db (SessionDep): database session, must stay open while iterating
+            tenant_owner_id (UUID): tenant owner ID for filtering
+            export_format (ExportFormat): ndjson or csv
+            search (str | None): keyword search in title, product_name or content
+            status (str | None): filter by status (pending, approved, rejected)
+            rating (int | None): filter by rating
+            category_name (str | None): filter by category name
+            tags (list[str] | None): filter by tag names (testimonials must have all tags)
+
+        Yields:
+            str: chunks of the export document
+        """
+        filtered = TestimonialService._build_query(
+            tenant_owner_id=tenant_owner_id,
+            search=search,
+            status=status,
+            rating=rating,
+            category_name=category_name,
+            tags=tags,
+        ).subquery("filtered")
+
+        if export_format == ExportFormat.NDJSON:
+            query = select(cast(testimonial_json(filtered), Text))
+        else:
+            query = select(*_csv_columns(filtered))
+        result = db.exec(
+            query.order_by(filtered.c.created_at.desc(), filtered.c.id).execution_options(
+                yield_per=settings.EXPORT_BATCH_SIZE
+            )
+        )
+
+        if export_format == ExportFormat.NDJSON:
+            for lines in result.partitions():
+                yield "".join(f"{line}\n" for line in lines)
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(_CSV_COLUMNS)
+        for rows in result.partitions():
+            for row in rows:
+                *values, image_url, category, tag_names, created_at, updated_at = row
+                writer.writerow(
+                    [
+                        *values,
+                        _CSV_LIST_SEPARATOR.join(image_url or []),
+                        category,
+                        tag_names,
+                        created_at,
+                        updated_at,
+                    ]
+                )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def get_listing_version(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+    ) -> int | None:
+        """Cheap probe used to validate cached testimonial listings.
+
+        Every transaction writing a testimonial of the tenant stamps a new
+        listing_version on its stats row (see StatsService.apply_changes), so
+        the version changes whenever any page of the tenant listing could change.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID for filtering
+
+        Returns:
+            int | None: listing version, None if the tenant never had testimonials
+        """
+        return db.exec(
+            select(TenantTestimonialStats.listing_version).where(
+                TenantTestimonialStats.user_id == tenant_owner_id
+            )
+        ).first()
+
     @staticmethod
     def get_testimonial_by_id(
         testimonial_id: UUID,
@@ -137,39 +669,426 @@ class TestimonialService:
         return testimonial
 
     @staticmethod
-    def update_testimonial(
-        data: TestimonialUpdate,
+    def get_testimonials_by_ids(
+        ids: list[UUID],
+        db: SessionDep,
+        tenant_owner_id: UUID,
+    ) -> tuple[list[Testimonial], list[UUID]]:
+        """Fetch several testimonials with one tenant-scoped `id = ANY(...)` query.
+
+        Args:
+            ids (list[UUID]): testimonial IDs, in the order the caller wants them
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID for filtering
+
+        Returns:
+            tuple: (testimonials in requested order without duplicates, missing IDs)
+        """
+        requested = list(dict.fromkeys(ids))
+        testimonials = db.exec(
+            select(Testimonial)
+            .where(
+                Testimonial.id == any_(bindparam("ids", requested, type_=ARRAY(Uuid))),
+                Testimonial.user_id == tenant_owner_id,
+            )
+            .options(joinedload(Testimonial.category), selectinload(Testimonial.tags))  # type: ignore
+        ).all()
+
+        by_id = {testimonial.id: testimonial for testimonial in testimonials}
+        found = [by_id[testimonial_id] for testimonial_id in requested if testimonial_id in by_id]
+        missing = [testimonial_id for testimonial_id in requested if testimonial_id not in by_id]
+        return found, missing
+
+    @staticmethod
+    def get_published(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        skip: int,
+        limit: int,
+        product_id: str | None = None,
+        category: str | None = None,
+        tag: str | None = None,
+    ) -> CachedBody:
+        """Get a serialized page of published testimonials, querying only on a cache miss.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID for filtering
+            skip (int): number of items to skip
+            limit (int): number of items to retrieve
+            product_id (str | None): filter by product ID
+            category (str | None): filter by category name or slug
+            tag (str | None): filter by tag name or slug
+
+        Returns:
+            CachedBody: JSON body of PaginationResponse[TestimonialResponse] and its ETag
+        """
+        # Name and slug spellings of a filter share one cache entry
+        category_slug = generate_slug(category) if category else None
+        tag_slug = generate_slug(tag) if tag else None
+
+        def build() -> bytes:
+            return FeedService.get_page_json(
+                db, tenant_owner_id, skip, limit, product_id, category_slug, tag_slug
+            ).encode()
+
+        def surrogate_keys(body: bytes) -> list[str]:
+            return PurgeService.page_keys(
+                tenant_owner_id, body, product_id, category_slug, tag_slug
+            )
+
+        key = ("page", skip, limit, product_id, category_slug, tag_slug)
+        return _published_cache.get_or_set(tenant_owner_id, key, build, surrogate_keys)
+
+    @staticmethod
+    def get_published_testimonial(
+        testimonial_id: UUID,
         db: SessionDep,
         tenant_owner_id: UUID,
+    ) -> CachedBody:
+        """Get one serialized published testimonial, querying only on a cache miss.
+
+        Raises:
+            HTTPException: 404 if the testimonial does not exist or is not published
+
+        Returns:
+            CachedBody: JSON body of TestimonialResponse and its ETag
+        """
+
+        def build() -> bytes:
+            body = FeedService.get_item_json(db, testimonial_id, tenant_owner_id)
+            if body is None:
+                raise HTTPException(status_code=404, detail="Testimonial not found")
+            return body.encode()
+
+        return _published_cache.get_or_set(
+            tenant_owner_id,
+            ("item", testimonial_id),
+            build,
+            lambda body: PurgeService.item_keys(tenant_owner_id, testimonial_id),
+        )
+
+    @staticmethod
+    def get_rating_summary(db: SessionDep, tenant_owner_id: UUID, product_id: str) -> CachedBody:
+        """Get the serialized rating summary of a product, querying only on a cache miss.
+
+        Returns:
+            CachedBody: JSON body of ProductRatingSummaryResponse and its ETag
+        """
+
+        def build() -> bytes:
+            summary = RatingSummaryService.get_summary(db, tenant_owner_id, product_id)
+            return summary.model_dump_json().encode()
+
+        return _published_cache.get_or_set(
+            tenant_owner_id,
+            ("rating", product_id),
+            build,
+            lambda body: PurgeService.product_keys(tenant_owner_id, product_id),
+        )
+
+    @staticmethod
+    def _invalidate_published(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Drop cached public responses of tenants whose published set changed, after commit.
+
+        Any write to a testimonial that is published before or after it counts,
+        content edits included.
+        """
+        tenants = {
+            change.tenant_owner_id
+            for change in changes
+            if (change.before is not None and change.before.published)
+            or (change.after is not None and change.after.published)
+        }
+        if tenants:
+            after_commit(db, lambda: TestimonialService.invalidate_published(tenants))
+
+    @staticmethod
+    def invalidate_published(tenant_owner_ids: Iterable[UUID]) -> None:
+        """Drop the cached public responses of the given tenants."""
+        for tenant_owner_id in tenant_owner_ids:
+            _published_cache.invalidate(tenant_owner_id)
+
+    @staticmethod
+    def _locked_previous(*criteria):
+        """Lock the matching rows and select the fields change records compare."""
+        return (
+            select(
+                Testimonial.id,
+                Testimonial.status,
+                Testimonial.is_active,
+                Testimonial.rating,
+                Testimonial.category_id,
+            )
+            .where(*criteria)
+            .with_for_update()
+        )
+
+    @staticmethod
+    def _returning_states(previous) -> list:
+        """RETURNING columns for the state after an UPDATE joined to `previous`."""
+        current_tags = (
+            select(
+                func.json_agg(
+                    aggregate_order_by(func.json_build_array(Tag.id, Tag.slug, Tag.name), Tag.name)
+                )
+            )
+            .join(TestimonialTagLink, TestimonialTagLink.tag_id == Tag.id)  # type: ignore
+            .where(TestimonialTagLink.testimonial_id == Testimonial.id)
+            .correlate(Testimonial)
+            .scalar_subquery()
+        )
+        return [
+            Testimonial.id,
+            Testimonial.product_id,
+            Testimonial.status,
+            Testimonial.is_active,
+            Testimonial.rating,
+            Testimonial.category_id,
+            previous.c.status.label("old_status"),
+            previous.c.is_active.label("old_is_active"),
+            previous.c.rating.label("old_rating"),
+            previous.c.category_id.label("old_category_id"),
+            current_tags.label("current_tags"),
+        ]
+
+    @staticmethod
+    def _states(row: Row) -> tuple[TestimonialState, TestimonialState]:
+        """Before/after states from a row returned with `_returning_states`."""
+        tag_ids = frozenset(UUID(tag_id) for tag_id, _, _ in row.current_tags or [])
+        before = TestimonialState(
+            id=row.id,
+            product_id=row.product_id,
+            status=row.old_status,
+            is_active=row.old_is_active,
+            rating=row.old_rating,
+            category_id=row.old_category_id,
+            tag_ids=tag_ids,
+        )
+        after = TestimonialState(
+            id=row.id,
+            product_id=row.product_id,
+            status=row.status,
+            is_active=row.is_active,
+            rating=row.rating,
+            category_id=row.category_id,
+            tag_ids=tag_ids,
+        )
+        return before, after
+
+    @staticmethod
+    def _update_returning(
+        db: SessionDep,
         testimonial_id: UUID,
-    ) -> Testimonial:
-        testimonial = db.get(Testimonial, testimonial_id)
-        if not testimonial or testimonial.user_id != tenant_owner_id:
+        tenant_owner_id: UUID,
+        values: dict,
+        *returning,
+    ) -> tuple[Row, TestimonialState, TestimonialState]:
+        """Update a tenant's testimonial in one round trip.
+
+        The UPDATE is joined to a locked copy of the old row so RETURNING can
+        report the state before and after the write, along with the current
+        tags. A missing row (or one owned by another tenant) updates nothing and
+        is reported as 404.
+
+        Args:
+            db (SessionDep): database session
+            testimonial_id (UUID): testimonial to update
+            tenant_owner_id (UUID): tenant the testimonial must belong to
+            values (dict): columns to set, updated_at is always bumped
+            *returning: extra columns to return
+
+        Raises:
+            HTTPException: if the testimonial is not found
+
+        Returns:
+            tuple[Row, TestimonialState, TestimonialState]: the returned row and the
+            state before and after the update
+        """
+        previous = TestimonialService._locked_previous(
+            Testimonial.id == testimonial_id, Testimonial.user_id == tenant_owner_id
+        ).subquery("previous")
+        row = db.exec(
+            update(Testimonial)
+            .where(Testimonial.id == previous.c.id)  # type: ignore
+            .values(**values, updated_at=func.now())
+            .returning(*TestimonialService._returning_states(previous), *returning)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+        if row is None:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Testimonial not found",
+                status_code=status.HTTP_404_NOT_FOUND, detail="Testimonial not found"
+            )
+
+        before, after = TestimonialService._states(row)
+        return row, before, after
+
+    @staticmethod
+    def _bulk_update(
+        db: SessionDep,
+        ids: list[UUID],
+        tenant_owner_id: UUID,
+        values: dict,
+    ) -> dict[UUID, TestimonialChange | None]:
+        """Apply the same values to many of a tenant's testimonials in one statement.
+
+        Rows that already hold the values are locked but not written, so their
+        updated_at (and ETags) stay put.
+
+        Args:
+            db (SessionDep): database session
+            ids (list[UUID]): testimonials to update
+            tenant_owner_id (UUID): tenant the testimonials must belong to
+            values (dict): columns to set
+
+        Returns:
+            dict[UUID, TestimonialChange | None]: change per matched id, None when
+            the row was left unchanged; ids not found are absent
+        """
+        previous = TestimonialService._locked_previous(
+            Testimonial.id.in_(ids),  # type: ignore
+            Testimonial.user_id == tenant_owner_id,
+        ).cte("previous")
+        updated = (
+            update(Testimonial)
+            .where(
+                Testimonial.id == previous.c.id,  # type: ignore
+                or_(*[previous.c[name].is_distinct_from(value) for name, value in values.items()]),
+            )
+            .values(**values, updated_at=func.now())
+            .returning(*TestimonialService._returning_states(previous))
+            .cte("updated")
+        )
+        rows = db.exec(
+            select(previous.c.id.label("matched_id"), *updated.c).outerjoin(
+                updated,
+                updated.c.id == previous.c.id,  # type: ignore
             )
+        ).all()
 
-        # Update content fields if provided
-        if data.content:
-            content_data = data.content.model_dump(exclude_unset=True)
-            for field, value in content_data.items():
-                setattr(testimonial, field, value)
+        changes: dict[UUID, TestimonialChange | None] = {}
+        for row in rows:
+            if row.id is None:
+                changes[row.matched_id] = None
+            else:
+                changes[row.id] = TestimonialChange(
+                    tenant_owner_id, *TestimonialService._states(row)
+                )
+        return changes
+
+    @staticmethod
+    def update_testimonial(
+        data: TestimonialUpdate,
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        testimonial_id: UUID,
+    ) -> TestimonialResponse:
+        values = data.content.model_dump(exclude_unset=True) if data.content else {}
 
         # Update category if provided
         if data.category_name:
             category = CategoryService.get_or_create_category(data.category_name, db)
-            testimonial.category_id = category.id
+            values["category_id"] = category.id
 
-        # Update tags if provided
-        if data.tags:
-            tags = TagService.get_or_create_tags(data.tags, db)
-            testimonial.tags = tags
+        current_category = (
+            select(Category.name)
+            .where(Category.id == Testimonial.category_id)
+            .correlate(Testimonial)
+            .scalar_subquery()
+        )
+        # Tag-only changes still bump updated_at, so ETags change too
+        row, before, after = TestimonialService._update_returning(
+            db,
+            testimonial_id,
+            tenant_owner_id,
+            values,
+            *[
+                column
+                for column in Testimonial.__table__.c  # type: ignore
+                if column.name
+                not in ("id", "product_id", "status", "is_active", "rating", "category_id")
+            ],
+            current_category.label("category_name"),
+        )
 
-        db.add(testimonial)
+        # Update tags if provided (only the link rows that change)
+        current = {slug: (UUID(tag_id), name) for tag_id, slug, name in row.current_tags or []}
+        tags = TestimonialService._sync_tags(db, testimonial_id, current, data)
+        after = after.evolve(tag_ids=frozenset(tag_id for tag_id, _ in tags.values()))
+
+        TestimonialService._apply_changes(db, [TestimonialChange(tenant_owner_id, before, after)])
+
+        response = TestimonialResponse.model_validate(
+            row._asdict() | {"tags": [name for _, name in tags.values()]}
+        )
         db.commit()
-        db.refresh(testimonial, attribute_names=["category", "tags"])
-        return testimonial
+        return response
+
+    @staticmethod
+    def _sync_tags(
+        db: SessionDep,
+        testimonial_id: UUID,
+        current: dict[str, tuple[UUID, str]],
+        data: TestimonialUpdate,
+    ) -> dict[str, tuple[UUID, str]]:
+        """Apply tag changes by diffing slugs instead of rewriting the whole collection.
+
+        `tags` replaces the list, `add_tags`/`remove_tags` patch it. Only the link
+        rows that actually change are written, with one bulk INSERT and one bulk
+        DELETE.
+
+        Args:
+            db (SessionDep): database session
+            testimonial_id (UUID): testimonial being updated
+            current (dict[str, tuple[UUID, str]]): current tags as {slug: (id, name)}
+            data (TestimonialUpdate): requested changes
+
+        Returns:
+            dict[str, tuple[UUID, str]]: tags of the testimonial after the update
+        """
+        if not (data.tags or data.add_tags or data.remove_tags):
+            return current
+
+        desired: dict[str, str] = {}
+        removed: set[str] = set()
+        if data.tags:
+            for name in data.tags:
+                desired.setdefault(generate_slug(name), name)
+            removed = {slug for slug in current if slug not in desired}
+        for name in data.add_tags or []:
+            desired.setdefault(generate_slug(name), name)
+        for name in data.remove_tags or []:
+            slug = generate_slug(name)
+            desired.pop(slug, None)
+            if slug in current:
+                removed.add(slug)
+
+        new_names = [name for slug, name in desired.items() if slug not in current]
+        added = {
+            tag.slug: (tag.id, tag.name) for tag in TagService.get_or_create_tags(new_names, db)
+        }
+
+        if added:
+            db.exec(
+                insert(TestimonialTagLink)
+                .values(
+                    [
+                        {"testimonial_id": testimonial_id, "tag_id": tag_id}
+                        for tag_id, _ in added.values()
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+        if removed:
+            db.exec(
+                delete(TestimonialTagLink).where(
+                    TestimonialTagLink.testimonial_id == testimonial_id,  # type: ignore
+                    TestimonialTagLink.tag_id.in_([current[slug][0] for slug in removed]),  # type: ignore
+                )
+            )
+
+        kept = {slug: tag for slug, tag in current.items() if slug not in removed}
+        return kept | added
 
     @staticmethod
     def soft_delete_testimonial(
@@ -177,14 +1096,10 @@ class TestimonialService:
         db: SessionDep,
         tenant_owner_id: UUID,
     ) -> bool:
-        testimonial = db.get(Testimonial, testimonial_id)
-        if not testimonial or testimonial.user_id != tenant_owner_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Testimonial not found"
-            )
-
-        testimonial.is_active = False
-        db.add(testimonial)
+        _, before, after = TestimonialService._update_returning(
+            db, testimonial_id, tenant_owner_id, {"is_active": False}
+        )
+        TestimonialService._apply_changes(db, [TestimonialChange(tenant_owner_id, before, after)])
         db.commit()
         return True
 
@@ -195,13 +1110,91 @@ class TestimonialService:
         db: SessionDep,
         tenant_owner_id: UUID,
     ) -> bool:
-        testimonial = db.get(Testimonial, testimonial_id)
-        if not testimonial or testimonial.user_id != tenant_owner_id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Testimonial not found"
-            )
-
-        testimonial.status = new_status  # type: ignore
-        db.add(testimonial)
+        _, before, after = TestimonialService._update_returning(
+            db, testimonial_id, tenant_owner_id, {"status": new_status}
+        )
+        TestimonialService._apply_changes(db, [TestimonialChange(tenant_owner_id, before, after)])
         db.commit()
         return True
+
+    @staticmethod
+    def bulk_moderate(
+        data: TestimonialBulkModeration,
+        db: SessionDep,
+        tenant_owner_id: UUID,
+    ) -> TestimonialBulkModerationResponse:
+        """Approve, reject or soft delete many testimonials at once.
+
+        Targets are the given ids, or the testimonials matching the filters that
+        the action would still change (at most BULK_MODERATION_MAX_IDS, so
+        repeating the call with `has_more` makes progress). Rows are written with
+        one set-based UPDATE per chunk, each chunk in its own transaction.
+
+        Args:
+            data (TestimonialBulkModeration): action and target ids or filters
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID
+
+        Returns:
+            TestimonialBulkModerationResponse: outcome per target id
+        """
+        values = _BULK_MODERATION_VALUES[data.action]
+        has_more = False
+        if data.ids is not None:
+            ids = list(dict.fromkeys(data.ids))
+        else:
+            filters = data.filters
+            query = TestimonialService._build_query(
+                tenant_owner_id,
+                filters.search,
+                filters.status,
+                filters.rating,
+                filters.category_name,
+                filters.tags,
+            )
+            # Skip rows already moderated this way
+            pending = or_(
+                *[
+                    getattr(Testimonial, name).is_distinct_from(value)
+                    for name, value in values.items()
+                ]
+            )
+            ids = list(
+                db.exec(
+                    query.with_only_columns(Testimonial.id)
+                    .where(pending)
+                    .limit(settings.BULK_MODERATION_MAX_IDS + 1)
+                ).all()
+            )
+            has_more = len(ids) > settings.BULK_MODERATION_MAX_IDS
+            ids = ids[: settings.BULK_MODERATION_MAX_IDS]
+
+        changes: dict[UUID, TestimonialChange | None] = {}
+        chunk_size = settings.BULK_MODERATION_CHUNK_SIZE
+        for start in range(0, len(ids), chunk_size):
+            chunk = TestimonialService._bulk_update(
+                db, ids[start : start + chunk_size], tenant_owner_id, values
+            )
+            TestimonialService._apply_changes(
+                db, [change for change in chunk.values() if change is not None]
+            )
+            db.commit()
+            changes |= chunk
+
+        results = []
+        for testimonial_id in ids:
+            if testimonial_id not in changes:
+                outcome = BulkModerationOutcome.NOT_FOUND
+            elif changes[testimonial_id] is None:
+                outcome = BulkModerationOutcome.UNCHANGED
+            else:
+                outcome = BulkModerationOutcome.UPDATED
+            results.append(BulkModerationItem(id=testimonial_id, outcome=outcome))
+
+        return TestimonialBulkModerationResponse(
+            action=data.action,
+            matched=len(changes),
+            updated=sum(change is not None for change in changes.values()),
+            has_more=has_more,
+            results=results,
+        )
@@ -0,0 +1,84 @@
+from collections import Counter
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.db import SessionDep, after_commit, before_commit
+from app.models.tenant_usage import TenantCategoryUsage, TenantTagUsage
+from app.services.category import CategoryService
+from app.services.changes import TestimonialChange
+from app.services.tag import TagService
+
+
+class UsageService:
+    @staticmethod
+    def apply_changes(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Queue testimonial changes for the per-tenant tag/category usage counts.
+
+        The counts are written by _write_usage right before the caller's
+        transaction commits, so their row locks are not held for the rest of it.
+
+        Args:
+            db (SessionDep): database session
+            changes (list[TestimonialChange]): writes performed in this transaction
+        """
+        before_commit(db, UsageService._write_usage).extend(changes)
+
+    @staticmethod
+    def _write_usage(db: SessionDep, changes: list[TestimonialChange]) -> None:
+        """Apply the usage deltas of a transaction's changes with one upsert per table.
+
+        Only active testimonials are counted. Rows are upserted in key order so
+        that transactions touching the same tags or categories in a different
+        order cannot deadlock.
+        """
+        tag_deltas: Counter[tuple[UUID, UUID]] = Counter()
+        category_deltas: Counter[tuple[UUID, UUID]] = Counter()
+
+        for change in changes:
+            for state, sign in ((change.before, -1), (change.after, 1)):
+                if state is None or not state.is_active:
+                    continue
+                for tag_id in state.tag_ids:
+                    tag_deltas[(change.tenant_owner_id, tag_id)] += sign
+                if state.category_id:
+                    category_deltas[(change.tenant_owner_id, state.category_id)] += sign
+
+        tag_rows = [
+            {"user_id": tenant, "tag_id": tag_id, "usage_count": delta}
+            for (tenant, tag_id), delta in sorted(tag_deltas.items())
+            if delta
+        ]
+        category_rows = [
+            {"user_id": tenant, "category_id": category_id, "usage_count": delta}
+            for (tenant, category_id), delta in sorted(category_deltas.items())
+            if delta
+        ]
+
+        if tag_rows:
+            stmt = insert(TenantTagUsage).values(tag_rows)
+            db.exec(
+                stmt.on_conflict_do_update(
+                    index_elements=["user_id", "tag_id"],
+                    set_={"usage_count": TenantTagUsage.usage_count + stmt.excluded.usage_count},
+                )
+            )
+        if category_rows:
+            stmt = insert(TenantCategoryUsage).values(category_rows)
+            db.exec(
+                stmt.on_conflict_do_update(
+                    index_elements=["user_id", "category_id"],
+                    set_={
+                        "usage_count": TenantCategoryUsage.usage_count + stmt.excluded.usage_count
+                    },
+                )
+            )
+
+        if tag_rows:
+            tenants = {row["user_id"] for row in tag_rows}
+            committed = {key: delta for key, delta in tag_deltas.items() if delta}
+            after_commit(db, lambda: TagService.invalidate_catalog(tenants))
+            after_commit(db, lambda: TagService.apply_usage_deltas(committed))
+        if category_rows:
+            tenants = {row["user_id"] for row in category_rows}
+            after_commit(db, lambda: CategoryService.invalidate_catalog(tenants))
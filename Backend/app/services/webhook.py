@@ -0,0 +1,713 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import secrets
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+from itertools import batched
+from uuid import UUID, uuid4
+
+import httpx
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    Integer,
+    String,
+    Uuid,
+    any_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    outerjoin,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import SessionDep, engine
+from app.models.testimonial_event import TestimonialEvent
+from app.models.webhook import WebhookDelivery, WebhookDeliveryStatus, WebhookEndpoint
+from app.schemas.webhook import WebhookEndpointCreate, WebhookEndpointUpdate
+from app.services.rendering import iso_utc
+from app.utils.validators.url import (
+    PrivateAddressError,
+    UnresolvableHostError,
+    resolve_public,
+    resolve_public_async,
+)
+
+logger = logging.getLogger(__name__)
+
+ID_HEADER = "Webhook-Id"
+TIMESTAMP_HEADER = "Webhook-Timestamp"
+SIGNATURE_HEADER = "Webhook-Signature"
+USER_AGENT = "Testify-Webhooks/1.0"
+
+
+class WebhookService:
+    @staticmethod
+    def check_url(url: str) -> None:
+        """Refuse endpoint URLs whose host resolves to a non-public address.
+
+        Raises:
+            HTTPException: 400 if the host does not resolve or any of its
+                addresses is loopback, private, link-local or reserved
+        """
+        if settings.WEBHOOK_ALLOW_PRIVATE_URLS:
+            return
+        target = httpx.URL(url)
+        try:
+            resolve_public(target.host, target.port or 443)
+        except UnresolvableHostError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Webhook URL host does not resolve",
+            ) from None
+        except PrivateAddressError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Webhook URL must resolve to public addresses only",
+            ) from None
+
+    @staticmethod
+    def _latest_event_id(db: SessionDep, tenant_owner_id: UUID) -> int:
+        """Id of the latest logged event of a tenant, 0 if there is none."""
+        return db.exec(
+            select(func.coalesce(func.max(TestimonialEvent.id), 0)).where(
+                TestimonialEvent.user_id == tenant_owner_id
+            )
+        ).one()
+
+    @staticmethod
+    def create_endpoint(
+        db: SessionDep, tenant_owner_id: UUID, data: WebhookEndpointCreate
+    ) -> WebhookEndpoint:
+        """Register an endpoint with a new signing secret.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID
+            data (WebhookEndpointCreate): URL, events and concurrency of the endpoint
+
+        Returns:
+            WebhookEndpoint: the endpoint, whose secret is only shown now
+
+        Raises:
+            HTTPException: 400 if the URL does not resolve to public addresses
+        """
+        WebhookService.check_url(str(data.url))
+        endpoint = WebhookEndpoint(
+            user_id=tenant_owner_id,
+            url=str(data.url),
+            description=data.description,
+            secret=f"whsec_{secrets.token_urlsafe(32)}",
+            events=[event.value for event in dict.fromkeys(data.events)],
+            max_concurrency=data.max_concurrency,
+            last_event_id=WebhookService._latest_event_id(db, tenant_owner_id),
+        )
+        db.add(endpoint)
+        db.commit()
+        db.refresh(endpoint)
+        return endpoint
+
+    @staticmethod
+    def list_endpoints(db: SessionDep, tenant_owner_id: UUID) -> list[WebhookEndpoint]:
+        """List the endpoints of a tenant, newest first."""
+        return db.exec(
+            select(WebhookEndpoint)
+            .where(WebhookEndpoint.user_id == tenant_owner_id)
+            .order_by(WebhookEndpoint.created_at.desc())  # type: ignore
+        ).all()
+
+    @staticmethod
+    def get_endpoint(db: SessionDep, tenant_owner_id: UUID, endpoint_id: UUID) -> WebhookEndpoint:
+        """Get an endpoint of the tenant.
+
+        Raises:
+            HTTPException: 404 if the endpoint does not exist or belongs to another tenant
+        """
+        endpoint = db.get(WebhookEndpoint, endpoint_id)
+        if endpoint is None or endpoint.user_id != tenant_owner_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found")
+        return endpoint
+
+    @staticmethod
+    def update_endpoint(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        endpoint_id: UUID,
+        data: WebhookEndpointUpdate,
+    ) -> WebhookEndpoint:
+        """Update the fields set in data; disabled endpoints keep their pending deliveries.
+
+        Events logged while an endpoint was disabled are not delivered once it
+        is enabled again.
+        """
+        endpoint = WebhookService.get_endpoint(db, tenant_owner_id, endpoint_id)
+        changes = data.model_dump(exclude_unset=True, exclude_none=True)
+        if "url" in changes:
+            changes["url"] = str(data.url)
+            WebhookService.check_url(changes["url"])
+        if "events" in changes:
+            changes["events"] = [event.value for event in dict.fromkeys(data.events)]
+        if changes.get("is_active") and not endpoint.is_active:
+            changes["last_event_id"] = WebhookService._latest_event_id(db, tenant_owner_id)
+        endpoint.sqlmodel_update(changes)
+        db.add(endpoint)
+        db.commit()
+        db.refresh(endpoint)
+        if endpoint.is_active:
+            webhook_dispatcher.wake()
+        return endpoint
+
+    @staticmethod
+    def delete_endpoint(db: SessionDep, tenant_owner_id: UUID, endpoint_id: UUID) -> None:
+        """Delete an endpoint with its deliveries, pending ones included."""
+        endpoint = WebhookService.get_endpoint(db, tenant_owner_id, endpoint_id)
+        db.delete(endpoint)
+        db.commit()
+
+    @staticmethod
+    def list_deliveries(
+        db: SessionDep,
+        tenant_owner_id: UUID,
+        endpoint_id: UUID,
+        delivery_status: WebhookDeliveryStatus | None = None,
+        limit: int = 50,
+    ) -> list[WebhookDelivery]:
+        """List the deliveries of an endpoint, newest first.
+
+        Args:
+            db (SessionDep): database session
+            tenant_owner_id (UUID): tenant owner ID
+            endpoint_id (UUID): endpoint ID
+            delivery_status (WebhookDeliveryStatus | None): only deliveries in this status
+            limit (int): number of deliveries to return
+
+        Returns:
+            list[WebhookDelivery]: the most recent deliveries
+        """
+        WebhookService.get_endpoint(db, tenant_owner_id, endpoint_id)
+        query = select(WebhookDelivery).where(WebhookDelivery.endpoint_id == endpoint_id)
+        if delivery_status is not None:
+            query = query.where(WebhookDelivery.status == delivery_status)
+        return db.exec(
+            query.order_by(WebhookDelivery.created_at.desc()).limit(limit)  # type: ignore
+        ).all()
+
+    @staticmethod
+    def redeliver(db: SessionDep, tenant_owner_id: UUID, endpoint_id: UUID) -> int:
+        """Queue the dead-lettered deliveries of an endpoint again, with a fresh attempt budget.
+
+        Returns:
+            int: number of deliveries queued
+        """
+        WebhookService.get_endpoint(db, tenant_owner_id, endpoint_id)
+        requeued = db.exec(
+            update(WebhookDelivery)
+            .where(
+                WebhookDelivery.endpoint_id == endpoint_id,
+                WebhookDelivery.status == WebhookDeliveryStatus.DEAD,
+            )
+            .values(
+                status=WebhookDeliveryStatus.PENDING,
+                attempts=0,
+                next_attempt_at=func.now(),
+                last_error=None,
+            )
+        ).rowcount
+        db.commit()
+        if requeued:
+            webhook_dispatcher.wake()
+        return requeued
+
+    @staticmethod
+    def fan_out(limit: int) -> int:
+        """Write the deliveries of the logged events no endpoint has been given yet.
+
+        One statement: active endpoints with events after their last_event_id
+        are locked (SKIP LOCKED, so dispatchers of other processes take other
+        endpoints), each reads at most limit of those events in id order, the
+        ones of its subscribed types become pending deliveries and
+        last_event_id moves past all of them. Event ids of a tenant are
+        allocated in commit order (see EventLogService._write_events), so no
+        event committed later can get an id the endpoint has already passed.
+
+        Args:
+            limit (int): events read per endpoint
+
+        Returns:
+            int: number of events read, deliveries written or not
+        """
+        endpoint = WebhookEndpoint
+        event = TestimonialEvent
+        due = (
+            select(endpoint.id, endpoint.user_id, endpoint.events, endpoint.last_event_id)
+            .where(
+                endpoint.is_active.is_(True),  # type: ignore
+                exists().where(
+                    event.user_id == endpoint.user_id,
+                    event.id > endpoint.last_event_id,  # type: ignore[operator]
+                ),
+            )
+            .with_for_update(skip_locked=True)
+            .cte("due")
+        )
+        pending = (
+            select(event.id, event.event_type, event.data, event.created_at)
+            .where(event.user_id == due.c.user_id, event.id > due.c.last_event_id)  # type: ignore[operator]
+            .order_by(event.id)  # type: ignore[arg-type]
+            .limit(limit)
+            .lateral("pending")
+        )
+        batch = (
+            select(
+                due.c.id.label("endpoint_id"),
+                due.c.events,
+                pending.c.id.label("event_id"),
+                pending.c.event_type,
+                pending.c.data,
+                pending.c.created_at,
+            )
+            .join(pending, true())
+            .cte("batch")
+        )
+        written = insert(WebhookDelivery).from_select(
+            [
+                "id",
+                "endpoint_id",
+                "event_type",
+                "payload",
+                "status",
+                "attempts",
+                "next_attempt_at",
+                "created_at",
+            ],
+            select(
+                func.gen_random_uuid(),
+                batch.c.endpoint_id,
+                batch.c.event_type,
+                func.jsonb_build_object(
+                    "id",
+                    cast(batch.c.event_id, String),
+                    "type",
+                    batch.c.event_type,
+                    "created_at",
+                    iso_utc(batch.c.created_at),
+                    "data",
+                    batch.c.data,
+                ),
+                literal(WebhookDeliveryStatus.PENDING, WebhookDelivery.__table__.c.status.type),
+                literal(0),
+                func.now(),
+                batch.c.created_at,
+            ).where(batch.c.event_type == any_(batch.c.events)),
+        )
+        passed = (
+            select(batch.c.endpoint_id, func.max(batch.c.event_id).label("last_event_id"))
+            .group_by(batch.c.endpoint_id)
+            .subquery("passed")
+        )
+        advanced = (
+            update(endpoint)
+            .where(endpoint.id == passed.c.endpoint_id)
+            # Not an edit of the endpoint: updated_at stays
+            .values(last_event_id=passed.c.last_event_id, updated_at=endpoint.updated_at)
+        )
+        with Session(engine) as db:
+            read = db.exec(
+                select(func.count())
+                .select_from(batch)
+                .add_cte(written.cte("written"), advanced.cte("advanced"))
+            ).one()
+            db.commit()
+        return read
+
+    @staticmethod
+    def sign(secret: str, timestamp: str, body: bytes) -> str:
+        """Signature header value: v1= and the hex HMAC-SHA256 of "{timestamp}.{body}"."""
+        digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256)
+        return f"v1={digest.hexdigest()}"
+
+    @staticmethod
+    def verify(
+        secret: str,
+        timestamp: str,
+        body: bytes,
+        signature: str,
+        tolerance: int = 300,
+    ) -> bool:
+        """Check a delivery as a receiver would: valid signature, timestamp within tolerance seconds."""
+        try:
+            age = abs(time.time() - int(timestamp))
+        except ValueError:
+            return False
+        expected = WebhookService.sign(secret, timestamp, body)
+        return age <= tolerance and hmac.compare_digest(expected, signature)
+
+    @staticmethod
+    def backoff(attempts: int) -> float:
+        """Seconds before the next attempt after attempts failures: doubling, capped, jittered.
+
+        The delay is drawn between half and all of the capped exponential one, so
+        deliveries failing together (an endpoint going down) do not all retry at once.
+        """
+        delay = min(
+            settings.WEBHOOK_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1),
+            settings.WEBHOOK_BACKOFF_MAX_SECONDS,
+        )
+        return delay * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def claim(in_flight: dict[UUID, int], batch_size: int) -> list:
+        """Lease the due deliveries this dispatcher has room for, in one statement.
+
+        Each active endpoint gets at most (max_concurrency - batches in flight)
+        batches of batch_size deliveries, oldest first. Rows are locked with SKIP
+        LOCKED and leased by moving next_attempt_at WEBHOOK_LEASE_SECONDS ahead,
+        so dispatchers of other processes skip them; if this process dies, the
+        lease expires and the deliveries are retried.
+
+        Args:
+            in_flight (dict[UUID, int]): batches being delivered, per endpoint ID
+            batch_size (int): deliveries per batch
+
+        Returns:
+            list: (id, endpoint_id, attempts, payload, created_at, url, secret)
+                rows, oldest first
+        """
+        delivery = WebhookDelivery
+        endpoint = aliased(WebhookEndpoint)
+        free = endpoint.max_concurrency
+        endpoints = endpoint
+        if in_flight:
+            busy = values(
+                column("endpoint_id", Uuid), column("batches", Integer), name="busy"
+            ).data(list(in_flight.items()))
+            free = free - func.coalesce(busy.c.batches, 0)
+            endpoints = outerjoin(endpoint, busy, busy.c.endpoint_id == endpoint.id)
+
+        due = (
+            select(delivery.id)
+            .where(
+                delivery.endpoint_id == endpoint.id,
+                delivery.status == WebhookDeliveryStatus.PENDING,
+                delivery.next_attempt_at <= func.now(),
+            )
+            .order_by(delivery.next_attempt_at)
+            .limit(free * batch_size)
+            .with_for_update(skip_locked=True)
+            .lateral("due")
+        )
+        claimed = (
+            select(due.c.id)
+            .select_from(endpoints)
+            .join(due, true())
+            .where(endpoint.is_active.is_(True), free > 0)  # type: ignore
+            .subquery("claimed")
+        )
+        with Session(engine) as db:
+            rows = db.exec(
+                update(delivery)
+                .where(delivery.id == claimed.c.id, WebhookEndpoint.id == delivery.endpoint_id)
+                .values(
+                    next_attempt_at=func.now() + timedelta(seconds=settings.WEBHOOK_LEASE_SECONDS)
+                )
+                .returning(
+                    delivery.id,
+                    delivery.endpoint_id,
+                    delivery.attempts,
+                    delivery.payload,
+                    delivery.created_at,
+                    WebhookEndpoint.url,
+                    WebhookEndpoint.secret,
+                )
+            ).all()
+            db.commit()
+        return sorted(rows, key=lambda row: row.created_at)
+
+    @staticmethod
+    def settle(deliveries: Sequence, error: str | None) -> None:
+        """Record the outcome of a request carrying the given claimed deliveries.
+
+        On success they are marked delivered. On failure the attempt is counted
+        and they are scheduled again after backoff(), or dead-lettered once
+        WEBHOOK_MAX_ATTEMPTS attempts have failed.
+
+        Args:
+            deliveries (Sequence): rows returned by claim()
+            error (str | None): why the request failed, None if it succeeded
+        """
+        delivery = WebhookDelivery
+        by_attempts: dict[int, list[UUID]] = defaultdict(list)
+        for row in deliveries:
+            by_attempts[row.attempts + 1].append(row.id)
+
+        with Session(engine) as db:
+            for attempts, ids in by_attempts.items():
+                if error is None:
+                    changes = {
+                        "status": WebhookDeliveryStatus.DELIVERED,
+                        "delivered_at": func.now(),
+                        "last_error": None,
+                    }
+                elif attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                    changes = {"status": WebhookDeliveryStatus.DEAD, "last_error": error[:500]}
+                else:
+                    retry_in = timedelta(seconds=WebhookService.backoff(attempts))
+                    changes = {"next_attempt_at": func.now() + retry_in, "last_error": error[:500]}
+                db.exec(
+                    update(delivery)
+                    .where(
+                        delivery.id == any_(bindparam("ids", ids, type_=ARRAY(Uuid))),
+                        delivery.status == WebhookDeliveryStatus.PENDING,
+                    )
+                    .values(attempts=attempts, **changes)
+                )
+            db.commit()
+
+    @staticmethod
+    async def send(
+        client: httpx.AsyncClient, url: str, secret: str, payloads: list[dict]
+    ) -> str | None:
+        """POST a batch of events as {"events": [...]}, signed with the endpoint secret.
+
+        The host is resolved again and the request sent to the checked address
+        (with the original Host header and TLS server name), so a DNS record
+        changed since registration cannot point it at an internal service.
+        Redirects are not followed and any non-2xx response counts as a failure.
+        Failures are reported as a coarse category only: the error is shown to
+        the tenant and must not reveal anything about the network it reached.
+
+        Returns:
+            str | None: why the delivery failed, None if it succeeded
+        """
+        target = httpx.URL(url)
+        body = json.dumps({"events": payloads}, separators=(",", ":")).encode()
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            ID_HEADER: str(uuid4()),
+            TIMESTAMP_HEADER: timestamp,
+            SIGNATURE_HEADER: WebhookService.sign(secret, timestamp, body),
+        }
+        extensions = {}
+        if not settings.WEBHOOK_ALLOW_PRIVATE_URLS:
+            if target.scheme != "https":
+                return "URL not allowed"
+            try:
+                address, *_ = await resolve_public_async(target.host, target.port or 443)
+            except UnresolvableHostError:
+                return "DNS error"
+            except PrivateAddressError:
+                return "URL not allowed"
+            headers["Host"] = target.netloc.decode()
+            extensions["sni_hostname"] = target.host
+            target = target.copy_with(host=address)
+        try:
+            response = await client.post(
+                target, content=body, headers=headers, extensions=extensions
+            )
+        except httpx.TimeoutException:
+            return "Timeout"
+        except httpx.HTTPError as exc:
+            logger.debug("webhook request to %s failed: %r", url, exc)
+            return "Connection error"
+        if response.is_success:
+            return None
+        return f"HTTP {response.status_code}"
+
+    @staticmethod
+    def prune(db: SessionDep, now: datetime | None = None) -> int:
+        """Delete delivered and dead-lettered rows older than WEBHOOK_RETENTION_DAYS.
+
+        Returns:
+            int: number of rows deleted
+        """
+        cutoff = (now or datetime.now(UTC)) - timedelta(days=settings.WEBHOOK_RETENTION_DAYS)
+        deleted = db.exec(
+            delete(WebhookDelivery).where(
+                WebhookDelivery.status != WebhookDeliveryStatus.PENDING,
+                WebhookDelivery.created_at < cutoff,
+            )
+        ).rowcount
+        db.commit()
+        return deleted
+
+
+class WebhookDispatcher:
+    """Delivers the outbox from an asyncio event loop running in a background thread.
+
+    Each pass first writes the deliveries of newly logged events (see
+    WebhookService.fan_out, at most fanout_limit events per endpoint), then
+    claims due deliveries (see WebhookService.claim), groups them per
+    endpoint into batches of batch_size events and sends each batch as one
+    signed request, concurrently, at most max_concurrency requests per endpoint.
+    A slow or failing endpoint thus only delays its own deliveries, and never
+    the requests that produced them.
+
+    The loop runs again whenever a request completes, when wake() is called
+    (after a commit logs events), at once while a pass found work and every
+    poll_interval seconds otherwise.
+    Delivery is at least once: receivers should deduplicate on the event id.
+    Concurrency limits are per process.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        timeout: float,
+        poll_interval: float,
+        fanout_limit: int,
+        name: str = "webhooks",
+    ):
+        self.batch_size = batch_size
+        self.fanout_limit = fanout_limit
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.name = name
+
+        # Batches being delivered per endpoint, only touched by the event loop
+        self._in_flight: dict[UUID, int] = {}
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup = asyncio.Event()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def start(self) -> None:
+        """Start the event loop thread (no-op once started)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._main, args=(self._loop,), name=f"{self.name}-dispatcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop claiming, wait for the requests in flight and stop the thread.
+
+        Requests still running after timeout are abandoned: their leases expire
+        and the deliveries are retried.
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+        self.wake()
+        thread.join(timeout)
+        with self._lock:
+            self._thread = None
+
+    def wake(self) -> None:
+        """Ask the loop to run a pass now; thread-safe, no-op when not running."""
+        loop = self._loop
+        if loop is None:
+            return
+        with suppress(RuntimeError):  # loop already closed
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _main(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.run_until_complete(self._run())
+        finally:
+            self._loop = None
+            loop.close()
+
+    async def _run(self) -> None:
+        tasks: set[asyncio.Task] = set()
+        async with httpx.AsyncClient(
+            timeout=self.timeout, headers={"User-Agent": USER_AGENT}
+        ) as client:
+            while not self._stopping:
+                self._wakeup.clear()
+                try:
+                    fanned_out = await asyncio.to_thread(WebhookService.fan_out, self.fanout_limit)
+                except Exception:
+                    logger.exception("%s: writing deliveries failed", self.name)
+                    fanned_out = 0
+                try:
+                    claimed = await asyncio.to_thread(
+                        WebhookService.claim, dict(self._in_flight), self.batch_size
+                    )
+                except Exception:
+                    logger.exception("%s: claiming deliveries failed", self.name)
+                    claimed = []
+
+                for batch in self._batches(claimed):
+                    endpoint_id = batch[0].endpoint_id
+                    self._in_flight[endpoint_id] = self._in_flight.get(endpoint_id, 0) + 1
+                    task = asyncio.create_task(self._deliver(client, batch))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                if not claimed and not fanned_out:
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+
+            if tasks:
+                _, pending = await asyncio.wait(tasks, timeout=self.timeout)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def _batches(self, claimed: list) -> list[tuple]:
+        """Split claimed rows, grouped by endpoint, into per-endpoint batches."""
+        per_endpoint: dict[UUID, list] = defaultdict(list)
+        for row in claimed:
+            per_endpoint[row.endpoint_id].append(row)
+        return [
+            batch
+            for rows in per_endpoint.values()
+            for batch in batched(rows, self.batch_size, strict=False)
+        ]
+
+    async def _deliver(self, client: httpx.AsyncClient, batch: tuple) -> None:
+        endpoint_id, url = batch[0].endpoint_id, batch[0].url
+        try:
+            error = await WebhookService.send(
+                client, url, batch[0].secret, [row.payload for row in batch]
+            )
+            if error is not None:
+                logger.warning(
+                    "%s: delivery of %d event(s) to %s failed: %s",
+                    self.name,
+                    len(batch),
+                    url,
+                    error,
+                )
+            await asyncio.to_thread(WebhookService.settle, batch, error)
+        except Exception:
+            logger.exception("%s: settling deliveries to %s failed", self.name, url)
+        finally:
+            self._in_flight[endpoint_id] -= 1
+            if not self._in_flight[endpoint_id]:
+                del self._in_flight[endpoint_id]
+            self._wakeup.set()
+
+
+webhook_dispatcher = WebhookDispatcher(
+    batch_size=settings.WEBHOOK_BATCH_SIZE,
+    timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+    poll_interval=settings.WEBHOOK_POLL_INTERVAL_SECONDS,
+    fanout_limit=settings.WEBHOOK_FANOUT_LIMIT,
+)
@@ -0,0 +1,69 @@
+import hashlib
+
+from fastapi import Response, status
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the values that identify a representation.
+
+    Args:
+        *parts: values (ids, timestamps, filters...) the response depends on.
+    Returns:
+        str: quoted ETag value.
+    """
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def etag_for_body(body: bytes) -> str:
+    """Strong ETag derived from the bytes of a pre-serialized response body."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current ETag.
+
+    Args:
+        if_none_match (str | None): raw If-None-Match header value.
+        etag (str): current ETag of the resource.
+    Returns:
+        bool: True if the client copy is still fresh.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """
+    Check whether an Accept-Encoding header allows a gzip-encoded response.
+
+    Args:
+        accept_encoding (str | None): raw Accept-Encoding header value.
+    Returns:
+        bool: True if gzip, or failing that *, is listed with a non-zero q.
+    """
+    qualities = {}
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        quality = params.strip().lower().removeprefix("q=") or "1"
+        try:
+            qualities[name.strip().lower()] = float(quality)
+        except ValueError:
+            continue
+    # An explicit gzip entry wins over the * wildcard
+    return qualities.get("gzip", qualities.get("*", 0)) > 0
+
+
+def not_modified(etag: str, cache_control: str | None = None) -> Response:
+    """Empty 304 response carrying the validators of the cached representation."""
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
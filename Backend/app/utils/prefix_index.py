@@ -0,0 +1,62 @@
+import heapq
+import threading
+from bisect import bisect_left
+from typing import NamedTuple
+from uuid import UUID
+
+
+class IndexEntry(NamedTuple):
+    id: UUID
+    name: str
+    slug: str
+    usage_count: int
+
+
+class PrefixIndex:
+    """
+    Sorted array of slugs answering prefix queries with bisect.
+
+    Matches for a prefix are a contiguous slice of the sorted slugs, so a lookup
+    is two binary searches plus a top-k selection by usage over that slice.
+    """
+
+    def __init__(self, entries: list[IndexEntry] | None = None):
+        self._lock = threading.Lock()
+        self._entries: dict[str, IndexEntry] = {}
+        self._slug_by_id: dict[UUID, str] = {}
+        for entry in entries or []:
+            self._entries[entry.slug] = entry
+            self._slug_by_id[entry.id] = entry.slug
+        self._slugs = sorted(self._entries)
+
+    def increment(self, tag_id: UUID, delta: int) -> bool:
+        """
+        Adjust the usage of a known entry.
+
+        Returns:
+            bool: False if the id is not indexed.
+        """
+        with self._lock:
+            slug = self._slug_by_id.get(tag_id)
+            if slug is None:
+                return False
+            entry = self._entries[slug]
+            self._entries[slug] = entry._replace(usage_count=entry.usage_count + delta)
+            return True
+
+    def search(self, prefix: str, limit: int = 10) -> list[IndexEntry]:
+        """
+        Most used entries whose slug starts with prefix.
+
+        Args:
+            prefix (str): slug prefix to match.
+            limit (int): maximum number of entries to return.
+        Returns:
+            list[IndexEntry]: entries ordered by usage (desc) then slug.
+        """
+        with self._lock:
+            lo = bisect_left(self._slugs, prefix)
+            hi = bisect_left(self._slugs, prefix + "\uffff", lo)
+            matches = [self._entries[slug] for slug in self._slugs[lo:hi]]
+        matches = [entry for entry in matches if entry.usage_count > 0]
+        return heapq.nsmallest(limit, matches, key=lambda e: (-e.usage_count, e.slug))
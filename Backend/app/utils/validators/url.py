@@ -0,0 +1,69 @@
+import asyncio
+import ipaddress
+import socket
+
+
+class UnresolvableHostError(ValueError):
+    """The host of a URL has no address."""
+
+
+class PrivateAddressError(ValueError):
+    """The host of a URL resolves to an address outbound requests must not reach."""
+
+
+def is_public_address(address: str) -> bool:
+    """
+    Whether an IP address is globally routable unicast.
+
+    Loopback, private, shared (CGNAT), link-local (cloud metadata), reserved,
+    unspecified and multicast addresses are not, including IPv4 addresses
+    mapped into IPv6.
+
+    Args:
+        address (str): IPv4 or IPv6 address, optionally with an IPv6 zone.
+    Returns:
+        bool: True if requests may be sent to it.
+    """
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def _public_addresses(host: str, infos: list) -> list[str]:
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    if not addresses:
+        raise UnresolvableHostError(host)
+    # One private address is enough to refuse: the client may pick any of them
+    if not all(is_public_address(address) for address in addresses):
+        raise PrivateAddressError(host)
+    return addresses
+
+
+def resolve_public(host: str, port: int) -> list[str]:
+    """
+    Resolve a host, refusing it unless every address is public.
+
+    Args:
+        host (str): host name or IP address literal.
+        port (int): port the request will go to.
+    Returns:
+        list[str]: addresses of the host, in resolver order.
+    Raises:
+        UnresolvableHostError: the host does not resolve.
+        PrivateAddressError: an address is not public.
+    """
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError) as exc:
+        raise UnresolvableHostError(host) from exc
+    return _public_addresses(host, infos)
+
+
+async def resolve_public_async(host: str, port: int) -> list[str]:
+    """resolve_public() without blocking the running event loop."""
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError) as exc:
+        raise UnresolvableHostError(host) from exc
+    return _public_addresses(host, infos)
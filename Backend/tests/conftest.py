@@ -4,13 +4,47 @@ Pytest configuration and fixtures.
 This file contains shared fixtures and configuration for all tests.
 """
 
+from collections.abc import Iterable
+from uuid import UUID, uuid4
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
 
 from app.main import app
+from app.models.testimonial import StatusType
+from app.services.changes import TestimonialState
 
 
 @pytest.fixture
 def client():
     """Provide a TestClient for testing endpoints."""
     return TestClient(app)
+
+
+def testimonial_state(
+    status: StatusType = StatusType.PENDING,
+    *,
+    product_id: str = "prod-1",
+    is_active: bool = True,
+    rating: int = 5,
+    category_id: UUID | None = None,
+    tag_ids: Iterable[UUID] = (),
+) -> TestimonialState:
+    """Build the state of a new testimonial for the apply_changes tests."""
+    return TestimonialState(
+        id=uuid4(),
+        product_id=product_id,
+        status=status,
+        is_active=is_active,
+        rating=rating,
+        category_id=category_id,
+        tag_ids=frozenset(tag_ids),
+    )
+
+
+def compiled_statements(mock_db) -> list:
+    """Statements executed on a mocked session, compiled for Postgres."""
+    return [
+        call.args[0].compile(dialect=postgresql.dialect()) for call in mock_db.exec.call_args_list
+    ]
@@ -0,0 +1,99 @@
+"""Tests for the in-process response cache."""
+
+import threading
+from unittest.mock import Mock
+
+from app.core.cache import ResponseCache
+
+
+def test_get_or_set_builds_once():
+    cache = ResponseCache(ttl_seconds=60)
+    build = Mock(return_value=b"[]")
+
+    first = cache.get_or_set("scope", "key", build)
+    second = cache.get_or_set("scope", "key", build)
+
+    assert first is second
+    assert first.body == b"[]"
+    build.assert_called_once()
+
+
+def test_expired_entries_are_rebuilt():
+    cache = ResponseCache(ttl_seconds=-1)
+    build = Mock(return_value=b"[]")
+
+    cache.get_or_set("scope", "key", build)
+    cache.get_or_set("scope", "key", build)
+
+    assert build.call_count == 2
+
+
+def test_invalidate_scope_keeps_other_scopes():
+    cache = ResponseCache(ttl_seconds=60)
+    cache.set("a", 1, b"a")
+    cache.set("b", 1, b"b")
+
+    cache.invalidate("a")
+
+    assert cache.get("a", 1) is None
+    assert cache.get("b", 1).body == b"b"
+
+    cache.invalidate()
+    assert cache.get("b", 1) is None
+
+
+def test_body_built_across_an_invalidation_is_not_stored():
+    cache = ResponseCache(ttl_seconds=60)
+
+    def build():
+        cache.invalidate("scope")
+        return b"stale"
+
+    assert cache.get_or_set("scope", "key", build).body == b"stale"
+    assert cache.get("scope", "key") is None
+
+
+def test_concurrent_misses_build_once():
+    cache = ResponseCache(ttl_seconds=60)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def build():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return b"[]"
+
+    first = threading.Thread(target=cache.get_or_set, args=("scope", "key", build))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=cache.get_or_set, args=("scope", "key", build))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert len(calls) == 1
+
+
+def test_max_entries_drops_oldest_key_of_scope():
+    cache = ResponseCache(ttl_seconds=60, max_entries=2)
+    cache.set("scope", 1, b"1")
+    cache.set("scope", 2, b"2")
+    cache.set("scope", 3, b"3")
+
+    assert cache.get("scope", 1) is None
+    assert cache.get("scope", 3).body == b"3"
+
+
+def test_surrogate_keys_are_derived_once_per_build():
+    cache = ResponseCache(ttl_seconds=60)
+    derive = Mock(return_value=["tenant:a", "testimonial:1"])
+
+    first = cache.get_or_set("scope", "key", lambda: b"body", derive)
+    second = cache.get_or_set("scope", "key", lambda: b"body", derive)
+
+    assert first.surrogate_keys == ("tenant:a", "testimonial:1")
+    assert second is first
+    derive.assert_called_once_with(b"body")
@@ -0,0 +1,74 @@
+"""Tests for the ring buffer."""
+
+import threading
+
+from app.core.ring_buffer import RingBuffer
+
+
+class Recorder:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.flushed = threading.Event()
+
+    def __call__(self, items):
+        self.flushed.set()
+        if self.fail:
+            raise RuntimeError("database down")
+        self.batches.append(list(items))
+
+
+def test_drain_returns_events_oldest_first():
+    buffer = RingBuffer(Recorder(), capacity=4, flush_interval=60.0, name="test")
+    buffer.extend([1, 2, 3])
+
+    assert buffer.drain() == [1, 2, 3]
+    assert buffer.drain() == []
+    buffer.stop()
+
+
+def test_full_buffer_overwrites_oldest_events():
+    buffer = RingBuffer(Recorder(), capacity=3, flush_interval=60.0, name="test")
+    buffer._thread = object()  # no worker: drain by hand
+
+    buffer.extend(range(5))
+    assert buffer.dropped == 2
+    assert buffer.drain() == [2, 3, 4]
+
+    buffer.extend([5, 6])
+    assert buffer.drain() == [5, 6]
+
+
+def test_half_full_buffer_is_flushed_without_waiting_for_interval():
+    flush = Recorder()
+    buffer = RingBuffer(flush, capacity=4, flush_interval=60.0, name="test")
+
+    buffer.extend([1, 2])
+
+    assert flush.flushed.wait(5)
+    buffer.stop()
+    assert flush.batches == [[1, 2]]
+
+
+def test_stop_flushes_stored_events():
+    flush = Recorder()
+    buffer = RingBuffer(flush, capacity=100, flush_interval=60.0, name="test")
+    buffer.append("a")
+
+    buffer.stop()
+
+    assert flush.batches == [["a"]]
+    assert len(buffer) == 0
+
+
+def test_failed_flush_drops_events_and_keeps_running():
+    flush = Recorder(fail=True)
+    buffer = RingBuffer(flush, capacity=4, flush_interval=60.0, name="test")
+
+    buffer.extend([1, 2])
+    assert flush.flushed.wait(5)
+    flush.fail = False
+    buffer.append(3)
+    buffer.stop()
+
+    assert flush.batches == [[3]]
@@ -0,0 +1,60 @@
+"""Tests for the moderation stream tokens."""
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.deps import get_current_user, get_stream_user
+from app.core.jwt import create_access_token, create_stream_token
+from app.models.user import Roles
+
+
+def _session(role=Roles.MODERATOR, is_active=True):
+    session = Mock()
+    session.get.return_value = SimpleNamespace(id=uuid4(), role=role, is_active=is_active)
+    return session
+
+
+def test_stream_tokens_open_streams():
+    session = _session()
+    user_id = str(uuid4())
+
+    user = get_stream_user(session, create_stream_token({"sub": user_id}))
+
+    assert user is session.get.return_value
+    assert session.get.call_args.args[1] == user_id
+
+
+def test_access_tokens_are_not_stream_tokens():
+    with pytest.raises(HTTPException) as exc_info:
+        get_stream_user(_session(), create_access_token({"sub": str(uuid4())}))
+
+    assert exc_info.value.status_code == 401
+
+
+def test_stream_tokens_are_not_access_tokens():
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(get_current_user(create_stream_token({"sub": str(uuid4())}), _session()))
+
+    assert exc_info.value.status_code == 401
+
+
+def test_expired_stream_tokens_are_refused():
+    token = create_stream_token({"sub": str(uuid4())}, timedelta(seconds=-1))
+
+    with pytest.raises(HTTPException) as exc_info:
+        get_stream_user(_session(), token)
+
+    assert exc_info.value.detail == "El token ha expirado."
+
+
+def test_inactive_users_are_refused():
+    with pytest.raises(HTTPException) as exc_info:
+        get_stream_user(_session(is_active=False), create_stream_token({"sub": str(uuid4())}))
+
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,145 @@
+"""Tests for the write-behind buffer."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from app.core.write_behind import BufferFull, WriteBehindBuffer
+
+
+class Recorder:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+        self.flushed = threading.Event()
+
+    def __call__(self, items):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("database down")
+        self.batches.append(list(items))
+        self.flushed.set()
+
+
+def _buffer(flush, **kwargs):
+    options = {"max_items": 100, "batch_size": 3, "flush_interval": 60.0} | kwargs
+    return WriteBehindBuffer(flush, name="test", **options)
+
+
+def test_full_batch_is_flushed_without_waiting_for_interval():
+    flush = Recorder()
+    buffer = _buffer(flush)
+
+    for i in range(3):
+        buffer.submit({"n": i})
+
+    assert flush.flushed.wait(5)
+    buffer.stop()
+    assert flush.batches == [[{"n": 0}, {"n": 1}, {"n": 2}]]
+
+
+def test_partial_batch_is_flushed_after_interval():
+    flush = Recorder()
+    buffer = _buffer(flush, flush_interval=0.01)
+
+    buffer.submit({"n": 1})
+
+    assert flush.flushed.wait(5)
+    buffer.stop()
+    assert flush.batches == [[{"n": 1}]]
+
+
+def test_stop_flushes_pending_items():
+    flush = Recorder()
+    buffer = _buffer(flush)
+    buffer.submit({"n": 1})
+
+    buffer.stop()
+
+    assert flush.batches == [[{"n": 1}]]
+    assert len(buffer) == 0
+
+
+def test_submit_raises_when_full():
+    buffer = _buffer(Recorder(), max_items=2)
+    buffer.submit({"n": 1})
+    buffer.submit({"n": 2})
+
+    with pytest.raises(BufferFull):
+        buffer.submit({"n": 3})
+    buffer.stop()
+
+
+def test_failed_flush_is_retried_in_order():
+    flush = Recorder(fail_times=1)
+    buffer = _buffer(flush, flush_interval=0.01, retry_backoff=0.01)
+
+    buffer.submit({"n": 1})
+    buffer.submit({"n": 2})
+
+    assert flush.flushed.wait(5)
+    buffer.stop()
+    assert flush.batches == [[{"n": 1}, {"n": 2}]]
+
+
+def test_unflushed_items_are_replayed_from_journal(tmp_path):
+    failing = _buffer(Recorder(fail_times=100), journal_dir=str(tmp_path), retry_backoff=0.01)
+    failing.submit({"n": 1})
+    failing.submit({"n": 2})
+    failing.stop()
+
+    (journal,) = tmp_path.glob("test-*.ndjson")
+    assert [json.loads(line) for line in journal.read_text().splitlines()] == [{"n": 1}, {"n": 2}]
+
+    flush = Recorder()
+    replaying = _buffer(flush, journal_dir=str(tmp_path))
+    replaying.start()
+    replaying.stop()
+
+    assert flush.batches == [[{"n": 1}, {"n": 2}]]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_live_journal_is_not_replayed_by_another_buffer(tmp_path):
+    owner = _buffer(Recorder(), journal_dir=str(tmp_path))
+    owner.submit({"n": 1})
+
+    flush = Recorder()
+    other = _buffer(flush, journal_dir=str(tmp_path))
+    other.start()
+    other.stop()
+    owner.stop()
+
+    assert flush.batches == []
+
+
+def test_journal_only_keeps_pending_items_after_a_flush(tmp_path):
+    flush = Recorder()
+    buffer = _buffer(flush, batch_size=2, journal_dir=str(tmp_path))
+    for i in range(3):
+        buffer.submit({"n": i})
+
+    assert flush.flushed.wait(5)
+    (journal,) = tmp_path.glob("test-*.ndjson")
+    # Compacted right after the flush returns
+    deadline = time.monotonic() + 5
+    while len(journal.read_text().splitlines()) > 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [json.loads(line) for line in journal.read_text().splitlines()] == [{"n": 2}]
+    buffer.submit({"n": 3})
+    buffer.stop()
+
+    assert flush.batches == [[{"n": 0}, {"n": 1}], [{"n": 2}, {"n": 3}]]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_leftovers_of_an_interrupted_compaction_are_removed(tmp_path):
+    (tmp_path / "test-1-dead.compacting").write_text('{"n": 1}\n')
+
+    buffer = _buffer(Recorder(), journal_dir=str(tmp_path))
+    buffer.start()
+    buffer.stop()
+
+    assert list(tmp_path.iterdir()) == []
@@ -1,7 +1,15 @@
+from uuid import uuid4
+
 import pytest
 from pydantic import ValidationError
 
-from app.schemas import CategoryCreate, TagCreate, TestimonialCreate, UserCreate
+from app.schemas import (
+    CategoryCreate,
+    TagCreate,
+    TestimonialBulkModeration,
+    TestimonialCreate,
+    UserCreate,
+)
 from app.utils.validators.slug import generate_slug
 
 
@@ -24,6 +32,16 @@ def test_testimonial_create():
     assert t.content.content == "Contenido suficientemente largo"
 
 
+def test_testimonial_bulk_moderation_requires_ids_or_filters():
+    with pytest.raises(ValidationError):
+        TestimonialBulkModeration(action="approve")
+    with pytest.raises(ValidationError):
+        TestimonialBulkModeration(action="approve", ids=[uuid4()], filters={"status": "pending"})
+
+    bulk = TestimonialBulkModeration(action="reject", filters={"status": "pending"})
+    assert bulk.filters.status == "pending"
+
+
 def test_usercreate_password_less_8_characters():
     with pytest.raises(ValidationError):
         UserCreate(
@@ -0,0 +1,283 @@
+"""Tests for AnalyticsService."""
+
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.core.db import _run_after_commit
+from app.models.testimonial import StatusType
+from app.schemas.analytics import AnalyticsDimension, AnalyticsInterval
+from app.services import analytics
+from app.services.analytics import AnalyticsService, build_facts
+from app.services.changes import TestimonialChange
+
+JAN = datetime(2025, 1, 15, 12, tzinfo=UTC)
+FEB = datetime(2025, 2, 3, 9, tzinfo=UTC)
+
+
+def _row(
+    product="p1",
+    author="Ana",
+    rating=5,
+    created_at=JAN,
+    status=StatusType.APPROVED,
+    category="shoes",
+):
+    return (uuid4(), product, author, rating, created_at, status, category)
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    analytics._facts_cache.clear()
+    analytics._generations.clear()
+    yield
+    analytics._facts_cache.clear()
+    analytics._generations.clear()
+
+
+class TestBuildFacts:
+    def test_columns_are_dictionary_encoded(self):
+        rows = [
+            _row(author=" Ana "),
+            _row(product="p2", author="ana", rating=None, category=None),
+            _row(author=None, status=StatusType.PENDING),
+        ]
+
+        facts = build_facts(rows, [])
+
+        assert len(facts) == 3
+        assert facts.products == ("p1", "p2")
+        assert facts.product.tolist() == [0, 1, 0]
+        assert facts.categories == ("shoes",)
+        assert facts.category.tolist() == [0, -1, 0]
+        # Authors are compared case- and whitespace-insensitively
+        assert facts.authors == ("ana",)
+        assert facts.author.tolist() == [0, 0, -1]
+        assert facts.rating.tolist() == [5, 0, 5]
+        assert facts.status.tolist() == [
+            analytics._STATUS_CODES[StatusType.APPROVED],
+            analytics._STATUS_CODES[StatusType.APPROVED],
+            analytics._STATUS_CODES[StatusType.PENDING],
+        ]
+        assert facts.created_at[0] == int(JAN.timestamp())
+
+    def test_tags_are_grouped_per_testimonial(self):
+        rows = [_row(), _row(), _row()]
+        tag_rows = [
+            (rows[2][0], "fast"),
+            (rows[0][0], "fast"),
+            (rows[2][0], "cheap"),
+            (uuid4(), "unknown testimonial"),
+        ]
+
+        facts = build_facts(rows, tag_rows)
+
+        assert facts.tag_offsets.tolist() == [0, 1, 1, 3]
+        assert [facts.tags[code] for code in facts.tag_codes] == ["fast", "fast", "cheap"]
+
+    def test_no_rows(self):
+        facts = build_facts([], [])
+
+        assert len(facts) == 0
+        assert facts.tag_offsets.tolist() == [0]
+        assert AnalyticsService.rating_breakdown(facts) == []
+        assert AnalyticsService.tag_cooccurrence(facts) == []
+        assert AnalyticsService.author_counts(facts) == []
+
+
+class TestRatingBreakdown:
+    def test_whole_range(self):
+        facts = build_facts([_row(rating=rating) for rating in (1, 4, 5, 5, None)], [])
+
+        (overall,) = AnalyticsService.rating_breakdown(facts, percentiles=[25, 50, 100])
+
+        assert overall.group is None
+        assert overall.period is None
+        assert overall.count == 4
+        assert overall.average_rating == 3.75
+        assert overall.histogram == {1: 1, 2: 0, 3: 0, 4: 1, 5: 2}
+        assert overall.percentiles == {25: 1, 50: 4, 100: 5}
+
+    def test_by_category_and_month(self):
+        facts = build_facts(
+            [
+                _row(rating=5),
+                _row(rating=3, created_at=FEB),
+                _row(rating=4, category=None),
+                _row(rating=2, category="hats"),
+                _row(rating=1, category="hats"),
+            ],
+            [],
+        )
+
+        breakdown = AnalyticsService.rating_breakdown(
+            facts, AnalyticsDimension.CATEGORY, AnalyticsInterval.MONTH
+        )
+
+        # Largest groups first, periods in order
+        assert [(entry.group, entry.period, entry.count) for entry in breakdown] == [
+            ("shoes", date(2025, 1, 1), 1),
+            ("shoes", date(2025, 2, 1), 1),
+            ("hats", date(2025, 1, 1), 2),
+            (None, date(2025, 1, 1), 1),
+        ]
+        assert breakdown[2].average_rating == 1.5
+        assert breakdown[2].percentiles == {50: 1, 90: 2}
+
+    def test_weeks_start_on_monday(self):
+        sunday = datetime(2025, 1, 19, 23, tzinfo=UTC)
+        facts = build_facts(
+            [_row(created_at=sunday), _row(created_at=sunday + timedelta(hours=1))], []
+        )
+
+        breakdown = AnalyticsService.rating_breakdown(facts, interval=AnalyticsInterval.WEEK)
+
+        assert [entry.period for entry in breakdown] == [date(2025, 1, 13), date(2025, 1, 20)]
+
+    def test_filters_and_limit(self):
+        facts = build_facts(
+            [
+                _row(product="p1"),
+                _row(product="p1"),
+                _row(product="p2"),
+                _row(product="p3", status=StatusType.PENDING),
+                _row(product="p2", created_at=FEB),
+            ],
+            [],
+        )
+
+        breakdown = AnalyticsService.rating_breakdown(
+            facts,
+            AnalyticsDimension.PRODUCT,
+            limit=1,
+            status=StatusType.APPROVED,
+            until=datetime(2025, 2, 1),
+        )
+
+        assert [(entry.group, entry.count) for entry in breakdown] == [("p1", 2)]
+
+
+class TestTagCooccurrence:
+    def test_pairs_are_counted_once_per_testimonial(self):
+        rows = [_row(), _row(), _row(status=StatusType.REJECTED)]
+        tag_rows = [
+            (rows[0][0], "fast"),
+            (rows[0][0], "cheap"),
+            (rows[0][0], "blue"),
+            (rows[1][0], "cheap"),
+            (rows[1][0], "fast"),
+            (rows[2][0], "blue"),
+            (rows[2][0], "cheap"),
+        ]
+        facts = build_facts(rows, tag_rows)
+
+        pairs = AnalyticsService.tag_cooccurrence(facts)
+        approved = AnalyticsService.tag_cooccurrence(facts, status=StatusType.APPROVED, limit=1)
+
+        assert [(set(pair.tags), pair.count) for pair in pairs] == [
+            ({"fast", "cheap"}, 2),
+            ({"cheap", "blue"}, 2),
+            ({"fast", "blue"}, 1),
+        ]
+        assert [(set(pair.tags), pair.count) for pair in approved] == [({"fast", "cheap"}, 2)]
+
+
+class TestAuthorCounts:
+    def test_distinct_authors_per_product(self):
+        facts = build_facts(
+            [
+                _row(product="p1", author="Ana"),
+                _row(product="p1", author="ANA"),
+                _row(product="p1", author=None),
+                _row(product="p2", author="Ana"),
+                _row(product="p2", author="Bo"),
+            ],
+            [],
+        )
+
+        counts = AnalyticsService.author_counts(facts)
+
+        assert [(c.product_id, c.testimonials, c.authors) for c in counts] == [
+            ("p2", 2, 2),
+            ("p1", 3, 1),
+        ]
+
+
+class TestGetFacts:
+    def _db(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        # Testimonials on the first query of each load, no tags on the second
+        mock_db.exec.return_value.all.side_effect = lambda: (
+            [_row()] if mock_db.exec.call_count % 2 else []
+        )
+        return mock_db
+
+    def test_facts_are_cached(self):
+        mock_db = self._db()
+        tenant_owner_id = uuid4()
+
+        first = AnalyticsService.get_facts(mock_db, tenant_owner_id)
+        second = AnalyticsService.get_facts(mock_db, tenant_owner_id)
+
+        assert first is second
+        assert len(first) == 1
+        assert mock_db.exec.call_count == 2
+
+    def test_expired_facts_are_reloaded(self):
+        mock_db = self._db()
+        tenant_owner_id = uuid4()
+
+        with patch("app.services.analytics.settings.ANALYTICS_CACHE_TTL_SECONDS", 0):
+            AnalyticsService.get_facts(mock_db, tenant_owner_id)
+            AnalyticsService.get_facts(mock_db, tenant_owner_id)
+
+        assert mock_db.exec.call_count == 4
+
+    def test_oldest_tenant_is_evicted(self):
+        mock_db = self._db()
+        tenants = [uuid4() for _ in range(3)]
+
+        with patch("app.services.analytics.settings.ANALYTICS_CACHE_MAX_TENANTS", 2):
+            for tenant_owner_id in tenants:
+                AnalyticsService.get_facts(mock_db, tenant_owner_id)
+
+        assert list(analytics._facts_cache) == tenants[1:]
+
+    def test_changes_invalidate_after_commit(self):
+        mock_db = self._db()
+        tenant_owner_id = uuid4()
+        AnalyticsService.get_facts(mock_db, tenant_owner_id)
+
+        AnalyticsService.apply_changes(mock_db, [TestimonialChange(tenant_owner_id, None, None)])
+        assert tenant_owner_id in analytics._facts_cache
+
+        _run_after_commit(mock_db)
+        assert tenant_owner_id not in analytics._facts_cache
+
+    def test_load_racing_with_a_write_is_not_cached(self):
+        mock_db = self._db()
+        tenant_owner_id = uuid4()
+
+        def build_during_write(rows, tag_rows):
+            AnalyticsService.invalidate([tenant_owner_id])
+            return build_facts(rows, tag_rows)
+
+        with patch("app.services.analytics.build_facts", side_effect=build_during_write):
+            facts = AnalyticsService.get_facts(mock_db, tenant_owner_id)
+
+        assert len(facts) == 1
+        assert tenant_owner_id not in analytics._facts_cache
+
+
+def test_period_starts_of_months_and_years():
+    created_at = np.array([int(JAN.timestamp()), int(FEB.timestamp())])
+
+    months = analytics._period_starts(created_at, AnalyticsInterval.MONTH)
+    years = analytics._period_starts(created_at, AnalyticsInterval.YEAR)
+
+    assert months.tolist() == [date(2025, 1, 1), date(2025, 2, 1)]
+    assert years.tolist() == [date(2025, 1, 1), date(2025, 1, 1)]
@@ -3,6 +3,7 @@
 from unittest.mock import Mock
 from uuid import uuid4
 
+from app.models.api_key import APIKey
 from app.services.api_keys import APIKeyService
 
 
@@ -146,6 +147,25 @@ class TestVerifyAPIKey:
 
         assert result is None
 
+    def test_verify_api_key_caches_verified_key(self):
+        """Test that a verified key is served from memory until revoked."""
+        raw, prefix, digest = APIKeyService.generate_api_key_pair()
+        key = APIKey(id=uuid4(), prefix=prefix, secret_digest=digest, user_id=uuid4())
+        mock_db = Mock()
+        mock_db.exec.return_value.first.return_value = key
+
+        first = APIKeyService.verify_api_key(mock_db, raw)
+        second = APIKeyService.verify_api_key(mock_db, raw)
+
+        assert first.user_id == second.user_id == key.user_id
+        assert mock_db.exec.call_count == 1
+
+        mock_db.get.return_value = key
+        APIKeyService.revoke_api_key(mock_db, key.id, key.user_id)
+        mock_db.exec.return_value.first.return_value = None
+
+        assert APIKeyService.verify_api_key(mock_db, raw) is None
+
 
 class TestListAPIKeys:
     """Tests for list_api_keys function."""
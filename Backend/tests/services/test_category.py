@@ -2,6 +2,8 @@
 
 from unittest.mock import Mock
 
+from sqlalchemy.dialects import postgresql
+
 from app.models.category import Category
 from app.services.category import CategoryService
 
@@ -24,19 +26,69 @@ def test_get_or_create_category_returns_existing():
 
 def test_get_or_create_category_creates_new():
     mock_db = Mock()
+    created = Category(name="new category", slug="new-category")
 
-    # No existing category
-    exec_result = Mock()
-    exec_result.first.return_value = None
-    mock_db.exec.return_value = exec_result
+    # No existing category, then INSERT ... RETURNING
+    select_result = Mock()
+    select_result.first.return_value = None
+    insert_result = Mock()
+    insert_result.scalar_one_or_none.return_value = created
+    mock_db.exec.side_effect = [select_result, insert_result]
 
     result = CategoryService.get_or_create_category("  New Category  ", mock_db)
 
-    assert result.name == "new category"
-    assert result.slug == "new-category"
-    mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
-    mock_db.refresh.assert_called_once_with(result)
+    assert result is created
+    insert_stmt = mock_db.exec.call_args_list[1].args[0]
+    params = insert_stmt.compile(dialect=postgresql.dialect()).params
+    assert params["name"] == "new category"
+    assert params["slug"] == "new-category"
+    assert "ON CONFLICT (slug) DO NOTHING" in str(insert_stmt.compile(dialect=postgresql.dialect()))
+    mock_db.commit.assert_not_called()
+
+
+def test_get_or_create_category_reselects_on_conflict():
+    mock_db = Mock()
+    raced = Category(name="raced", slug="raced")
+
+    select_result = Mock()
+    select_result.first.return_value = None
+    insert_result = Mock()
+    insert_result.scalar_one_or_none.return_value = None
+    reselect_result = Mock()
+    reselect_result.one.return_value = raced
+    mock_db.exec.side_effect = [select_result, insert_result, reselect_result]
+
+    assert CategoryService.get_or_create_category("Raced", mock_db) is raced
+
+
+def test_get_or_create_categories_creates_missing_in_bulk():
+    mock_db = Mock()
+    existing = Category(name="books", slug="books")
+    created = Category(name="new category", slug="new-category")
+
+    select_result = Mock()
+    select_result.all.return_value = [existing]
+    insert_result = Mock()
+    insert_result.scalars.return_value = [created]
+    mock_db.exec.side_effect = [select_result, insert_result]
+
+    result = CategoryService.get_or_create_categories(
+        ["New Category", "Books", "new category"], mock_db
+    )
+
+    # Deduplicated by slug, in input order
+    assert result == [created, existing]
+    assert mock_db.exec.call_count == 2
+    insert_sql = str(mock_db.exec.call_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (slug) DO NOTHING" in insert_sql
+    mock_db.commit.assert_not_called()
+
+
+def test_get_or_create_categories_empty_list_skips_queries():
+    mock_db = Mock()
+
+    assert CategoryService.get_or_create_categories([], mock_db) == []
+    mock_db.exec.assert_not_called()
 
 
 def test_get_all_categories_returns_list():
@@ -54,3 +106,28 @@ def test_get_all_categories_returns_list():
     assert len(result) == 2
     assert result[0] is c1
     assert result[1] is c2
+
+
+def test_get_catalog_is_cached_per_tenant_until_invalidated():
+    from uuid import uuid4
+
+    from app.services.category import _catalog_cache
+
+    _catalog_cache.invalidate()
+    tenant_owner_id = uuid4()
+    mock_db = Mock()
+    exec_result = Mock()
+    exec_result.one.return_value = 0
+    exec_result.all.return_value = []
+    mock_db.exec.return_value = exec_result
+
+    first = CategoryService.get_catalog(mock_db, tenant_owner_id, 0, 50)
+    second = CategoryService.get_catalog(mock_db, tenant_owner_id, 0, 50)
+
+    assert first is second
+    assert mock_db.exec.call_count == 2
+
+    CategoryService.invalidate_catalog([tenant_owner_id])
+    CategoryService.get_catalog(mock_db, tenant_owner_id, 0, 50)
+
+    assert mock_db.exec.call_count == 4
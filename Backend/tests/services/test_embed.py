@@ -0,0 +1,97 @@
+"""Tests for EmbedService."""
+
+import gzip
+import json
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+from app.core.cache import CachedBody
+from app.schemas.testimonial import EmbedLayout
+from app.services.embed import EmbedService, render_fragment
+
+
+def _testimonial(content="Great", author="Ana", rating=4):
+    return {
+        "id": str(uuid4()),
+        "content": {"title": None, "content": content, "rating": rating, "author_name": author},
+    }
+
+
+def _page(testimonials, etag='"v1"'):
+    body = json.dumps({"results": testimonials}).encode()
+    return CachedBody(body, etag, 0.0, ("tenant:t", "tenant:t:feed"))
+
+
+class TestRenderFragment:
+    def test_user_content_is_escaped(self):
+        html = render_fragment(
+            [_testimonial("<script>alert(1)</script>", "A & B")], EmbedLayout.GRID
+        )
+
+        assert "<script>" not in html
+        assert "&lt;script&gt;" in html
+        assert "A &amp; B" in html
+        assert 'class="tm-embed tm-grid"' in html
+
+    def test_single_layout_shows_one_testimonial(self):
+        html = render_fragment([_testimonial("first"), _testimonial("second")], EmbedLayout.SINGLE)
+
+        assert "first" in html
+        assert "second" not in html
+
+    def test_empty_feed_renders_placeholder(self):
+        assert "tm-empty" in render_fragment([], EmbedLayout.CAROUSEL)
+
+
+class TestGetWidget:
+    def setup_method(self):
+        self.tenant_owner_id = uuid4()
+
+    def _widget(self, page, **kwargs):
+        with patch(
+            "app.services.embed.TestimonialService.get_published", return_value=page
+        ) as get_published:
+            widget = EmbedService.get_widget(
+                Mock(), self.tenant_owner_id, EmbedLayout.CAROUSEL, 6, **kwargs
+            )
+        return widget, get_published
+
+    def test_widget_is_rendered_once_per_feed_version(self):
+        page = _page([_testimonial()])
+
+        with patch("app.services.embed.render_fragment", wraps=render_fragment) as render:
+            first, _ = self._widget(page)
+            second, _ = self._widget(page)
+            self._widget(_page([_testimonial()], etag='"v2"'))
+
+        assert second is first
+        assert render.call_count == 2
+        assert first.body.startswith(b"<!doctype html>")
+        assert first.surrogate_keys == page.surrogate_keys
+
+    def test_gzip_variant_is_stored_alongside(self):
+        page = _page([_testimonial()])
+
+        plain, _ = self._widget(page)
+        compressed, _ = self._widget(page, compressed=True)
+        again, _ = self._widget(page, compressed=True)
+
+        assert gzip.decompress(compressed.body) == plain.body
+        assert compressed.etag != plain.etag
+        assert again is compressed
+
+    def test_script_cannot_close_its_tag(self):
+        widget, _ = self._widget(_page([_testimonial("</script><b>x</b>")]), script=True)
+
+        body = widget.body.decode()
+        assert body.startswith("(function(){")
+        assert "</" not in body
+
+    def test_single_layout_fetches_one_testimonial(self):
+        with patch(
+            "app.services.embed.TestimonialService.get_published", return_value=_page([])
+        ) as get_published:
+            EmbedService.get_widget(Mock(), self.tenant_owner_id, EmbedLayout.SINGLE, 6, tag="Dev")
+
+        assert get_published.call_args.args[3] == 1
+        assert get_published.call_args.kwargs["tag"] == "Dev"
@@ -0,0 +1,186 @@
+"""Tests for EngagementService."""
+
+from datetime import UTC, datetime
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.ring_buffer import RingBuffer
+from app.models.engagement import TestimonialEngagementDaily, TestimonialEngagementHourly
+from app.schemas.engagement import (
+    EngagementBeacon,
+    EngagementEvent,
+    EngagementGranularity,
+    EngagementType,
+)
+from app.services.engagement import EngagementService
+from tests.conftest import compiled_statements
+
+# 2026-01-01T00:00:00Z
+EPOCH = 1767225600
+EPOCH_DAY = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+class TestRecord:
+    def test_events_are_only_buffered(self):
+        buffer = RingBuffer(lambda items: None, capacity=10, flush_interval=60.0, name="test")
+        buffer._thread = object()  # no worker: drain by hand
+        tenant_owner_id, testimonial_id = uuid4(), uuid4()
+        beacon = EngagementBeacon(
+            events=[
+                EngagementEvent(testimonial_id=testimonial_id, type=EngagementType.IMPRESSION),
+                EngagementEvent(testimonial_id=testimonial_id, type=EngagementType.CLICK),
+            ]
+        )
+
+        with (
+            patch("app.services.engagement.engagement_buffer", buffer),
+            patch("app.services.engagement.Session") as session,
+        ):
+            EngagementService.record(tenant_owner_id, beacon)
+
+        assert not session.called
+        events = buffer.drain()
+        assert [event[:3] for event in events] == [
+            (tenant_owner_id, testimonial_id, EngagementType.IMPRESSION),
+            (tenant_owner_id, testimonial_id, EngagementType.CLICK),
+        ]
+
+
+class TestAggregate:
+    def test_events_are_summed_per_testimonial_and_bucket(self):
+        tenant_owner_id, first, second = uuid4(), uuid4(), uuid4()
+        impression, click = EngagementType.IMPRESSION, EngagementType.CLICK
+
+        with patch("app.services.engagement.settings.ENGAGEMENT_BUCKET_SECONDS", 60):
+            rows = EngagementService.aggregate(
+                [
+                    (tenant_owner_id, first, impression, EPOCH + 1.5),
+                    (tenant_owner_id, first, impression, EPOCH + 59.9),
+                    (tenant_owner_id, first, click, EPOCH + 30),
+                    (tenant_owner_id, first, impression, EPOCH + 60),
+                    (tenant_owner_id, second, impression, EPOCH + 2),
+                ]
+            )
+
+        by_key = {(row["testimonial_id"], row["bucket_start"]): row for row in rows}
+        start = datetime(2026, 1, 1, tzinfo=UTC)
+        assert len(rows) == 3
+        assert by_key[(first, start)]["impressions"] == 2
+        assert by_key[(first, start)]["clicks"] == 1
+        assert by_key[(first, start.replace(minute=1))]["impressions"] == 1
+        assert by_key[(second, start)]["user_id"] == tenant_owner_id
+
+
+class TestUpsert:
+    def test_increments_only_reach_testimonials_of_the_tenant(self):
+        row = {
+            "user_id": uuid4(),
+            "testimonial_id": uuid4(),
+            "bucket_start": datetime(2026, 1, 1, tzinfo=UTC),
+            "impressions": 3,
+            "clicks": 1,
+        }
+
+        sql = str(EngagementService._upsert([row]).compile(dialect=postgresql.dialect()))
+
+        assert "JOIN testimonial ON testimonial.id = increments.testimonial_id" in sql
+        assert "AND testimonial.user_id = increments.user_id" in sql
+        assert "ON CONFLICT (testimonial_id, bucket_start) DO UPDATE" in sql
+        assert "impressions = (testimonialengagement.impressions + excluded.impressions)" in sql
+
+    def test_flush_writes_batches(self):
+        tenant_owner_id = uuid4()
+        events = [(tenant_owner_id, uuid4(), EngagementType.IMPRESSION, EPOCH) for _ in range(5)]
+
+        with (
+            patch("app.services.engagement.settings.ENGAGEMENT_BATCH_SIZE", 2),
+            patch("app.services.engagement.Session") as session,
+        ):
+            EngagementService.flush(events)
+
+        db = session.return_value.__enter__.return_value
+        assert db.exec.call_count == 3
+        assert db.commit.call_count == 3
+
+
+class TestCompact:
+    def test_completed_hours_are_moved_to_both_rollups_in_one_statement(self):
+        mock_db = Mock()
+        mock_db.exec.return_value.one.return_value = 7
+        mock_db.exec.return_value.rowcount = 0
+        now = datetime(2026, 1, 10, 15, 42, tzinfo=UTC)
+
+        result = EngagementService.compact(mock_db, now)
+
+        fold, expire_hourly, expire_daily = compiled_statements(mock_db)
+        sql = str(fold)
+        assert sql.startswith("WITH moved AS \n(DELETE FROM testimonialengagement")
+        assert "INSERT INTO testimonialengagementhourly" in sql
+        assert "INSERT INTO testimonialengagementdaily" in sql
+        assert "FROM hours GROUP BY" in sql
+        assert datetime(2026, 1, 10, 15, tzinfo=UTC) in fold.params.values()
+        assert mock_db.commit.called
+        assert result == {"folded": 7, "hourly_expired": 0, "daily_expired": 0}
+
+    def test_rollups_expire_after_their_retention(self):
+        mock_db = Mock()
+        now = datetime(2026, 1, 10, 15, 42, tzinfo=UTC)
+
+        with (
+            patch("app.services.engagement.settings.ENGAGEMENT_HOURLY_RETENTION_DAYS", 7),
+            patch("app.services.engagement.settings.ENGAGEMENT_DAILY_RETENTION_DAYS", 365),
+        ):
+            EngagementService.compact(mock_db, now)
+
+        _, expire_hourly, expire_daily = compiled_statements(mock_db)
+        assert str(expire_hourly).startswith("DELETE FROM testimonialengagementhourly")
+        assert datetime(2026, 1, 3, tzinfo=UTC) in expire_hourly.params.values()
+        assert str(expire_daily).startswith("DELETE FROM testimonialengagementdaily")
+        assert datetime(2025, 1, 10, tzinfo=UTC) in expire_daily.params.values()
+
+
+class TestGetReport:
+    def test_daily_report_reads_the_daily_rollup(self):
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+        mock_db.exec.return_value.all.return_value = [
+            Mock(_asdict=lambda: {"bucket_start": EPOCH_DAY, "impressions": 10, "clicks": 2}),
+            Mock(_asdict=lambda: {"bucket_start": EPOCH_DAY, "impressions": 5, "clicks": 0}),
+        ]
+
+        report = EngagementService.get_report(
+            mock_db,
+            tenant_owner_id,
+            EngagementGranularity.DAY,
+            datetime(2026, 1, 1, 13, 30),
+            datetime(2026, 1, 8, tzinfo=UTC),
+        )
+
+        (query,) = compiled_statements(mock_db)
+        assert f"FROM {TestimonialEngagementDaily.__tablename__}" in str(query)
+        assert "GROUP BY testimonialengagementdaily.bucket_start" in str(query)
+        assert tenant_owner_id in query.params.values()
+        assert report.start == EPOCH_DAY
+        assert (report.impressions, report.clicks) == (15, 2)
+
+    def test_hourly_report_for_one_testimonial(self):
+        mock_db = Mock()
+        mock_db.exec.return_value.all.return_value = []
+        testimonial_id = uuid4()
+
+        report = EngagementService.get_report(
+            mock_db,
+            uuid4(),
+            EngagementGranularity.HOUR,
+            datetime(2026, 1, 1, 13, 30, tzinfo=UTC),
+            datetime(2026, 1, 2, tzinfo=UTC),
+            testimonial_id,
+        )
+
+        (query,) = compiled_statements(mock_db)
+        assert f"FROM {TestimonialEngagementHourly.__tablename__}" in str(query)
+        assert testimonial_id in query.params.values()
+        assert report.start == datetime(2026, 1, 1, 13, tzinfo=UTC)
+        assert report.series == []
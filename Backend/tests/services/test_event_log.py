@@ -0,0 +1,149 @@
+"""Tests for EventLogService."""
+
+from datetime import UTC, datetime
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.db import _discard_after_commit, _run_after_commit, _run_before_commit
+from app.models.testimonial import StatusType
+from app.services import event_log
+from app.services.changes import TestimonialChange
+from app.services.event_log import EventLogService, _lock_key
+from tests.conftest import compiled_statements, testimonial_state
+
+
+class TestApplyChanges:
+    def test_events_are_only_written_right_before_commit(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        pending = testimonial_state()
+
+        EventLogService.apply_changes(mock_db, [TestimonialChange(uuid4(), None, pending)])
+        EventLogService.apply_changes(
+            mock_db,
+            [TestimonialChange(uuid4(), pending, pending.evolve(status=StatusType.APPROVED))],
+        )
+
+        assert not mock_db.exec.called
+        _run_before_commit(mock_db)
+        (statement,) = compiled_statements(mock_db)
+        assert "INSERT INTO testimonialevent" in str(statement)
+        assert "before_commit" not in mock_db.info
+
+    def test_the_webhook_dispatcher_is_woken_after_commit(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        EventLogService.apply_changes(
+            mock_db, [TestimonialChange(uuid4(), None, testimonial_state())]
+        )
+
+        with patch.object(event_log.webhook_dispatcher, "wake") as mock_wake:
+            _run_before_commit(mock_db)
+            assert not mock_wake.called
+            _run_after_commit(mock_db)
+
+        mock_wake.assert_called_once_with()
+
+    def test_rolled_back_events_are_discarded(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        EventLogService.apply_changes(
+            mock_db, [TestimonialChange(uuid4(), None, testimonial_state())]
+        )
+
+        _discard_after_commit(mock_db, None)
+        _run_before_commit(mock_db)
+
+        assert not mock_db.exec.called
+
+    def test_events_are_locked_per_tenant_inserted_and_notified_in_one_statement(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        tenants = [uuid4(), uuid4()]
+        pending = testimonial_state()
+
+        EventLogService._write_events(
+            mock_db,
+            [
+                TestimonialChange(tenants[0], None, pending),
+                TestimonialChange(tenants[1], pending, pending.evolve(status=StatusType.APPROVED)),
+                TestimonialChange(tenants[0], pending, pending.evolve(is_active=False)),
+            ],
+        )
+
+        (statement,) = compiled_statements(mock_db)
+        sql = str(statement)
+        assert sql.startswith("WITH locked AS MATERIALIZED")
+        assert "pg_advisory_xact_lock(unnest(" in sql
+        assert sorted(_lock_key(tenant) for tenant in tenants) in statement.params.values()
+        # No row reaches the INSERT before every lock is held
+        assert "WHERE (SELECT count(*) AS count_1 \nFROM locked) = " in sql
+        assert "INSERT INTO testimonialevent" in sql
+        assert "RETURNING testimonialevent.id, testimonialevent.user_id" in sql
+        assert "pg_notify(" in sql
+        assert "GROUP BY inserted.user_id" in sql
+        event_types = [
+            value
+            for value in statement.params.values()
+            if isinstance(value, str) and value.startswith("testimonial.")
+        ]
+        assert event_types == [
+            "testimonial.created",
+            "testimonial.status_changed",
+            "testimonial.deleted",
+        ]
+        assert event_log.CHANNEL in statement.params.values()
+
+    def test_events_describe_the_write(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        pending = testimonial_state(tag_ids=[uuid4()])
+        approved = pending.evolve(status=StatusType.APPROVED)
+
+        EventLogService._write_events(
+            mock_db,
+            [
+                TestimonialChange(uuid4(), pending, approved),
+                TestimonialChange(uuid4(), approved, approved),
+            ],
+        )
+
+        (statement,) = compiled_statements(mock_db)
+        status_changed, updated = [
+            value for value in statement.params.values() if isinstance(value, dict)
+        ]
+        assert status_changed["status"] == "approved"
+        assert status_changed["previous_status"] == "pending"
+        assert status_changed["tag_ids"] == [str(next(iter(pending.tag_ids)))]
+        assert updated["id"] == str(pending.id)
+        assert "testimonial.updated" in statement.params.values()
+
+    def test_writes_to_removed_testimonials_write_nothing(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        removed = testimonial_state(is_active=False)
+
+        EventLogService._write_events(mock_db, [TestimonialChange(uuid4(), removed, removed)])
+
+        assert not mock_db.exec.called
+        assert "after_commit" not in mock_db.info
+
+
+class TestPrune:
+    def test_deletes_events_past_retention_that_every_endpoint_has_passed(self):
+        mock_db = Mock()
+        mock_db.exec.return_value.rowcount = 3
+
+        with patch("app.services.event_log.settings.EVENT_LOG_RETENTION_HOURS", 24):
+            deleted = EventLogService.prune(mock_db, datetime(2026, 1, 2, tzinfo=UTC))
+
+        statement = mock_db.exec.call_args.args[0].compile(dialect=postgresql.dialect())
+        sql = str(statement)
+        assert deleted == 3
+        assert "DELETE FROM testimonialevent" in sql
+        assert "NOT (EXISTS (SELECT * \nFROM webhookendpoint" in sql
+        assert "webhookendpoint.last_event_id < testimonialevent.id" in sql
+        assert datetime(2026, 1, 1, tzinfo=UTC) in statement.params.values()
+        assert mock_db.commit.called
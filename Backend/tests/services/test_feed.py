@@ -0,0 +1,87 @@
+"""Tests for FeedService."""
+
+from unittest.mock import Mock
+from uuid import uuid4
+
+from app.models.testimonial import StatusType
+from app.services.changes import TestimonialChange
+from app.services.feed import FeedService
+from tests.conftest import compiled_statements, testimonial_state
+
+
+class TestApplyChanges:
+    def test_unpublished_changes_are_ignored(self):
+        mock_db = Mock()
+        pending = testimonial_state(StatusType.PENDING)
+
+        FeedService.apply_changes(
+            mock_db,
+            [
+                TestimonialChange(uuid4(), None, pending),
+                TestimonialChange(uuid4(), pending, pending.evolve(status=StatusType.REJECTED)),
+            ],
+        )
+
+        assert not mock_db.exec.called
+
+    def test_published_testimonials_are_upserted_in_one_statement(self):
+        mock_db = Mock()
+        approved = testimonial_state(StatusType.PENDING)
+        edited = testimonial_state(StatusType.APPROVED)
+
+        FeedService.apply_changes(
+            mock_db,
+            [
+                TestimonialChange(uuid4(), approved, approved.evolve(status=StatusType.APPROVED)),
+                TestimonialChange(uuid4(), edited, edited),
+            ],
+        )
+
+        (upsert,) = compiled_statements(mock_db)
+        sql = str(upsert)
+        assert sql.startswith("INSERT INTO publishedtestimonial")
+        assert "ON CONFLICT (id) DO UPDATE" in sql
+        assert "json_build_object" in sql
+        assert set(upsert.params["ids"]) == {approved.id, edited.id}
+
+    def test_unpublished_testimonials_are_deleted(self):
+        mock_db = Mock()
+        rejected = testimonial_state(StatusType.APPROVED)
+        deleted = testimonial_state(StatusType.APPROVED)
+
+        FeedService.apply_changes(
+            mock_db,
+            [
+                TestimonialChange(uuid4(), rejected, rejected.evolve(status=StatusType.REJECTED)),
+                TestimonialChange(uuid4(), deleted, deleted.evolve(is_active=False)),
+            ],
+        )
+
+        (delete,) = compiled_statements(mock_db)
+        assert str(delete).startswith("DELETE FROM publishedtestimonial")
+        assert set(delete.params["ids"]) == {rejected.id, deleted.id}
+
+
+class TestRebuild:
+    def test_rebuild_is_scoped_to_tenant(self):
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+
+        FeedService.rebuild(mock_db, tenant_owner_id)
+
+        delete, upsert = compiled_statements(mock_db)
+        assert tenant_owner_id in delete.params.values()
+        assert tenant_owner_id in upsert.params.values()
+        assert mock_db.commit.called
+
+
+class TestReads:
+    def test_page_is_an_index_range_without_joins(self):
+        mock_db = Mock()
+
+        FeedService.get_page_json(mock_db, uuid4(), 0, 10, product_id="prod-1", tag_slug="dev")
+
+        sql = str(compiled_statements(mock_db)[0])
+        assert "JOIN" not in sql
+        assert "publishedtestimonial.product_id" in sql
+        assert "ORDER BY filtered.created_at DESC, filtered.id DESC" in sql
@@ -0,0 +1,137 @@
+"""Tests for IngestService."""
+
+from unittest.mock import MagicMock, patch
+from uuid import UUID, uuid4
+
+import psycopg
+import pytest
+from fastapi import HTTPException
+
+from app.core.write_behind import BufferFull
+from app.schemas.testimonial import TestimonialCreate
+from app.services.ingest import IngestService
+
+PAYLOAD = {
+    "product": {"id": "prod-1", "name": "Product"},
+    "content": {"content": "Great product", "rating": 5, "author_name": "Ann"},
+}
+
+
+def _item(tenant, **data):
+    return {"id": str(uuid4()), "tenant_owner_id": str(tenant), "data": PAYLOAD | data}
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    db.exec.return_value.all.return_value = []
+    with patch("app.services.ingest.Session") as session_cls:
+        session_cls.return_value.__enter__.return_value = db
+        yield db
+
+
+class TestSubmit:
+    def test_buffers_payload_and_returns_id(self):
+        tenant = uuid4()
+        with patch("app.services.ingest.ingest_buffer") as buffer:
+            testimonial_id = IngestService.submit(TestimonialCreate.model_validate(PAYLOAD), tenant)
+
+        item = buffer.submit.call_args.args[0]
+        assert item["id"] == str(testimonial_id)
+        assert item["tenant_owner_id"] == str(tenant)
+        assert TestimonialCreate.model_validate(item["data"]).product.id == "prod-1"
+
+    def test_keys_without_owner_are_refused(self):
+        with patch("app.services.ingest.ingest_buffer") as buffer:
+            with pytest.raises(HTTPException) as exc:
+                IngestService.submit(TestimonialCreate.model_validate(PAYLOAD), None)
+
+        assert exc.value.status_code == 401
+        assert not buffer.submit.called
+
+    def test_full_buffer_returns_503(self):
+        with patch("app.services.ingest.ingest_buffer") as buffer:
+            buffer.submit.side_effect = BufferFull()
+            with pytest.raises(HTTPException) as exc:
+                IngestService.submit(TestimonialCreate.model_validate(PAYLOAD), uuid4())
+
+        assert exc.value.status_code == 503
+        assert "Retry-After" in exc.value.headers
+
+
+class TestFlush:
+    def test_inserts_one_batch_per_tenant_with_assigned_ids(self, mock_db):
+        tenant_a, tenant_b = uuid4(), uuid4()
+        items = [_item(tenant_a), _item(tenant_b), _item(tenant_a)]
+
+        with patch("app.services.ingest.TestimonialService._insert_batch") as insert:
+            IngestService.flush(items)
+
+        calls = {call.args[2]: call.kwargs["ids"] for call in insert.call_args_list}
+        assert calls == {
+            tenant_a: [UUID(items[0]["id"]), UUID(items[2]["id"])],
+            tenant_b: [UUID(items[1]["id"])],
+        }
+
+    def test_skips_already_inserted_ids(self, mock_db):
+        tenant = uuid4()
+        items = [_item(tenant), _item(tenant)]
+        mock_db.exec.return_value.all.return_value = [UUID(items[0]["id"])]
+
+        with patch("app.services.ingest.TestimonialService._insert_batch") as insert:
+            IngestService.flush(items)
+
+        insert.assert_called_once()
+        assert insert.call_args.kwargs["ids"] == [UUID(items[1]["id"])]
+
+    def test_failing_item_is_dropped_and_others_inserted(self, mock_db):
+        tenant = uuid4()
+        items = [_item(tenant), _item(tenant, product={"id": "bad", "name": "Bad"})]
+
+        def insert(batch, db, tenant_owner_id, ids):
+            if any(data.product.id == "bad" for data in batch):
+                raise psycopg.errors.ForeignKeyViolation()
+
+        with patch(
+            "app.services.ingest.TestimonialService._insert_batch", side_effect=insert
+        ) as insert_mock:
+            IngestService.flush(items)
+
+        assert [call.kwargs["ids"] for call in insert_mock.call_args_list] == [
+            [UUID(items[0]["id"]), UUID(items[1]["id"])],
+            [UUID(items[0]["id"])],
+            [UUID(items[1]["id"])],
+        ]
+
+    def test_bad_items_in_a_batch_do_not_block_the_good_ones(self, mock_db):
+        tenant = uuid4()
+        items = [
+            _item(tenant),
+            _item(None),
+            _item(tenant, content={"rating": 9}),
+            _item(tenant, product={"id": "bad", "name": "Bad"}),
+            _item(tenant),
+        ]
+
+        def insert(batch, db, tenant_owner_id, ids):
+            if any(data.product.id == "bad" for data in batch):
+                raise ValueError("not storable")
+
+        with patch(
+            "app.services.ingest.TestimonialService._insert_batch", side_effect=insert
+        ) as insert_mock:
+            IngestService.flush(items)
+
+        stored = [UUID(items[0]["id"]), UUID(items[3]["id"]), UUID(items[4]["id"])]
+        assert [call.kwargs["ids"] for call in insert_mock.call_args_list] == [
+            stored,
+            *[[testimonial_id] for testimonial_id in stored],
+        ]
+
+    def test_outage_propagates_for_retry(self, mock_db):
+        with patch(
+            "app.services.ingest.TestimonialService._insert_batch",
+            side_effect=psycopg.OperationalError(),
+        ):
+            with pytest.raises(psycopg.OperationalError):
+                IngestService.flush([_item(uuid4())])
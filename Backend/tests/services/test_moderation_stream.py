@@ -0,0 +1,185 @@
+"""Tests for ModerationStreamService and ModerationEventBus."""
+
+import asyncio
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
+from uuid import uuid4
+
+from app.services import moderation_stream
+from app.services.moderation_stream import ModerationEventBus, ModerationStreamService, Subscription
+
+
+def _event(event_id, tenant_owner_id=None):
+    return SimpleNamespace(
+        id=event_id,
+        user_id=tenant_owner_id or uuid4(),
+        event_type="testimonial.created",
+        created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        data={"id": "t"},
+    )
+
+
+def _frames(body: str) -> list[dict]:
+    frames = []
+    for block in body.split("\n\n"):
+        if block:
+            frames.append(dict(line.split(": ", 1) for line in block.split("\n")))
+    return frames
+
+
+class TestReplay:
+    def _db(self, latest, seen=None, events=()):
+        mock_db = Mock()
+        mock_db.exec.side_effect = [
+            Mock(one=Mock(return_value=latest)),
+            Mock(all=Mock(return_value=list(events))),
+        ]
+        mock_db.get.return_value = seen
+        return mock_db
+
+    def test_new_clients_start_from_the_latest_event(self):
+        mock_db = self._db(latest=42)
+
+        assert ModerationStreamService.replay(mock_db, uuid4(), None) == ([], 42, False)
+        assert not mock_db.get.called
+
+    def test_missed_events_are_replayed(self):
+        tenant_owner_id = uuid4()
+        events = [_event(8, tenant_owner_id), _event(11, tenant_owner_id)]
+        mock_db = self._db(latest=11, seen=_event(5, tenant_owner_id), events=events)
+
+        assert ModerationStreamService.replay(mock_db, tenant_owner_id, 5) == (events, 11, False)
+
+    def test_caught_up_clients_keep_their_id(self):
+        tenant_owner_id = uuid4()
+        mock_db = self._db(latest=5, seen=_event(5, tenant_owner_id))
+
+        assert ModerationStreamService.replay(mock_db, tenant_owner_id, 5) == ([], 5, False)
+
+    def test_pruned_or_foreign_ids_reset(self):
+        assert ModerationStreamService.replay(self._db(latest=9), uuid4(), 5) == ([], 9, True)
+        foreign = self._db(latest=9, seen=_event(5))
+        assert ModerationStreamService.replay(foreign, uuid4(), 5) == ([], 9, True)
+
+    def test_too_many_missed_events_reset(self):
+        tenant_owner_id = uuid4()
+        events = [_event(event_id, tenant_owner_id) for event_id in range(6, 10)]
+        mock_db = self._db(latest=9, seen=_event(5, tenant_owner_id), events=events)
+
+        with patch("app.services.moderation_stream.settings.MODERATION_STREAM_REPLAY_LIMIT", 3):
+            assert ModerationStreamService.replay(mock_db, tenant_owner_id, 5) == ([], 9, True)
+
+
+class TestStream:
+    def _run(self, replayed, live, closed=True, max_seconds=60):
+        """Body sent for a replay result, then live batches pushed to the subscription."""
+        tenant_owner_id = uuid4()
+
+        async def subscribe(tenant):
+            subscription = Subscription(tenant, asyncio.get_running_loop(), max_events=100)
+            for events in live:
+                subscription._push(events)
+            if closed:
+                subscription._close()
+            return subscription
+
+        async def consume():
+            return "".join(
+                [frame async for frame in ModerationStreamService.stream(tenant_owner_id, 3)]
+            )
+
+        with (
+            patch.object(moderation_stream.moderation_event_bus, "subscribe", subscribe),
+            patch.object(moderation_stream.moderation_event_bus, "unsubscribe") as unsubscribe,
+            patch("app.services.moderation_stream.Session", MagicMock()),
+            patch.object(ModerationStreamService, "replay", return_value=replayed),
+            patch(
+                "app.services.moderation_stream.settings.MODERATION_STREAM_MAX_SECONDS", max_seconds
+            ),
+        ):
+            body = asyncio.run(consume())
+        assert unsubscribe.called
+        return _frames(body)
+
+    def test_replay_then_live_events_without_duplicates(self):
+        frames = self._run(
+            ([_event(4), _event(6)], 6, False),
+            [[_event(5), _event(6), _event(7)], [_event(9)]],
+        )
+
+        assert frames[0] == {"retry": "3000"}
+        assert [(frame["event"], frame["id"]) for frame in frames[1:]] == [
+            ("testimonial.created", "4"),
+            ("testimonial.created", "6"),
+            ("ready", "6"),
+            ("testimonial.created", "7"),
+            ("testimonial.created", "9"),
+        ]
+        assert '"created_at":"2026-01-01T00:00:00+00:00"' in frames[-1]["data"]
+
+    def test_reset_carries_the_latest_id(self):
+        frames = self._run(([], 12, True), [[_event(12), _event(13)]])
+
+        assert [(frame["event"], frame["id"]) for frame in frames[1:]] == [
+            ("reset", "12"),
+            ("testimonial.created", "13"),
+        ]
+
+    def test_streams_end_after_their_lifetime_asking_for_a_quick_reconnect(self):
+        frames = self._run(([], 3, False), [], closed=False, max_seconds=0.05)
+
+        assert frames[-1] == {"retry": "100"}
+
+
+class TestSubscription:
+    def test_slow_subscribers_are_closed(self):
+        async def run():
+            subscription = Subscription(uuid4(), asyncio.get_running_loop(), max_events=3)
+            subscription._push([_event(1), _event(2)])
+            subscription._push([_event(3), _event(4)])
+            subscription._push([_event(5)])
+            return [await subscription.get(), await subscription.get(), subscription.closed]
+
+        first, end, closed = asyncio.run(run())
+
+        assert [event.id for event in first] == [1, 2]
+        assert end is None
+        assert closed
+
+
+class TestEventBus:
+    def test_publish_fetches_watched_tenants_and_pushes_in_order(self):
+        bus = ModerationEventBus()
+        watched, other = uuid4(), uuid4()
+        subscriptions = [Mock(tenant_owner_id=watched), Mock(tenant_owner_id=watched)]
+        bus._subscriptions[watched] = set(subscriptions)
+        events = [_event(7, watched), _event(8, watched)]
+
+        with (
+            patch("app.services.moderation_stream.Session", MagicMock()),
+            patch.object(ModerationStreamService, "fetch", return_value=events) as fetch,
+        ):
+            bus.publish([f"{other}:1:2", f"{watched}:7:8"])
+
+        assert fetch.call_args.args[1] == [(watched, 7, 8)]
+        for subscription in subscriptions:
+            subscription.push.assert_called_once_with(events)
+
+    def test_unwatched_tenants_cost_no_query(self):
+        bus = ModerationEventBus()
+
+        with patch.object(ModerationStreamService, "fetch") as fetch:
+            bus.publish([f"{uuid4()}:1:1"])
+
+        assert not fetch.called
+
+    def test_unsubscribe_forgets_the_tenant(self):
+        bus = ModerationEventBus()
+        subscription = Mock(tenant_owner_id=uuid4())
+        bus._subscriptions[subscription.tenant_owner_id].add(subscription)
+
+        bus.unsubscribe(subscription)
+        bus.unsubscribe(subscription)
+
+        assert not bus._subscriptions
@@ -0,0 +1,229 @@
+"""Tests for PurgeService and the HTTP purge backend."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, Mock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.core.db import _run_after_commit
+from app.models.testimonial import StatusType
+from app.services.changes import TestimonialChange
+from app.services.purge import HTTPPurgeBackend, PurgeService
+from tests.conftest import testimonial_state
+
+
+class _PurgeStub(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((dict(self.headers), json.loads(body)))
+        statuses = self.server.statuses
+        self.send_response(statuses.pop(0) if statuses else self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def purge_stub():
+    """Local purge endpoint recording the requests it receives."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PurgeStub)
+    server.requests = []
+    server.status = 200
+    server.statuses = []  # answered first, one per request
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/purge"
+
+
+class TestKeys:
+    def test_page_keys_include_filters_and_listed_testimonials(self):
+        tenant_owner_id = uuid4()
+        first, second = uuid4(), uuid4()
+        body = json.dumps({"results": [{"id": str(first)}, {"id": str(second)}]}).encode()
+
+        keys = PurgeService.page_keys(tenant_owner_id, body, "prod-1", tag_slug="dev-ops")
+
+        assert keys == [
+            f"tenant:{tenant_owner_id}",
+            f"tenant:{tenant_owner_id}:product:prod-1",
+            f"tenant:{tenant_owner_id}:tag:dev-ops",
+            f"testimonial:{first}",
+            f"testimonial:{second}",
+        ]
+
+    def test_unfiltered_page_has_feed_key(self):
+        tenant_owner_id = uuid4()
+
+        keys = PurgeService.page_keys(tenant_owner_id, b'{"results": []}')
+
+        assert keys == [f"tenant:{tenant_owner_id}", f"tenant:{tenant_owner_id}:feed"]
+
+    def test_product_ids_with_separators_are_digested(self):
+        keys = PurgeService.membership_keys(uuid4(), "a product, b", None, [])
+
+        product_key = keys[1].rsplit(":", 1)[1]
+        assert product_key.startswith("~")
+        assert " " not in product_key and "," not in product_key
+
+
+class TestHTTPPurgeBackend:
+    def test_posts_keys_with_token(self, purge_stub):
+        HTTPPurgeBackend(_url(purge_stub), token="secret").purge(["a", "b"])
+
+        ((headers, body),) = purge_stub.requests
+        assert body == {"tags": ["a", "b"]}
+        assert headers["Surrogate-Key"] == "a b"
+        assert headers["Authorization"] == "Bearer secret"
+
+    @pytest.mark.parametrize("status", [503, 429])
+    def test_transient_failures_raise(self, purge_stub, status):
+        purge_stub.status = status
+
+        with pytest.raises(httpx.HTTPStatusError):
+            HTTPPurgeBackend(_url(purge_stub)).purge(["a"])
+
+    def test_rejected_purges_are_dropped(self, purge_stub):
+        purge_stub.status = 403
+
+        HTTPPurgeBackend(_url(purge_stub)).purge(["a"])
+
+        assert len(purge_stub.requests) == 1
+
+
+class TestFlush:
+    def _flush(self, items, after, backend, batch_size=256):
+        with (
+            patch("app.services.purge.purge_backend", backend),
+            patch("app.services.purge.settings.PURGE_BATCH_SIZE", batch_size),
+            patch("app.services.purge.Session", MagicMock()),
+            patch("app.services.purge.PurgeService._published_keys", return_value=after),
+        ):
+            PurgeService.flush(items)
+
+    def test_edit_in_place_purges_only_the_testimonial(self, purge_stub):
+        testimonial_id = uuid4()
+        keys = ["tenant:t:feed", "tenant:t:product:prod-1"]
+
+        self._flush(
+            [{"id": str(testimonial_id), "before": keys}],
+            {testimonial_id: set(keys)},
+            HTTPPurgeBackend(_url(purge_stub)),
+        )
+
+        ((_, body),) = purge_stub.requests
+        assert body["tags"] == [f"testimonial:{testimonial_id}"]
+
+    def test_membership_changes_are_deduplicated_and_batched(self, purge_stub):
+        approved, rejected = uuid4(), uuid4()
+
+        self._flush(
+            [
+                {"id": str(approved), "before": []},
+                {"id": str(rejected), "before": ["tenant:t:feed", "tenant:t:product:p2"]},
+                {"id": str(rejected), "before": ["tenant:t:feed", "tenant:t:product:p2"]},
+            ],
+            {approved: {"tenant:t:feed", "tenant:t:product:p1"}},
+            HTTPPurgeBackend(_url(purge_stub)),
+            batch_size=2,
+        )
+
+        purged = [tag for _, body in purge_stub.requests for tag in body["tags"]]
+        assert len(purge_stub.requests) == 3
+        assert sorted(purged) == sorted(
+            {
+                "tenant:t:feed",
+                "tenant:t:product:p1",
+                "tenant:t:product:p2",
+                f"testimonial:{approved}",
+                f"testimonial:{rejected}",
+            }
+        )
+
+    def test_a_rejected_batch_does_not_hold_up_the_next(self, purge_stub):
+        purge_stub.statuses = [400]
+        testimonial_ids = [uuid4(), uuid4()]
+
+        self._flush(
+            [{"id": str(testimonial_id), "before": []} for testimonial_id in testimonial_ids],
+            {},
+            HTTPPurgeBackend(_url(purge_stub)),
+            batch_size=1,
+        )
+
+        assert [body["tags"] for _, body in purge_stub.requests] == [
+            [key] for key in sorted(f"testimonial:{id_}" for id_ in testimonial_ids)
+        ]
+
+
+class TestApplyChanges:
+    def test_disabled_without_backend(self):
+        mock_db = Mock()
+        mock_db.info = {}
+
+        with patch("app.services.purge.purge_backend", None):
+            PurgeService.apply_changes(
+                mock_db, [TestimonialChange(uuid4(), None, testimonial_state(StatusType.APPROVED))]
+            )
+
+        assert not mock_db.exec.called
+        assert mock_db.info == {}
+
+    def test_published_changes_are_queued_after_commit(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        published = testimonial_state(StatusType.APPROVED)
+        pending = testimonial_state(StatusType.PENDING)
+        before = {published.id: {"tenant:t:feed"}}
+
+        with (
+            patch("app.services.purge.purge_backend", Mock()),
+            patch("app.services.purge.PurgeService._published_keys", return_value=before),
+            patch("app.services.purge.purge_buffer") as buffer,
+        ):
+            PurgeService.apply_changes(
+                mock_db,
+                [
+                    TestimonialChange(
+                        uuid4(), published, published.evolve(status=StatusType.REJECTED)
+                    ),
+                    TestimonialChange(uuid4(), None, pending),
+                ],
+            )
+            assert not buffer.submit.called
+
+            _run_after_commit(mock_db)
+
+        buffer.submit.assert_called_once_with(
+            {"id": str(published.id), "before": ["tenant:t:feed"], "keys": []}
+        )
+
+    def test_rating_edit_purges_the_product_summary(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        tenant_owner_id = uuid4()
+        published = testimonial_state(StatusType.APPROVED)
+
+        with (
+            patch("app.services.purge.purge_backend", Mock()),
+            patch("app.services.purge.PurgeService._published_keys", return_value={}),
+            patch("app.services.purge.purge_buffer") as buffer,
+        ):
+            PurgeService.apply_changes(
+                mock_db, [TestimonialChange(tenant_owner_id, published, published.evolve(rating=1))]
+            )
+            _run_after_commit(mock_db)
+
+        (item,) = [call.args[0] for call in buffer.submit.call_args_list]
+        assert item["keys"] == [f"tenant:{tenant_owner_id}:product:prod-1"]
@@ -0,0 +1,136 @@
+"""Tests for RatingSummaryService."""
+
+from unittest.mock import Mock
+from uuid import uuid4
+
+from app.core.db import _run_before_commit
+from app.models.product_rating_summary import ProductRatingSummary
+from app.models.testimonial import StatusType
+from app.services.changes import TestimonialChange
+from app.services.rating_summary import RatingSummaryService
+from tests.conftest import compiled_statements, testimonial_state
+
+
+class TestApplyChanges:
+    def test_unpublished_and_unrated_changes_are_ignored(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        tenant_owner_id = uuid4()
+        pending = testimonial_state(status=StatusType.PENDING)
+        unrated = testimonial_state(StatusType.APPROVED, rating=0)
+
+        RatingSummaryService.apply_changes(
+            mock_db,
+            [
+                TestimonialChange(tenant_owner_id, None, pending),
+                TestimonialChange(tenant_owner_id, pending, pending.evolve(rating=3)),
+                TestimonialChange(tenant_owner_id, None, unrated),
+            ],
+        )
+        _run_before_commit(mock_db)
+
+        assert not mock_db.exec.called
+
+    def test_deltas_are_aggregated_into_one_upsert(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        tenant_owner_id = uuid4()
+        approved = testimonial_state(rating=4, status=StatusType.PENDING)
+        edited = testimonial_state(StatusType.APPROVED, rating=5)
+
+        RatingSummaryService.apply_changes(
+            mock_db,
+            [
+                TestimonialChange(
+                    tenant_owner_id, approved, approved.evolve(status=StatusType.APPROVED)
+                ),
+                TestimonialChange(tenant_owner_id, edited, edited.evolve(rating=2)),
+            ],
+        )
+        _run_before_commit(mock_db)
+
+        (upsert,) = compiled_statements(mock_db)
+        sql = str(upsert)
+        assert "ON CONFLICT (user_id, product_id) DO UPDATE" in sql
+        assert "review_count = (productratingsummary.review_count + excluded.review_count)" in sql
+        params = upsert.params
+        assert params["review_count_m0"] == 1
+        assert params["rating_sum_m0"] == 4 - 5 + 2
+        assert (params["rating_2_m0"], params["rating_4_m0"], params["rating_5_m0"]) == (1, 1, -1)
+
+    def test_changes_cancelling_out_write_nothing(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        state = testimonial_state(StatusType.APPROVED, rating=3)
+
+        RatingSummaryService.apply_changes(mock_db, [TestimonialChange(uuid4(), state, state)])
+        _run_before_commit(mock_db)
+
+        assert not mock_db.exec.called
+
+    def test_summaries_are_written_right_before_commit_in_key_order(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        tenant_owner_id = uuid4()
+        products = ["prod-c", "prod-a", "prod-b"]
+
+        RatingSummaryService.apply_changes(
+            mock_db,
+            [
+                TestimonialChange(
+                    tenant_owner_id,
+                    None,
+                    testimonial_state(StatusType.APPROVED, product_id=product),
+                )
+                for product in products
+            ],
+        )
+        assert not mock_db.exec.called
+
+        _run_before_commit(mock_db)
+        (upsert,) = compiled_statements(mock_db)
+        assert [upsert.params[f"product_id_m{i}"] for i in range(3)] == sorted(products)
+
+
+class TestRebuild:
+    def test_rebuild_is_scoped_to_tenant(self):
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+
+        RatingSummaryService.rebuild(mock_db, tenant_owner_id)
+
+        delete, insert = compiled_statements(mock_db)
+        assert tenant_owner_id in delete.params.values()
+        assert "GROUP BY testimonial.user_id, testimonial.product_id" in str(insert)
+        assert mock_db.commit.called
+
+
+class TestGetSummary:
+    def test_summary_of_product_without_reviews(self):
+        mock_db = Mock()
+        mock_db.get.return_value = None
+
+        summary = RatingSummaryService.get_summary(mock_db, uuid4(), "prod-1")
+
+        assert summary.review_count == 0
+        assert summary.average_rating is None
+        assert summary.histogram == {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+
+    def test_summary_is_a_primary_key_lookup(self):
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+        mock_db.get.return_value = ProductRatingSummary(
+            user_id=tenant_owner_id,
+            product_id="prod-1",
+            review_count=3,
+            rating_sum=14,
+            rating_4=1,
+            rating_5=2,
+        )
+
+        summary = RatingSummaryService.get_summary(mock_db, tenant_owner_id, "prod-1")
+
+        mock_db.get.assert_called_once_with(ProductRatingSummary, (tenant_owner_id, "prod-1"))
+        assert summary.average_rating == 4.67
+        assert summary.histogram[5] == 2
+        assert not mock_db.exec.called
@@ -0,0 +1,20 @@
+"""Tests for the SQL JSON rendering helpers."""
+
+from sqlalchemy import column
+from sqlalchemy.dialects import postgresql
+
+from app.services.rendering import iso_utc
+
+
+def test_iso_utc_omits_the_fraction_when_microseconds_are_zero():
+    """Pydantic writes 2026-01-01T00:00:00Z, without .000000, for whole seconds."""
+    compiled = iso_utc(column("created_at")).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    sql = str(compiled)
+
+    assert (
+        "CASE WHEN (EXTRACT(microseconds FROM timezone('UTC', created_at)) %% 1000000 = 0)" in sql
+    )
+    assert """THEN to_char(timezone('UTC', created_at), 'YYYY-MM-DD"T"HH24:MI:SS"Z"')""" in sql
+    assert """ELSE to_char(timezone('UTC', created_at), 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"')""" in sql
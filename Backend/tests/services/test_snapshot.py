@@ -0,0 +1,134 @@
+"""Tests for SnapshotService."""
+
+import json
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+from app.core.db import _run_after_commit
+from app.models.testimonial import StatusType
+from app.services.changes import TestimonialChange
+from app.services.snapshot import ALL_PRODUCTS, SnapshotService
+from tests.conftest import testimonial_state
+
+
+def _bodies(count):
+    return [json.dumps({"id": str(index)}) for index in range(count)]
+
+
+class TestWriteShard:
+    def setup_method(self):
+        self.tenant_owner_id = uuid4()
+
+    def _write(self, root, product_id, bodies):
+        with (
+            patch("app.services.snapshot.settings.SNAPSHOT_PAGE_SIZE", 2),
+            patch(
+                "app.services.snapshot.FeedService.iter_bodies", return_value=iter(bodies)
+            ) as iter_bodies,
+        ):
+            SnapshotService.write_shard(Mock(), root, self.tenant_owner_id, product_id, len(bodies))
+        return iter_bodies
+
+    def test_pages_are_pagination_documents(self, tmp_path):
+        self._write(tmp_path, ALL_PRODUCTS, _bodies(3))
+
+        shard = tmp_path / str(self.tenant_owner_id) / "all"
+        first = json.loads((shard / "page-1.json").read_text())
+        last = json.loads((shard / "page-2.json").read_text())
+        assert first["results"] == [{"id": "0"}, {"id": "1"}]
+        assert first["total_items"] == 3
+        assert first["total_pages"] == 2
+        assert first["has_next"] and not first["has_prev"]
+        assert last["results"] == [{"id": "2"}]
+        assert not last["has_next"] and last["has_prev"]
+        assert sorted(path.name for path in shard.iterdir()) == ["page-1.json", "page-2.json"]
+
+    def test_pages_past_the_new_end_are_removed(self, tmp_path):
+        self._write(tmp_path, "a/b", _bodies(5))
+        self._write(tmp_path, "a/b", _bodies(1))
+
+        shard = tmp_path / str(self.tenant_owner_id) / SnapshotService.shard_path("a/b")
+        assert shard.parent.name == "products"
+        assert shard.name.startswith("~")
+        assert [path.name for path in shard.iterdir()] == ["page-1.json"]
+
+    def test_empty_shard_keeps_first_page(self, tmp_path):
+        iter_bodies = self._write(tmp_path, "prod-1", [])
+
+        page = json.loads(
+            (tmp_path / str(self.tenant_owner_id) / "products/prod-1/page-1.json").read_text()
+        )
+        assert page["results"] == []
+        assert page["total_items"] == 0
+        assert iter_bodies.call_args.args[2] == "prod-1"
+
+
+class TestRegenerate:
+    def test_full_regeneration_writes_manifest_and_drops_stale_products(self, tmp_path):
+        tenant_owner_id = uuid4()
+        stale = tmp_path / str(tenant_owner_id) / "products" / "gone"
+        stale.mkdir(parents=True)
+
+        with (
+            patch(
+                "app.services.snapshot.FeedService.count_by_product",
+                return_value={"prod-1": 3, "prod 2": 1},
+            ),
+            patch("app.services.snapshot.SnapshotService.write_shard") as write_shard,
+        ):
+            SnapshotService.regenerate(Mock(), tmp_path, tenant_owner_id)
+
+        written = {call.args[3]: call.args[4] for call in write_shard.call_args_list}
+        assert written == {ALL_PRODUCTS: 4, "prod-1": 3, "prod 2": 1}
+        assert not stale.exists()
+        manifest = json.loads((tmp_path / str(tenant_owner_id) / "manifest.json").read_text())
+        assert manifest["all"]["total_items"] == 4
+        assert manifest["products"]["prod-1"]["path"] == "products/prod-1"
+        assert manifest["products"]["prod 2"]["path"] == SnapshotService.shard_path("prod 2")
+
+    def test_partial_regeneration_only_writes_given_products(self, tmp_path):
+        with (
+            patch("app.services.snapshot.FeedService.count_by_product", return_value={"prod-1": 3}),
+            patch("app.services.snapshot.SnapshotService.write_shard") as write_shard,
+        ):
+            SnapshotService.regenerate(Mock(), tmp_path, uuid4(), {"prod-2"})
+
+        written = {call.args[3]: call.args[4] for call in write_shard.call_args_list}
+        assert written == {ALL_PRODUCTS: 3, "prod-2": 0}
+
+
+class TestApplyChanges:
+    def test_disabled_without_snapshot_dir(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        state = testimonial_state(StatusType.APPROVED)
+
+        with patch("app.services.snapshot.settings.SNAPSHOT_DIR", None):
+            SnapshotService.apply_changes(mock_db, [TestimonialChange(uuid4(), None, state)])
+
+        assert mock_db.info == {}
+
+    def test_touched_shards_are_queued_after_commit(self, tmp_path):
+        mock_db = Mock()
+        mock_db.info = {}
+        tenant_owner_id = uuid4()
+        moved = testimonial_state(StatusType.APPROVED, product_id="prod-1")
+        pending = testimonial_state(StatusType.PENDING, product_id="prod-3")
+
+        with (
+            patch("app.services.snapshot.settings.SNAPSHOT_DIR", str(tmp_path)),
+            patch("app.services.snapshot.snapshot_buffer") as buffer,
+        ):
+            SnapshotService.apply_changes(
+                mock_db,
+                [
+                    TestimonialChange(tenant_owner_id, moved, moved.evolve(product_id="prod-2")),
+                    TestimonialChange(tenant_owner_id, None, pending),
+                ],
+            )
+            assert not buffer.submit.called
+
+            _run_after_commit(mock_db)
+
+        queued = {call.args[0]["product_id"] for call in buffer.submit.call_args_list}
+        assert queued == {"prod-1", "prod-2"}
@@ -0,0 +1,183 @@
+"""Tests for StatsService."""
+
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.db import _run_before_commit
+from app.models.tenant_usage import TenantTestimonialStats
+from app.models.testimonial import StatusType
+from app.services.changes import TestimonialChange
+from app.services.stats import StatsService
+from tests.conftest import compiled_statements, testimonial_state
+
+
+class TestApplyChanges:
+    def test_counters_are_written_right_before_commit(self):
+        mock_db = Mock()
+        mock_db.info = {}
+        tenant_owner_id = uuid4()
+
+        StatsService.apply_changes(
+            mock_db, [TestimonialChange(tenant_owner_id, None, testimonial_state())]
+        )
+        StatsService.apply_changes(
+            mock_db, [TestimonialChange(tenant_owner_id, None, testimonial_state())]
+        )
+
+        assert not mock_db.exec.called
+        _run_before_commit(mock_db)
+        (upsert,) = compiled_statements(mock_db)
+        assert upsert.params["pending_count_m0"] == 2
+
+    def test_create_moderation_and_delete_are_one_upsert(self):
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+        created = testimonial_state(rating=5)
+        moderated = testimonial_state(rating=3, category_id=uuid4())
+        deleted = testimonial_state(status=StatusType.REJECTED, rating=0)
+
+        StatsService._write_counters(
+            mock_db,
+            [
+                TestimonialChange(tenant_owner_id, None, created),
+                TestimonialChange(
+                    tenant_owner_id, moderated, moderated.evolve(status=StatusType.APPROVED)
+                ),
+                TestimonialChange(tenant_owner_id, deleted, deleted.evolve(is_active=False)),
+            ],
+        )
+
+        (upsert,) = compiled_statements(mock_db)
+        assert "ON CONFLICT (user_id) DO UPDATE" in str(upsert)
+        assert (
+            "pending_count = (tenanttestimonialstats.pending_count + excluded.pending_count)"
+            in str(upsert)
+        )
+        params = upsert.params
+        assert params["pending_count_m0"] == 1 - 1
+        assert params["approved_count_m0"] == 1
+        assert params["rejected_count_m0"] == -1
+        assert params["uncategorized_count_m0"] == 1 - 1
+        assert params["rating_count_m0"] == 1
+        assert params["rating_sum_m0"] == 5
+        assert "nextval('tenanttestimonialstats_listing_version_seq')" in str(upsert)
+        assert "listing_version = excluded.listing_version" in str(upsert)
+
+    def test_category_change_moves_uncategorized(self):
+        mock_db = Mock()
+        state = testimonial_state()
+
+        StatsService._write_counters(
+            mock_db, [TestimonialChange(uuid4(), state, state.evolve(category_id=uuid4()))]
+        )
+
+        (upsert,) = compiled_statements(mock_db)
+        assert upsert.params["uncategorized_count_m0"] == -1
+        assert upsert.params["pending_count_m0"] == 0
+
+    def test_unchanged_counters_still_bump_the_listing_version(self):
+        mock_db = Mock()
+        state = testimonial_state()
+        inactive = testimonial_state(is_active=False)
+        tenants = [uuid4(), uuid4()]
+
+        StatsService._write_counters(
+            mock_db,
+            [
+                TestimonialChange(tenants[0], state, state.evolve(product_id="prod-2")),
+                TestimonialChange(tenants[1], None, inactive),
+            ],
+        )
+
+        (upsert,) = compiled_statements(mock_db)
+        assert [upsert.params[f"user_id_m{row}"] for row in range(2)] == sorted(tenants)
+        assert all(
+            upsert.params[f"{counter}_m{row}"] == 0
+            for counter in ("pending_count", "rating_sum")
+            for row in range(2)
+        )
+
+    def test_no_changes_write_nothing(self):
+        mock_db = Mock()
+
+        StatsService._write_counters(mock_db, [])
+
+        assert not mock_db.exec.called
+
+
+class TestGetStats:
+    def test_stats_come_from_the_counters(self):
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+        mock_db.get.return_value = TenantTestimonialStats(
+            user_id=tenant_owner_id,
+            pending_count=2,
+            approved_count=5,
+            rejected_count=1,
+            uncategorized_count=3,
+            rating_count=6,
+            rating_sum=25,
+        )
+
+        with patch(
+            "app.services.stats.CategoryService.get_tenant_categories", return_value=([], 0)
+        ) as get_categories:
+            stats = StatsService.get_stats(mock_db, tenant_owner_id, 5)
+
+        mock_db.get.assert_called_once_with(TenantTestimonialStats, tenant_owner_id)
+        get_categories.assert_called_once_with(mock_db, tenant_owner_id, 0, 5)
+        assert not mock_db.exec.called
+        assert (stats.total, stats.pending, stats.approved, stats.rejected) == (8, 2, 5, 1)
+        assert stats.average_rating == 4.17
+        assert stats.uncategorized == 3
+
+    def test_tenant_without_testimonials(self):
+        mock_db = Mock()
+        mock_db.get.return_value = None
+
+        with patch(
+            "app.services.stats.CategoryService.get_tenant_categories", return_value=([], 0)
+        ):
+            stats = StatsService.get_stats(mock_db, uuid4())
+
+        assert stats.total == 0
+        assert stats.average_rating is None
+
+
+class TestReconcile:
+    def test_counters_are_locked_and_only_drifted_rows_written(self):
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+        drifted = uuid4()
+        mock_db.exec.return_value.scalars.return_value.all.return_value = [drifted]
+
+        with (
+            patch("app.services.stats.TagService") as tag_service,
+            patch("app.services.stats.CategoryService") as category_service,
+        ):
+            corrected = StatsService.reconcile(mock_db, tenant_owner_id)
+
+        lock, *statements = mock_db.exec.call_args_list
+        assert str(lock.args[0]) == (
+            "LOCK TABLE tenanttagusage, tenantcategoryusage, tenanttestimonialstats "
+            "IN SHARE ROW EXCLUSIVE MODE"
+        )
+        compiled = [call.args[0].compile(dialect=postgresql.dialect()) for call in statements]
+        assert len(compiled) == 6
+        for stmt in compiled:
+            assert tenant_owner_id in stmt.params.values()
+        upsert = str(compiled[-1])
+        assert "ON CONFLICT (user_id) DO UPDATE" in upsert
+        assert "IS DISTINCT FROM" in upsert
+        assert "RETURNING tenanttestimonialstats.user_id" in upsert
+
+        assert mock_db.commit.called
+        assert corrected == {
+            "tenanttagusage": 1,
+            "tenantcategoryusage": 1,
+            "tenanttestimonialstats": 1,
+        }
+        tag_service.invalidate_suggestions.assert_called_once_with({drifted})
+        category_service.invalidate_catalog.assert_called_once_with({drifted})
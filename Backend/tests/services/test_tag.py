@@ -2,6 +2,8 @@
 
 from unittest.mock import Mock
 
+from sqlalchemy.dialects import postgresql
+
 from app.models.tag import Tag
 from app.services.tag import TagService
 
@@ -9,29 +11,53 @@ from app.services.tag import TagService
 def test_get_or_create_tags_creates_and_returns_mixed():
     mock_db = Mock()
 
-    # First tag does not exist -> create
-    exec_result_1 = Mock()
-    exec_result_1.first.return_value = None
-
-    # Second tag exists
+    # One SELECT finds the existing tag
     existing = Tag(name="exist", slug="exist")
-    exec_result_2 = Mock()
-    exec_result_2.first.return_value = existing
+    select_result = Mock()
+    select_result.all.return_value = [existing]
+
+    # One INSERT ... RETURNING creates the missing one
+    created = Tag(name="newtag", slug="newtag")
+    insert_result = Mock()
+    insert_result.scalars.return_value = [created]
 
-    # Configure side_effect of db.exec so each call returns a different exec result
-    mock_db.exec.side_effect = [exec_result_1, exec_result_2]
+    mock_db.exec.side_effect = [select_result, insert_result]
 
-    names = ["NewTag", "Exist"]
+    names = ["NewTag", "Exist", "exist"]
     result = TagService.get_or_create_tags(names, mock_db)
 
-    assert len(result) == 2
-    # second should be the existing object
-    assert result[1] is existing
-    # first should be a Tag instance created
-    assert isinstance(result[0], Tag)
-    mock_db.add.assert_called_once()
-    mock_db.commit.assert_called()
-    mock_db.refresh.assert_called()
+    # Deduplicated by slug, in input order
+    assert result == [created, existing]
+    assert mock_db.exec.call_count == 2
+    insert_sql = str(mock_db.exec.call_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT DO NOTHING" in insert_sql
+    assert "RETURNING" in insert_sql
+    mock_db.commit.assert_not_called()
+
+
+def test_get_or_create_tags_reselects_tags_created_concurrently():
+    mock_db = Mock()
+    raced = Tag(name="raced", slug="raced")
+
+    first_select = Mock()
+    first_select.all.return_value = []
+    insert_result = Mock()
+    insert_result.scalars.return_value = []  # conflict: nothing returned
+    second_select = Mock()
+    second_select.all.return_value = [raced]
+    mock_db.exec.side_effect = [first_select, insert_result, second_select]
+
+    result = TagService.get_or_create_tags(["Raced"], mock_db)
+
+    assert result == [raced]
+    assert mock_db.exec.call_count == 3
+
+
+def test_get_or_create_tags_empty_list_skips_queries():
+    mock_db = Mock()
+
+    assert TagService.get_or_create_tags([], mock_db) == []
+    mock_db.exec.assert_not_called()
 
 
 def test_get_all_tags_returns_list():
@@ -49,3 +75,95 @@ def test_get_all_tags_returns_list():
     assert len(result) == 2
     assert result[0] is t1
     assert result[1] is t2
+
+
+def test_get_catalog_is_cached_per_tenant_until_invalidated():
+    from uuid import uuid4
+
+    from app.services.tag import _catalog_cache
+
+    _catalog_cache.invalidate()
+    tenant_a, tenant_b = uuid4(), uuid4()
+    mock_db = Mock()
+    exec_result = Mock()
+    exec_result.one.return_value = 0
+    exec_result.all.return_value = []
+    mock_db.exec.return_value = exec_result
+
+    first = TagService.get_catalog(mock_db, tenant_a, 0, 50)
+    second = TagService.get_catalog(mock_db, tenant_a, 0, 50)
+
+    assert first is second
+    assert b'"total_items":0' in first.body
+    assert mock_db.exec.call_count == 2  # count + page, once
+
+    TagService.get_catalog(mock_db, tenant_b, 0, 50)
+    TagService.invalidate_catalog([tenant_a])
+
+    assert TagService.get_catalog(mock_db, tenant_a, 0, 50) is not first
+    assert mock_db.exec.call_count == 6
+
+
+def test_get_tenant_tags_returns_usage_counts():
+    from datetime import UTC, datetime
+    from uuid import uuid4
+
+    mock_db = Mock()
+    row = Mock()
+    row._asdict.return_value = {
+        "id": uuid4(),
+        "name": "tech",
+        "slug": "tech",
+        "created_at": datetime.now(UTC),
+        "usage_count": 7,
+    }
+    mock_db.exec.return_value.one.return_value = 1
+    mock_db.exec.return_value.all.return_value = [row]
+
+    tags, total = TagService.get_tenant_tags(mock_db, uuid4(), 0, 10)
+
+    assert total == 1
+    assert tags[0].slug == "tech"
+    assert tags[0].usage_count == 7
+
+
+def test_suggest_tags_loads_index_once_per_tenant():
+    from uuid import uuid4
+
+    from app.services.tag import _suggest_indexes
+
+    tenant_owner_id = uuid4()
+    _suggest_indexes.pop(tenant_owner_id, None)
+    mock_db = Mock()
+    mock_db.exec.return_value.all.return_value = [
+        (uuid4(), "café", "cafe", 3),
+        (uuid4(), "camera", "camera", 8),
+        (uuid4(), "tech", "tech", 1),
+    ]
+
+    first = TagService.suggest_tags(mock_db, tenant_owner_id, "Ca")
+    second = TagService.suggest_tags(mock_db, tenant_owner_id, "Caf")
+
+    assert [e.slug for e in first] == ["camera", "cafe"]
+    assert [e.slug for e in second] == ["cafe"]
+    assert mock_db.exec.call_count == 1
+
+
+def test_apply_usage_deltas_updates_or_drops_loaded_index():
+    from uuid import uuid4
+
+    from app.services.tag import _suggest_indexes
+
+    tenant_owner_id = uuid4()
+    _suggest_indexes.pop(tenant_owner_id, None)
+    tag_id = uuid4()
+    mock_db = Mock()
+    mock_db.exec.return_value.all.return_value = [(tag_id, "tech", "tech", 1)]
+    TagService.suggest_tags(mock_db, tenant_owner_id, "te")
+
+    TagService.apply_usage_deltas({(tenant_owner_id, tag_id): 4})
+    assert TagService.suggest_tags(mock_db, tenant_owner_id, "te")[0].usage_count == 5
+
+    # Unknown tag: the index is dropped and reloaded lazily
+    TagService.apply_usage_deltas({(tenant_owner_id, uuid4()): 1})
+    assert tenant_owner_id not in _suggest_indexes
@@ -1,11 +1,21 @@
 """Tests for Testimonial service."""
 
-from unittest.mock import Mock, patch
+import csv
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, Mock, patch
 from uuid import uuid4
 
-from app.models.testimonial import Testimonial
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.core.db import _run_before_commit
+from app.models.testimonial import StatusType, Testimonial
 from app.schemas.testimonial import TestimonialContent, TestimonialCreate, TestimonialProduct
+from app.services.changes import TestimonialChange
+from app.services.event_log import EventLogService
+from app.services.stats import StatsService
 from app.services.testimonial import TestimonialService
+from tests.conftest import compiled_statements, testimonial_state
 
 
 class TestCreateTestimonial:
@@ -14,6 +24,7 @@ class TestCreateTestimonial:
     def test_create_testimonial_with_category(self):
         """Test creating testimonial with category."""
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
         mock_category = Mock()
         mock_category.id = uuid4()
@@ -44,6 +55,7 @@ class TestCreateTestimonial:
     def test_create_testimonial_with_tags(self):
         """Test creating testimonial with tags."""
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
 
         data = TestimonialCreate(
@@ -60,6 +72,7 @@ class TestCreateTestimonial:
     def test_create_testimonial_minimal_fields(self):
         """Test creating testimonial with only required fields."""
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
 
         data = TestimonialCreate(
@@ -75,6 +88,7 @@ class TestCreateTestimonial:
     def test_create_testimonial_without_category(self):
         """Test creating testimonial without category."""
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
 
         data = TestimonialCreate(
@@ -94,6 +108,7 @@ class TestCreateTestimonial:
     def test_create_testimonial_without_tags(self):
         """Test creating testimonial without tags."""
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
 
         data = TestimonialCreate(
@@ -109,6 +124,154 @@ class TestCreateTestimonial:
             assert mock_db.add.called
 
 
+class TestImportTestimonials:
+    """Tests for import_testimonials function."""
+
+    def test_import_ndjson_batches_valid_lines_and_reports_errors(self):
+        """Test valid lines are inserted in batches and bad lines are reported."""
+        from app.schemas.testimonial import ExportFormat
+
+        lines = [
+            '{"product": {"id": "p1", "name": "One"}}\n',
+            "{not json\n",
+            "\n",
+            '{"product": {"id": "", "name": "Two"}}\n',
+            '{"product": {"id": "p3", "name": "Three"}, "tags": ["a"]}\n',
+            '{"product": {"id": "p4", "name": "Four"}}\n',
+        ]
+        batches = []
+
+        with (
+            patch("app.services.testimonial.settings.IMPORT_BATCH_SIZE", 2),
+            patch.object(
+                TestimonialService,
+                "_insert_batch",
+                side_effect=lambda batch, db, tenant: batches.append(batch) or len(batch),
+            ),
+        ):
+            result = TestimonialService.import_testimonials(
+                lines, ExportFormat.NDJSON, Mock(), uuid4()
+            )
+
+        assert [[data.product.id for data in batch] for batch in batches] == [
+            ["p1", "p3"],
+            ["p4"],
+        ]
+        assert result.imported == 3
+        assert result.failed == 2
+        assert [error.line for error in result.errors] == [2, 4]
+        assert result.errors[1].error == "product.id: String should have at least 1 character"
+
+    def test_import_csv_reads_export_layout(self):
+        """Test CSV rows in the export layout become create payloads."""
+        from app.schemas.testimonial import ExportFormat
+
+        lines = [
+            "id,status,product_id,product_name,title,content,rating,author_name,"
+            "youtube_url,image_url,category,tags,created_at,updated_at\n",
+            f"{uuid4()},approved,p1,Product,Great,,4,Ana,,https://a.com/1.png|https://a.com/2.png,"
+            "Books,a|b,2025-01-01T00:00:00.000000Z,2025-01-01T00:00:00.000000Z\n",
+        ]
+        batches = []
+
+        with patch.object(
+            TestimonialService,
+            "_insert_batch",
+            side_effect=lambda batch, db, tenant: batches.append(batch) or len(batch),
+        ):
+            result = TestimonialService.import_testimonials(
+                lines, ExportFormat.CSV, Mock(), uuid4()
+            )
+
+        assert result.imported == 1
+        (data,) = batches[0]
+        assert data.product.id == "p1"
+        assert data.content.rating == 4
+        assert data.content.content is None
+        assert data.media.image_url == ["https://a.com/1.png", "https://a.com/2.png"]
+        assert data.category_name == "Books"
+        assert data.tags == ["a", "b"]
+
+    def test_import_csv_parse_error_ends_import_after_inserting_earlier_rows(self):
+        """Test a CSV the csv module cannot parse is reported as a rejected line."""
+        from app.schemas.testimonial import ExportFormat
+
+        lines = [
+            "product_id,product_name,content\n",
+            "p1,One,Fine\n",
+            f"p2,Two,{'x' * (csv.field_size_limit() + 1)}\n",
+            "p3,Three,Never read\n",
+        ]
+        batches = []
+
+        with patch.object(
+            TestimonialService,
+            "_insert_batch",
+            side_effect=lambda batch, db, tenant: batches.append(batch) or len(batch),
+        ):
+            result = TestimonialService.import_testimonials(
+                lines, ExportFormat.CSV, Mock(), uuid4()
+            )
+
+        assert [[data.product.id for data in batch] for batch in batches] == [["p1"]]
+        assert result.imported == 1
+        assert result.failed == 1
+        (error,) = result.errors
+        assert error.line == 3
+        assert error.error.startswith("Invalid CSV: field larger than field limit")
+
+    def test_insert_batch_copies_rows_and_links(self):
+        """Test a batch resolves categories/tags once, COPYs rows and commits once."""
+        mock_db = MagicMock()
+        copy = mock_db.connection.return_value.connection.cursor.return_value.copy
+        tenant_owner_id = uuid4()
+
+        category = Mock(slug="books", id=uuid4())
+        tag = Mock(slug="a", id=uuid4())
+        batch = [
+            TestimonialCreate(
+                product={"id": "p1", "name": "One"}, category_name="Books", tags=["A"]
+            ),
+            TestimonialCreate(product={"id": "p2", "name": "Two"}, tags=["a"]),
+        ]
+
+        with (
+            patch(
+                "app.services.testimonial.CategoryService.get_or_create_categories",
+                return_value=[category],
+            ) as mock_categories,
+            patch(
+                "app.services.testimonial.TagService.get_or_create_tags", return_value=[tag]
+            ) as mock_tags,
+            patch.object(TestimonialService, "_apply_changes") as mock_apply,
+        ):
+            inserted = TestimonialService._insert_batch(batch, mock_db, tenant_owner_id)
+
+        assert inserted == 2
+        mock_categories.assert_called_once_with(["Books"], mock_db)
+        mock_tags.assert_called_once_with(["A", "a"], mock_db)
+
+        assert [call.args[0].split(" (")[0] for call in copy.call_args_list] == [
+            "COPY testimonial",
+            "COPY testimonialtaglink",
+        ]
+        written = [
+            call.args[0]
+            for call in copy.return_value.__enter__.return_value.write_row.call_args_list
+        ]
+        rows, links = written[:2], written[2:]
+        assert rows[0][3:5] == [tenant_owner_id, True]
+        assert "PENDING" in rows[0]
+        assert rows[0][-1] == category.id
+        assert links == [(rows[0][0], tag.id), (rows[1][0], tag.id)]
+
+        changes = mock_apply.call_args.args[1]
+        assert [change.before for change in changes] == [None, None]
+        assert changes[0].after.category_id == category.id
+        assert changes[1].after.tag_ids == {tag.id}
+        mock_db.commit.assert_called_once()
+
+
 class TestGetTestimonials:
     """Tests for get_testimonials function."""
 
@@ -322,6 +485,262 @@ class TestGetTestimonials:
         assert mock_db.exec.call_count == 2
 
 
+class TestGetTestimonialsJson:
+    """Tests for get_testimonials_json function."""
+
+    def test_get_testimonials_json_returns_single_value(self):
+        """Test that the whole page comes back from one statement as text."""
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+        mock_db.exec.return_value.one.return_value = '{"total_items": 0, "results": []}'
+
+        result = TestimonialService.get_testimonials_json(
+            mock_db, skip=0, limit=10, tenant_owner_id=tenant_owner_id
+        )
+
+        assert result == '{"total_items": 0, "results": []}'
+        assert mock_db.exec.call_count == 1
+
+    def test_get_testimonials_json_builds_json_in_postgres(self):
+        """Test that the statement aggregates tags and builds the JSON document."""
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+
+        TestimonialService.get_testimonials_json(
+            mock_db,
+            skip=0,
+            limit=10,
+            tenant_owner_id=tenant_owner_id,
+            status="approved",
+            tags=["tech"],
+        )
+
+        statement = mock_db.exec.call_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "json_build_object" in sql
+        assert "json_agg" in sql
+        assert "testimonialtaglink" in sql
+
+
+class TestGetPublished:
+    """Tests for the cached public read functions."""
+
+    tenant_owner_id = uuid4()
+
+    def setup_method(self):
+        TestimonialService.invalidate_published([self.tenant_owner_id])
+
+    def test_get_published_reads_feed_by_slugs(self):
+        """Test that pages come from the feed table, filters compared as slugs."""
+        mock_db = Mock()
+        mock_db.exec.return_value.one.return_value = '{"results": []}'
+
+        TestimonialService.get_published(
+            mock_db, self.tenant_owner_id, 0, 10, category="Home Office", tag="Dev Ops"
+        )
+
+        compiled = mock_db.exec.call_args.args[0].compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert "FROM publishedtestimonial" in sql
+        assert "JOIN" not in sql
+        assert "publishedtestimonial.tag_slugs @>" in sql
+        assert "home-office" in compiled.params.values()
+        assert ["dev-ops"] in compiled.params.values()
+
+    def test_get_published_serves_repeated_reads_from_cache(self):
+        """Test that name and slug spellings share one cached page."""
+        mock_db = Mock()
+        mock_db.exec.return_value.one.return_value = '{"results": []}'
+
+        first = TestimonialService.get_published(
+            mock_db, self.tenant_owner_id, 0, 10, tag="Dev Ops"
+        )
+        second = TestimonialService.get_published(
+            mock_db, self.tenant_owner_id, 0, 10, tag="dev-ops"
+        )
+
+        assert first.body == b'{"results": []}'
+        assert second is first
+        assert mock_db.exec.call_count == 1
+
+    def test_status_change_of_published_testimonial_invalidates_after_commit(self):
+        """Test that unpublishing drops the tenant cache once the write commits."""
+        from app.core.db import _run_after_commit
+        from app.services.changes import TestimonialChange, TestimonialState
+
+        mock_db = Mock()
+        mock_db.info = {}
+        mock_db.exec.return_value.one.return_value = '{"results": []}'
+        TestimonialService.get_published(mock_db, self.tenant_owner_id, 0, 10)
+        state = TestimonialState(
+            id=uuid4(),
+            product_id="p1",
+            status=StatusType.APPROVED,
+            is_active=True,
+            rating=5,
+            category_id=None,
+        )
+
+        with (
+            patch("app.services.testimonial.UsageService.apply_changes"),
+            patch("app.services.testimonial.FeedService.apply_changes"),
+            patch("app.services.testimonial.RatingSummaryService.apply_changes"),
+        ):
+            TestimonialService._apply_changes(
+                mock_db,
+                [
+                    TestimonialChange(
+                        self.tenant_owner_id, state, state.evolve(status=StatusType.REJECTED)
+                    )
+                ],
+            )
+        TestimonialService.get_published(mock_db, self.tenant_owner_id, 0, 10)
+        assert mock_db.exec.call_count == 1
+
+        _run_after_commit(mock_db)
+        TestimonialService.get_published(mock_db, self.tenant_owner_id, 0, 10)
+        assert mock_db.exec.call_count == 2
+
+    def test_pending_changes_keep_cache(self):
+        """Test that writes to unpublished testimonials do not touch the cache."""
+        from app.services.changes import TestimonialChange, TestimonialState
+
+        mock_db = Mock()
+        mock_db.info = {}
+        state = TestimonialState(
+            id=uuid4(),
+            product_id="p1",
+            status=StatusType.PENDING,
+            is_active=True,
+            rating=5,
+            category_id=None,
+        )
+
+        with (
+            patch("app.services.testimonial.UsageService.apply_changes"),
+            patch("app.services.testimonial.AnalyticsService.apply_changes"),
+        ):
+            TestimonialService._apply_changes(
+                mock_db, [TestimonialChange(self.tenant_owner_id, None, state)]
+            )
+
+        assert "after_commit" not in mock_db.info
+
+    def test_get_published_testimonial_not_found(self):
+        """Test that an unpublished or unknown id is a 404 and is not cached."""
+        from fastapi import HTTPException
+
+        mock_db = Mock()
+        mock_db.exec.return_value.first.return_value = None
+
+        for _ in range(2):
+            try:
+                TestimonialService.get_published_testimonial(uuid4(), mock_db, self.tenant_owner_id)
+                raise AssertionError("Should have raised HTTPException")
+            except HTTPException as e:
+                assert e.status_code == 404
+
+        assert mock_db.exec.call_count == 2
+
+
+class TestApplyChanges:
+    """Tests for the fan-out of testimonial writes."""
+
+    def test_tenant_locks_are_taken_only_right_before_commit(self):
+        """Concurrent writers of a tenant only serialize on the last statement of the transaction."""
+        mock_db = Mock()
+        mock_db.info = {}
+        pending = testimonial_state(tag_ids=[uuid4()])
+
+        TestimonialService._apply_changes(
+            mock_db,
+            [TestimonialChange(uuid4(), pending, pending.evolve(status=StatusType.APPROVED))],
+        )
+
+        fan_out = compiled_statements(mock_db)
+        assert fan_out
+        assert not any("pg_advisory_xact_lock" in str(statement) for statement in fan_out)
+
+        _run_before_commit(mock_db)
+        *_, last = compiled_statements(mock_db)
+        assert "pg_advisory_xact_lock" in str(last)
+
+
+class TestExportTestimonials:
+    """Tests for export_testimonials function."""
+
+    def test_export_ndjson_streams_one_chunk_per_batch(self):
+        """Test NDJSON lines rendered by Postgres are joined per cursor batch."""
+        from app.schemas.testimonial import ExportFormat
+
+        mock_db = Mock()
+        mock_db.exec.return_value.partitions.return_value = iter(
+            [['{"id": 1}', '{"id": 2}'], ['{"id": 3}']]
+        )
+
+        chunks = list(TestimonialService.export_testimonials(mock_db, uuid4(), ExportFormat.NDJSON))
+
+        assert chunks == ['{"id": 1}\n{"id": 2}\n', '{"id": 3}\n']
+        query = mock_db.exec.call_args.args[0]
+        assert query.get_execution_options()["yield_per"] == settings.EXPORT_BATCH_SIZE
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert "json_build_object" in sql
+        assert "testimonial.user_id = " in sql
+
+    def test_export_csv_writes_header_and_flattens_lists(self):
+        """Test CSV export writes a header and joins list values."""
+        from app.schemas.testimonial import ExportFormat
+
+        mock_db = Mock()
+        row = (
+            uuid4(), "approved", "prod-1", "Product", "Title", "Body, with comma", 5, "Ana",
+            None, ["https://a.com/1.png", "https://a.com/2.png"], "Books", "a|b",
+            "2025-01-01T00:00:00.000000Z", "2025-01-02T00:00:00.000000Z",
+        )  # fmt: skip
+        mock_db.exec.return_value.partitions.return_value = iter([[row]])
+
+        body = "".join(
+            TestimonialService.export_testimonials(
+                mock_db, uuid4(), ExportFormat.CSV, status="approved", tags=["a"]
+            )
+        )
+
+        header, line = body.splitlines()
+        assert header.startswith("id,status,product_id")
+        assert '"Body, with comma"' in line
+        assert "https://a.com/1.png|https://a.com/2.png,Books,a|b" in line
+
+    def test_export_csv_without_rows_still_has_header(self):
+        """Test an empty CSV export is just the header."""
+        from app.schemas.testimonial import ExportFormat
+
+        mock_db = Mock()
+        mock_db.exec.return_value.partitions.return_value = iter([])
+
+        body = "".join(TestimonialService.export_testimonials(mock_db, uuid4(), ExportFormat.CSV))
+
+        assert body.splitlines() == [
+            "id,status,product_id,product_name,title,content,rating,author_name,"
+            "youtube_url,image_url,category,tags,created_at,updated_at"
+        ]
+
+
+class TestGetListingVersion:
+    """Tests for get_listing_version function."""
+
+    def test_get_listing_version_reads_the_stats_row(self):
+        """Test that the probe is a single primary-key read of the tenant's listing version."""
+        mock_db = Mock()
+        mock_db.exec.return_value.first.return_value = 42
+
+        result = TestimonialService.get_listing_version(mock_db, uuid4())
+
+        assert result == 42
+        assert mock_db.exec.call_count == 1
+        sql = str(mock_db.exec.call_args.args[0])
+        assert "tenanttestimonialstats.listing_version" in sql
+
+
 class TestGetTestimonialById:
     """Tests for get_testimonial_by_id function."""
 
@@ -374,6 +793,80 @@ class TestGetTestimonialById:
         assert mock_db.exec.called
 
 
+class TestGetTestimonialsByIds:
+    """Tests for get_testimonials_by_ids function."""
+
+    def test_get_testimonials_by_ids_keeps_requested_order(self):
+        """Test results follow the requested order and missing ids are reported."""
+        mock_db = Mock()
+        first, second, missing = uuid4(), uuid4(), uuid4()
+
+        found = []
+        for testimonial_id in (first, second):
+            testimonial = Mock(spec=Testimonial)
+            testimonial.id = testimonial_id
+            found.append(testimonial)
+        mock_db.exec.return_value.all.return_value = found
+
+        testimonials, not_found = TestimonialService.get_testimonials_by_ids(
+            [second, missing, first, second], mock_db, uuid4()
+        )
+
+        assert [t.id for t in testimonials] == [second, first]
+        assert not_found == [missing]
+        assert mock_db.exec.call_count == 1
+
+    def test_get_testimonials_by_ids_single_tenant_scoped_query(self):
+        """Test ids are bound as one array and filtered by tenant."""
+        mock_db = Mock()
+        mock_db.exec.return_value.all.return_value = []
+        ids = [uuid4(), uuid4()]
+
+        TestimonialService.get_testimonials_by_ids(ids, mock_db, uuid4())
+
+        query = mock_db.exec.call_args.args[0]
+        compiled = query.compile(dialect=postgresql.dialect())
+        assert "testimonial.id = ANY (%(ids)s::UUID[])" in str(compiled)
+        assert "testimonial.user_id = " in str(compiled)
+        assert compiled.params["ids"] == ids
+
+
+def _returning_row(testimonial_id, current_tags=None, category_name=None, **overrides):
+    """Row returned by the UPDATE ... RETURNING of the write paths."""
+    now = datetime.now(UTC)
+    values = {
+        "id": testimonial_id,
+        "created_at": now,
+        "updated_at": now,
+        "product_id": "prod-123",
+        "product_name": "Test Product",
+        "title": "Original Title",
+        "content": "Original content",
+        "author_name": "Original Author",
+        "youtube_url": None,
+        "image_url": [],
+        "status": StatusType.PENDING,
+        "is_active": True,
+        "rating": 5,
+        "category_id": None,
+        "old_status": StatusType.PENDING,
+        "old_is_active": True,
+        "old_rating": 5,
+        "old_category_id": None,
+        "current_tags": current_tags,
+        "category_name": category_name,
+    } | overrides
+    row = Mock(**values)
+    row._asdict.return_value = values
+    return row
+
+
+def _update_params(mock_db):
+    """Bound SET values of the UPDATE issued by a write path."""
+    statement = mock_db.exec.call_args_list[0].args[0]
+    return statement.compile(dialect=postgresql.dialect()).params
+
+
 class TestUpdateTestimonial:
     """Tests for update_testimonial function."""
 
@@ -382,15 +875,12 @@ class TestUpdateTestimonial:
         from app.schemas.testimonial import TestimonialContent, TestimonialUpdate
 
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
         testimonial_id = uuid4()
-
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = tenant_owner_id
-        mock_testimonial.category = None
-        mock_testimonial.tags = []
-
-        mock_db.get.return_value = mock_testimonial
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(
+            testimonial_id, title="Updated Title"
+        )
 
         data = TestimonialUpdate(
             content=TestimonialContent(
@@ -408,83 +898,84 @@ class TestUpdateTestimonial:
             testimonial_id=testimonial_id,
         )
 
-        assert mock_db.get.called
-        assert mock_db.add.called
+        assert mock_db.exec.call_count == 1
+        assert mock_db.info["before_commit"][EventLogService._write_events]
+        assert _update_params(mock_db)["title"] == "Updated Title"
         assert mock_db.commit.called
-        assert mock_db.refresh.called
+        assert not mock_db.get.called
+        assert result.id == testimonial_id
         assert result.title == "Updated Title"
 
-    def test_update_testimonial_not_found(self):
-        """Test updating non-existent testimonial raises error."""
-        from fastapi import HTTPException
-
+    def test_update_testimonial_is_single_tenant_scoped_statement(self):
+        """Test the update locks, filters by tenant and returns old and new values."""
         from app.schemas.testimonial import TestimonialUpdate
 
         mock_db = Mock()
-        tenant_owner_id = uuid4()
+        mock_db.info = {}
         testimonial_id = uuid4()
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(testimonial_id)
 
-        mock_db.get.return_value = None
-
-        data = TestimonialUpdate()
+        TestimonialService.update_testimonial(
+            data=TestimonialUpdate(),
+            db=mock_db,
+            tenant_owner_id=uuid4(),
+            testimonial_id=testimonial_id,
+        )
 
-        try:
-            TestimonialService.update_testimonial(
-                data=data,
-                db=mock_db,
-                tenant_owner_id=tenant_owner_id,
-                testimonial_id=testimonial_id,
-            )
-            raise AssertionError("Should have raised HTTPException")
-        except HTTPException as e:
-            assert e.status_code == 404
+        statement = mock_db.exec.call_args_list[0].args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE testimonial SET updated_at=now()")
+        assert "testimonial.user_id = " in sql
+        assert "FOR UPDATE" in sql
+        assert "RETURNING" in sql
+        assert "previous.status AS old_status" in sql
 
-    def test_update_testimonial_from_different_tenant(self):
-        """Test updating testimonial from different tenant raises error."""
+    def test_update_testimonial_not_found(self):
+        """Test updating non-existent testimonial raises error."""
         from fastapi import HTTPException
 
         from app.schemas.testimonial import TestimonialUpdate
 
         mock_db = Mock()
         tenant_owner_id = uuid4()
-        other_tenant_id = uuid4()
         testimonial_id = uuid4()
 
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = other_tenant_id
-
-        mock_db.get.return_value = mock_testimonial
+        # No row updated: missing, or owned by another tenant
+        mock_db.exec.return_value.one_or_none.return_value = None
 
-        data = TestimonialUpdate()
+        data = TestimonialUpdate(tags=["tag1"])
 
-        try:
-            TestimonialService.update_testimonial(
-                data=data,
-                db=mock_db,
-                tenant_owner_id=tenant_owner_id,
-                testimonial_id=testimonial_id,
-            )
-            raise AssertionError("Should have raised HTTPException")
-        except HTTPException as e:
-            assert e.status_code == 404
+        with patch("app.services.testimonial.TagService.get_or_create_tags") as mock_get_tags:
+            try:
+                TestimonialService.update_testimonial(
+                    data=data,
+                    db=mock_db,
+                    tenant_owner_id=tenant_owner_id,
+                    testimonial_id=testimonial_id,
+                )
+                raise AssertionError("Should have raised HTTPException")
+            except HTTPException as e:
+                assert e.status_code == 404
+
+        assert not mock_get_tags.called
+        assert not mock_db.commit.called
 
     def test_update_testimonial_with_category(self):
         """Test updating testimonial with new category."""
         from app.schemas.testimonial import TestimonialUpdate
 
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
         testimonial_id = uuid4()
 
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = tenant_owner_id
-        mock_testimonial.category = None
-        mock_testimonial.tags = []
-
-        mock_db.get.return_value = mock_testimonial
-
         mock_category = Mock()
         mock_category.id = uuid4()
+        mock_category.name = "new category"
+
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(
+            testimonial_id, category_id=mock_category.id, category_name="new category"
+        )
 
         data = TestimonialUpdate(category_name="New Category")
 
@@ -493,7 +984,7 @@ class TestUpdateTestimonial:
         ) as mock_get_category:
             mock_get_category.return_value = mock_category
 
-            TestimonialService.update_testimonial(
+            result = TestimonialService.update_testimonial(
                 data=data,
                 db=mock_db,
                 tenant_owner_id=tenant_owner_id,
@@ -501,27 +992,30 @@ class TestUpdateTestimonial:
             )
 
             mock_get_category.assert_called_once_with("New Category", mock_db)
-            assert mock_testimonial.category_id == mock_category.id
+            assert _update_params(mock_db)["category_id"] == mock_category.id
+            assert result.category_name == "new category"
 
     def test_update_testimonial_with_tags(self):
         """Test updating testimonial with new tags."""
         from app.schemas.testimonial import TestimonialUpdate
 
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
         testimonial_id = uuid4()
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(testimonial_id)
 
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = tenant_owner_id
-        mock_testimonial.category = None
-        mock_testimonial.tags = []
-
-        mock_db.get.return_value = mock_testimonial
+        tags = []
+        for name in ("tag1", "tag2"):
+            tag = Mock()
+            tag.id, tag.slug, tag.name = uuid4(), name, name
+            tags.append(tag)
 
         data = TestimonialUpdate(tags=["tag1", "tag2"])
 
         with patch("app.services.testimonial.TagService.get_or_create_tags") as mock_get_tags:
-            TestimonialService.update_testimonial(
+            mock_get_tags.return_value = tags
+            result = TestimonialService.update_testimonial(
                 data=data,
                 db=mock_db,
                 tenant_owner_id=tenant_owner_id,
@@ -529,42 +1023,109 @@ class TestUpdateTestimonial:
             )
 
             mock_get_tags.assert_called_once_with(["tag1", "tag2"], mock_db)
+            assert result.tags == ["tag1", "tag2"]
 
     def test_update_testimonial_partial_content(self):
         """Test partial update only modifies provided fields."""
         from app.schemas.testimonial import TestimonialContent, TestimonialUpdate
 
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
         testimonial_id = uuid4()
-
-        # Existing testimonial with all fields filled
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = tenant_owner_id
-        mock_testimonial.title = "Original Title"
-        mock_testimonial.content = "Original content"
-        mock_testimonial.rating = 5
-        mock_testimonial.author_name = "Original Author"
-        mock_testimonial.category = None
-        mock_testimonial.tags = []
-
-        mock_db.get.return_value = mock_testimonial
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(
+            testimonial_id, author_name="New Author"
+        )
 
         # Only update author_name
         data = TestimonialUpdate(content=TestimonialContent(author_name="New Author"))
 
-        TestimonialService.update_testimonial(
+        result = TestimonialService.update_testimonial(
             data=data,
             db=mock_db,
             tenant_owner_id=tenant_owner_id,
             testimonial_id=testimonial_id,
         )
 
-        # Only author_name should change, others should remain
-        assert mock_testimonial.author_name == "New Author"
-        assert mock_testimonial.title == "Original Title"
-        assert mock_testimonial.content == "Original content"
-        assert mock_testimonial.rating == 5
+        # Only author_name should be set, others should remain
+        params = _update_params(mock_db)
+        assert params["author_name"] == "New Author"
+        assert "title" not in params
+        assert "content" not in params
+        assert "rating" not in params
+        assert result.title == "Original Title"
+
+    def test_update_testimonial_tags_only_writes_changed_links(self):
+        """Test replacing tags only creates new tags and unlinks dropped ones."""
+        from app.schemas.testimonial import TestimonialUpdate
+
+        mock_db = Mock()
+        mock_db.info = {}
+        tenant_owner_id = uuid4()
+        testimonial_id = uuid4()
+        kept_id, dropped_id, new_id = uuid4(), uuid4(), uuid4()
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(
+            testimonial_id,
+            current_tags=[[str(kept_id), "kept", "Kept"], [str(dropped_id), "dropped", "Dropped"]],
+        )
+
+        new_tag = Mock()
+        new_tag.id, new_tag.slug, new_tag.name = new_id, "new", "New"
+
+        with (
+            patch("app.services.testimonial.TagService.get_or_create_tags") as mock_get_tags,
+            patch("app.services.testimonial.UsageService.apply_changes") as mock_apply,
+        ):
+            mock_get_tags.return_value = [new_tag]
+            result = TestimonialService.update_testimonial(
+                data=TestimonialUpdate(tags=["Kept", "New"]),
+                db=mock_db,
+                tenant_owner_id=tenant_owner_id,
+                testimonial_id=testimonial_id,
+            )
+
+        mock_get_tags.assert_called_once_with(["New"], mock_db)
+        statements = [call.args[0] for call in mock_db.exec.call_args_list]
+        assert [type(stmt).__name__ for stmt in statements] == ["Update", "Insert", "Delete"]
+        assert result.tags == ["Kept", "New"]
+
+        (change,) = mock_apply.call_args.args[1]
+        assert change.before.tag_ids == {kept_id, dropped_id}
+        assert change.after.tag_ids == {kept_id, new_id}
+
+    def test_update_testimonial_add_and_remove_tags(self):
+        """Test add_tags/remove_tags patch the current tags."""
+        from app.schemas.testimonial import TestimonialUpdate
+
+        mock_db = Mock()
+        mock_db.info = {}
+        tenant_owner_id = uuid4()
+        testimonial_id = uuid4()
+        kept_id, dropped_id = uuid4(), uuid4()
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(
+            testimonial_id,
+            current_tags=[[str(kept_id), "kept", "Kept"], [str(dropped_id), "dropped", "Dropped"]],
+        )
+
+        with (
+            patch("app.services.testimonial.TagService.get_or_create_tags") as mock_get_tags,
+            patch("app.services.testimonial.UsageService.apply_changes") as mock_apply,
+        ):
+            mock_get_tags.return_value = []
+            result = TestimonialService.update_testimonial(
+                data=TestimonialUpdate(add_tags=["kept"], remove_tags=["Dropped"]),
+                db=mock_db,
+                tenant_owner_id=tenant_owner_id,
+                testimonial_id=testimonial_id,
+            )
+
+        mock_get_tags.assert_called_once_with([], mock_db)
+        statements = [call.args[0] for call in mock_db.exec.call_args_list]
+        assert [type(stmt).__name__ for stmt in statements] == ["Update", "Delete"]
+        assert result.tags == ["Kept"]
+
+        (change,) = mock_apply.call_args.args[1]
+        assert change.after.tag_ids == {kept_id}
 
 
 class TestSoftDeleteTestimonial:
@@ -573,22 +1134,31 @@ class TestSoftDeleteTestimonial:
     def test_soft_delete_testimonial_success(self):
         """Test soft deleting testimonial successfully."""
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
         testimonial_id = uuid4()
-
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = tenant_owner_id
-
-        mock_db.get.return_value = mock_testimonial
-
-        result = TestimonialService.soft_delete_testimonial(
-            testimonial_id, mock_db, tenant_owner_id
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(
+            testimonial_id, is_active=False
         )
 
+        with patch("app.services.testimonial.UsageService.apply_changes") as mock_apply:
+            result = TestimonialService.soft_delete_testimonial(
+                testimonial_id, mock_db, tenant_owner_id
+            )
+
         assert result is True
-        assert mock_testimonial.is_active is False
-        assert mock_db.add.called
+        assert mock_db.exec.call_count == 1
+        # Written right before commit, with the rest of the fan-out
+        deferred = mock_db.info["before_commit"]
+        assert deferred[StatsService._write_counters] == mock_apply.call_args.args[1]
+        assert deferred[EventLogService._write_events] == mock_apply.call_args.args[1]
+        assert _update_params(mock_db)["is_active"] is False
         assert mock_db.commit.called
+        assert not mock_db.get.called
+
+        (change,) = mock_apply.call_args.args[1]
+        assert change.before.is_active is True
+        assert change.after.is_active is False
 
     def test_soft_delete_testimonial_not_found(self):
         """Test soft deleting non-existent testimonial raises HTTPException."""
@@ -598,7 +1168,7 @@ class TestSoftDeleteTestimonial:
         tenant_owner_id = uuid4()
         testimonial_id = uuid4()
 
-        mock_db.get.return_value = None
+        mock_db.exec.return_value.one_or_none.return_value = None
 
         try:
             TestimonialService.soft_delete_testimonial(testimonial_id, mock_db, tenant_owner_id)
@@ -606,19 +1176,18 @@ class TestSoftDeleteTestimonial:
         except HTTPException as e:
             assert e.status_code == 404
 
+        assert not mock_db.commit.called
+
     def test_soft_delete_testimonial_from_different_tenant(self):
         """Test soft deleting testimonial from different tenant raises HTTPException."""
         from fastapi import HTTPException
 
         mock_db = Mock()
         tenant_owner_id = uuid4()
-        other_tenant_id = uuid4()
         testimonial_id = uuid4()
 
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = other_tenant_id
-
-        mock_db.get.return_value = mock_testimonial
+        # The row exists but the tenant filter matches nothing
+        mock_db.exec.return_value.one_or_none.return_value = None
 
         try:
             TestimonialService.soft_delete_testimonial(testimonial_id, mock_db, tenant_owner_id)
@@ -626,43 +1195,52 @@ class TestSoftDeleteTestimonial:
         except HTTPException as e:
             assert e.status_code == 404
 
+        assert _update_params(mock_db)["user_id_1"] == tenant_owner_id
+
 
 class TestUpdateStatus:
     """Tests for update_status function."""
 
     def test_update_status_success(self):
         """Test updating testimonial status successfully."""
-        from app.models.testimonial import StatusType
-
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
         testimonial_id = uuid4()
-
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = tenant_owner_id
-
-        mock_db.get.return_value = mock_testimonial
-
-        result = TestimonialService.update_status(
-            testimonial_id, StatusType.APPROVED, mock_db, tenant_owner_id
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(
+            testimonial_id, status=StatusType.APPROVED
         )
 
+        with (
+            patch("app.services.testimonial.UsageService.apply_changes") as mock_apply,
+            patch("app.services.testimonial.FeedService.apply_changes") as mock_feed,
+            patch("app.services.testimonial.RatingSummaryService.apply_changes") as mock_ratings,
+        ):
+            result = TestimonialService.update_status(
+                testimonial_id, StatusType.APPROVED, mock_db, tenant_owner_id
+            )
+
         assert result is True
-        assert mock_testimonial.status == StatusType.APPROVED
-        assert mock_db.add.called
+        assert mock_db.exec.call_count == 1
+        assert _update_params(mock_db)["status"] == StatusType.APPROVED
         assert mock_db.commit.called
+        assert not mock_db.get.called
+
+        (change,) = mock_apply.call_args.args[1]
+        assert change.before.status == StatusType.PENDING
+        assert change.after.status == StatusType.APPROVED
+        assert mock_feed.call_args.args[1] == [change]
+        assert mock_ratings.call_args.args[1] == [change]
 
     def test_update_status_not_found(self):
         """Test updating status of non-existent testimonial raises HTTPException."""
         from fastapi import HTTPException
 
-        from app.models.testimonial import StatusType
-
         mock_db = Mock()
         tenant_owner_id = uuid4()
         testimonial_id = uuid4()
 
-        mock_db.get.return_value = None
+        mock_db.exec.return_value.one_or_none.return_value = None
 
         try:
             TestimonialService.update_status(
@@ -672,21 +1250,18 @@ class TestUpdateStatus:
         except HTTPException as e:
             assert e.status_code == 404
 
+        assert not mock_db.commit.called
+
     def test_update_status_from_different_tenant(self):
         """Test updating status of testimonial from different tenant raises HTTPException."""
         from fastapi import HTTPException
 
-        from app.models.testimonial import StatusType
-
         mock_db = Mock()
         tenant_owner_id = uuid4()
-        other_tenant_id = uuid4()
         testimonial_id = uuid4()
 
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = other_tenant_id
-
-        mock_db.get.return_value = mock_testimonial
+        # The row exists but the tenant filter matches nothing
+        mock_db.exec.return_value.one_or_none.return_value = None
 
         try:
             TestimonialService.update_status(
@@ -696,42 +1271,139 @@ class TestUpdateStatus:
         except HTTPException as e:
             assert e.status_code == 404
 
+        assert _update_params(mock_db)["user_id_1"] == tenant_owner_id
+
     def test_update_status_to_rejected(self):
         """Test updating testimonial status to rejected."""
-        from app.models.testimonial import StatusType
-
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
         testimonial_id = uuid4()
-
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = tenant_owner_id
-
-        mock_db.get.return_value = mock_testimonial
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(
+            testimonial_id, status=StatusType.REJECTED
+        )
 
         result = TestimonialService.update_status(
             testimonial_id, StatusType.REJECTED, mock_db, tenant_owner_id
         )
 
         assert result is True
-        assert mock_testimonial.status == StatusType.REJECTED
+        assert _update_params(mock_db)["status"] == StatusType.REJECTED
 
     def test_update_status_to_pending(self):
         """Test updating testimonial status back to pending."""
-        from app.models.testimonial import StatusType
-
         mock_db = Mock()
+        mock_db.info = {}
         tenant_owner_id = uuid4()
         testimonial_id = uuid4()
-
-        mock_testimonial = Mock(spec=Testimonial)
-        mock_testimonial.user_id = tenant_owner_id
-
-        mock_db.get.return_value = mock_testimonial
+        mock_db.exec.return_value.one_or_none.return_value = _returning_row(
+            testimonial_id, old_status=StatusType.APPROVED
+        )
 
         result = TestimonialService.update_status(
             testimonial_id, StatusType.PENDING, mock_db, tenant_owner_id
         )
 
         assert result is True
-        assert mock_testimonial.status == StatusType.PENDING
+        assert _update_params(mock_db)["status"] == StatusType.PENDING
+
+
+class TestBulkModerate:
+    """Tests for bulk_moderate function."""
+
+    def test_bulk_moderate_ids_reports_outcomes(self):
+        """Test each requested id gets updated, unchanged or not_found."""
+        from app.schemas.testimonial import TestimonialBulkModeration
+
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+        updated_id, unchanged_id, missing_id = uuid4(), uuid4(), uuid4()
+
+        with (
+            patch.object(TestimonialService, "_bulk_update") as mock_bulk,
+            patch.object(TestimonialService, "_apply_changes") as mock_apply,
+        ):
+            change = Mock()
+            mock_bulk.return_value = {updated_id: change, unchanged_id: None}
+            result = TestimonialService.bulk_moderate(
+                TestimonialBulkModeration(
+                    action="approve", ids=[updated_id, unchanged_id, missing_id, updated_id]
+                ),
+                mock_db,
+                tenant_owner_id,
+            )
+
+        mock_bulk.assert_called_once_with(
+            mock_db,
+            [updated_id, unchanged_id, missing_id],
+            tenant_owner_id,
+            {"status": StatusType.APPROVED},
+        )
+        mock_apply.assert_called_once_with(mock_db, [change])
+        assert [item.outcome for item in result.results] == ["updated", "unchanged", "not_found"]
+        assert result.matched == 2
+        assert result.updated == 1
+
+    def test_bulk_moderate_commits_per_chunk(self):
+        """Test ids are written in chunks, one transaction each."""
+        from app.schemas.testimonial import TestimonialBulkModeration
+
+        mock_db = Mock()
+        ids = [uuid4() for _ in range(5)]
+
+        with (
+            patch("app.services.testimonial.settings.BULK_MODERATION_CHUNK_SIZE", 2),
+            patch.object(TestimonialService, "_bulk_update", return_value={}) as mock_bulk,
+        ):
+            TestimonialService.bulk_moderate(
+                TestimonialBulkModeration(action="delete", ids=ids), mock_db, uuid4()
+            )
+
+        assert [call.args[1] for call in mock_bulk.call_args_list] == [ids[:2], ids[2:4], ids[4:]]
+        assert mock_bulk.call_args.args[3] == {"is_active": False}
+        assert mock_db.commit.call_count == 3
+
+    def test_bulk_moderate_filters_caps_targets(self):
+        """Test filter targets are capped and has_more is reported."""
+        from app.schemas.testimonial import TestimonialBulkModeration
+
+        mock_db = Mock()
+        ids = [uuid4() for _ in range(3)]
+        mock_db.exec.return_value.all.return_value = ids
+
+        with (
+            patch("app.services.testimonial.settings.BULK_MODERATION_MAX_IDS", 2),
+            patch.object(TestimonialService, "_bulk_update", return_value={}) as mock_bulk,
+        ):
+            result = TestimonialService.bulk_moderate(
+                TestimonialBulkModeration(action="reject", filters={"rating": 1}),
+                mock_db,
+                uuid4(),
+            )
+
+        assert mock_bulk.call_args.args[1] == ids[:2]
+        assert result.has_more is True
+
+        query = mock_db.exec.call_args_list[0].args[0]
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert sql.startswith("SELECT testimonial.id")
+        assert "testimonial.status IS DISTINCT FROM" in sql
+
+    def test_bulk_update_is_single_locked_statement(self):
+        """Test the chunk update locks the tenant's rows and skips unchanged ones."""
+        mock_db = Mock()
+        tenant_owner_id = uuid4()
+        unchanged_id = uuid4()
+        mock_db.exec.return_value.all.return_value = [Mock(matched_id=unchanged_id, id=None)]
+
+        changes = TestimonialService._bulk_update(
+            mock_db, [unchanged_id], tenant_owner_id, {"status": StatusType.APPROVED}
+        )
+
+        assert changes == {unchanged_id: None}
+        assert mock_db.exec.call_count == 1
+        sql = str(mock_db.exec.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FOR UPDATE" in sql
+        assert "testimonial.user_id = " in sql
+        assert "previous.status IS DISTINCT FROM" in sql
+        assert "RETURNING" in sql
@@ -0,0 +1,102 @@
+"""Tests for UsageService."""
+
+from unittest.mock import Mock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.db import _run_before_commit
+from app.services.changes import TestimonialChange
+from app.services.usage import UsageService
+from tests.conftest import testimonial_state
+
+
+def _upserted_counts(mock_db):
+    counts = {}
+    for call in mock_db.exec.call_args_list:
+        params = call.args[0].compile(dialect=postgresql.dialect()).params
+        for key, value in params.items():
+            if key.startswith("tag_id") or key.startswith("category_id"):
+                counts[value] = params[
+                    key.replace("tag_id", "usage_count").replace("category_id", "usage_count")
+                ]
+    return counts
+
+
+def test_apply_changes_counts_created_testimonial():
+    mock_db = Mock()
+    mock_db.info = {}
+    tag_a, tag_b, category = uuid4(), uuid4(), uuid4()
+
+    UsageService.apply_changes(
+        mock_db,
+        [
+            TestimonialChange(
+                uuid4(), None, testimonial_state(tag_ids=[tag_a, tag_b], category_id=category)
+            )
+        ],
+    )
+    _run_before_commit(mock_db)
+
+    assert mock_db.exec.call_count == 2
+    assert _upserted_counts(mock_db) == {tag_a: 1, tag_b: 1, category: 1}
+
+
+def test_apply_changes_only_writes_tag_differences():
+    mock_db = Mock()
+    mock_db.info = {}
+    kept, removed, added = uuid4(), uuid4(), uuid4()
+    before = testimonial_state(tag_ids=[kept, removed])
+
+    UsageService.apply_changes(
+        mock_db,
+        [TestimonialChange(uuid4(), before, before.evolve(tag_ids=frozenset([kept, added])))],
+    )
+    _run_before_commit(mock_db)
+
+    assert mock_db.exec.call_count == 1
+    assert _upserted_counts(mock_db) == {removed: -1, added: 1}
+
+
+def test_apply_changes_soft_delete_decrements():
+    mock_db = Mock()
+    mock_db.info = {}
+    tag, category = uuid4(), uuid4()
+    before = testimonial_state(tag_ids=[tag], category_id=category)
+
+    UsageService.apply_changes(
+        mock_db, [TestimonialChange(uuid4(), before, before.evolve(is_active=False))]
+    )
+    _run_before_commit(mock_db)
+
+    assert _upserted_counts(mock_db) == {tag: -1, category: -1}
+
+
+def test_apply_changes_without_deltas_does_nothing():
+    mock_db = Mock()
+    mock_db.info = {}
+    state = testimonial_state(tag_ids=[uuid4()])
+
+    UsageService.apply_changes(mock_db, [TestimonialChange(uuid4(), state, state)])
+    _run_before_commit(mock_db)
+
+    mock_db.exec.assert_not_called()
+    assert mock_db.info == {}
+
+
+def test_apply_changes_is_written_right_before_commit_in_key_order():
+    mock_db = Mock()
+    mock_db.info = {}
+    tenant = uuid4()
+    tags = [uuid4() for _ in range(3)]
+
+    UsageService.apply_changes(
+        mock_db, [TestimonialChange(tenant, None, testimonial_state(tag_ids=tags))]
+    )
+    mock_db.exec.assert_not_called()
+
+    _run_before_commit(mock_db)
+    (call,) = mock_db.exec.call_args_list
+    params = call.args[0].compile(dialect=postgresql.dialect()).params
+    written = [value for key, value in params.items() if key.startswith("tag_id")]
+    assert written == sorted(tags)
@@ -0,0 +1,439 @@
+"""Tests for WebhookService and WebhookDispatcher."""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+
+from app.models.webhook import WebhookDeliveryStatus, WebhookEndpoint, WebhookEventType
+from app.schemas.webhook import WebhookEndpointCreate, WebhookEndpointUpdate
+from app.services import webhook
+from app.services.webhook import WebhookDispatcher, WebhookService
+
+
+class _Stub(BaseHTTPRequestHandler):
+    """Answers POSTs after server.delay seconds with the status set for the path, recording them."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+            server.received.append((self.path, dict(self.headers), body))
+        self.send_response(server.statuses.get(self.path, 200))
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    server.lock = threading.Lock()
+    server.received, server.statuses = [], {}
+    server.delay, server.active, server.peak = 0.0, 0, 0
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    # The stub is a plain http server on loopback, as in local development
+    with patch("app.services.webhook.settings.WEBHOOK_ALLOW_PRIVATE_URLS", True):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _claimed(endpoint_id, url, attempts=0, secret="whsec_test"):
+    return SimpleNamespace(
+        id=uuid4(),
+        endpoint_id=endpoint_id,
+        attempts=attempts,
+        payload={"id": str(uuid4()), "type": "testimonial.created", "data": {}},
+        url=url,
+        secret=secret,
+    )
+
+
+def _statements(function, *args):
+    """Compiled statements run by function through its own Session."""
+    statements = []
+    session = MagicMock()
+    session.__enter__.return_value.exec.side_effect = lambda stmt: (
+        statements.append(stmt.compile(dialect=postgresql.dialect())) or MagicMock()
+    )
+    with patch("app.services.webhook.Session", return_value=session):
+        function(*args)
+    return statements
+
+
+class TestFanOut:
+    def test_new_events_become_deliveries_and_advance_their_endpoints(self):
+        (statement,) = _statements(WebhookService.fan_out, 500)
+
+        sql = str(statement)
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "testimonialevent.id > webhookendpoint.last_event_id" in sql
+        assert "LATERAL (SELECT" in sql
+        assert "testimonialevent.id > due.last_event_id ORDER BY testimonialevent.id" in sql
+        assert 500 in statement.params.values()
+        assert "INSERT INTO webhookdelivery" in sql
+        assert "WHERE batch.event_type = ANY (batch.events)" in sql
+        assert "jsonb_build_object(" in sql
+        assert "UPDATE webhookendpoint SET updated_at=webhookendpoint.updated_at, " in sql
+        assert "last_event_id=passed.last_event_id" in sql
+        assert sql.endswith("SELECT count(*) AS count_1 \nFROM batch")
+
+    def test_new_endpoints_start_after_the_latest_event(self):
+        mock_db = Mock()
+        mock_db.exec.return_value.one.return_value = 42
+
+        with patch("app.services.webhook.settings.WEBHOOK_ALLOW_PRIVATE_URLS", True):
+            endpoint = WebhookService.create_endpoint(
+                mock_db, uuid4(), WebhookEndpointCreate(url="https://hooks.example.com/hook")
+            )
+
+        assert endpoint.last_event_id == 42
+
+    def test_reenabled_endpoints_skip_the_events_they_missed(self):
+        tenant_owner_id = uuid4()
+        endpoint = WebhookEndpoint(
+            user_id=tenant_owner_id,
+            url="https://hooks.example.com/hook",
+            secret="whsec_test",
+            events=[WebhookEventType.TESTIMONIAL_CREATED.value],
+            is_active=False,
+            last_event_id=7,
+        )
+        mock_db = Mock()
+        mock_db.get.return_value = endpoint
+        mock_db.exec.return_value.one.return_value = 42
+
+        with patch.object(webhook.webhook_dispatcher, "wake"):
+            WebhookService.update_endpoint(
+                mock_db, tenant_owner_id, endpoint.id, WebhookEndpointUpdate(description="x")
+            )
+            assert endpoint.last_event_id == 7
+            WebhookService.update_endpoint(
+                mock_db, tenant_owner_id, endpoint.id, WebhookEndpointUpdate(is_active=True)
+            )
+
+        assert endpoint.last_event_id == 42
+
+
+class TestSigning:
+    def test_signature_round_trip(self):
+        timestamp = str(int(time.time()))
+        signature = WebhookService.sign("whsec_test", timestamp, b'{"events":[]}')
+
+        assert signature.startswith("v1=")
+        assert WebhookService.verify("whsec_test", timestamp, b'{"events":[]}', signature)
+        assert not WebhookService.verify("whsec_other", timestamp, b'{"events":[]}', signature)
+        assert not WebhookService.verify("whsec_test", timestamp, b'{"events":[1]}', signature)
+
+    def test_stale_timestamp_is_rejected(self):
+        timestamp = str(int(time.time()) - 600)
+        signature = WebhookService.sign("whsec_test", timestamp, b"{}")
+
+        assert not WebhookService.verify("whsec_test", timestamp, b"{}", signature)
+
+
+class TestBackoff:
+    def test_doubles_up_to_the_cap_with_jitter(self):
+        with (
+            patch("app.services.webhook.settings.WEBHOOK_BACKOFF_BASE_SECONDS", 10),
+            patch("app.services.webhook.settings.WEBHOOK_BACKOFF_MAX_SECONDS", 60),
+        ):
+            delays = {attempts: WebhookService.backoff(attempts) for attempts in (1, 2, 3, 10)}
+
+        assert 5 <= delays[1] <= 10
+        assert 10 <= delays[2] <= 20
+        assert 20 <= delays[3] <= 40
+        assert 30 <= delays[10] <= 60
+
+
+class TestClaimAndSettle:
+    def test_claim_leases_each_endpoint_up_to_its_free_slots(self):
+        busy_endpoint = uuid4()
+
+        (claim,) = _statements(WebhookService.claim, {busy_endpoint: 1}, 20)
+
+        sql = str(claim)
+        assert "JOIN LATERAL" in sql
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "LIMIT (webhookendpoint_1.max_concurrency - coalesce(busy.batches" in sql
+        assert "SET next_attempt_at=(now() + " in sql
+        assert busy_endpoint in claim.params.values()
+
+    def _settle(self, deliveries, error):
+        with patch("app.services.webhook.settings.WEBHOOK_MAX_ATTEMPTS", 3):
+            return _statements(WebhookService.settle, deliveries, error)
+
+    def test_success_marks_delivered(self):
+        (update,) = self._settle(
+            [_claimed(uuid4(), "http://x"), _claimed(uuid4(), "http://x")], None
+        )
+
+        assert update.params["status"] == WebhookDeliveryStatus.DELIVERED
+        assert update.params["attempts"] == 1
+        assert "delivered_at=now()" in str(update)
+
+    def test_failure_retries_then_dead_letters(self):
+        endpoint_id = uuid4()
+        retried, dead = self._settle(
+            [
+                _claimed(endpoint_id, "http://x", attempts=0),
+                _claimed(endpoint_id, "http://x", attempts=2),
+            ],
+            "HTTP 500",
+        )
+
+        assert retried.params["attempts"] == 1
+        assert "next_attempt_at=(now() + " in str(retried)
+        assert "status" not in retried.params
+        assert dead.params["attempts"] == 3
+        assert dead.params["status"] == WebhookDeliveryStatus.DEAD
+        assert dead.params["last_error"] == "HTTP 500"
+
+
+class TestSend:
+    def test_signed_batch_is_posted(self, stub):
+        payloads = [
+            {"id": "1", "type": "testimonial.created"},
+            {"id": "2", "type": "testimonial.deleted"},
+        ]
+
+        async def send():
+            async with httpx.AsyncClient() as client:
+                return await WebhookService.send(client, f"{stub.url}/hook", "whsec_test", payloads)
+
+        assert asyncio.run(send()) is None
+        ((path, headers, body),) = stub.received
+        assert path == "/hook"
+        assert json.loads(body) == {"events": payloads}
+        assert WebhookService.verify(
+            "whsec_test", headers["Webhook-Timestamp"], body, headers["Webhook-Signature"]
+        )
+
+    def test_errors_are_reported(self, stub):
+        stub.statuses["/down"] = 503
+
+        async def send(url):
+            async with httpx.AsyncClient() as client:
+                return await WebhookService.send(client, url, "whsec_test", [{}])
+
+        assert asyncio.run(send(f"{stub.url}/down")) == "HTTP 503"
+        assert asyncio.run(send("http://127.0.0.1:9/closed")) == "Connection error"
+
+
+def _resolves_to(*addresses):
+    """Patch DNS so every host resolves to addresses."""
+    return patch(
+        "socket.getaddrinfo",
+        return_value=[
+            (
+                socket.AF_INET6 if ":" in address else socket.AF_INET,
+                socket.SOCK_STREAM,
+                6,
+                "",
+                (address, 443),
+            )
+            for address in addresses
+        ],
+    )
+
+
+class TestUrlChecks:
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://127.0.0.1/hook",
+            "https://localhost/hook",
+            "https://10.0.0.5/hook",
+            "https://192.168.1.10:8443/hook",
+            "https://100.64.0.1/hook",
+            "https://169.254.169.254/latest/meta-data",
+            "https://0.0.0.0/hook",
+            "https://[::1]/hook",
+            "https://[::ffff:127.0.0.1]/hook",
+            "https://[fe80::1]/hook",
+        ],
+    )
+    def test_internal_addresses_are_rejected(self, url):
+        mock_db = Mock()
+        data = WebhookEndpointCreate(url=url)
+
+        with pytest.raises(HTTPException) as exc_info:
+            WebhookService.create_endpoint(mock_db, uuid4(), data)
+
+        assert exc_info.value.status_code == 400
+        assert not mock_db.add.called
+
+    def test_hosts_with_any_private_address_are_rejected(self):
+        with _resolves_to("93.184.215.14", "10.1.2.3"), pytest.raises(HTTPException):
+            WebhookService.check_url("https://hooks.example.com/hook")
+
+    def test_unresolvable_hosts_are_rejected(self):
+        with (
+            patch("socket.getaddrinfo", side_effect=socket.gaierror),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            WebhookService.check_url("https://hooks.example.com/hook")
+
+        assert exc_info.value.detail == "Webhook URL host does not resolve"
+
+    def test_public_hosts_are_accepted(self):
+        with _resolves_to("93.184.215.14", "2606:2800:21f:cb07:6820:80da:af6b:8b2c"):
+            WebhookService.check_url("https://hooks.example.com/hook")
+
+    def test_updates_check_the_new_url(self):
+        mock_db = Mock()
+        mock_db.get.return_value = SimpleNamespace(user_id=(tenant_owner_id := uuid4()))
+
+        with pytest.raises(HTTPException):
+            WebhookService.update_endpoint(
+                mock_db, tenant_owner_id, uuid4(), WebhookEndpointUpdate(url="https://10.0.0.1/")
+            )
+
+        assert not mock_db.commit.called
+
+    def test_http_is_rejected(self):
+        with pytest.raises(ValidationError, match="must use https"):
+            WebhookEndpointCreate(url="http://hooks.example.com/hook")
+        with pytest.raises(ValidationError, match="must use https"):
+            WebhookEndpointUpdate(url="http://hooks.example.com/hook")
+
+    def test_send_pins_the_checked_address(self):
+        client = Mock(post=AsyncMock(return_value=Mock(is_success=True)))
+
+        with _resolves_to("93.184.215.14"):
+            error = asyncio.run(
+                WebhookService.send(client, "https://hooks.example.com/hook", "whsec_test", [{}])
+            )
+
+        assert error is None
+        url = client.post.call_args.args[0]
+        assert str(url) == "https://93.184.215.14/hook"
+        assert client.post.call_args.kwargs["headers"]["Host"] == "hooks.example.com"
+        assert client.post.call_args.kwargs["extensions"] == {"sni_hostname": "hooks.example.com"}
+
+    @pytest.mark.parametrize("url", ["https://hooks.example.com/hook", "http://93.184.215.14/hook"])
+    def test_send_refuses_hosts_rebound_to_internal_addresses(self, url):
+        client = Mock(post=AsyncMock())
+
+        with _resolves_to("169.254.169.254"):
+            error = asyncio.run(WebhookService.send(client, url, "whsec_test", [{}]))
+
+        assert error == "URL not allowed"
+        assert not client.post.called
+
+    def test_send_reports_coarse_errors(self):
+        client = Mock(post=AsyncMock(side_effect=httpx.ConnectError("[Errno 111] 10.0.0.1:443")))
+
+        with _resolves_to("93.184.215.14"):
+            error = asyncio.run(
+                WebhookService.send(client, "https://hooks.example.com/hook", "whsec_test", [{}])
+            )
+
+        assert error == "Connection error"
+
+
+class TestDispatcher:
+    def test_batches_per_endpoint_and_settles_each_request(self, stub):
+        stub.delay = 0.2
+        stub.statuses["/down"] = 500
+        healthy, failing = uuid4(), uuid4()
+        claimed = [_claimed(healthy, f"{stub.url}/ok") for _ in range(5)]
+        claimed.append(_claimed(failing, f"{stub.url}/down"))
+        claims, settled = [], []
+
+        def claim(in_flight, batch_size):
+            claims.append(in_flight)
+            return claimed if len(claims) == 1 else []
+
+        def settle(deliveries, error):
+            settled.append(([row.id for row in deliveries], error))
+
+        dispatcher = WebhookDispatcher(
+            batch_size=2, timeout=5, poll_interval=0.05, fanout_limit=100
+        )
+        with (
+            patch("app.services.webhook.WebhookService.fan_out", return_value=0),
+            patch("app.services.webhook.WebhookService.claim", side_effect=claim),
+            patch("app.services.webhook.WebhookService.settle", side_effect=settle),
+        ):
+            dispatcher.start()
+            deadline = time.monotonic() + 5
+            while len(settled) < 4 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            dispatcher.stop(5)
+
+        # Three batches of the healthy endpoint and one of the failing one, sent at once
+        assert len(stub.received) == 4
+        assert stub.peak == 4
+        assert sorted(len(ids) for ids, _ in settled) == [1, 1, 2, 2]
+        assert {error for ids, error in settled if claimed[-1].id in ids} == {"HTTP 500"}
+        assert {error for ids, error in settled if claimed[-1].id not in ids} == {None}
+        # Claims made while requests were in flight report them per endpoint
+        assert claims[1] == {healthy: 3, failing: 1}
+        assert claims[-1] == {}
+
+    def test_wake_triggers_a_claim(self):
+        claims = []
+        dispatcher = WebhookDispatcher(batch_size=10, timeout=5, poll_interval=60, fanout_limit=100)
+
+        with (
+            patch("app.services.webhook.WebhookService.fan_out", return_value=0),
+            patch(
+                "app.services.webhook.WebhookService.claim",
+                side_effect=lambda in_flight, batch_size: claims.append(in_flight) or [],
+            ),
+        ):
+            dispatcher.start()
+            deadline = time.monotonic() + 5
+            while not claims and time.monotonic() < deadline:
+                time.sleep(0.01)
+            dispatcher.wake()
+            while len(claims) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            dispatcher.stop(5)
+
+        assert len(claims) == 2
+
+    def test_passes_repeat_at_once_while_events_are_fanned_out(self):
+        fanned_out = [500, 500, 3]
+        claims = []
+        dispatcher = WebhookDispatcher(batch_size=10, timeout=5, poll_interval=60, fanout_limit=500)
+
+        with (
+            patch(
+                "app.services.webhook.WebhookService.fan_out",
+                side_effect=lambda limit: fanned_out.pop(0) if fanned_out else 0,
+            ),
+            patch(
+                "app.services.webhook.WebhookService.claim",
+                side_effect=lambda in_flight, batch_size: claims.append(in_flight) or [],
+            ),
+        ):
+            dispatcher.start()
+            deadline = time.monotonic() + 5
+            while len(claims) < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            dispatcher.stop(5)
+
+        # Three passes with events, then one that finds nothing and waits
+        assert len(claims) == 4
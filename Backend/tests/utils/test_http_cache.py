@@ -0,0 +1,38 @@
+"""Tests for HTTP cache helpers."""
+
+from fastapi import status
+
+from app.utils.http_cache import accepts_gzip, etag_matches, make_etag, not_modified
+
+
+def test_make_etag_is_quoted_and_stable():
+    etag = make_etag("a", 1, None)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("a", 1, None)
+
+
+def test_make_etag_changes_with_parts():
+    assert make_etag("a", 1) != make_etag("a", 2)
+
+
+def test_etag_matches_list_and_weak_validators():
+    etag = make_etag("x")
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_not_modified_response():
+    response = not_modified('"abc"', "private, no-cache")
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == '"abc"'
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_accepts_gzip_honours_quality_values():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("*;q=0.5")
+    assert not accepts_gzip("gzip;q=0, *")
+    assert not accepts_gzip("br")
+    assert not accepts_gzip(None)
@@ -0,0 +1,33 @@
+"""Tests for the sorted-array prefix index."""
+
+from uuid import uuid4
+
+from app.utils.prefix_index import IndexEntry, PrefixIndex
+
+
+def _entry(slug, usage_count):
+    return IndexEntry(id=uuid4(), name=slug, slug=slug, usage_count=usage_count)
+
+
+def test_search_returns_prefix_matches_by_usage():
+    index = PrefixIndex([_entry("tech", 2), _entry("technology", 9), _entry("team", 5)])
+
+    assert [e.slug for e in index.search("te")] == ["technology", "team", "tech"]
+    assert [e.slug for e in index.search("tech")] == ["technology", "tech"]
+    assert [e.slug for e in index.search("tech", limit=1)] == ["technology"]
+    assert index.search("x") == []
+
+
+def test_search_ties_are_alphabetical_and_unused_are_hidden():
+    index = PrefixIndex([_entry("beta", 1), _entry("alpha", 1), _entry("apple", 0)])
+
+    assert [e.slug for e in index.search("")] == ["alpha", "beta"]
+
+
+def test_increment():
+    entry = _entry("gadget", 1)
+    index = PrefixIndex([entry])
+
+    assert index.increment(entry.id, 2) is True
+    assert index.search("gad")[0].usage_count == 3
+    assert index.increment(uuid4(), 1) is False
@@ -0,0 +1,54 @@
+"""Tests for the public address checks of outbound URLs."""
+
+import asyncio
+import socket
+from unittest.mock import patch
+
+import pytest
+
+from app.utils.validators.url import (
+    PrivateAddressError,
+    UnresolvableHostError,
+    is_public_address,
+    resolve_public,
+    resolve_public_async,
+)
+
+
+@pytest.mark.parametrize("address", ["93.184.215.14", "2606:2800:21f:cb07:6820:80da:af6b:8b2c"])
+def test_global_unicast_is_public(address):
+    assert is_public_address(address)
+
+
+@pytest.mark.parametrize(
+    "address",
+    [
+        "127.0.0.1",
+        "10.0.0.1",
+        "172.16.0.1",
+        "192.168.0.1",
+        "100.64.0.1",
+        "169.254.169.254",
+        "0.0.0.0",
+        "240.0.0.1",
+        "224.0.0.1",
+        "::1",
+        "::",
+        "fc00::1",
+        "fe80::1%eth0",
+        "::ffff:10.0.0.1",
+        "ff02::1",
+    ],
+)
+def test_internal_addresses_are_not_public(address):
+    assert not is_public_address(address)
+
+
+def test_resolution_errors():
+    with (
+        patch("socket.getaddrinfo", side_effect=socket.gaierror),
+        pytest.raises(UnresolvableHostError),
+    ):
+        resolve_public("hooks.example.com", 443)
+    with pytest.raises(PrivateAddressError):
+        asyncio.run(resolve_public_async("127.0.0.1", 443))